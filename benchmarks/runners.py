@@ -0,0 +1,83 @@
+"""
+Compare ObserverRunner dispatch modes:
+a new thread per consumer per event vs. a long-lived thread pool.
+
+Usage::
+
+    python -m benchmarks.runners --events 20000 --consumers 3 --pool-size 3
+"""
+
+import argparse
+import logging
+import time
+from typing import Any
+
+from eventscore.core.consumers import Consumer
+from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.runners import ObserverRunner
+from eventscore.core.types import Event
+
+logger = logging.getLogger("eventscore.benchmarks")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+class ListStream:
+    """Stream stub that pops events from a pre-filled list, no broker involved."""
+
+    def __init__(self, events: list[Event]) -> None:
+        self.__events = events
+
+    def put(self, event: Event, **kwargs: Any) -> None:
+        self.__events.append(event)
+
+    def pop(self, *args: Any, **kwargs: Any) -> Event:
+        if not self.__events:
+            raise EmptyStreamError
+        return self.__events.pop()
+
+    def flush(self) -> None:
+        pass
+
+
+def consume(event: Event) -> None:
+    pass
+
+
+def bench(events: int, consumers: int, pool_size: int) -> float:
+    stream = ListStream([Event(type="bench") for _ in range(events)])
+    runner = ObserverRunner(
+        lambda: stream,  # type:ignore[arg-type]
+        "bench",
+        "bench",
+        *(Consumer(consume, logger=logger) for _ in range(consumers)),
+        max_events=events,
+        logger=logger,
+        pool_size=pool_size,
+    )
+    started = time.perf_counter()
+    runner.run()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--consumers", type=int, default=3)
+    parser.add_argument("--pool-size", type=int, default=3)
+    args = parser.parse_args()
+
+    for title, pool_size in (
+        ("thread per event", 0),
+        (f"pool of {args.pool_size}", args.pool_size),
+    ):
+        elapsed = bench(args.events, args.consumers, pool_size)
+        print(
+            f"{title:>20}: {elapsed:.3f}s, "
+            + f"{args.events / elapsed:,.0f} events/s "
+            + f"({args.consumers} consumers)"
+        )
+
+
+if __name__ == "__main__":
+    main()
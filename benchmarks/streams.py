@@ -0,0 +1,87 @@
+"""
+Compare SegmentLogStream with RedisStream on the same machine:
+produce and consume throughput of a single process.
+
+Events are put in batches of `--batch` events and popped
+in batches of the same size. RedisStream is skipped
+if Redis is not reachable at `--redis-url`.
+
+Usage::
+
+    python -m benchmarks.streams --events 20000 --batch 100
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+import uuid
+
+import redis
+
+from eventscore.core.abstract import IStream
+from eventscore.core.types import Event
+from eventscore.ext.redis.serializers import RedisEventSerializer
+from eventscore.ext.redis.streams import RedisStream
+from eventscore.ext.segments.streams import SegmentLogStream
+
+logger = logging.getLogger("eventscore.benchmarks")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+def bench(stream: IStream, name: str, events: int, batch: int) -> tuple[float, float]:
+    batches = [
+        [Event(type=name, payload={"idx": idx}) for idx in range(start, start + batch)]
+        for start in range(0, events, batch)
+    ]
+    started = time.perf_counter()
+    for produced in batches:
+        _ = stream.put_many(produced)
+    produced_in = time.perf_counter() - started
+
+    started = time.perf_counter()
+    consumed = 0
+    while consumed < events:
+        consumed += len(stream.pop_many(name, "bench", max_count=batch))
+    return produced_in, time.perf_counter() - started
+
+
+def report(title: str, events: int, elapsed: tuple[float, float]) -> None:
+    produced_in, consumed_in = elapsed
+    print(
+        f"{title:>24}: produce {events / produced_in:,.0f} events/s, "
+        + f"consume {events / consumed_in:,.0f} events/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    args = parser.parse_args()
+
+    name = f"bench-{uuid.uuid4()}"
+    for title, fsync in (("segment log, fsync", True), ("segment log", False)):
+        with tempfile.TemporaryDirectory() as directory:
+            stream = SegmentLogStream(directory=directory, fsync=fsync, logger=logger)
+            report(title, args.events, bench(stream, name, args.events, args.batch))
+
+    client = redis.Redis.from_url(args.redis_url)
+    try:
+        _ = client.ping()
+    except redis.RedisError as exc:
+        print(f"{'redis':>24}: skipped, {exc}")
+        return
+    try:
+        redis_stream = RedisStream(
+            serializer=RedisEventSerializer(), redis=client, logger=logger
+        )
+        report("redis", args.events, bench(redis_stream, name, args.events, args.batch))
+    finally:
+        _ = client.delete(name)
+
+
+if __name__ == "__main__":
+    main()
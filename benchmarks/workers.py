@@ -0,0 +1,152 @@
+"""
+Compare SpawnMPWorker start methods:
+per-clone unique memory (USS) and time-to-first-event.
+
+Spawning process holds a heap of `--heap-mb` megabytes of small objects,
+the way a web process does. Every clone consumes a single event,
+runs a full GC pass and reports its USS, which includes every page
+of inherited heap the clone has un-shared. Linux only, USS is read
+from procfs.
+
+Usage::
+
+    python -m benchmarks.workers --clones 4 --heap-mb 200
+"""
+
+import argparse
+import gc
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Any
+
+from eventscore.core.consumers import Consumer
+from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.runners import ObserverRunner
+from eventscore.core.types import Event, Worker
+from eventscore.core.workers import SpawnMPWorker
+
+logger = logging.getLogger("eventscore.benchmarks")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+# NOTE: stands for the heap of spawning process, inherited by forked clones
+HEAP: list[list[Any]] = []
+
+
+class QueueStream:
+    """Stream stub that pops events from a multiprocessing queue."""
+
+    def __init__(self, events: "mp.Queue[Event]") -> None:
+        self.__events = events
+
+    def pop(self, *args: Any, timeout: int = 5, **kwargs: Any) -> Event:
+        try:
+            return self.__events.get(timeout=timeout)
+        except queue.Empty:
+            raise EmptyStreamError
+
+    def flush(self) -> None:
+        pass
+
+
+class QueueStreamFactory:
+    """Picklable stream factory, so runners can be started by any method."""
+
+    def __init__(self, events: "mp.Queue[Event]") -> None:
+        self.__events = events
+
+    def __call__(self) -> QueueStream:
+        return QueueStream(self.__events)
+
+
+class Reporter:
+    """Consumer reporting time of the first event and USS after a GC pass."""
+
+    __name__ = "report"
+
+    def __init__(self, reports: "mp.Queue[tuple[float, int]]") -> None:
+        self.__reports = reports
+
+    def __call__(self, event: Event) -> None:
+        consumed_at = time.monotonic()
+        _ = gc.collect()
+        self.__reports.put((consumed_at, uss()))
+
+
+def uss() -> int:
+    try:
+        with open("/proc/self/smaps_rollup") as smaps:
+            return 1024 * sum(
+                int(line.split()[1])
+                for line in smaps
+                if line.startswith(("Private_Clean:", "Private_Dirty:"))
+            )
+    except OSError:
+        return 0
+
+
+def bench(
+    clones: int,
+    start_method: str,
+    gc_freeze: bool,
+    preload: tuple[str, ...],
+) -> tuple[float, float]:
+    context = mp.get_context(start_method)
+    events: "mp.Queue[Event]" = context.Queue()
+    reports: "mp.Queue[tuple[float, int]]" = context.Queue()
+    runner = ObserverRunner(
+        QueueStreamFactory(events),  # type:ignore[arg-type]
+        "bench",
+        "bench",
+        Consumer(Reporter(reports), logger=logger),
+        max_events=1,
+        logger=logger,
+    )
+    spawn = SpawnMPWorker(
+        logger,
+        start_method=start_method,
+        gc_freeze=gc_freeze,
+        preload=preload,
+    )
+
+    started = time.monotonic()
+    for _ in range(clones):
+        events.put(Event(type="bench"))
+    _ = spawn(Worker(name="bench", runner=runner, clones=clones))
+    results = [reports.get(timeout=60) for _ in range(clones)]
+
+    first_event = sum(consumed_at - started for consumed_at, _ in results) / clones
+    return first_event, sum(uss for _, uss in results) / clones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clones", type=int, default=4)
+    parser.add_argument("--heap-mb", type=int, default=200)
+    args = parser.parse_args()
+
+    # NOTE: roughly 200 bytes per list with its items,
+    # lists are tracked by GC, so GC passes touch every one of them.
+    HEAP.extend([idx, str(idx)] for idx in range(args.heap_mb * 5000))
+    print(f"Spawning process {os.getpid()}: {uss() / 2**20:,.0f} MiB USS")
+
+    preload = ("eventscore.core.runners",)
+    for title, start_method, gc_freeze in (
+        ("fork", "fork", False),
+        ("fork + gc.freeze", "fork", True),
+        ("forkserver + preload", "forkserver", False),
+        ("spawn", "spawn", False),
+    ):
+        first_event, clone_uss = bench(args.clones, start_method, gc_freeze, preload)
+        print(
+            f"{title:>22}: {clone_uss / 2**20:,.1f} MiB USS per clone, "
+            + f"{first_event * 1000:,.0f} ms to first event "
+            + f"({args.clones} clones)"
+        )
+
+
+if __name__ == "__main__":
+    main()
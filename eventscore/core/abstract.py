@@ -1,21 +1,33 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Sequence
 from enum import IntEnum, StrEnum
 from typing import Any, Protocol, TypeAlias, TypeVar
 
 from eventscore.core.logging import logger as _logger
-from eventscore.core.types import Event, Pipeline, Worker
+from eventscore.core.types import (
+    Event,
+    GroupStats,
+    Pipeline,
+    ProduceResult,
+    RateLimit,
+    RetryPolicy,
+    Worker,
+)
 
 # Type alias for user-defined event type
 EventType: TypeAlias = str | StrEnum | IntEnum
 # Type alias for user-defined consumer functions/other callable
 ConsumerFunc: TypeAlias = Callable[[Event], Any]
+# Type alias for user-defined coroutine consumer functions
+AsyncConsumerFunc: TypeAlias = Callable[[Event], Awaitable[Any]]
 # Type alias for user-defined consumer group
 ConsumerGroup: TypeAlias = str | StrEnum | IntEnum
 # Type alias for number of clones
 NumberOfClones: TypeAlias = int
+# Type alias for relative load of a single consumer clone
+Weight: TypeAlias = float
 # Type alias for path to consumer function's module
 FunctionModulePath: TypeAlias = str
 
@@ -99,6 +111,9 @@ class IECore(Protocol):
         event: EventType,
         group: ConsumerGroup,
         clones: NumberOfClones = 1,
+        weight: Weight = 1.0,
+        retry: RetryPolicy | None = None,
+        rate_limit: RateLimit | None = None,
     ) -> ConsumerFunc:
         """
         Decorator for consumer functions
@@ -111,6 +126,18 @@ class IECore(Protocol):
         :type group: ConsumerGroup
         :param clones: No of clones
         :type clones: NumberOfClones
+        :param weight: Relative load of a single clone,
+            used by spawners that host several workers per process
+        :type weight: Weight
+        :param retry: Retry policy of consumer.
+            Not supported for coroutine consumer functions.
+            Defaults to None, i.e. events consumer failed to consume
+            are not retried
+        :type retry: RetryPolicy | None
+        :param rate_limit: Rate limit of consumer, shared by all its clones.
+            Not applied to coroutine consumer functions.
+            Defaults to None, i.e. consumer is not limited
+        :type rate_limit: RateLimit | None
         :return: Decorated function
         :rtype: ConsumerFunc
         """
@@ -124,6 +151,9 @@ class IECore(Protocol):
         *,
         clones: NumberOfClones = 1,
         func_path: str | None = None,
+        weight: Weight = 1.0,
+        retry: RetryPolicy | None = None,
+        rate_limit: RateLimit | None = None,
     ) -> None:
         """
         Consumer function registrator
@@ -145,6 +175,18 @@ class IECore(Protocol):
             (inspect.getsourcefile(func) or "") + ":" + func.__name__
             ```
         :type func_path: str | None
+        :param weight: Relative load of a single clone,
+            used by spawners that host several workers per process
+        :type weight: Weight
+        :param retry: Retry policy of consumer.
+            Not supported for coroutine consumer functions.
+            Defaults to None, i.e. events consumer failed to consume
+            are not retried
+        :type retry: RetryPolicy | None
+        :param rate_limit: Rate limit of consumer, shared by all its clones.
+            Not applied to coroutine consumer functions.
+            Defaults to None, i.e. consumer is not limited
+        :type rate_limit: RateLimit | None
         :return: None
         :rtype: None
         """
@@ -168,10 +210,66 @@ class IECore(Protocol):
         *,
         block: bool = True,
         timeout: int = 5,
+        deliver_at: float | None = None,
+        delay: float | None = None,
     ) -> None:
         """
         Produce an event
 
+        :param event: Event to produce
+        :type event: Event
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :param deliver_at: UNIX timestamp event is delivered to consumers at.
+            Defaults to None, i.e. event is delivered at once
+        :type deliver_at: float | None
+        :param delay: Number of seconds event is delivered to consumers after.
+            Defaults to None. Mutually exclusive with deliver_at
+        :type delay: float | None
+        :return: None
+        :rtype: None
+        """
+        ...
+
+    def produce_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        """
+        Produce several events at once, sharing broker round trips.
+        Failure of one event does not prevent others from being sent.
+
+        :param events: Events to produce
+        :type events: Sequence[Event]
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :return: Result for every given event, in the same order.
+            Empty if producing is skipped by skipping predicate
+        :rtype: list[ProduceResult]
+        """
+        ...
+
+    async def aproduce(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        """
+        Produce an event without blocking an event loop
+
         :param event: Event to produce
         :type event: Event
         :param block: Should I/O be blocked if some delay occurs.
@@ -238,6 +336,17 @@ class ISpawnWorker(Protocol):
         """
         ...
 
+    def finalize(self) -> tuple[int, ...]:
+        """
+        Spawn workers deferred by previous calls, if any.
+        Is called once after all workers are passed to spawner.
+        Optional, spawners without it spawn every worker when it is passed.
+
+        :return: PIDs
+        :rtype: tuple[int, ...]
+        """
+        ...
+
 
 class IEventSerializer(Protocol[IType, RType]):
     """
@@ -284,10 +393,65 @@ class IProducer(Protocol):
         *,
         block: bool = True,
         timeout: int = 5,
+        deliver_at: float | None = None,
+        delay: float | None = None,
     ) -> None:
         """
         Produce an event
 
+        :param event: Event to produce
+        :type event: Event
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :param deliver_at: UNIX timestamp event is delivered to consumers at.
+            Defaults to None, i.e. event is delivered at once
+        :type deliver_at: float | None
+        :param delay: Number of seconds event is delivered to consumers after.
+            Defaults to None. Mutually exclusive with deliver_at
+        :type delay: float | None
+        :return: None
+        :rtype: None
+        """
+        ...
+
+    def produce_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        """
+        Produce several events at once, sharing broker round trips.
+        Failure of one event does not prevent others from being sent.
+
+        :param events: Events to produce
+        :type events: Sequence[Event]
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :return: Result for every given event, in the same order
+        :rtype: list[ProduceResult]
+        """
+        ...
+
+    async def aproduce(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        """
+        Produce an event without blocking an event loop
+
         :param event: Event to produce
         :type event: Event
         :param block: Should I/O be blocked if some delay occurs.
@@ -333,6 +497,90 @@ class IStream(Protocol):
         """
         ...
 
+    def put_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        """
+        Put several events at once, sharing broker round trips.
+        Failure of one event does not prevent others from being sent.
+
+        :param events: Events to put
+        :type events: Sequence[Event]
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :return: Result for every given event, in the same order
+        :rtype: list[ProduceResult]
+        """
+        ...
+
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        """
+        Put an event to stream at given time.
+        Event is kept aside until it is due, then it is put to stream
+        like any other one, see `move_due` of stream implementation.
+
+        :param event: Event to put
+        :type event: Event
+        :param deliver_at: UNIX timestamp event is put to stream at
+        :type deliver_at: float
+        :raises UnsupportedOperationError: Broker can not delay events
+        :return: None
+        :rtype: None
+        """
+        ...
+
+    def take_tokens(
+        self, key: str, rate_limit: RateLimit, count: int
+    ) -> tuple[int, float]:
+        """
+        Take tokens from a token bucket kept by broker,
+        so that it is shared by all processes using the stream.
+        Bucket is created on first take, full.
+
+        :param key: Name of token bucket
+        :type key: str
+        :param rate_limit: Rate limit bucket is refilled by
+        :type rate_limit: RateLimit
+        :param count: Max number of tokens to take
+        :type count: int
+        :raises UnsupportedOperationError: Broker can not keep token buckets
+        :return: Number of taken tokens and number of seconds
+            until the next token is available, if none was taken
+        :rtype: tuple[int, float]
+        """
+        ...
+
+    async def aput(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        """
+        Put an event to stream without blocking an event loop
+
+        :param event: Event to put
+        :type event: Event
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :return: None
+        :rtype: None
+        """
+        ...
+
     def pop(
         self,
         event: EventType,
@@ -340,6 +588,7 @@ class IStream(Protocol):
         *,
         block: bool = True,
         timeout: int = 5,
+        ack: bool = True,
     ) -> Event:
         """
         Pop an event from stream
@@ -352,11 +601,206 @@ class IStream(Protocol):
         :param timeout: Number of seconds to wait in case of latency.
             Defaults to `5`.
         :type timeout: int
+        :param ack: Should event be acknowledged right away.
+            Defaults to `True`.
+            If `False`, event is delivered again by `reclaim`
+            unless it is acknowledged with `ack`.
+        :type ack: bool
         :return: Next unprocessed event in stream
         :rtype: Event
         """
         ...
 
+    def pop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        """
+        Pop up to `max_count` events from stream in a single round trip
+
+        :param event: Event type
+        :type event: EventType
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param max_count: Max number of events to pop.
+            Defaults to `10`.
+        :type max_count: int
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :param ack: Should events be acknowledged right away.
+            Defaults to `True`.
+            If `False`, events are delivered again by `reclaim`
+            unless they are acknowledged with `ack`.
+        :type ack: bool
+        :return: Next unprocessed events in stream, at least one
+        :rtype: list[Event]
+        """
+        ...
+
+    def pop_multi(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        """
+        Pop events of several types in a single round trip
+
+        :param events: Event types
+        :type events: Sequence[EventType]
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param max_count: Max number of events to pop of every type.
+            Defaults to `10`.
+        :type max_count: int
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :param ack: Should events be acknowledged right away.
+            Defaults to `True`.
+            If `False`, events are delivered again by `reclaim`
+            unless they are acknowledged with `ack`.
+        :type ack: bool
+        :return: Next unprocessed events in streams, at least one
+        :rtype: list[Event]
+        """
+        ...
+
+    def ack(self, event: EventType, group: ConsumerGroup, *events: Event) -> None:
+        """
+        Acknowledge events popped with `ack=False`,
+        so they are never delivered to consumer group again
+
+        :param event: Event type
+        :type event: EventType
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param events: Events to acknowledge
+        :type events: Tuple[Event, ...]
+        :return: None
+        :rtype: None
+        """
+        ...
+
+    def reclaim(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        min_idle: float = 60.0,
+        max_count: int = 10,
+    ) -> list[Event]:
+        """
+        Take over events delivered to consumer group,
+        but not acknowledged for at least `min_idle` seconds,
+        e.g. because consumer has crashed.
+        Reclaimed events must be acknowledged with `ack`.
+
+        :param event: Event type
+        :type event: EventType
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param min_idle: Min number of seconds event is not acknowledged for.
+            Defaults to `60.0`.
+        :type min_idle: float
+        :param max_count: Max number of events to reclaim.
+            Defaults to `10`.
+        :type max_count: int
+        :return: Reclaimed events, possibly none
+        :rtype: list[Event]
+        """
+        ...
+
+    def group_stats(self, event: EventType, group: ConsumerGroup) -> GroupStats:
+        """
+        Inspect how far consumer group is behind stream of event type
+
+        :param event: Event type
+        :type event: EventType
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :return: Lag and pending events of consumer group
+        :rtype: GroupStats
+        """
+        ...
+
+    def flush(self) -> None:
+        """
+        Send everything stream has buffered (e.g. acknowledgements) to broker.
+        Must be called before stream is abandoned.
+
+        :return: None
+        :rtype: None
+        """
+        ...
+
+
+class IAsyncStream(Protocol):
+    """
+    Asynchronous event stream class.
+    One and only purpose of this class is to pop events
+    without blocking an event loop.
+    """
+
+    __slots__ = ()
+
+    async def apop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[Event]:
+        """
+        Pop up to `max_count` events from stream in a single round trip
+
+        :param event: Event type
+        :type event: EventType
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param max_count: Max number of events to pop.
+            Defaults to `10`.
+        :type max_count: int
+        :param block: Should I/O be blocked if some delay occurs.
+            Defaults to `True`.
+        :type block: bool
+        :param timeout: Number of seconds to wait in case of latency.
+            Defaults to `5`.
+        :type timeout: int
+        :return: Next unprocessed events in stream, at least one
+        :rtype: list[Event]
+        """
+        ...
+
+    async def aflush(self) -> None:
+        """
+        Send everything stream has buffered to broker
+        and release asynchronous resources.
+
+        :return: None
+        :rtype: None
+        """
+        ...
+
 
 class IStreamFactory(Protocol):
     """
@@ -385,8 +829,8 @@ class IRunner(Protocol):
 
     :param stream: Event stream
     :type stream: IStream
-    :param event: Event type
-    :type event: EventType
+    :param event: Event type or several event types
+    :type event: EventType | Tuple[EventType, ...]
     :param consumers: Consumers
     :type consumers: Tuple[IConsumer, ...]
     :param max_events: Max events to process
@@ -403,7 +847,7 @@ class IRunner(Protocol):
     def __init__(
         self,
         stream_factory: IStreamFactory,
-        event: EventType,
+        event: EventType | tuple[EventType, ...],
         group: ConsumerGroup,
         *consumers: IConsumer,
         max_events: int = -1,
@@ -428,7 +872,14 @@ class IConsumer(Protocol):
 
     __slots__ = ()
 
-    def __init__(self, func: ConsumerFunc, logger: logging.Logger = _logger) -> None:
+    def __init__(
+        self,
+        func: ConsumerFunc,
+        logger: logging.Logger = _logger,
+        event: EventType | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limit: RateLimit | None = None,
+    ) -> None:
         """
         Construct consumer instance
 
@@ -436,6 +887,57 @@ class IConsumer(Protocol):
         :type func: ConsumerFunc
         :param logger: Logger instance
         :type logger: logging.Logger
+        :param event: Event type consumer is bound to.
+            Defaults to None, i.e. consumer accepts events of any type
+        :type event: EventType | None
+        :param retry: Retry policy, applied by runner.
+            Defaults to None, i.e. events are not retried
+        :type retry: RetryPolicy | None
+        :param rate_limit: Rate limit, applied by runner.
+            Defaults to None, i.e. consumer is not limited
+        :type rate_limit: RateLimit | None
+        """
+        ...
+
+    @property
+    def event(self) -> EventType | None:
+        """
+        Event type consumer is bound to,
+        runners of several event types dispatch events by it
+
+        :return: Event type or None, if consumer accepts events of any type
+        :rtype: EventType | None
+        """
+        ...
+
+    @property
+    def name(self) -> str:
+        """
+        Name of consumer, stable across processes and restarts,
+        runners with independent consumers name consumer groups by it
+
+        :return: Name
+        :rtype: str
+        """
+        ...
+
+    @property
+    def retry(self) -> RetryPolicy | None:
+        """
+        Retry policy of events consumer failed to consume
+
+        :return: Retry policy or None, if events are not retried
+        :rtype: RetryPolicy | None
+        """
+        ...
+
+    @property
+    def rate_limit(self) -> RateLimit | None:
+        """
+        Rate limit of consumer, shared by all its clones
+
+        :return: Rate limit or None, if consumer is not limited
+        :rtype: RateLimit | None
         """
         ...
 
@@ -449,3 +951,39 @@ class IConsumer(Protocol):
         :rtype: None
         """
         ...
+
+
+class IAsyncConsumer(Protocol):
+    """
+    Asynchronous consumer class.
+    One and only purpose of this class is to consume events
+    within an event loop.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        func: ConsumerFunc | AsyncConsumerFunc,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct asynchronous consumer instance
+
+        :param func: Consumer function, coroutine or regular one
+        :type func: ConsumerFunc | AsyncConsumerFunc
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        ...
+
+    async def consume(self, event: Event) -> None:
+        """
+        Consume an event with consumer function
+
+        :param event: Event to consume
+        :type event: Event
+        :return: None
+        :rtype: None
+        """
+        ...
@@ -1,14 +1,50 @@
+import asyncio
+import inspect
 import logging
 
-from eventscore.core.abstract import ConsumerFunc, IConsumer
+from eventscore.core.abstract import (
+    AsyncConsumerFunc,
+    ConsumerFunc,
+    EventType,
+    IAsyncConsumer,
+    IConsumer,
+)
 from eventscore.core.logging import logger as _logger
-from eventscore.core.types import Event
+from eventscore.core.types import Event, RateLimit, RetryPolicy
 
 
 class Consumer(IConsumer):
-    def __init__(self, func: ConsumerFunc, logger: logging.Logger = _logger) -> None:
+    def __init__(
+        self,
+        func: ConsumerFunc,
+        logger: logging.Logger = _logger,
+        event: EventType | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limit: RateLimit | None = None,
+    ) -> None:
         self.__func = func
         self.__logger = logger
+        self.__event = event
+        self.__retry = retry
+        self.__rate_limit = rate_limit
+
+    @property
+    def event(self) -> EventType | None:
+        return self.__event
+
+    @property
+    def name(self) -> str:
+        # NOTE: callable objects are named after their class
+        qualname = getattr(self.__func, "__qualname__", type(self.__func).__qualname__)
+        return f"{self.__func.__module__}.{qualname}"
+
+    @property
+    def retry(self) -> RetryPolicy | None:
+        return self.__retry
+
+    @property
+    def rate_limit(self) -> RateLimit | None:
+        return self.__rate_limit
 
     def consume(self, event: Event) -> None:
         self.__logger.debug("Consumer started.")
@@ -16,3 +52,26 @@ class Consumer(IConsumer):
         self.__logger.info(
             f"[{self.__func.__name__}] " + f"Successfully consumed an event: {event}."
         )
+
+
+class AsyncConsumer(IAsyncConsumer):
+    def __init__(
+        self,
+        func: ConsumerFunc | AsyncConsumerFunc,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        self.__func = func
+        self.__is_coroutine = inspect.iscoroutinefunction(func)
+        self.__logger = logger
+
+    async def consume(self, event: Event) -> None:
+        self.__logger.debug("Consumer started.")
+        if self.__is_coroutine:
+            await self.__func(event)
+        else:
+            # NOTE: regular functions are run in a separate thread,
+            # so they do not block other events in flight.
+            _ = await asyncio.to_thread(self.__func, event)
+        self.__logger.info(
+            f"[{self.__func.__name__}] " + f"Successfully consumed an event: {event}."
+        )
@@ -5,7 +5,7 @@ import os
 import sys
 import traceback
 from collections import defaultdict
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterator, Sequence
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, TypeAlias
@@ -23,6 +23,7 @@ from eventscore.core.abstract import (
     IStream,
     IStreamFactory,
     NumberOfClones,
+    Weight,
 )
 from eventscore.core.exceptions import (
     AlreadySpawnedError,
@@ -33,7 +34,7 @@ from eventscore.core.exceptions import (
 from eventscore.core.logging import logger as _logger
 from eventscore.core.pipelines import Pipeline, PipelineItem, ProcessPipeline
 from eventscore.core.producers import Producer
-from eventscore.core.types import Event
+from eventscore.core.types import Event, ProduceResult, RateLimit, RetryPolicy
 from eventscore.core.workers import SpawnMPWorker, Worker
 from eventscore.decorators import consumer as _consumer
 
@@ -44,6 +45,9 @@ FoundConsumerFunctions: TypeAlias = list[
         ConsumerGroup,
         NumberOfClones,
         FunctionModulePath,
+        Weight,
+        RetryPolicy | None,
+        RateLimit | None,
     ]
 ]
 
@@ -71,6 +75,7 @@ class ECore(IECore):
         spawn_worker: ISpawnWorker | None = None,
         spawn_worker_type: type[ISpawnWorker] = SpawnMPWorker,
         spawn_worker_init_kwargs: dict[str, Any] | None = None,
+        group_spawn_workers: dict[ConsumerGroup, ISpawnWorker] | None = None,
         producer: IProducer | None = None,
         producer_type: type[IProducer] = Producer,
         producer_init_kwargs: dict[str, Any] | None = None,
@@ -102,6 +107,10 @@ class ECore(IECore):
             Defaults to None.
             Param is ignored when spawn_worker is not None
         :type spawn_worker_init_kwargs: dict[str, Any] | None
+        :param group_spawn_workers: Worker spawners of specific consumer groups,
+            e.g. `SpawnThreadWorker` for I/O-bound groups.
+            Other groups are spawned by spawn_worker. Defaults to None
+        :type group_spawn_workers: dict[ConsumerGroup, ISpawnWorker] | None
         :param producer: Producer. Defaults to None
         :type producer: IProducer | None
         :param producer_type: Type of the producer.
@@ -128,6 +137,7 @@ class ECore(IECore):
         self.__spawn_worker = spawn_worker
         self.__spawn_worker_type = spawn_worker_type
         self.__spawn_worker_init_kwargs = spawn_worker_init_kwargs
+        self.__group_spawn_workers = group_spawn_workers or {}
         self.__producer = producer
         self.__producer_type = producer_type
         self.__producer_init_kwargs = producer_init_kwargs
@@ -207,8 +217,20 @@ class ECore(IECore):
         event: EventType,
         group: ConsumerGroup,
         clones: int = 1,
+        weight: Weight = 1.0,
+        retry: RetryPolicy | None = None,
+        rate_limit: RateLimit | None = None,
     ) -> ConsumerFunc:
-        return _consumer(func, ecore=self, event=event, group=group, clones=clones)
+        return _consumer(
+            func,
+            ecore=self,
+            event=event,
+            group=group,
+            clones=clones,
+            weight=weight,
+            retry=retry,
+            rate_limit=rate_limit,
+        )
 
     def register_consumer(
         self,
@@ -218,6 +240,9 @@ class ECore(IECore):
         *,
         clones: int = 1,
         func_path: str | None = None,
+        weight: Weight = 1.0,
+        retry: RetryPolicy | None = None,
+        rate_limit: RateLimit | None = None,
     ) -> None:
         if self.__skip:
             self.__logger.warning(
@@ -245,6 +270,9 @@ class ECore(IECore):
                 event=event,
                 group=group,
                 clones=clones,
+                weight=weight,
+                retry=retry,
+                rate_limit=rate_limit,
             )
         )
         self.__logger.info(
@@ -252,7 +280,10 @@ class ECore(IECore):
             + f"func={func.__name__}, "
             + f"event={event}, "
             + f"group={group}, "
-            + f"clones={clones} "
+            + f"clones={clones}, "
+            + f"weight={weight}, "
+            + f"retry={retry}, "
+            + f"rate_limit={rate_limit} "
             + "is successfully registered."
         )
 
@@ -346,17 +377,32 @@ class ECore(IECore):
                             func.__consumer_group__,
                             func.__consumer_clones__,
                             f"{file_path}:{func.__name__}",
+                            getattr(func, "__consumer_weight__", 1.0),
+                            getattr(func, "__consumer_retry__", None),
+                            getattr(func, "__consumer_rate_limit__", None),
                         )
                     )
                     self.__logger.info(f"Discovered consumer: {func} in {modname}")
 
-        for func, event, group, clones, func_path in found:
+        for (
+            func,
+            event,
+            group,
+            clones,
+            func_path,
+            weight,
+            retry,
+            rate_limit,
+        ) in found:
             self.register_consumer(
                 func,
                 event,
                 group,
                 clones=clones,
                 func_path=func_path,
+                weight=weight,
+                retry=retry,
+                rate_limit=rate_limit,
             )
 
         self.__logger.info(
@@ -369,13 +415,45 @@ class ECore(IECore):
         *,
         block: bool = True,
         timeout: int = 5,
+        deliver_at: float | None = None,
+        delay: float | None = None,
+    ) -> None:
+        if self.__skip:
+            self.__logger.warning("Skipping event producing due to skipping predicate.")
+            return
+        if not self.__workers_spawned:
+            self.__logger.warning("There is no spawned consumers at the moment.")
+        self.producer.produce(
+            event, block=block, timeout=timeout, deliver_at=deliver_at, delay=delay
+        )
+
+    def produce_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        if self.__skip:
+            self.__logger.warning("Skipping event producing due to skipping predicate.")
+            return []
+        if not self.__workers_spawned:
+            self.__logger.warning("There is no spawned consumers at the moment.")
+        return self.producer.produce_many(events, block=block, timeout=timeout)
+
+    async def aproduce(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
     ) -> None:
         if self.__skip:
             self.__logger.warning("Skipping event producing due to skipping predicate.")
             return
         if not self.__workers_spawned:
             self.__logger.warning("There is no spawned consumers at the moment.")
-        self.producer.produce(event, block=block, timeout=timeout)
+        await self.producer.aproduce(event, block=block, timeout=timeout)
 
     def spawn_workers(self) -> None:
         if self.__skip:
@@ -391,8 +469,19 @@ class ECore(IECore):
             return
 
         workers = self.__build_workers()
-        for worker in workers:
-            _ = self.spawn_worker(worker)
+        spawners: list[ISpawnWorker] = []
+        for group, worker in zip(self.__pipelines, workers):
+            spawn_worker = self.__group_spawn_workers.get(group, self.spawn_worker)
+            _ = spawn_worker(worker)
+            if spawn_worker not in spawners:
+                spawners.append(spawn_worker)
+        for spawn_worker in spawners:
+            # NOTE: spawners written before `finalize` was added may lack it.
+            finalize: Callable[[], tuple[int, ...]] | None = getattr(
+                spawn_worker, "finalize", None
+            )
+            if finalize is not None:
+                _ = finalize()
         self.__workers_spawned = True
         self.__logger.info("Workers successfully spawned.")
 
@@ -22,6 +22,10 @@ class EventNotSentError(EventsCoreError):
     message = "Could not send message to stream due to an unexpected error."
 
 
+class BufferFullError(EventsCoreError):
+    message = "Producer buffer is full."
+
+
 class EmptyStreamError(EventsCoreError):
     message = "Stream does not have unprocessed messages."
 
@@ -30,6 +34,10 @@ class TooManyDataError(EventsCoreError):
     message = "Unexpected number of data received for event."
 
 
+class UnsupportedOperationError(EventsCoreError):
+    message = "Operation is not supported by stream."
+
+
 class PathError(EventsCoreError):
     message = "Provided path does not exist."
 
@@ -1,23 +1,26 @@
 from __future__ import annotations
 
+import inspect
 import logging
+from typing import Any
 
 from eventscore.core.abstract import (
     ConsumerGroup,
     EventType,
+    IAsyncConsumer,
     IConsumer,
     IECore,
     IProcessPipeline,
     IRunner,
 )
-from eventscore.core.consumers import Consumer
+from eventscore.core.consumers import AsyncConsumer, Consumer
 from eventscore.core.exceptions import (
     ClonesMismatchError,
     EmptyPipelineError,
     UnrelatedConsumersError,
 )
 from eventscore.core.logging import logger as _logger
-from eventscore.core.runners import ObserverRunner
+from eventscore.core.runners import AsyncObserverRunner, ObserverRunner
 from eventscore.core.types import Pipeline, PipelineItem
 from eventscore.core.workers import Worker
 
@@ -28,31 +31,86 @@ class ProcessPipeline(IProcessPipeline):
         consumer_type: type[IConsumer] = Consumer,
         runner_type: type[IRunner] = ObserverRunner,
         logger: logging.Logger = _logger,
+        runner_init_kwargs: dict[str, Any] | None = None,
+        async_consumer_type: type[IAsyncConsumer] = AsyncConsumer,
+        async_runner_type: type[IRunner] = AsyncObserverRunner,
+        async_runner_init_kwargs: dict[str, Any] | None = None,
+        multi_event: bool = False,
     ) -> None:
+        """
+        Construct pipeline processor instance
+
+        :param consumer_type: Type of consumers. Defaults to Consumer
+        :type consumer_type: type[IConsumer]
+        :param runner_type: Type of runners. Defaults to ObserverRunner
+        :type runner_type: type[IRunner]
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        :param runner_init_kwargs: Extra initial kwargs for runner type,
+            e.g. `{"pool_size": 4}` for ObserverRunner.
+            Defaults to None.
+        :type runner_init_kwargs: dict[str, Any] | None
+        :param async_consumer_type: Type of consumers for pipelines
+            with at least one coroutine consumer function.
+            Defaults to AsyncConsumer
+        :type async_consumer_type: type[IAsyncConsumer]
+        :param async_runner_type: Type of runners for pipelines
+            with at least one coroutine consumer function.
+            Defaults to AsyncObserverRunner
+        :type async_runner_type: type[IRunner]
+        :param async_runner_init_kwargs: Extra initial kwargs for async runner type,
+            e.g. `{"max_in_flight": 500}` for AsyncObserverRunner.
+            Defaults to None.
+        :type async_runner_init_kwargs: dict[str, Any] | None
+        :param multi_event: Allow consumers of a single group
+            to be related to several event types.
+            Such pipeline is run by a single worker that reads
+            all the streams at once, which takes much less processes
+            than a worker per event type.
+            Not supported for coroutine consumer functions.
+            Defaults to `False`.
+        :type multi_event: bool
+        """
         self.__consumer_type = consumer_type
         self.__runner_type = runner_type
         self.__logger = logger
+        self.__runner_init_kwargs = runner_init_kwargs or {}
+        self.__async_consumer_type = async_consumer_type
+        self.__async_runner_type = async_runner_type
+        self.__async_runner_init_kwargs = async_runner_init_kwargs or {}
+        self.__multi_event = multi_event
 
     def __call__(self, pipeline: Pipeline, ecore: IECore) -> Worker:
-        event, group, clones = self.__validate_pipeline(pipeline)
+        events, group, clones = self.__validate_pipeline(pipeline)
+        event = events[0]
         self.__logger.debug(
-            f"Received valid pipeline {pipeline}. Event: {event}. Clones: {clones}"
+            f"Received valid pipeline {pipeline}. Events: {events}. Clones: {clones}"
         )
-        consumers = self.__make_consumers(pipeline.items)
-        self.__logger.debug(f"Built consumers: {consumers}")
-        runner = self.__make_runner(consumers, ecore, event, group)
+        if len(events) > 1:
+            consumers = self.__make_consumers(pipeline.items, bind_events=True)
+            self.__logger.debug(f"Built consumers: {consumers}")
+            runner = self.__make_runner(consumers, ecore, events, group)
+        elif any(inspect.iscoroutinefunction(item.func) for item in pipeline.items):
+            runner = self.__make_async_runner(pipeline.items, ecore, event, group)
+        else:
+            consumers = self.__make_consumers(pipeline.items)
+            self.__logger.debug(f"Built consumers: {consumers}")
+            runner = self.__make_runner(consumers, ecore, event, group)
         self.__logger.debug(f"Built runner: {runner}")
         return Worker(
             uid=pipeline.uid,
             name=str(pipeline.uid),
             clones=clones,
             runner=runner,
+            weight=sum(item.weight for item in pipeline.items),
+            events=events,
+            group=group,
         )
 
     def __validate_pipeline(
         self,
         pipeline: Pipeline,
-    ) -> tuple[EventType, ConsumerGroup, int]:
+    ) -> tuple[tuple[EventType, ...], ConsumerGroup, int]:
         if len(pipeline.items) == 0:
             raise EmptyPipelineError
 
@@ -60,19 +118,36 @@ class ProcessPipeline(IProcessPipeline):
         if len(clones_unique) > 1:
             raise ClonesMismatchError
         events_unique = set(item.event for item in pipeline.items)
-        if (len(events_unique)) > 1:
+        if len(events_unique) > 1 and (
+            not self.__multi_event
+            or any(inspect.iscoroutinefunction(item.func) for item in pipeline.items)
+        ):
             raise UnrelatedConsumersError
 
         return (
-            events_unique.pop(),
+            tuple(sorted(events_unique, key=str)),
             next(iter(pipeline.items)).group,
             clones_unique.pop(),
         )
 
-    def __make_consumers(self, items: set[PipelineItem]) -> list[IConsumer]:
+    def __make_consumers(
+        self,
+        items: set[PipelineItem],
+        *,
+        bind_events: bool = False,
+    ) -> list[IConsumer]:
         result: list[IConsumer] = []
         for item in items:
-            result.append(self.__consumer_type(item.func, logger=self.__logger))
+            kwargs: dict[str, Any] = {}
+            if bind_events:
+                kwargs["event"] = item.event
+            if item.retry is not None:
+                kwargs["retry"] = item.retry
+            if item.rate_limit is not None:
+                kwargs["rate_limit"] = item.rate_limit
+            result.append(
+                self.__consumer_type(item.func, logger=self.__logger, **kwargs)
+            )
 
         return result
 
@@ -80,7 +155,7 @@ class ProcessPipeline(IProcessPipeline):
         self,
         consumers: list[IConsumer],
         ecore: IECore,
-        event: EventType,
+        event: EventType | tuple[EventType, ...],
         group: ConsumerGroup,
     ) -> IRunner:
         return self.__runner_type(
@@ -89,4 +164,30 @@ class ProcessPipeline(IProcessPipeline):
             group,
             *consumers,
             logger=self.__logger,
+            **self.__runner_init_kwargs,
+        )
+
+    def __make_async_runner(
+        self,
+        items: set[PipelineItem],
+        ecore: IECore,
+        event: EventType,
+        group: ConsumerGroup,
+    ) -> IRunner:
+        assert all(
+            item.retry is None for item in items
+        ), "Retry is not supported for coroutine consumers."
+
+        consumers = [
+            self.__async_consumer_type(item.func, logger=self.__logger)
+            for item in items
+        ]
+        self.__logger.debug(f"Built async consumers: {consumers}")
+        return self.__async_runner_type(
+            ecore.stream_factory,
+            event,
+            group,
+            *consumers,  # type:ignore[arg-type]
+            logger=self.__logger,
+            **self.__async_runner_init_kwargs,
         )
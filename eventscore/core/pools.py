@@ -0,0 +1,145 @@
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, TypeAlias, TypeVar
+
+from eventscore.core.logging import logger as _logger
+
+T = TypeVar("T")
+
+_Task: TypeAlias = tuple[Future[Any], Callable[..., Any], tuple[Any, ...]]
+
+
+class ThreadPool:
+    """
+    Bounded pool of long-lived threads.
+    Unlike `concurrent.futures.ThreadPoolExecutor`, queue of pending tasks
+    can be bounded and its depth is observable.
+    Threads are started lazily on first submit, so pool instance
+    must be created in the process that is going to use it.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        maxsize: int = 0,
+        name: str = "eventscore-pool",
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct thread pool instance
+
+        :param size: Number of threads in pool
+        :type size: int
+        :param maxsize: Max number of pending tasks.
+            If value is equal to 0, then queue is not bounded.
+            Submitting to a full queue blocks until a slot is freed.
+        :type maxsize: int
+        :param name: Prefix for thread names
+        :type name: str
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert size > 0, "Pool size must be positive."
+        assert maxsize >= 0, "Pool queue max size must be non-negative."
+
+        self.__size = size
+        self.__name = name
+        self.__queue: queue.Queue[_Task | None] = queue.Queue(maxsize)
+        self.__threads: list[threading.Thread] = []
+        self.__lock = threading.Lock()
+        self.__shutdown = False
+        self.__logger = logger
+
+    @property
+    def size(self) -> int:
+        """
+        Number of threads in pool
+
+        :return: Pool size
+        :rtype: int
+        """
+        return self.__size
+
+    @property
+    def qsize(self) -> int:
+        """
+        Number of submitted tasks waiting for a free thread
+
+        :return: Queue depth
+        :rtype: int
+        """
+        return self.__queue.qsize()
+
+    def submit(self, func: Callable[..., T], *args: Any) -> Future[T]:
+        """
+        Schedule a callable to be executed by one of pool threads
+
+        :param func: Callable to execute
+        :type func: Callable[..., T]
+        :return: Future of callable result
+        :rtype: Future[T]
+        """
+        with self.__lock:
+            if self.__shutdown:
+                raise RuntimeError("Cannot submit to a pool after shutdown.")
+            self.__ensure_threads()
+
+        future: Future[T] = Future()
+        self.__queue.put((future, func, args))
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop pool threads after all pending tasks are done
+
+        :param wait: Should the call wait for threads to stop.
+            Defaults to `True`.
+        :type wait: bool
+        :return: None
+        :rtype: None
+        """
+        with self.__lock:
+            if self.__shutdown:
+                return
+            self.__shutdown = True
+            threads = tuple(self.__threads)
+
+        for _ in threads:
+            self.__queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+        self.__logger.debug(f"Pool {self.__name} is shut down.")
+
+    def __ensure_threads(self) -> None:
+        if self.__threads:
+            return
+        for idx in range(self.__size):
+            thread = threading.Thread(
+                target=self.__work,
+                name=f"{self.__name}-{idx}",
+                daemon=True,
+            )
+            thread.start()
+            self.__threads.append(thread)
+        self.__logger.debug(f"Pool {self.__name} started {self.__size} threads.")
+
+    def __work(self) -> None:
+        while True:
+            task = self.__queue.get()
+            if task is None:
+                return
+
+            future, func, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(*args)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
@@ -1,8 +1,27 @@
+import asyncio
+import atexit
 import logging
+import os
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import monotonic, time
+from typing import TypeAlias
 
 from eventscore.core.abstract import IECore, IProducer
+from eventscore.core.exceptions import BufferFullError, EventNotSentError
 from eventscore.core.logging import logger as _logger
-from eventscore.core.types import Event
+from eventscore.core.types import BufferFullPolicy, Event, EventStatus, ProduceResult
+
+_Item: TypeAlias = tuple[Event, Future[ProduceResult]]
+
+
+def _deliver_at(deliver_at: float | None, delay: float | None) -> float | None:
+    assert deliver_at is None or delay is None, "Either deliver at or delay is allowed."
+    assert delay is None or delay >= 0, "Delay must be non-negative."
+    return time() + delay if delay is not None else deliver_at
 
 
 class Producer(IProducer):
@@ -22,9 +41,369 @@ class Producer(IProducer):
         *,
         block: bool = True,
         timeout: int = 5,
+        deliver_at: float | None = None,
+        delay: float | None = None,
     ) -> None:
         self.__logger.debug(
             f"Producing event {event} with block={block}, timeout={timeout}."
         )
+        deliver_at = _deliver_at(deliver_at, delay)
+        if deliver_at is not None:
+            self.__ecore.stream.schedule(event, deliver_at)
+            self.__logger.info(f"Successfully scheduled an event: {event}.")
+            return
         self.__ecore.stream.put(event=event, block=block, timeout=timeout)
         self.__logger.info(f"Successfully produced an event: {event}.")
+
+    def produce_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        self.__logger.debug(
+            f"Producing {len(events)} events with block={block}, timeout={timeout}."
+        )
+        results = self.__ecore.stream.put_many(events, block=block, timeout=timeout)
+        failed = sum(1 for result in results if result.status == EventStatus.FAILED)
+        if failed:
+            self.__logger.error(f"Failed to produce {failed} of {len(events)} events.")
+        else:
+            self.__logger.info(f"Successfully produced {len(events)} events.")
+        return results
+
+    async def aproduce(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        self.__logger.debug(
+            f"Producing event {event} asynchronously "
+            + f"with block={block}, timeout={timeout}."
+        )
+        await self.__ecore.stream.aput(event=event, block=block, timeout=timeout)
+        self.__logger.info(f"Successfully produced an event: {event}.")
+
+
+class AsyncBatchingProducer(IProducer):
+    """
+    Producer that buffers events in memory and sends them to stream
+    from a background thread in micro-batches.
+    Batch is sent as soon as it has `batch_size` events
+    or `linger` seconds passed since its first event.
+    """
+
+    def __init__(
+        self,
+        ecore: IECore,
+        logger: logging.Logger = _logger,
+        *,
+        buffer_size: int = 10000,
+        batch_size: int = 100,
+        linger: float = 0.005,
+        on_buffer_full: BufferFullPolicy = BufferFullPolicy.BLOCK,
+        callback: Callable[[ProduceResult], None] | None = None,
+        flush_on_exit: bool = True,
+    ) -> None:
+        """
+        Construct batching producer instance
+
+        :param ecore: Event core instance
+        :type ecore: IECore
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        :param buffer_size: Max number of events waiting to be sent.
+            Defaults to 10000.
+        :type buffer_size: int
+        :param batch_size: Max number of events sent to stream at once.
+            Defaults to 100.
+        :type batch_size: int
+        :param linger: Max number of seconds to wait for a batch to fill up.
+            Defaults to 0.005.
+        :type linger: float
+        :param on_buffer_full: What to do with an event when buffer is full.
+            BLOCK waits for a free slot up to produce timeout and raises after,
+            DROP discards event, RAISE raises immediately.
+            Defaults to BLOCK.
+        :type on_buffer_full: BufferFullPolicy
+        :param callback: Callable invoked from background thread
+            with a result of every event. Defaults to None.
+        :type callback: Callable[[ProduceResult], None] | None
+        :param flush_on_exit: Should buffered events be sent
+            on interpreter exit. Defaults to `True`.
+        :type flush_on_exit: bool
+        """
+        assert buffer_size > 0, "Buffer size must be positive."
+        assert batch_size > 0, "Batch size must be positive."
+        assert linger >= 0, "Linger must be non-negative."
+
+        self.__ecore = ecore
+        self.__logger = logger
+        self.__buffer_size = buffer_size
+        self.__batch_size = batch_size
+        self.__linger = linger
+        self.__on_buffer_full = on_buffer_full
+        self.__callback = callback
+        self.__flush_on_exit = flush_on_exit
+        self.__lock = threading.Lock()
+        # NOTE: events are enqueued under a separate lock, so that close
+        # waits for enqueueing submits and stop marker is the last item.
+        # Background thread never takes it, buffer is drained while held.
+        self.__submit_lock = threading.Lock()
+        self.__unfinished = threading.Condition(self.__lock)
+        self.__unfinished_count = 0
+        self.__closed = False
+        self.__pid: int | None = None
+        self.__thread: threading.Thread | None = None
+        self.__buffer: queue.Queue[_Item | None] = queue.Queue(buffer_size)
+
+    @property
+    def qsize(self) -> int:
+        """
+        Number of events waiting to be sent
+
+        :return: Buffer depth
+        :rtype: int
+        """
+        return self.__buffer.qsize()
+
+    def submit(self, event: Event, *, timeout: int = 5) -> Future[ProduceResult]:
+        """
+        Put event to buffer without waiting for it to be sent
+
+        :param event: Event to produce
+        :type event: Event
+        :param timeout: Max number of seconds to wait for a free slot in buffer.
+            Used only with BLOCK buffer full policy.
+        :type timeout: int
+        :raises BufferFullError: Buffer is full and policy is BLOCK or RAISE
+        :return: Future of produce result
+        :rtype: Future[ProduceResult]
+        """
+        future: Future[ProduceResult] = Future()
+        try:
+            with self.__submit_lock:
+                with self.__lock:
+                    if self.__closed:
+                        raise RuntimeError("Cannot produce with a closed producer.")
+                    self.__ensure_thread()
+                    self.__unfinished_count += 1
+
+                if self.__on_buffer_full == BufferFullPolicy.BLOCK:
+                    self.__buffer.put((event, future), timeout=timeout)
+                else:
+                    self.__buffer.put_nowait((event, future))
+        except queue.Full as exc:
+            self.__task_done(1)
+            if self.__on_buffer_full != BufferFullPolicy.DROP:
+                raise BufferFullError from exc
+            self.__logger.warning(f"Buffer is full, event {event} is dropped.")
+            self.__resolve(future, ProduceResult(event, EventStatus.FAILED, exc))
+        return future
+
+    def produce(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+        deliver_at: float | None = None,
+        delay: float | None = None,
+    ) -> None:
+        self.__logger.debug(
+            f"Producing event {event} with block={block}, timeout={timeout}."
+        )
+        deliver_at = _deliver_at(deliver_at, delay)
+        if deliver_at is not None:
+            self.__ecore.stream.schedule(event, deliver_at)
+            self.__logger.info(f"Successfully scheduled an event: {event}.")
+            return
+        future = self.submit(event, timeout=timeout)
+        if block:
+            self.__wait(future, timeout)
+            self.__logger.info(f"Successfully produced an event: {event}.")
+
+    def produce_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        self.__logger.debug(
+            f"Producing {len(events)} events with block={block}, timeout={timeout}."
+        )
+        futures = [self.submit(event, timeout=timeout) for event in events]
+        if not block:
+            return [
+                ProduceResult(event=event, status=EventStatus.PENDING)
+                for event in events
+            ]
+
+        deadline = monotonic() + timeout
+        results: list[ProduceResult] = []
+        for event, future in zip(events, futures):
+            try:
+                results.append(future.result(max(deadline - monotonic(), 0)))
+            except FutureTimeoutError as exc:
+                results.append(ProduceResult(event, EventStatus.FAILED, exc))
+        return results
+
+    async def aproduce(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        self.__logger.debug(
+            f"Producing event {event} asynchronously "
+            + f"with block={block}, timeout={timeout}."
+        )
+        # NOTE: with BLOCK policy submit may wait for a free slot,
+        # so it is called outside of event loop thread
+        future = await asyncio.to_thread(self.submit, event, timeout=timeout)
+        if not block:
+            return
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError as exc:
+            raise EventNotSentError from exc
+        self.__check(result)
+        self.__logger.info(f"Successfully produced an event: {event}.")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait for all buffered events to be sent
+
+        :param timeout: Max number of seconds to wait. Defaults to None
+        :type timeout: float | None
+        :return: Were all events sent before timeout
+        :rtype: bool
+        """
+        with self.__unfinished:
+            return self.__unfinished.wait_for(
+                lambda: self.__unfinished_count == 0, timeout
+            )
+
+    def close(self, timeout: float | None = 5) -> None:
+        """
+        Send buffered events and stop background thread.
+        Producing after close raises `RuntimeError`.
+
+        :param timeout: Max number of seconds to wait. Defaults to 5
+        :type timeout: float | None
+        :return: None
+        :rtype: None
+        """
+        with self.__submit_lock, self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            thread = self.__thread if self.__pid == os.getpid() else None
+
+        if thread is None:
+            return
+        atexit.unregister(self.close)
+        # NOTE: stop marker makes background thread send
+        # a lingering batch right away instead of waiting for it to fill up
+        try:
+            self.__buffer.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+        if thread.is_alive():
+            self.__logger.warning(
+                f"{self.__unfinished_count} events were not sent before producer close."
+            )
+
+    def __ensure_thread(self) -> None:
+        pid = os.getpid()
+        if self.__thread is not None and self.__pid == pid:
+            return
+        if self.__pid is not None:
+            # NOTE: producer was inherited by a forked process,
+            # parent's thread and buffered events are not ours
+            self.__buffer = queue.Queue(self.__buffer_size)
+            self.__unfinished_count = 0
+
+        self.__pid = pid
+        self.__thread = threading.Thread(
+            target=self.__work,
+            args=(self.__buffer,),
+            name="eventscore-producer",
+            daemon=True,
+        )
+        self.__thread.start()
+        if self.__flush_on_exit:
+            _ = atexit.register(self.close)
+        self.__logger.debug("Producer background thread has started.")
+
+    def __work(self, buffer: "queue.Queue[_Item | None]") -> None:
+        stopped = False
+        while not stopped:
+            item = buffer.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = monotonic() + self.__linger
+            while len(batch) < self.__batch_size:
+                try:
+                    item = buffer.get(timeout=max(deadline - monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopped = True
+                    break
+                batch.append(item)
+            self.__send(batch)
+
+    def __send(self, batch: list[_Item]) -> None:
+        events = [event for event, _ in batch]
+        try:
+            results = self.__ecore.stream.put_many(events, block=True)
+        except Exception as exc:
+            self.__logger.error(
+                f"Failed to produce a batch of {len(events)} events: {exc!r}",
+                exc_info=exc,
+            )
+            results = [
+                ProduceResult(event, EventStatus.FAILED, exc) for event in events
+            ]
+        else:
+            self.__logger.debug(f"Produced a batch of {len(events)} events.")
+
+        for (_, future), result in zip(batch, results):
+            self.__resolve(future, result)
+        self.__task_done(len(batch))
+
+    def __resolve(self, future: Future[ProduceResult], result: ProduceResult) -> None:
+        future.set_result(result)
+        if self.__callback is None:
+            return
+        try:
+            self.__callback(result)
+        except Exception as exc:
+            self.__logger.error(f"Producer callback failed: {exc!r}", exc_info=exc)
+
+    def __task_done(self, count: int) -> None:
+        with self.__unfinished:
+            self.__unfinished_count -= count
+            if self.__unfinished_count <= 0:
+                self.__unfinished.notify_all()
+
+    def __wait(self, future: Future[ProduceResult], timeout: int) -> None:
+        try:
+            result = future.result(timeout)
+        except FutureTimeoutError as exc:
+            raise EventNotSentError from exc
+        self.__check(result)
+
+    def __check(self, result: ProduceResult) -> None:
+        if result.status == EventStatus.FAILED:
+            raise EventNotSentError from result.error
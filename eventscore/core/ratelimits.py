@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+
+from eventscore.core.abstract import IStream
+from eventscore.core.exceptions import UnsupportedOperationError
+from eventscore.core.logging import logger as _logger
+from eventscore.core.types import RateLimit
+
+_local_buckets: dict[str, "TokenBucket"] = {}
+_local_buckets_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Token bucket kept in memory of a single process.
+    Used when stream can not keep token buckets shared by processes,
+    so that rate is limited per process instead.
+    """
+
+    def __init__(self, rate_limit: RateLimit) -> None:
+        """
+        Construct token bucket instance, full
+
+        :param rate_limit: Rate limit bucket is refilled by
+        :type rate_limit: RateLimit
+        """
+        self.__rate = rate_limit.rate
+        self.__capacity = rate_limit.capacity
+        self.__tokens = float(self.__capacity)
+        self.__refilled_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def take(self, count: int) -> tuple[int, float]:
+        """
+        Take tokens from bucket
+
+        :param count: Max number of tokens to take
+        :type count: int
+        :return: Number of taken tokens and number of seconds
+            until the next token is available, if none was taken
+        :rtype: tuple[int, float]
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                self.__capacity,
+                self.__tokens + (now - self.__refilled_at) * self.__rate,
+            )
+            self.__refilled_at = now
+            taken = min(count, int(self.__tokens))
+            self.__tokens -= taken
+            if taken:
+                return taken, 0.0
+            return 0, (1 - self.__tokens) / self.__rate
+
+
+def local_bucket(key: str, rate_limit: RateLimit) -> TokenBucket:
+    """
+    Token bucket shared by all rate limiters of current process
+    with the same key
+
+    :param key: Name of token bucket
+    :type key: str
+    :param rate_limit: Rate limit bucket is refilled by
+    :type rate_limit: RateLimit
+    :return: Token bucket
+    :rtype: TokenBucket
+    """
+    with _local_buckets_lock:
+        bucket = _local_buckets.get(key)
+        if bucket is None:
+            bucket = _local_buckets[key] = TokenBucket(rate_limit)
+        return bucket
+
+
+class RateLimiter:
+    """
+    Rate limiter of a consumer.
+    Tokens are taken from a bucket kept by broker, so that
+    the limit is shared by all clones of consumer on all hosts,
+    see `IStream.take_tokens`. Tokens are taken in batches
+    of `RateLimit.prefetch` and spent locally.
+    If stream can not keep token buckets, rate is limited
+    by a bucket of current process instead.
+    """
+
+    def __init__(
+        self,
+        stream: IStream,
+        key: str,
+        rate_limit: RateLimit,
+        *,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct rate limiter instance
+
+        :param stream: Stream keeping token bucket
+        :type stream: IStream
+        :param key: Name of token bucket, e.g. consumer name
+        :type key: str
+        :param rate_limit: Rate limit
+        :type rate_limit: RateLimit
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        self.__stream = stream
+        self.__key = key
+        self.__rate_limit = rate_limit
+        self.__logger = logger
+        self.__bucket: TokenBucket | None = None
+        self.__tokens = 0
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a token is available and take it
+
+        :return: None
+        :rtype: None
+        """
+        # NOTE: waiting threads are served one by one,
+        # so that they do not race for tokens.
+        with self.__lock:
+            while self.__tokens == 0:
+                taken, wait = self.__take(
+                    min(self.__rate_limit.prefetch, self.__rate_limit.capacity)
+                )
+                self.__tokens += taken
+                if not taken:
+                    self.__logger.debug(
+                        f"Rate limit {self.__key} is exceeded, waiting {wait:.3f}s."
+                    )
+                    time.sleep(wait)
+            self.__tokens -= 1
+
+    def __take(self, count: int) -> tuple[int, float]:
+        if self.__bucket is None:
+            try:
+                return self.__stream.take_tokens(self.__key, self.__rate_limit, count)
+            except UnsupportedOperationError:
+                self.__logger.warning(
+                    f"Stream can not keep token buckets, rate limit {self.__key} "
+                    + "is applied per process."
+                )
+                self.__bucket = local_bucket(self.__key, self.__rate_limit)
+        return self.__bucket.take(count)
@@ -0,0 +1,210 @@
+import dataclasses
+import logging
+import time
+
+from eventscore.core.abstract import ConsumerGroup, IConsumer, IRunner, IStreamFactory
+from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.logging import logger as _logger
+from eventscore.core.types import Event, EventStatus
+
+# Number of attempt to consume the event, starting from 1
+ATTEMPT_HEADER = "eventscore-attempt"
+# Consumer group the event is put to stream again for
+GROUP_HEADER = "eventscore-group"
+# Name of consumer the event is put to stream again for
+CONSUMER_HEADER = "eventscore-consumer"
+# Last error consumer failed with
+ERROR_HEADER = "eventscore-error"
+# Original type of dead-lettered event
+TYPE_HEADER = "eventscore-type"
+# Consumer group dead-letter streams are redriven by
+REDRIVE_GROUP = "eventscore-redrive"
+
+
+def dead_letter_stream(group: ConsumerGroup) -> str:
+    """
+    Type of events dead-lettered by consumer group
+
+    :param group: Consumer group
+    :type group: ConsumerGroup
+    :return: Event type
+    :rtype: str
+    """
+    return f"eventscore.dlq.{group}"
+
+
+def retry_event(
+    event: Event,
+    group: ConsumerGroup,
+    consumer: IConsumer,
+    error: Exception,
+    attempt: int,
+) -> Event:
+    """
+    Event to be consumed again by a single consumer of consumer group
+
+    :param event: Event consumer failed to consume
+    :type event: Event
+    :param group: Consumer group
+    :type group: ConsumerGroup
+    :param consumer: Failed consumer
+    :type consumer: IConsumer
+    :param error: Error consumer failed with
+    :type error: Exception
+    :param attempt: Number of the next attempt
+    :type attempt: int
+    :return: Event
+    :rtype: Event
+    """
+    return dataclasses.replace(
+        event,
+        headers={
+            **event.headers,
+            ATTEMPT_HEADER: attempt,
+            GROUP_HEADER: str(group),
+            CONSUMER_HEADER: consumer.name,
+            ERROR_HEADER: repr(error),
+        },
+    )
+
+
+def dead_letter_event(
+    event: Event,
+    group: ConsumerGroup,
+    consumer: IConsumer,
+    error: Exception,
+) -> Event:
+    """
+    Event to be put to dead-letter stream of consumer group
+
+    :param event: Event consumer failed to consume on the last attempt
+    :type event: Event
+    :param group: Consumer group
+    :type group: ConsumerGroup
+    :param consumer: Failed consumer
+    :type consumer: IConsumer
+    :param error: Error consumer failed with
+    :type error: Exception
+    :return: Event
+    :rtype: Event
+    """
+    return dataclasses.replace(
+        event,
+        type=dead_letter_stream(group),
+        headers={
+            **event.headers,
+            GROUP_HEADER: str(group),
+            CONSUMER_HEADER: consumer.name,
+            ERROR_HEADER: repr(error),
+            TYPE_HEADER: str(event.type),
+        },
+    )
+
+
+def redriven_event(event: Event) -> Event:
+    """
+    Dead-lettered event to be consumed again by consumer that failed it,
+    with all attempts of its retry policy
+
+    :param event: Dead-lettered event
+    :type event: Event
+    :return: Event
+    :rtype: Event
+    """
+    headers = dict(event.headers)
+    type_ = str(headers.pop(TYPE_HEADER))
+    _ = headers.pop(ATTEMPT_HEADER, None)
+    _ = headers.pop(ERROR_HEADER, None)
+    return dataclasses.replace(event, type=type_, headers=headers)
+
+
+class DeadLetterRedrive(IRunner):
+    """
+    Bulk redrive of dead-letter stream of a consumer group.
+    Puts dead-lettered events back to their streams at a limited rate,
+    so that consumers that failed them consume them again.
+    Every dead-lettered event is redriven once: redrive reads
+    dead-letter stream within its own consumer group and stops
+    when there is nothing left to redrive.
+    """
+
+    def __init__(
+        self,
+        stream_factory: IStreamFactory,
+        group: ConsumerGroup,
+        *,
+        rate: float = 100.0,
+        batch_size: int = 100,
+        max_events: int = -1,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct dead-letter redrive instance
+
+        :param stream_factory: Factory of streams events were dead-lettered to
+        :type stream_factory: IStreamFactory
+        :param group: Consumer group which dead-letter stream is redriven
+        :type group: ConsumerGroup
+        :param rate: Max number of events redriven per second.
+            Defaults to 100.0.
+        :type rate: float
+        :param batch_size: Max number of events redriven at once.
+            Defaults to 100.
+        :type batch_size: int
+        :param max_events: Max number of events to redrive.
+            Defaults to -1.
+            If value is equal to -1, then all events are redriven
+        :type max_events: int
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert rate > 0, "Rate must be positive."
+        assert batch_size > 0, "Batch size must be positive."
+        assert max_events == -1 or max_events > 0, "Max events must be positive or -1."
+
+        self.__stream_factory = stream_factory
+        self.__group = group
+        self.__rate = rate
+        self.__batch_size = batch_size
+        self.__max_events = max_events
+        self.__logger = logger
+
+    def run(self) -> None:
+        # NOTE: stream is created on run, since redrive is constructed
+        # in one process and run in another one.
+        stream = self.__stream_factory()
+        dlq = dead_letter_stream(self.__group)
+        redriven = failed = 0
+        started = time.monotonic()
+        while self.__max_events == -1 or redriven + failed < self.__max_events:
+            max_count = self.__batch_size
+            if self.__max_events != -1:
+                max_count = min(max_count, self.__max_events - redriven - failed)
+            try:
+                events = stream.pop_many(
+                    dlq, REDRIVE_GROUP, max_count=max_count, block=False, ack=False
+                )
+            except EmptyStreamError:
+                break
+
+            results = stream.put_many([redriven_event(e) for e in events])
+            # NOTE: events failed to be redriven stay pending in redrive group
+            sent = [
+                event
+                for event, result in zip(events, results)
+                if result.status != EventStatus.FAILED
+            ]
+            if sent:
+                stream.ack(dlq, REDRIVE_GROUP, *sent)
+            redriven += len(sent)
+            failed += len(events) - len(sent)
+
+            ahead = (redriven + failed) / self.__rate - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+        stream.flush()
+        self.__logger.info(
+            f"Redriven {redriven} events of consumer group {self.__group}, "
+            + f"failed to redrive {failed} events."
+        )
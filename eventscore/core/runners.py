@@ -1,55 +1,741 @@
+import asyncio
+import copy
 import logging
+import queue
 import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import wait
+from typing import Any, TypeAlias, cast
 
 from eventscore.core.abstract import (
     ConsumerGroup,
     EventType,
+    IAsyncConsumer,
+    IAsyncStream,
     IConsumer,
     IRunner,
+    IStream,
     IStreamFactory,
 )
-from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.exceptions import EmptyStreamError, UnsupportedOperationError
 from eventscore.core.logging import logger as _logger
+from eventscore.core.pools import ThreadPool
+from eventscore.core.ratelimits import RateLimiter
+from eventscore.core.retries import (
+    ATTEMPT_HEADER,
+    CONSUMER_HEADER,
+    GROUP_HEADER,
+    dead_letter_event,
+    retry_event,
+)
+from eventscore.core.types import DeliverySemantic, Event, RateLimit, RetryPolicy
+
+Failure: TypeAlias = tuple[IConsumer, Exception]
 
 
 class ObserverRunner(IRunner):
     def __init__(
         self,
         stream_factory: IStreamFactory,
-        event: EventType,
+        event: EventType | tuple[EventType, ...],
         group: ConsumerGroup,
         *consumers: IConsumer,
         max_events: int = -1,
         logger: logging.Logger = _logger,
+        pool_size: int = 0,
+        pool_queue_size: int = 0,
+        batch_size: int = 1,
+        delivery_semantic: DeliverySemantic = DeliverySemantic.AT_MOST_ONCE,
+        reclaim_interval: float = 30.0,
+        reclaim_min_idle: float = 60.0,
+        prefetch: int = 0,
+        independent_consumers: bool = False,
     ) -> None:
-        self.__stream = stream_factory()
-        self.__event = event
+        """
+        Construct observer runner instance
+
+        :param stream_factory: Event stream factory
+        :type stream_factory: IStreamFactory
+        :param event: Event type or several event types.
+            Events of several types are popped from all their streams at once
+            and dispatched to consumers bound to their type, see `IConsumer.event`
+        :type event: EventType | Tuple[EventType, ...]
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param consumers: Consumers
+        :type consumers: Tuple[IConsumer, ...]
+        :param max_events: Max events to process
+            Defaults to -1.
+            If value is equal to -1,
+            then there is not limit for number of events to process
+        :type max_events: int
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        :param pool_size: Number of long-lived threads consumers are run on.
+            Defaults to 0.
+            If value is equal to 0, then a new thread is started
+            for every consumer on every event.
+        :type pool_size: int
+        :param pool_queue_size: Max number of consumer calls
+            waiting for a free pool thread.
+            Defaults to 0, i.e. not bounded.
+            Param is ignored when pool_size is equal to 0
+        :type pool_queue_size: int
+        :param batch_size: Max number of events popped from stream at once.
+            Defaults to 1.
+            Popped events are still dispatched one by one,
+            only broker round trips are shared.
+        :type batch_size: int
+        :param delivery_semantic: Delivery semantic.
+            Defaults to AT_MOST_ONCE, i.e. events are acknowledged
+            as soon as they are popped.
+            With AT_LEAST_ONCE events are acknowledged only after
+            all consumers have consumed them successfully,
+            once per popped batch. The rest is reclaimed
+            and consumed by all consumers again.
+        :type delivery_semantic: DeliverySemantic
+        :param reclaim_interval: Number of seconds between attempts
+            to reclaim events that were not acknowledged in time.
+            Defaults to 30.0.
+            Param is ignored with AT_MOST_ONCE delivery semantic
+        :type reclaim_interval: float
+        :param reclaim_min_idle: Number of seconds after which
+            not acknowledged event is reclaimed,
+            must exceed max time consumers may take.
+            Defaults to 60.0.
+            Param is ignored with AT_MOST_ONCE delivery semantic
+        :type reclaim_min_idle: float
+        :param prefetch: Max number of events popped ahead of consumers
+            by a background reader thread, so that broker round trips
+            overlap with consuming.
+            Defaults to 0, i.e. events are popped only when consumers are idle.
+            Prefetched events are consumed before runner stops.
+        :type prefetch: int
+        :param independent_consumers: Run every consumer on its own thread
+            within its own consumer group `<group>:<consumer name>`,
+            so that a slow consumer does not hold back the others.
+            Every consumer pops, consumes and acknowledges events
+            at its own pace, with its own batch and prefetch window.
+            Defaults to False, i.e. next events are popped only
+            after all consumers have consumed previous ones.
+            Max events are counted per consumer. Consumer groups are
+            created on first run and read streams from the beginning.
+        :type independent_consumers: bool
+        """
+        self.__stream_factory = stream_factory
+        # NOTE: stream is created on first run and not in constructor,
+        # because runner is constructed in one process and run in another,
+        # and connections must not be shared between processes.
+        self.__stream: IStream | None = None
+        # NOTE: stream is not thread-safe, so events are retried
+        # through a stream of their own and every rate limiter
+        # takes tokens through its own stream as well.
+        self.__retry_stream: IStream | None = None
+        self.__events = event if isinstance(event, tuple) else (event,)
+        self.__event = self.__events[0]
         self.__group = group
         self.__max_events = max_events
         self.__consumers = consumers
         self.__logger = logger
+        self.__pool_size = pool_size
+        self.__pool_queue_size = pool_queue_size
+        self.__pool: ThreadPool | None = None
+        self.__batch_size = batch_size
+        self.__at_least_once = delivery_semantic == DeliverySemantic.AT_LEAST_ONCE
+        self.__reclaim_interval = reclaim_interval
+        self.__reclaim_min_idle = reclaim_min_idle
+        self.__reclaimed_at: float | None = None
+        self.__prefetch = prefetch
+        self.__stopping = False
+        self.__independent_consumers = independent_consumers
+        self.__children: list[ObserverRunner] = []
+        self.__limiters: dict[str, RateLimiter] = {}
 
+        assert len(self.__events) > 0, "No events provided to runner."
         assert len(consumers) > 0, "No consumers provided to runner."
         assert max_events == -1 or max_events > 0, "Max events must be positive or -1."
+        assert pool_size >= 0, "Pool size must be non-negative."
+        assert batch_size > 0, "Batch size must be positive."
+        assert (
+            delivery_semantic != DeliverySemantic.EXACTLY_ONCE
+        ), "Exactly once delivery semantic is not supported."
+        assert reclaim_interval >= 0, "Reclaim interval must be non-negative."
+        assert reclaim_min_idle > 0, "Reclaim min idle must be positive."
+        assert prefetch >= 0, "Prefetch must be non-negative."
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of consumer calls waiting for a free pool thread.
+        Always 0 if runner does not use a pool.
+
+        :return: Queue depth
+        :rtype: int
+        """
+        return self.__pool.qsize if self.__pool is not None else 0
+
+    def __copy__(self) -> "ObserverRunner":
+        # NOTE: copies may run concurrently within one process,
+        # so every copy creates its own stream.
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.__stream = None
+        clone.__retry_stream = None
+        clone.__limiters = {}
+        clone.__stopping = False
+        clone.__children = []
+        return clone
 
     def run(self) -> None:
+        # NOTE: stopping flag is not reset here, so that `stop` called
+        # before `run` is not lost and `run` returns right away.
+        if self.__independent_consumers:
+            self.__run_independent()
+            return
+
+        if self.__pool_size:
+            # NOTE: pool is created here and not in constructor,
+            # because runner is constructed in one process and run in another.
+            self.__pool = ThreadPool(
+                self.__pool_size,
+                maxsize=self.__pool_queue_size,
+                name=f"eventscore-{self.__group}",
+                logger=self.__logger,
+            )
+        try:
+            if self.__prefetch:
+                self.__run_prefetched()
+            else:
+                self.__run()
+        finally:
+            self.__get_stream().flush()
+            if self.__retry_stream is not None:
+                self.__retry_stream.flush()
+            if self.__pool is not None:
+                self.__pool.shutdown()
+                self.__pool = None
+
+    def __get_stream(self) -> IStream:
+        if self.__stream is None:
+            self.__stream = self.__stream_factory()
+        return self.__stream
+
+    def stop(self) -> None:
+        """
+        Stop runner gracefully.
+        Events already popped are consumed and acknowledged
+        before `run` returns. Safe to call from other threads
+        and signal handlers.
+
+        :return: None
+        :rtype: None
+        """
+        self.__stopping = True
+        for child in self.__children:
+            child.stop()
+
+    def __running(self, events_counter: int) -> bool:
+        return not self.__stopping and (
+            self.__max_events == -1 or events_counter < self.__max_events
+        )
+
+    def __run(self) -> None:
         events_counter = 0
-        while self.__max_events == -1 or events_counter < self.__max_events:
+        while self.__running(events_counter):
             try:
-                event = self.__stream.pop(self.__event, self.__group, block=True)
+                events = self.__pop(events_counter)
             except EmptyStreamError:
                 self.__logger.debug("Stream is empty, no consumers ran this iteration.")
                 continue
 
-            events_counter += 1
-            tasks = tuple(
-                threading.Thread(target=consumer.consume, args=(event,))
-                for consumer in self.__consumers
+            events_counter += len(events)
+            consumed = [event for event in events if self.__dispatch(event)]
+            if self.__at_least_once and consumed:
+                self.__ack(consumed)
+
+    def __run_independent(self) -> None:
+        self.__children = [self.__child(consumer) for consumer in self.__consumers]
+        if self.__stopping:
+            # NOTE: runner may be stopped while children are copied.
+            self.stop()
+        errors: list[Exception] = []
+        threads = [
+            threading.Thread(
+                target=self.__run_child,
+                args=(child, errors),
+                name=f"eventscore-{child.__group}",
+                daemon=True,
+            )
+            for child in self.__children
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.__children = []
+        if errors:
+            raise errors[0]
+
+    def __child(self, consumer: IConsumer) -> "ObserverRunner":
+        # NOTE: consumer group per consumer keeps its own progress
+        # and acknowledgements, every child creates its own stream.
+        child = copy.copy(self)
+        child.__group = f"{self.__group}:{consumer.name}"
+        child.__consumers = (consumer,)
+        if consumer.event is not None and len(self.__events) > 1:
+            child.__events = (consumer.event,)
+            child.__event = consumer.event
+        child.__independent_consumers = False
+        child.__stopping = self.__stopping
+        return child
+
+    def __run_child(self, child: "ObserverRunner", errors: list[Exception]) -> None:
+        try:
+            child.run()
+        except Exception as exc:
+            errors.append(exc)
+            self.__logger.error(
+                f"Consumer group {child.__group} has failed: {exc!r}", exc_info=exc
+            )
+            # NOTE: clone is stopped as a whole, so that it is restarted
+            # by supervisor instead of running without some consumers.
+            self.stop()
+
+    def __run_prefetched(self) -> None:
+        # NOTE: stream is used by reader thread only, while it is alive,
+        # so consumed events are passed to it to be acknowledged.
+        # Retries and rate limits do not use it, see constructor.
+        buffer: queue.Queue[Event | None] = queue.Queue(self.__prefetch)
+        acks: queue.SimpleQueue[Event] = queue.SimpleQueue()
+        errors: list[Exception] = []
+        reader = threading.Thread(
+            target=self.__read,
+            args=(buffer, acks, errors),
+            name=f"eventscore-{self.__group}-reader",
+            daemon=True,
+        )
+        reader.start()
+
+        while (event := buffer.get()) is not None:
+            if self.__dispatch(event) and self.__at_least_once:
+                acks.put(event)
+
+        reader.join()
+        self.__ack_prefetched(acks)
+        if errors:
+            raise errors[0]
+
+    def __read(
+        self,
+        buffer: "queue.Queue[Event | None]",
+        acks: "queue.SimpleQueue[Event]",
+        errors: list[Exception],
+    ) -> None:
+        events_counter = 0
+        try:
+            while self.__running(events_counter):
+                self.__ack_prefetched(acks)
+                try:
+                    events = self.__pop(events_counter)
+                except EmptyStreamError:
+                    self.__logger.debug("Stream is empty, nothing to prefetch.")
+                    continue
+
+                events_counter += len(events)
+                for event in events:
+                    buffer.put(event)
+                self.__logger.debug(f"Prefetched {buffer.qsize()} events.")
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            buffer.put(None)
+
+    def __ack_prefetched(self, acks: "queue.SimpleQueue[Event]") -> None:
+        consumed: list[Event] = []
+        while not acks.empty():
+            consumed.append(acks.get_nowait())
+        if consumed:
+            self.__ack(consumed)
+
+    def __ack(self, events: list[Event]) -> None:
+        if len(self.__events) == 1:
+            self.__get_stream().ack(self.__event, self.__group, *events)
+            return
+
+        by_type: dict[str, list[Event]] = defaultdict(list)
+        for event in events:
+            by_type[str(event.type)].append(event)
+        for event_type, typed_events in by_type.items():
+            self.__get_stream().ack(event_type, self.__group, *typed_events)
+
+    def __dispatch(self, event: Event) -> bool:
+        group = event.headers.get(GROUP_HEADER)
+        if group is not None and group != str(self.__group):
+            self.__logger.debug(f"Event {event} is retried by group {group!r}.")
+            return True
+
+        consumers = self.__consumers_of(event)
+        if not consumers:
+            self.__logger.warning(f"No consumers for an event {event}.")
+            return True
+        if self.__pool is None:
+            failures = self.__dispatch_threads(consumers, event)
+        else:
+            failures = self.__dispatch_pool(self.__pool, consumers, event)
+
+        succeeded = True
+        for consumer, exc in failures:
+            self.__logger.error(
+                f"Consumer failed to consume an event {event}: {exc!r}",
+                exc_info=exc,
+            )
+            # NOTE: event retried by the consumer is not consumed again
+            # by the others, so it is consumed as far as group is concerned.
+            succeeded = self.__retry(consumer, event, exc) and succeeded
+        return succeeded
+
+    def __consumers_of(self, event: Event) -> tuple[IConsumer, ...]:
+        name = event.headers.get(CONSUMER_HEADER)
+        if name is not None:
+            return tuple(
+                consumer for consumer in self.__consumers if consumer.name == name
             )
-            for task in tasks:
-                task.start()
-                self.__logger.debug(f"Consumer thread {task.ident} has started.")
+        if len(self.__events) == 1:
+            return self.__consumers
+        return tuple(
+            consumer
+            for consumer in self.__consumers
+            if consumer.event is None or str(consumer.event) == str(event.type)
+        )
+
+    def __retry(self, consumer: IConsumer, event: Event, exc: Exception) -> bool:
+        policy = self.__retry_policy(consumer)
+        if policy is None:
+            return False
+
+        attempt = int(event.headers.get(ATTEMPT_HEADER, 1))
+        if self.__retry_stream is None:
+            self.__retry_stream = self.__stream_factory()
+        stream = self.__retry_stream
+        try:
+            if attempt < policy.max_attempts:
+                delay = policy.delay(attempt)
+                stream.schedule(
+                    retry_event(event, self.__group, consumer, exc, attempt + 1),
+                    time.time() + delay,
+                )
+                self.__logger.info(
+                    f"Event {event} is retried in {delay:.1f} seconds, "
+                    + f"attempt {attempt + 1} of {policy.max_attempts}."
+                )
+                return True
+        except UnsupportedOperationError:
+            self.__logger.warning(
+                f"Stream can not delay events, event {event} is dead-lettered."
+            )
+        except Exception as error:
+            self.__logger.error(f"Failed to retry an event {event}: {error!r}")
+            return False
+
+        try:
+            stream.put(dead_letter_event(event, self.__group, consumer, exc))
+        except Exception as error:
+            self.__logger.error(f"Failed to dead-letter an event {event}: {error!r}")
+            return False
+        self.__logger.warning(
+            f"Event {event} is dead-lettered after {attempt} attempts."
+        )
+        return True
+
+    def __retry_policy(self, consumer: IConsumer) -> RetryPolicy | None:
+        # NOTE: consumers implemented before retry policies have no such attribute
+        retry = getattr(consumer, "retry", None)
+        return retry if isinstance(retry, RetryPolicy) else None
+
+    def __pop(self, events_counter: int) -> list[Event]:
+        max_count = self.__batch_size
+        if self.__max_events != -1:
+            max_count = min(max_count, self.__max_events - events_counter)
+
+        if self.__at_least_once:
+            reclaimed = self.__reclaim(max_count)
+            if reclaimed:
+                return reclaimed
+            kwargs = dict(ack=False)
+        else:
+            kwargs = {}
+
+        if len(self.__events) > 1:
+            # NOTE: batch size limits events of every type separately
+            return self.__get_stream().pop_multi(
+                self.__events,
+                self.__group,
+                max_count=max_count,
+                block=True,
+                **kwargs,
+            )
+        if self.__batch_size == 1:
+            return [
+                self.__get_stream().pop(
+                    self.__event, self.__group, block=True, **kwargs
+                )
+            ]
+        return self.__get_stream().pop_many(
+            self.__event,
+            self.__group,
+            max_count=max_count,
+            block=True,
+            **kwargs,
+        )
+
+    def __reclaim(self, max_count: int) -> list[Event]:
+        now = time.monotonic()
+        if (
+            self.__reclaimed_at is not None
+            and now - self.__reclaimed_at < self.__reclaim_interval
+        ):
+            return []
+
+        events: list[Event] = []
+        for event in self.__events:
+            events.extend(
+                self.__get_stream().reclaim(
+                    event,
+                    self.__group,
+                    min_idle=self.__reclaim_min_idle,
+                    max_count=max_count - len(events),
+                )
+            )
+            if len(events) >= max_count:
+                break
+        # NOTE: a full batch means there may be more events to reclaim,
+        # so next iteration reclaims again instead of waiting for interval.
+        self.__reclaimed_at = None if len(events) == max_count else now
+        if events:
+            self.__logger.info(f"Reclaimed {len(events)} not acknowledged events.")
+        return events
+
+    def __dispatch_threads(
+        self,
+        consumers: tuple[IConsumer, ...],
+        event: Event,
+    ) -> list[Failure]:
+        failures: list[Failure] = []
+        tasks = tuple(
+            threading.Thread(
+                target=self.__thread_target(consumer, failures),
+                args=(event,),
+            )
+            for consumer in consumers
+        )
+        for task in tasks:
+            task.start()
+            self.__logger.debug(f"Consumer thread {task.ident} has started.")
+
+        for task in tasks:
+            task.join()
+            self.__logger.debug(f"Consumer thread {task.ident} has finished.")
+        return failures
+
+    def __thread_target(
+        self,
+        consumer: IConsumer,
+        failures: list[Failure],
+    ) -> Callable[[Event], None]:
+        consume = self.__consume_of(consumer)
+        if not self.__at_least_once and self.__retry_policy(consumer) is None:
+            return consume
+
+        def target(event: Event) -> None:
+            try:
+                consume(event)
+            except Exception as exc:
+                failures.append((consumer, exc))
+
+        return target
+
+    def __consume_of(self, consumer: IConsumer) -> Callable[[Event], None]:
+        # NOTE: consumers implemented before rate limits have no such attribute
+        rate_limit = getattr(consumer, "rate_limit", None)
+        if not isinstance(rate_limit, RateLimit):
+            return consumer.consume
+
+        limiter = self.__limiters.get(consumer.name)
+        if limiter is None:
+            # NOTE: bucket is named after consumer, so that it is shared
+            # by all its clones, independent consumer groups included.
+            limiter = self.__limiters[consumer.name] = RateLimiter(
+                self.__stream_factory(),
+                consumer.name,
+                rate_limit,
+                logger=self.__logger,
+            )
+
+        def consume(event: Event) -> None:
+            limiter.acquire()
+            consumer.consume(event)
+
+        return consume
+
+    def __dispatch_pool(
+        self,
+        pool: ThreadPool,
+        consumers: tuple[IConsumer, ...],
+        event: Event,
+    ) -> list[Failure]:
+        futures = tuple(
+            pool.submit(self.__consume_of(consumer), event) for consumer in consumers
+        )
+        self.__logger.debug(
+            f"Submitted {len(futures)} consumers to pool. Queue depth: {pool.qsize}."
+        )
+        _ = wait(futures)
+        failures: list[Failure] = []
+        for consumer, future in zip(consumers, futures):
+            exc = future.exception()
+            if exc is not None:
+                failures.append((consumer, cast(Exception, exc)))
+        return failures
+
+
+class AsyncObserverRunner(IRunner):
+    def __init__(
+        self,
+        stream_factory: IStreamFactory,
+        event: EventType,
+        group: ConsumerGroup,
+        *consumers: IAsyncConsumer,
+        max_events: int = -1,
+        logger: logging.Logger = _logger,
+        max_in_flight: int = 100,
+        batch_size: int = 10,
+    ) -> None:
+        """
+        Construct asynchronous observer runner instance.
+        Events are consumed concurrently on a single event loop,
+        so stream produced by factory must implement IAsyncStream.
+
+        :param stream_factory: Event stream factory
+        :type stream_factory: IStreamFactory
+        :param event: Event type
+        :type event: EventType
+        :param group: Consumer group
+        :type group: ConsumerGroup
+        :param consumers: Asynchronous consumers
+        :type consumers: Tuple[IAsyncConsumer, ...]
+        :param max_events: Max events to process
+            Defaults to -1.
+            If value is equal to -1,
+            then there is not limit for number of events to process
+        :type max_events: int
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        :param max_in_flight: Max number of events consumed concurrently.
+            Defaults to 100.
+        :type max_in_flight: int
+        :param batch_size: Max number of events popped from stream at once.
+            Defaults to 10.
+        :type batch_size: int
+        """
+        self.__stream_factory = stream_factory
+        self.__stream: IAsyncStream | None = None
+        self.__event = event
+        self.__group = group
+        self.__max_events = max_events
+        self.__consumers = consumers
+        self.__logger = logger
+        self.__max_in_flight = max_in_flight
+        self.__batch_size = batch_size
+        self.__stopping = False
+
+        assert len(consumers) > 0, "No consumers provided to runner."
+        assert max_events == -1 or max_events > 0, "Max events must be positive or -1."
+        assert max_in_flight > 0, "Max in flight must be positive."
+        assert batch_size > 0, "Batch size must be positive."
+
+    def __copy__(self) -> "AsyncObserverRunner":
+        # NOTE: copies may run concurrently within one process,
+        # so every copy creates its own stream.
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.__stream = None
+        clone.__stopping = False
+        return clone
+
+    def run(self) -> None:
+        asyncio.run(self.arun())
+
+    async def arun(self) -> None:
+        """
+        Start runner within a running event loop
+
+        :return: None
+        :rtype: None
+        """
+        # NOTE: stopping flag is not reset here, see `ObserverRunner.run`.
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            await self.__arun(tasks)
+        finally:
+            if tasks:
+                _ = await asyncio.wait(tasks)
+            await self.__get_stream().aflush()
+
+    def __get_stream(self) -> IAsyncStream:
+        if self.__stream is None:
+            self.__stream = cast(IAsyncStream, self.__stream_factory())
+        return self.__stream
+
+    def stop(self) -> None:
+        """
+        Stop runner gracefully.
+        Events in flight are consumed before `arun` returns.
+        Safe to call from other threads and signal handlers.
+
+        :return: None
+        :rtype: None
+        """
+        self.__stopping = True
+
+    async def __arun(self, tasks: set[asyncio.Task[None]]) -> None:
+        events_counter = 0
+        while not self.__stopping and (
+            self.__max_events == -1 or events_counter < self.__max_events
+        ):
+            if len(tasks) >= self.__max_in_flight:
+                _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            max_count = min(self.__batch_size, self.__max_in_flight - len(tasks))
+            if self.__max_events != -1:
+                max_count = min(max_count, self.__max_events - events_counter)
+            try:
+                events = await self.__get_stream().apop_many(
+                    self.__event,
+                    self.__group,
+                    max_count=max_count,
+                    block=True,
+                )
+            except EmptyStreamError:
+                self.__logger.debug("Stream is empty, no consumers ran this iteration.")
+                continue
+
+            for event in events:
+                events_counter += 1
+                task = asyncio.create_task(self.__dispatch(event))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            self.__logger.debug(f"{len(tasks)} events are in flight.")
 
-            for task in tasks:
-                task.join()
-                self.__logger.debug(f"Consumer thread {task.ident} has finished.")
+    async def __dispatch(self, event: Event) -> None:
+        results: list[Any] = await asyncio.gather(
+            *(consumer.consume(event) for consumer in self.__consumers),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                self.__logger.error(
+                    f"Consumer failed to consume an event {event}: {result!r}",
+                    exc_info=result,
+                )
@@ -0,0 +1,289 @@
+import logging
+import multiprocessing as mp
+import time
+from collections import deque
+from typing import cast
+
+from eventscore.core.abstract import ConsumerGroup, IStream
+from eventscore.core.logging import logger as _logger
+from eventscore.core.supervision import run_supervised
+from eventscore.core.types import GroupStats, ScalingDecision, ScalingPolicy, Worker
+
+
+class Autoscaler:
+    """
+    Supervisor of clones of a single worker.
+    Scales number of clone processes between policy bounds
+    by backlog of worker consumer group.
+    Must be used in the process that spawns workers.
+    """
+
+    def __init__(
+        self,
+        worker: Worker,
+        stream: IStream,
+        policy: ScalingPolicy,
+        *,
+        history: int = 100,
+        drain_timeout: float = 30.0,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct autoscaler instance
+
+        :param worker: Worker to scale. Must have events and group set
+        :type worker: Worker
+        :param stream: Stream to inspect consumer group with
+        :type stream: IStream
+        :param policy: Scaling policy
+        :type policy: ScalingPolicy
+        :param history: Max number of recent decisions kept.
+            Defaults to 100.
+        :type history: int
+        :param drain_timeout: Max number of seconds removed clone is given
+            to drain before it is killed. Defaults to 30.0
+        :type drain_timeout: float
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert worker.events, "Worker has no events to inspect."
+        assert worker.group is not None, "Worker has no consumer group to inspect."
+        assert history > 0, "History must be positive."
+        assert drain_timeout >= 0, "Drain timeout must be non-negative."
+
+        self.__worker = worker
+        self.__stream = stream
+        self.__policy = policy
+        self.__drain_timeout = drain_timeout
+        self.__logger = logger
+        self.__processes: list[mp.Process] = []
+        self.__draining: list[tuple[mp.Process, float]] = []
+        self.__decisions: deque[ScalingDecision] = deque(maxlen=history)
+        self.__stats: GroupStats | None = None
+        self.__streak = 0
+        self.__scaled_at = float("-inf")
+
+    @property
+    def worker(self) -> Worker:
+        """
+        Scaled worker
+
+        :return: Worker
+        :rtype: Worker
+        """
+        return self.__worker
+
+    @property
+    def clones(self) -> int:
+        """
+        Number of running clones
+
+        :return: Number of clones
+        :rtype: int
+        """
+        return sum(process.is_alive() for process in self.__processes)
+
+    @property
+    def pids(self) -> tuple[int, ...]:
+        """
+        PIDs of running clones
+
+        :return: PIDs
+        :rtype: tuple[int, ...]
+        """
+        return tuple(
+            cast(int, process.pid) for process in self.__processes if process.is_alive()
+        )
+
+    @property
+    def draining(self) -> tuple[int, ...]:
+        """
+        PIDs of removed clones, which are still draining
+
+        :return: PIDs
+        :rtype: tuple[int, ...]
+        """
+        return tuple(cast(int, process.pid) for process, _ in self.__draining)
+
+    @property
+    def stats(self) -> GroupStats | None:
+        """
+        Consumer group stats of the last observation
+
+        :return: Stats or None, if nothing is observed yet
+        :rtype: GroupStats | None
+        """
+        return self.__stats
+
+    @property
+    def decisions(self) -> tuple[ScalingDecision, ...]:
+        """
+        Recent scaling decisions, oldest first
+
+        :return: Decisions
+        :rtype: tuple[ScalingDecision, ...]
+        """
+        return tuple(self.__decisions)
+
+    def start(self) -> tuple[int, ...]:
+        """
+        Spawn initial clones: number of worker clones within policy bounds
+
+        :return: PIDs of spawned clones
+        :rtype: tuple[int, ...]
+        """
+        clones = min(
+            max(self.__worker.clones, self.__policy.min_clones),
+            self.__policy.max_clones,
+        )
+        self.__scale(clones)
+        self.__scaled_at = time.monotonic()
+        return self.pids
+
+    def step(self) -> ScalingDecision | None:
+        """
+        Observe consumer group once and scale clones, if needed
+
+        :return: Decision, if number of clones has changed
+        :rtype: ScalingDecision | None
+        """
+        self.__reap()
+        self.__drain()
+        stats = self.__observe()
+        self.__stats = stats
+
+        previous = len(self.__processes)
+        clones, reason = self.__target(stats, previous)
+        if clones == previous:
+            return None
+
+        self.__scale(clones)
+        self.__streak = 0
+        self.__scaled_at = time.monotonic()
+        decision = ScalingDecision(
+            group=cast(ConsumerGroup, self.__worker.group),
+            previous=previous,
+            clones=clones,
+            stats=stats,
+            reason=reason,
+        )
+        self.__decisions.append(decision)
+        self.__logger.info(
+            f"Worker {self.__worker.name} is scaled "
+            + f"from {previous} to {clones} clones: {reason}."
+        )
+        return decision
+
+    def stop(self, block: bool = True) -> None:
+        """
+        Terminate all clones
+
+        :param block: Wait for clones to drain, killing ones which have not drained
+            in time. Defaults to True
+        :type block: bool
+        :return: None
+        :rtype: None
+        """
+        self.__scale(0)
+        if not block:
+            return
+
+        for process, deadline in self.__draining:
+            process.join(max(deadline - time.monotonic(), 0))
+        self.__drain(force=True)
+
+    def __observe(self) -> GroupStats:
+        lag = pending = consumers = 0
+        for event in self.__worker.events:
+            stats = self.__stream.group_stats(
+                event, cast(ConsumerGroup, self.__worker.group)
+            )
+            lag += stats.lag
+            pending += stats.pending
+            consumers += stats.consumers
+        return GroupStats(lag=lag, pending=pending, consumers=consumers)
+
+    def __target(self, stats: GroupStats, clones: int) -> tuple[int, str]:
+        policy = self.__policy
+        if clones < policy.min_clones:
+            self.__streak = 0
+            return policy.min_clones, "below min clones"
+
+        backlog = (stats.lag + stats.pending) / max(clones, 1)
+        # NOTE: streak is positive while backlog stays above scale up threshold
+        # and negative while it stays below scale down one, so a single
+        # spike or dip does not cause scaling.
+        if backlog > policy.scale_up_backlog:
+            self.__streak = max(self.__streak, 0) + 1
+        elif backlog < policy.scale_down_backlog:
+            self.__streak = min(self.__streak, 0) - 1
+        else:
+            self.__streak = 0
+
+        elapsed = time.monotonic() - self.__scaled_at
+        if (
+            self.__streak >= policy.sustain
+            and clones < policy.max_clones
+            and elapsed >= policy.scale_up_cooldown
+        ):
+            return (
+                min(clones + policy.step, policy.max_clones),
+                f"backlog {backlog:.0f} per clone above {policy.scale_up_backlog}",
+            )
+        if (
+            -self.__streak >= policy.sustain
+            and clones > policy.min_clones
+            and elapsed >= policy.scale_down_cooldown
+        ):
+            return (
+                max(clones - policy.step, policy.min_clones),
+                f"backlog {backlog:.0f} per clone below {policy.scale_down_backlog}",
+            )
+        return clones, ""
+
+    def __scale(self, clones: int) -> None:
+        while len(self.__processes) < clones:
+            # NOTE: clone drains on SIGTERM, so that events it has popped
+            # are consumed and acknowledged before it is removed.
+            process = mp.Process(
+                target=run_supervised,
+                args=(self.__worker.runner, None, None, 1.0, self.__logger),
+                daemon=True,
+            )
+            process.start()
+            self.__processes.append(process)
+            self.__logger.debug(f"Process {process.pid} has started.")
+        # NOTE: the newest clones are removed first. They are not waited for
+        # here, so that draining does not stall scaling of other workers,
+        # but reaped by later steps instead.
+        removed = self.__processes[clones:]
+        del self.__processes[clones:]
+        deadline = time.monotonic() + self.__drain_timeout
+        for process in removed:
+            process.terminate()
+            self.__draining.append((process, deadline))
+
+    def __drain(self, force: bool = False) -> None:
+        now = time.monotonic()
+        draining: list[tuple[mp.Process, float]] = []
+        for process, deadline in self.__draining:
+            if process.is_alive():
+                if not force and now < deadline:
+                    draining.append((process, deadline))
+                    continue
+
+                self.__logger.warning(
+                    f"Process {process.pid} has not drained in time, killing it."
+                )
+                process.kill()
+            process.join()
+            self.__logger.debug(f"Process {process.pid} has been terminated.")
+        self.__draining = draining
+
+    def __reap(self) -> None:
+        for process in [p for p in self.__processes if not p.is_alive()]:
+            self.__logger.warning(
+                f"Process {process.pid} of worker {self.__worker.name} "
+                + f"has exited with code {process.exitcode}."
+            )
+            self.__processes.remove(process)
@@ -10,3 +10,13 @@ class EventSerializer(IEventSerializer[bytes, bytes]):
 
     def decode(self, event: bytes) -> Event:
         return Event.fromdict(json.loads(event.decode()))
+
+
+class MemoryViewEventSerializer(IEventSerializer[memoryview, bytes]):
+    def encode(self, event: Event) -> bytes:
+        return json.dumps(event.asdict()).encode()
+
+    def decode(self, event: memoryview) -> Event:
+        # NOTE: bytes are copied once, into decoded text,
+        # without an intermediate bytes object.
+        return Event.fromdict(json.loads(str(event, "utf-8")))
@@ -1,12 +1,55 @@
+import os
+import threading
+from collections.abc import Callable
 from typing import Any
 
 from eventscore.core.abstract import IStream, IStreamFactory
 
 
 class StreamFactory(IStreamFactory):
+    """
+    Stream factory keeping a per-process registry of resources
+    shared by all streams it creates, e.g. connection pools.
+    Stream class provides such resources with an optional classmethod
+    `shared_kwargs(**kwargs) -> dict[str, Any]`, which is called once
+    per process and which result is passed to every stream constructor.
+    Resources created in one process are never used in another one.
+    """
+
     def __init__(self, stream_class: type[IStream], kwargs: dict[str, Any]) -> None:
         self.__stream_class = stream_class
         self.__kwargs = kwargs
+        self.__shared: dict[int, dict[str, Any]] = {}
+        self.__lock = threading.Lock()
 
     def __call__(self) -> IStream:
-        return self.__stream_class(**self.__kwargs)
+        return self.__stream_class(**self.__kwargs, **self.__shared_kwargs())
+
+    def __getstate__(self) -> dict[str, Any]:
+        # NOTE: shared resources, as well as lock, are not picklable
+        # and belong to current process anyway.
+        state = self.__dict__.copy()
+        state["_StreamFactory__shared"] = {}
+        del state["_StreamFactory__lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __shared_kwargs(self) -> dict[str, Any]:
+        pid = os.getpid()
+        shared = self.__shared.get(pid)
+        if shared is not None:
+            return shared
+
+        with self.__lock:
+            shared = self.__shared.get(pid)
+            if shared is None:
+                make: Callable[..., dict[str, Any]] | None = getattr(
+                    self.__stream_class, "shared_kwargs", None
+                )
+                shared = make(**self.__kwargs) if make is not None else {}
+                # NOTE: resources inherited from parent process are dropped.
+                self.__shared = {pid: shared}
+        return shared
@@ -0,0 +1,117 @@
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from eventscore.core.abstract import IRunner
+
+
+def run_supervised(
+    runner: IRunner,
+    ttl: float | None,
+    max_rss: int | None,
+    check_interval: float,
+    logger: logging.Logger,
+) -> None:
+    """
+    Run runner in a clone process, so that it drains on SIGTERM
+    and is stopped once it exceeds TTL or max RSS
+
+    :param runner: Runner to run
+    :type runner: IRunner
+    :param ttl: Max number of seconds runner runs, None for no limit
+    :type ttl: float | None
+    :param max_rss: Max resident memory in bytes, None for no limit
+    :type max_rss: int | None
+    :param check_interval: Number of seconds between checks of TTL and RSS
+    :type check_interval: float
+    :param logger: Logger instance
+    :type logger: logging.Logger
+    :return: None
+    :rtype: None
+    """
+    stop: Callable[[], None] | None = getattr(runner, "stop", None)
+    if stop is None:
+        # NOTE: runner cannot drain, default SIGTERM handling is kept.
+        runner.run()
+        return
+
+    def on_sigterm(signum: int, frame: Any) -> None:
+        logger.info(f"Process {os.getpid()} has received SIGTERM, draining.")
+        stop()
+
+    _ = signal.signal(signal.SIGTERM, on_sigterm)
+    if ttl is not None or max_rss is not None:
+        threading.Thread(
+            target=watch_recycling,
+            args=(stop, ttl, max_rss, check_interval, logger),
+            name="eventscore-recycling",
+            daemon=True,
+        ).start()
+    runner.run()
+
+
+def watch_recycling(
+    stop: Callable[[], None],
+    ttl: float | None,
+    max_rss: int | None,
+    check_interval: float,
+    logger: logging.Logger,
+) -> None:
+    """
+    Call `stop` once process exceeds TTL or max RSS
+
+    :param stop: Callback stopping the runner
+    :type stop: Callable[[], None]
+    :param ttl: Max number of seconds process runs, None for no limit
+    :type ttl: float | None
+    :param max_rss: Max resident memory in bytes, None for no limit
+    :type max_rss: int | None
+    :param check_interval: Number of seconds between checks
+    :type check_interval: float
+    :param logger: Logger instance
+    :type logger: logging.Logger
+    :return: None
+    :rtype: None
+    """
+    started_at = time.monotonic()
+    while True:
+        time.sleep(check_interval)
+        if ttl is not None and time.monotonic() - started_at >= ttl:
+            logger.info(f"Process {os.getpid()} has reached TTL, recycling it.")
+            break
+        if max_rss is not None and rss() >= max_rss:
+            logger.info(f"Process {os.getpid()} has reached max RSS, recycling it.")
+            break
+    stop()
+
+
+def rss() -> int:
+    """
+    Resident memory of current process in bytes,
+    0 where it can not be measured (Windows)
+
+    :return: Resident memory
+    :rtype: int
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    # NOTE: resource module is POSIX only, so it is imported here,
+    # where it is needed, and not along with the package.
+    try:
+        import resource
+    except ImportError:
+        # NOTE: RSS is not measured on Windows, clones are recycled by TTL only.
+        return 0
+    # NOTE: peak RSS is the best guess where procfs is not available,
+    # it is reported in bytes on macOS and in kilobytes elsewhere.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import math
+import random
 import uuid
+import zlib
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import IntEnum, StrEnum
 from time import time
-from typing import Any, TypeAlias, TypedDict
+from typing import Any, NotRequired, TypeAlias, TypedDict
 
 # FIXME: Duplicating definitions from abstract for now,
 # FIXME: to evade circular import problem
@@ -28,11 +31,18 @@ class EventStatus(IntEnum):
     FAILED = 2
 
 
+class BufferFullPolicy(IntEnum):
+    BLOCK = 0
+    DROP = 1
+    RAISE = 2
+
+
 class EventDict(TypedDict):
     type: str
     uid: str
     ts: str
     payload: dict[str, EncodableT]
+    headers: NotRequired[dict[str, EncodableT]]
 
 
 @dataclass(frozen=True, slots=True)
@@ -48,6 +58,9 @@ class Event:
     :type ts: str
     :param payload: payload of the event. Defaults to empty dict
     :type payload: dict[str, EncodableT]
+    :param headers: metadata of the event, e.g. delivery attempt.
+        Defaults to empty dict
+    :type headers: dict[str, EncodableT]
     """
 
     type: EventType
@@ -56,6 +69,9 @@ class Event:
     payload: dict[str, EncodableT] = field(  # pyright:ignore[reportUnknownVariableType]
         default_factory=dict
     )
+    headers: dict[str, EncodableT] = field(  # pyright:ignore[reportUnknownVariableType]
+        default_factory=dict
+    )
 
     def asdict(self) -> EventDict:
         """
@@ -64,12 +80,17 @@ class Event:
         :return: Dictionary representation of the event
         :rtype: EventDict
         """
-        return {
+        result: EventDict = {
             "type": str(self.type),
             "uid": str(self.uid),
             "ts": self.ts,
             "payload": self.payload,
         }
+        # NOTE: events without headers are encoded the same way
+        # they were before headers were introduced.
+        if self.headers:
+            result["headers"] = self.headers
+        return result
 
     @classmethod
     def fromdict(cls, obj: EventDict) -> Event:
@@ -86,7 +107,207 @@ class Event:
             uid=uuid.UUID(obj["uid"]),
             ts=obj["ts"],
             payload=obj["payload"],
+            headers=obj.get("headers", {}),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ProduceResult:
+    """
+    Produce result class
+
+    :param event: produced event
+    :type event: Event
+    :param status: status of the event.
+        PENDING if delivery was not awaited
+    :type status: EventStatus
+    :param error: error occured while producing, if any. Defaults to None
+    :type error: Exception | None
+    """
+
+    event: Event
+    status: EventStatus
+    error: Exception | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """
+    Retention policy of a stream of a single event type
+
+    :param maxlen: max number of events kept in stream. Defaults to None
+    :type maxlen: int | None
+    :param max_age: max number of seconds events are kept in stream.
+        Defaults to None
+    :type max_age: float | None
+    :param keep_unconsumed: do not trim events that are not yet
+        consumed by every consumer group.
+        Restricts max_age, if set, otherwise every event
+        consumed by all groups is trimmed.
+        Checked only by periodic trimming, since it requires
+        consumer groups to be inspected. Defaults to False
+    :type keep_unconsumed: bool
+    :param approximate: allow broker to trim lazily,
+        which is much cheaper than exact trimming. Defaults to True
+    :type approximate: bool
+    :param limit: max number of events evicted by a single trim.
+        Used only with approximate trimming. Defaults to None
+    :type limit: int | None
+    """
+
+    maxlen: int | None = None
+    max_age: float | None = None
+    keep_unconsumed: bool = False
+    approximate: bool = True
+    limit: int | None = None
+
+    def __post_init__(self) -> None:
+        assert self.maxlen is None or self.maxlen >= 0, "Max len must be non-negative."
+        assert self.max_age is None or self.max_age > 0, "Max age must be positive."
+        assert self.limit is None or self.limit > 0, "Limit must be positive."
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    Retry policy of a consumer.
+    Event that consumer failed to consume is put to stream again
+    after a delay, growing exponentially with every attempt.
+    Event that consumer failed to consume on the last attempt
+    is put to dead-letter stream of consumer group.
+
+    :param max_attempts: max number of attempts to consume an event,
+        including the first one. Defaults to 3
+    :type max_attempts: int
+    :param backoff: number of seconds before the second attempt. Defaults to 1.0
+    :type backoff: float
+    :param multiplier: factor delay grows by with every attempt. Defaults to 2.0
+    :type multiplier: float
+    :param max_backoff: max number of seconds between attempts. Defaults to 300.0
+    :type max_backoff: float
+    :param jitter: max fraction of delay added or subtracted at random,
+        so that events failed at once are not retried at once. Defaults to 0.1
+    :type jitter: float
+    """
+
+    max_attempts: int = 3
+    backoff: float = 1.0
+    multiplier: float = 2.0
+    max_backoff: float = 300.0
+    jitter: float = 0.1
+
+    def __post_init__(self) -> None:
+        assert self.max_attempts > 0, "Max attempts must be positive."
+        assert self.backoff >= 0, "Backoff must be non-negative."
+        assert self.multiplier >= 1, "Multiplier must not be less than 1."
+        assert (
+            self.max_backoff >= self.backoff
+        ), "Max backoff must not be less than backoff."
+        assert 0 <= self.jitter <= 1, "Jitter must be between 0 and 1."
+
+    def delay(self, attempt: int) -> float:
+        """
+        Number of seconds to wait before the next attempt
+
+        :param attempt: Number of failed attempt, starting from 1
+        :type attempt: int
+        :return: Delay
+        :rtype: float
+        """
+        delay = min(
+            self.backoff * self.multiplier ** (attempt - 1),
+            self.max_backoff,
         )
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """
+    Rate limit of a consumer, shared by all its clones.
+    Consumer takes a token from a bucket before every event,
+    bucket is refilled at a constant rate up to its capacity.
+    Tokens are taken in batches, so that limiting does not cost
+    a broker round trip per event. Clones may hold up to `prefetch`
+    unused tokens each, so bursts may slightly exceed `burst`.
+
+    :param rate: max number of events consumed per second by all clones
+    :type rate: float
+    :param burst: max number of tokens bucket holds, i.e. events consumed
+        at once after consumer was idle. Defaults to 0, i.e. rate rounded up
+    :type burst: int
+    :param prefetch: max number of tokens taken from bucket at once.
+        Defaults to 10
+    :type prefetch: int
+    """
+
+    rate: float
+    burst: int = 0
+    prefetch: int = 10
+
+    def __post_init__(self) -> None:
+        assert self.rate > 0, "Rate must be positive."
+        assert self.burst >= 0, "Burst must be non-negative."
+        assert self.prefetch > 0, "Prefetch must be positive."
+
+    @property
+    def capacity(self) -> int:
+        """
+        Max number of tokens bucket holds
+
+        :return: Capacity
+        :rtype: int
+        """
+        return self.burst or math.ceil(self.rate)
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionPolicy:
+    """
+    Partitioning of a stream of a single event type into lanes.
+    Events with the same key always get to the same lane,
+    every lane is consumed by a single consumer of a group at a time,
+    so events with the same key are consumed in order they were produced.
+
+    :param key: payload field or callable extracting key of the event
+    :type key: str | Callable[[Event], Any]
+    :param lanes: number of lanes, i.e. max number of consumers
+        of a group consuming the event type in parallel. Defaults to 16
+    :type lanes: int
+    """
+
+    key: str | Callable[[Event], Any]
+    lanes: int = 16
+
+    def __post_init__(self) -> None:
+        assert self.lanes > 0, "Number of lanes must be positive."
+
+    def key_of(self, event: Event) -> bytes:
+        """
+        Partitioning key of the event
+
+        :param event: Event
+        :type event: Event
+        :return: Key
+        :rtype: bytes
+        """
+        key = (
+            event.payload.get(self.key)
+            if isinstance(self.key, str)
+            else self.key(event)
+        )
+        return str(key).encode()
+
+    def lane(self, event: Event) -> int:
+        """
+        Lane of the event, stable across processes and restarts
+
+        :param event: Event
+        :type event: Event
+        :return: Lane number
+        :rtype: int
+        """
+        return zlib.crc32(self.key_of(event)) % self.lanes
 
 
 # FIXME: Duplicating definitions from abstract for now,
@@ -110,6 +331,12 @@ class PipelineItem:
     :type group: ConsumerGroup
     :param clones: number of clones. Defaults to 1
     :type clones: int
+    :param weight: relative load of a single clone. Defaults to 1.0
+    :type weight: float
+    :param retry: retry policy of consumer. Defaults to None
+    :type retry: RetryPolicy | None
+    :param rate_limit: rate limit of consumer. Defaults to None
+    :type rate_limit: RateLimit | None
     """
 
     func: ConsumerFunc
@@ -117,6 +344,9 @@ class PipelineItem:
     event: EventType
     group: ConsumerGroup = DEFAULT_CONSUMER_GROUP
     clones: int = 1
+    weight: float = 1.0
+    retry: RetryPolicy | None = None
+    rate_limit: RateLimit | None = None
 
     def __eq__(self, other: PipelineItem) -> bool:  # type:ignore[override]
         """
@@ -176,9 +406,119 @@ class Worker:
     :type clones: int
     :param uid: unique id of the worker. Defaults to random uuid4
     :type uid: uuid.UUID
+    :param weight: relative load of a single clone. Defaults to 1.0
+    :type weight: float
+    :param events: event types read by the worker. Defaults to empty tuple
+    :type events: tuple[EventType, ...]
+    :param group: consumer group of the worker. Defaults to None
+    :type group: ConsumerGroup | None
     """
 
     name: str
     runner: Any  # FIXME: type annotation causes circular import problem
     clones: int = 1
     uid: uuid.UUID = field(default_factory=uuid.uuid4)
+    weight: float = 1.0
+    events: tuple[EventType, ...] = ()
+    group: ConsumerGroup | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class GroupStats:
+    """
+    Consumption progress of a consumer group
+
+    :param lag: number of events not yet delivered to group. Defaults to 0
+    :type lag: int
+    :param pending: number of events delivered to group,
+        but not acknowledged yet. Defaults to 0
+    :type pending: int
+    :param consumers: number of consumers known to broker. Defaults to 0
+    :type consumers: int
+    """
+
+    lag: int = 0
+    pending: int = 0
+    consumers: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ScalingPolicy:
+    """
+    Policy of scaling clones of a worker by its consumer group backlog.
+    Backlog is lag plus pending events per running clone.
+
+    :param min_clones: min number of clones. Defaults to 1
+    :type min_clones: int
+    :param max_clones: max number of clones. Defaults to 8
+    :type max_clones: int
+    :param scale_up_backlog: backlog per clone above which
+        clones are added. Defaults to 1000
+    :type scale_up_backlog: int
+    :param scale_down_backlog: backlog per clone below which
+        clones are removed. Must be less than scale_up_backlog,
+        the gap between them prevents flapping. Defaults to 100
+    :type scale_down_backlog: int
+    :param step: number of clones added or removed at once. Defaults to 1
+    :type step: int
+    :param sustain: number of consecutive observations backlog must stay
+        above or below threshold before scaling. Defaults to 3
+    :type sustain: int
+    :param scale_up_cooldown: min number of seconds since last scaling
+        before clones are added. Defaults to 30.0
+    :type scale_up_cooldown: float
+    :param scale_down_cooldown: min number of seconds since last scaling
+        before clones are removed. Defaults to 120.0
+    :type scale_down_cooldown: float
+    """
+
+    min_clones: int = 1
+    max_clones: int = 8
+    scale_up_backlog: int = 1000
+    scale_down_backlog: int = 100
+    step: int = 1
+    sustain: int = 3
+    scale_up_cooldown: float = 30.0
+    scale_down_cooldown: float = 120.0
+
+    def __post_init__(self) -> None:
+        assert self.min_clones >= 0, "Min clones must be non-negative."
+        assert (
+            self.max_clones >= self.min_clones
+        ), "Max clones must not be less than min clones."
+        assert (
+            0 <= self.scale_down_backlog < self.scale_up_backlog
+        ), "Scale down backlog must be non-negative and less than scale up backlog."
+        assert self.step > 0, "Step must be positive."
+        assert self.sustain > 0, "Sustain must be positive."
+        assert self.scale_up_cooldown >= 0, "Scale up cooldown must be non-negative."
+        assert (
+            self.scale_down_cooldown >= 0
+        ), "Scale down cooldown must be non-negative."
+
+
+@dataclass(frozen=True, slots=True)
+class ScalingDecision:
+    """
+    Change of number of clones made by autoscaler
+
+    :param group: consumer group of scaled worker
+    :type group: ConsumerGroup
+    :param previous: number of clones before scaling
+    :type previous: int
+    :param clones: number of clones after scaling
+    :type clones: int
+    :param stats: consumer group stats scaling is based on
+    :type stats: GroupStats
+    :param reason: short description of decision reason
+    :type reason: str
+    :param ts: timestamp of decision. Defaults to current timestamp
+    :type ts: float
+    """
+
+    group: ConsumerGroup
+    previous: int
+    clones: int
+    stats: GroupStats
+    reason: str
+    ts: float = field(default_factory=time)
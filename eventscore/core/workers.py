@@ -1,30 +1,596 @@
+import asyncio
+import copy
+import gc
+import heapq
 import logging
 import multiprocessing as mp
-from typing import cast
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, cast
 
-from eventscore.core.abstract import ISpawnWorker
+from eventscore.core.abstract import (
+    ConsumerGroup,
+    IRunner,
+    ISpawnWorker,
+    IStream,
+    IStreamFactory,
+)
 from eventscore.core.logging import logger as _logger
-from eventscore.core.types import Worker
+from eventscore.core.scaling import Autoscaler
+from eventscore.core.supervision import run_supervised
+from eventscore.core.types import ScalingPolicy, Worker
 
 
 class SpawnMPWorker(ISpawnWorker):
-    def __init__(self, logger: logging.Logger = _logger) -> None:
+    def __init__(
+        self,
+        logger: logging.Logger = _logger,
+        *,
+        start_method: str | None = None,
+        gc_freeze: bool = False,
+        preload: Sequence[str] = (),
+    ) -> None:
         """
         Construct spawn worker instance
 
         :param logger: Logger instance
         :type logger: logging.Logger
+        :param start_method: Multiprocessing start method:
+            "fork", "forkserver" or "spawn".
+            Forked clones share memory pages of spawning process
+            until either of them writes to a page,
+            other methods start clones from a fresh interpreter,
+            which requires runners to be picklable.
+            Defaults to None, i.e. default start method of the platform
+        :type start_method: str | None
+        :param gc_freeze: Move all objects of spawning process to
+            permanent GC generation while clones are forked,
+            so that GC passes in clones do not touch and un-share
+            pages of inherited heap. Makes sense only for "fork".
+            Defaults to `False`.
+        :type gc_freeze: bool
+        :param preload: Modules imported by forkserver before it forks clones,
+            e.g. modules with consumers. Used only with "forkserver".
+            Defaults to empty tuple
+        :type preload: Sequence[str]
         """
+        assert start_method is None or start_method in (
+            "fork",
+            "forkserver",
+            "spawn",
+        ), "Unknown start method."
+
         self.__logger = logger
+        self.__start_method = start_method
+        self.__gc_freeze = gc_freeze
+        self.__preload = list(preload)
 
     def __call__(self, worker: Worker) -> tuple[int, ...]:
+        context = self.__context()
         processes: list[mp.Process] = []
         for _ in range(worker.clones):
-            process = mp.Process(target=worker.runner.run, daemon=True)
+            process = context.Process(target=worker.runner.run, daemon=True)
             processes.append(process)
 
+        if self.__gc_freeze:
+            # NOTE: objects are frozen only while clones are forked,
+            # so spawning process keeps collecting its garbage.
+            gc.freeze()
+        try:
+            for process in processes:
+                process.start()
+                self.__logger.debug(f"Process {process.pid} has started.")
+        finally:
+            if self.__gc_freeze:
+                gc.unfreeze()
+
+        return tuple(cast(int, process.pid) for process in processes)
+
+    def __context(self) -> Any:
+        if self.__start_method is None:
+            return mp
+        context = mp.get_context(self.__start_method)
+        if self.__start_method == "forkserver" and self.__preload:
+            context.set_forkserver_preload(self.__preload)
+        return context
+
+    def finalize(self) -> tuple[int, ...]:
+        return ()
+
+
+class SpawnSupervisedMPWorker(ISpawnWorker):
+    """
+    Worker spawner watching clone processes.
+    Crashed clones are restarted with exponential backoff.
+    Clones drain events already popped and exit on SIGTERM,
+    clones that finish on their own (e.g. runner `max_events` is reached)
+    or exceed `ttl` or `max_rss` are recycled, i.e. restarted immediately.
+    Clones are watched by a background thread started by `finalize`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float | None = None,
+        max_rss: int | None = None,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        check_interval: float = 1.0,
+        drain_timeout: float = 30.0,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct supervised spawn worker instance
+
+        :param ttl: Max number of seconds a clone runs before it is recycled.
+            Defaults to None, i.e. no limit
+        :type ttl: float | None
+        :param max_rss: Max resident memory of a clone in bytes
+            before it is recycled. Defaults to None, i.e. no limit
+        :type max_rss: int | None
+        :param backoff: Number of seconds before the first restart
+            of a crashed clone, doubled by every consecutive crash.
+            Defaults to 1.0
+        :type backoff: float
+        :param max_backoff: Max number of seconds before restart.
+            Clone running for that long is considered healthy again.
+            Defaults to 60.0
+        :type max_backoff: float
+        :param check_interval: Number of seconds between checks of clones.
+            Defaults to 1.0
+        :type check_interval: float
+        :param drain_timeout: Max number of seconds stopped clone is waited for
+            before it is killed. Defaults to 30.0
+        :type drain_timeout: float
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert ttl is None or ttl > 0, "TTL must be positive."
+        assert max_rss is None or max_rss > 0, "Max RSS must be positive."
+        assert (
+            0 < backoff <= max_backoff
+        ), "Backoff must be positive and not exceed max."
+        assert check_interval > 0, "Check interval must be positive."
+        assert drain_timeout >= 0, "Drain timeout must be non-negative."
+
+        self.__ttl = ttl
+        self.__max_rss = max_rss
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__check_interval = check_interval
+        self.__drain_timeout = drain_timeout
+        self.__logger = logger
+        self.__clones: list[_Clone] = []
+        self.__stopping = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def pids(self) -> tuple[int, ...]:
+        """
+        PIDs of running clones
+
+        :return: PIDs
+        :rtype: tuple[int, ...]
+        """
+        return tuple(
+            cast(int, clone.process.pid)
+            for clone in self.__clones
+            if clone.process is not None and clone.process.is_alive()
+        )
+
+    def __call__(self, worker: Worker) -> tuple[int, ...]:
+        clones = [_Clone(worker) for _ in range(worker.clones)]
+        for clone in clones:
+            self.__start(clone)
+        self.__clones.extend(clones)
+        return tuple(cast(int, clone.process.pid) for clone in clones if clone.process)
+
+    def finalize(self) -> tuple[int, ...]:
+        if self.__clones and self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__supervise,
+                name="eventscore-supervisor",
+                daemon=True,
+            )
+            self.__thread.start()
+        return ()
+
+    def check(self) -> None:
+        """
+        Restart every clone that has exited and is due to restart
+
+        :return: None
+        :rtype: None
+        """
+        now = time.monotonic()
+        for clone in self.__clones:
+            process = clone.process
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                self.__on_exit(clone, process, now)
+            if clone.restart_at <= now:
+                self.__start(clone)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop supervising and let every clone drain and exit.
+        Clones not exited within drain timeout are killed.
+
+        :param timeout: Max number of seconds to wait for supervisor thread.
+            Defaults to None
+        :type timeout: float | None
+        :return: None
+        :rtype: None
+        """
+        self.__stopping.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+
+        processes = [
+            clone.process for clone in self.__clones if clone.process is not None
+        ]
         for process in processes:
+            process.terminate()
+        deadline = time.monotonic() + self.__drain_timeout
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                self.__logger.warning(
+                    f"Process {process.pid} has not drained in time, killing it."
+                )
+                process.kill()
+                process.join()
+        self.__clones.clear()
+
+    def __supervise(self) -> None:
+        while not self.__stopping.wait(self.__check_interval):
+            try:
+                self.check()
+            except Exception as exc:
+                self.__logger.error(f"Failed to check clones: {exc!r}")
+
+    def __start(self, clone: "_Clone") -> None:
+        process = mp.Process(
+            target=run_supervised,
+            args=(
+                clone.worker.runner,
+                self.__ttl,
+                self.__max_rss,
+                self.__check_interval,
+                self.__logger,
+            ),
+            daemon=True,
+        )
+        process.start()
+        clone.process = process
+        clone.started_at = time.monotonic()
+        self.__logger.debug(f"Process {process.pid} has started.")
+
+    def __on_exit(self, clone: "_Clone", process: mp.Process, now: float) -> None:
+        clone.process = None
+        if process.exitcode == 0:
+            # NOTE: runner has finished on its own or has been recycled.
+            clone.failures = 0
+            clone.restart_at = now
+            self.__logger.info(f"Process {process.pid} has exited, recycling it.")
+            return
+
+        if now - clone.started_at >= self.__max_backoff:
+            clone.failures = 0
+        delay = min(self.__backoff * 2**clone.failures, self.__max_backoff)
+        clone.failures += 1
+        clone.restart_at = now + delay
+        self.__logger.warning(
+            f"Process {process.pid} of worker {clone.worker.name} has crashed "
+            + f"with code {process.exitcode}, restarting it in {delay:.1f}s."
+        )
+
+
+class _Clone:
+    __slots__ = ("worker", "process", "started_at", "restart_at", "failures")
+
+    def __init__(self, worker: Worker) -> None:
+        self.worker = worker
+        self.process: mp.Process | None = None
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.failures = 0
+
+
+class SpawnAutoscaledMPWorker(ISpawnWorker):
+    """
+    Worker spawner scaling number of clone processes by consumer group backlog.
+    Clones of every worker with a scaling policy are supervised
+    by an `Autoscaler`, autoscalers are stepped by a background thread
+    started by `finalize`. Workers without policy are spawned as is.
+    """
+
+    def __init__(
+        self,
+        stream_factory: IStreamFactory,
+        policies: dict[ConsumerGroup, ScalingPolicy] | None = None,
+        *,
+        default_policy: ScalingPolicy | None = None,
+        interval: float = 5.0,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct autoscaled spawn worker instance
+
+        :param stream_factory: Factory of stream to inspect consumer groups with.
+            Stream is created on first scaled worker, in the spawning process
+        :type stream_factory: IStreamFactory
+        :param policies: Scaling policies of consumer groups. Defaults to None
+        :type policies: dict[ConsumerGroup, ScalingPolicy] | None
+        :param default_policy: Scaling policy of groups without their own one.
+            Defaults to None, i.e. such groups are not scaled
+        :type default_policy: ScalingPolicy | None
+        :param interval: Number of seconds between observations.
+            Defaults to 5.0
+        :type interval: float
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert interval > 0, "Interval must be positive."
+
+        self.__stream_factory = stream_factory
+        self.__stream: IStream | None = None
+        self.__policies = {
+            str(group): policy for group, policy in (policies or {}).items()
+        }
+        self.__default_policy = default_policy
+        self.__interval = interval
+        self.__logger = logger
+        self.__autoscalers: dict[str, Autoscaler] = {}
+        self.__stopping = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def autoscalers(self) -> dict[str, Autoscaler]:
+        """
+        Autoscalers by consumer group, e.g. to expose clones and decisions
+
+        :return: Autoscalers
+        :rtype: dict[str, Autoscaler]
+        """
+        return dict(self.__autoscalers)
+
+    def __call__(self, worker: Worker) -> tuple[int, ...]:
+        policy = self.__policies.get(str(worker.group), self.__default_policy)
+        if policy is None or worker.group is None:
+            return SpawnMPWorker(logger=self.__logger)(worker)
+
+        if self.__stream is None:
+            self.__stream = self.__stream_factory()
+        autoscaler = Autoscaler(worker, self.__stream, policy, logger=self.__logger)
+        self.__autoscalers[str(worker.group)] = autoscaler
+        return autoscaler.start()
+
+    def finalize(self) -> tuple[int, ...]:
+        if self.__autoscalers and self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__supervise,
+                name="eventscore-autoscaler",
+                daemon=True,
+            )
+            self.__thread.start()
+        return ()
+
+    def step(self) -> None:
+        """
+        Step every autoscaler once
+
+        :return: None
+        :rtype: None
+        """
+        for group, autoscaler in self.__autoscalers.items():
+            try:
+                _ = autoscaler.step()
+            except Exception as exc:
+                self.__logger.error(f"Failed to autoscale group {group}: {exc!r}")
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop supervising and terminate all supervised clones
+
+        :param timeout: Max number of seconds to wait for supervisor thread.
+            Defaults to None
+        :type timeout: float | None
+        :return: None
+        :rtype: None
+        """
+        self.__stopping.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+        # NOTE: all clones are terminated first, so that they drain
+        # simultaneously, and only then waited for.
+        for autoscaler in self.__autoscalers.values():
+            autoscaler.stop(block=False)
+        for autoscaler in self.__autoscalers.values():
+            autoscaler.stop()
+
+    def __supervise(self) -> None:
+        while not self.__stopping.wait(self.__interval):
+            self.step()
+
+
+class SpawnThreadWorker(ISpawnWorker):
+    """
+    Worker spawner running every clone on a daemon thread of current process.
+    Suits I/O-bound consumers, which do not need a process of their own.
+    """
+
+    def __init__(self, logger: logging.Logger = _logger) -> None:
+        """
+        Construct thread spawn worker instance
+
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        self.__logger = logger
+        self.__runners: list[IRunner] = []
+        self.__threads: list[threading.Thread] = []
+
+    def __call__(self, worker: Worker) -> tuple[int, ...]:
+        for idx in range(worker.clones):
+            # NOTE: clones run concurrently, so every one of them
+            # needs its own copy of runner and, thus, of stream.
+            runner = copy.copy(worker.runner)
+            thread = threading.Thread(
+                target=_run_safely,
+                args=(runner.run, self.__logger),
+                name=f"eventscore-{worker.name}-{idx}",
+                daemon=True,
+            )
+            thread.start()
+            self.__logger.debug(f"Thread {thread.native_id} has started.")
+            self.__runners.append(runner)
+            self.__threads.append(thread)
+
+        return (os.getpid(),) * worker.clones
+
+    def finalize(self) -> tuple[int, ...]:
+        return ()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop runners that support graceful stop and wait for threads
+
+        :param timeout: Max number of seconds to wait for every thread.
+            Defaults to None
+        :type timeout: float | None
+        :return: None
+        :rtype: None
+        """
+        for runner in self.__runners:
+            stop = getattr(runner, "stop", None)
+            if stop is not None:
+                stop()
+        for thread in self.__threads:
+            thread.join(timeout)
+        self.__runners.clear()
+        self.__threads = [thread for thread in self.__threads if thread.is_alive()]
+
+
+class SpawnMultiplexedWorker(ISpawnWorker):
+    """
+    Worker spawner hosting clones of many workers in a fixed number of processes.
+    Workers are only collected by calls, processes are started by `finalize`.
+    """
+
+    def __init__(
+        self,
+        hosts: int | None = None,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct multiplexed spawn worker instance
+
+        :param hosts: Max number of host processes.
+            Defaults to None, i.e. number of CPUs.
+        :type hosts: int | None
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        self.__hosts = hosts or os.cpu_count() or 1
+        self.__logger = logger
+        self.__workers: list[Worker] = []
+
+        assert self.__hosts > 0, "Number of hosts must be positive."
+
+    def __call__(self, worker: Worker) -> tuple[int, ...]:
+        self.__workers.append(worker)
+        self.__logger.debug(f"Worker {worker.name} is deferred to finalize.")
+        return ()
+
+    def finalize(self) -> tuple[int, ...]:
+        pids: list[int] = []
+        for idx, runners in enumerate(self.pack()):
+            process = mp.Process(
+                target=_run_host,
+                args=(runners, self.__logger),
+                name=f"eventscore-host-{idx}",
+                daemon=True,
+            )
             process.start()
-            self.__logger.debug(f"Process {process.pid} has started.")
+            self.__logger.debug(
+                f"Process {process.pid} has started, hosting {len(runners)} runners."
+            )
+            pids.append(cast(int, process.pid))
 
-        return tuple(cast(int, process.pid) for process in processes)
+        self.__workers.clear()
+        return tuple(pids)
+
+    def pack(self) -> list[list[IRunner]]:
+        """
+        Distribute clones of collected workers between hosts,
+        so that total weight of hosts is as even as possible.
+        Every clone gets its own copy of worker runner.
+
+        :return: Runners of every non-empty host
+        :rtype: list[list[IRunner]]
+        """
+        clones = sorted(
+            (
+                (worker.weight, worker.runner)
+                for worker in self.__workers
+                for _ in range(worker.clones)
+            ),
+            key=lambda clone: clone[0],
+            reverse=True,
+        )
+        # NOTE: greedy longest-processing-time packing,
+        # the heaviest clone goes to the least loaded host.
+        heap = [(0.0, idx) for idx in range(min(self.__hosts, len(clones)))]
+        hosts: list[list[IRunner]] = [[] for _ in heap]
+        for weight, runner in clones:
+            load, idx = heapq.heappop(heap)
+            hosts[idx].append(copy.copy(runner))
+            heapq.heappush(heap, (load + weight, idx))
+        return hosts
+
+
+def _run_host(runners: list[IRunner], logger: logging.Logger) -> None:
+    # NOTE: runners with `arun` share a single event loop,
+    # other runners get a thread each.
+    coroutine_runners: list[Any] = []
+    threads: list[threading.Thread] = []
+    for idx, runner in enumerate(runners):
+        if hasattr(runner, "arun"):
+            coroutine_runners.append(runner)
+            continue
+        threads.append(
+            threading.Thread(
+                target=_run_safely,
+                args=(runner.run, logger),
+                name=f"eventscore-runner-{idx}",
+                daemon=True,
+            )
+        )
+
+    for thread in threads:
+        thread.start()
+    if coroutine_runners:
+        asyncio.run(_arun_all(coroutine_runners, logger))
+    for thread in threads:
+        thread.join()
+
+
+def _run_safely(run: Callable[[], None], logger: logging.Logger) -> None:
+    try:
+        run()
+    except Exception as exc:
+        logger.error(f"Runner has failed: {exc!r}", exc_info=exc)
+
+
+async def _arun_all(runners: list[Any], logger: logging.Logger) -> None:
+    results = await asyncio.gather(
+        *(runner.arun() for runner in runners),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"Runner has failed: {result!r}", exc_info=result)
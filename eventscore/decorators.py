@@ -1,7 +1,15 @@
 import functools
+import inspect
 from typing import Any
 
-from eventscore.core.abstract import ConsumerFunc, ConsumerGroup, EventType, IECore
+from eventscore.core.abstract import (
+    ConsumerFunc,
+    ConsumerGroup,
+    EventType,
+    IECore,
+    Weight,
+)
+from eventscore.core.types import RateLimit, RetryPolicy
 
 
 def consumer(
@@ -11,14 +19,37 @@ def consumer(
     event: EventType,
     group: ConsumerGroup,
     clones: int = 1,
+    weight: Weight = 1.0,
+    retry: RetryPolicy | None = None,
+    rate_limit: RateLimit | None = None,
 ) -> ConsumerFunc:
     def decorator(func: ConsumerFunc) -> ConsumerFunc:
-        ecore.register_consumer(func, event, group, clones=clones)
+        ecore.register_consumer(
+            func,
+            event,
+            group,
+            clones=clones,
+            weight=weight,
+            retry=retry,
+            rate_limit=rate_limit,
+        )
 
         setattr(func, "__is_consumer__", True)
         setattr(func, "__consumer_event__", event)
         setattr(func, "__consumer_group__", group)
         setattr(func, "__consumer_clones__", clones)
+        setattr(func, "__consumer_weight__", weight)
+        setattr(func, "__consumer_retry__", retry)
+        setattr(func, "__consumer_rate_limit__", rate_limit)
+
+        if inspect.iscoroutinefunction(func):
+            # NOTE: wrapper must stay a coroutine function,
+            # otherwise it is not detected as an asynchronous consumer.
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await func(*args, **kwargs)
+
+            return async_wrapper
 
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
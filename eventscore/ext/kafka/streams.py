@@ -1,30 +1,67 @@
-from typing import Any, TypeAlias
+import asyncio
+import json
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any
 
 from kafka import KafkaConsumer, KafkaProducer  # type:ignore[import-untyped]
 from kafka.errors import KafkaTimeoutError  # type:ignore[import-untyped]
 from kafka.producer.future import FutureRecordMetadata  # type:ignore[import-untyped]
+from kafka.structs import (  # type:ignore[import-untyped]
+    OffsetAndMetadata,
+    TopicPartition,
+)
 
 from eventscore.core.abstract import ConsumerGroup, EventType, IEventSerializer, IStream
 from eventscore.core.exceptions import (
     EmptyStreamError,
     EventNotSentError,
     TooManyDataError,
+    UnsupportedOperationError,
+)
+from eventscore.core.types import (
+    Event,
+    EventDict,
+    EventStatus,
+    GroupStats,
+    PartitionPolicy,
+    ProduceResult,
+    RateLimit,
 )
-from eventscore.core.types import Event, EventDict
 
-PollResult: TypeAlias = dict[str, list[EventDict]]
+
+def _deserialize(value: bytes | None) -> Any:
+    return None if value is None else json.loads(value)
 
 
 class KafkaStream(IStream):
     def __init__(
         self,
         serializer: IEventSerializer[EventDict, bytes],
+        partitions: dict[EventType, PartitionPolicy] | None = None,
     ) -> None:
         self.__serializer = serializer
+        # NOTE: events with the same key get to the same topic partition,
+        # which is consumed by a single consumer of a group at a time.
+        self.__partitions = {
+            str(event): policy for event, policy in (partitions or {}).items()
+        }
         configs: dict[str, Any] = {}
         self.__producer = KafkaProducer(**configs)
-        self.__consumer = KafkaConsumer(**configs)
-        self.__consumer_subscription: EventType | None = None
+        # NOTE: offsets are committed explicitly, right after poll
+        # or on ack, so every consumer group has a consumer of its own.
+        self.__consumers: dict[str, Any] = {}
+        self.__consumer_subscriptions: dict[str, tuple[str, ...]] = {}
+        self.__configs = configs
+        self.__group_consumers: dict[str, Any] = {}
+        # NOTE: positions are next offsets to commit by group and partition,
+        # pending events are those popped with `ack=False` and not acknowledged.
+        self.__positions: dict[str, dict[Any, int]] = defaultdict(dict)
+        self.__pending: dict[str, dict[uuid.UUID, tuple[Any, int, float, Event]]] = (
+            defaultdict(dict)
+        )
 
     def put(
         self,
@@ -33,11 +70,10 @@ class KafkaStream(IStream):
         block: bool = True,
         timeout: int = 5,
     ) -> None:
-        record: FutureRecordMetadata = (  # type:ignore
-            self.__producer.send(  # pyright:ignore[reportUnknownMemberType]
-                topic=str(event),
-                value=self.__serializer.encode(event),
-            )
+        record: FutureRecordMetadata = self.__producer.send(  # type:ignore
+            topic=str(event.type),
+            value=self.__serializer.encode(event),
+            key=self.__key(event),
         )
         if not block:
             return
@@ -49,6 +85,79 @@ class KafkaStream(IStream):
         except KafkaTimeoutError as exc:
             raise EventNotSentError from exc
 
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        raise UnsupportedOperationError(
+            "Kafka does not support delayed events, "
+            + "schedule them with a Redis stream instead."
+        )
+
+    def take_tokens(
+        self, key: str, rate_limit: RateLimit, count: int
+    ) -> tuple[int, float]:
+        raise UnsupportedOperationError(
+            "Kafka does not keep token buckets, "
+            + "rate limits are applied per process."
+        )
+
+    def put_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        records: list[FutureRecordMetadata] = [  # type:ignore
+            self.__producer.send(
+                topic=str(event.type),
+                value=self.__serializer.encode(event),
+                key=self.__key(event),
+            )
+            for event in events
+        ]
+        if not block:
+            return [
+                ProduceResult(event=event, status=EventStatus.PENDING)
+                for event in events
+            ]
+
+        try:
+            self.__producer.flush(timeout)
+        except KafkaTimeoutError:
+            pass  # undelivered records are reported below
+
+        results: list[ProduceResult] = []
+        for event, record in zip(events, records):
+            if not record.is_done:
+                results.append(
+                    ProduceResult(
+                        event=event,
+                        status=EventStatus.FAILED,
+                        error=EventNotSentError(),
+                    )
+                )
+            elif record.failed():  # pyright:ignore[reportUnknownMemberType]
+                results.append(
+                    ProduceResult(
+                        event=event,
+                        status=EventStatus.FAILED,
+                        error=record.exception,
+                    )
+                )
+            else:
+                results.append(ProduceResult(event=event, status=EventStatus.SENT))
+        return results
+
+    async def aput(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        # NOTE: kafka-python has no asyncio support,
+        # so waiting for delivery is moved to a separate thread.
+        await asyncio.to_thread(self.put, event, block=block, timeout=timeout)
+
     def pop(
         self,
         event: EventType,
@@ -56,30 +165,181 @@ class KafkaStream(IStream):
         *,
         block: bool = True,
         timeout: int = 5,
+        ack: bool = True,
     ) -> Event:
-        self.__single_consumer_subscription_lock(event)
-        record: PollResult = (  # pyright:ignore[reportUnknownVariableType]
-            self.__consumer.poll(  # pyright:ignore[reportUnknownMemberType]
-                timeout * 1000 if block else 0,
-                max_records=1,
-                update_offsets=True,
-            )
-        )
-        if event not in record or not record[str(event)]:
+        popped = self.__pop(group, (event,), 1, block, timeout, ack)
+        if not popped[str(event)]:
+            raise EmptyStreamError
+        if len(popped[str(event)]) > 1:
+            raise TooManyDataError
+        return popped[str(event)][0]
+
+    def pop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        popped = self.__pop(group, (event,), max_count, block, timeout, ack)
+        if not popped[str(event)]:
             raise EmptyStreamError
-        if len(record[str(event)]) > 1:
+        if len(popped[str(event)]) > max_count:
             raise TooManyDataError
+        return popped[str(event)]
 
-        data = record[str(event)][0]
-        return self.__serializer.decode(data)
+    def pop_multi(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+        assert len(events) > 0, "No events to pop."
 
-    def __single_consumer_subscription_lock(self, event: EventType) -> None:
-        if self.__consumer_subscription == event:
-            return
-        if self.__consumer_subscription is not None:
-            self.__consumer.unsubscribe()
+        # NOTE: unlike Redis, Kafka limits number of records for all topics
+        popped = self.__pop(group, events, max_count * len(events), block, timeout, ack)
+        result = [event for event_type in events for event in popped[str(event_type)]]
+        if not result:
+            raise EmptyStreamError
+        return result
+
+    def ack(self, event: EventType, group: ConsumerGroup, *events: Event) -> None:
+        pending = self.__pending[str(group)]
+        for acked in events:
+            _ = pending.pop(acked.uid, None)
+        if str(group) in self.__consumers:
+            self.__commit(str(group))
 
-        self.__consumer_subscription = event
-        self.__consumer.subscribe(  # pyright:ignore[reportUnknownMemberType]
-            topics=[str(event)]
+    def reclaim(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        min_idle: float = 60.0,
+        max_count: int = 10,
+    ) -> list[Event]:
+        # NOTE: offsets of not acknowledged events are never committed,
+        # so they are kept by this consumer and delivered again from memory.
+        # Events of a crashed consumer are polled again by the new owner
+        # of its partitions, once broker reassigns them.
+        pending = self.__pending[str(group)]
+        now = time.monotonic()
+        reclaimed: list[Event] = []
+        for uid, (partition, offset, polled_at, pending_event) in pending.items():
+            if len(reclaimed) >= max_count:
+                break
+            if partition.topic != str(event) or now - polled_at < min_idle:
+                continue
+            pending[uid] = (partition, offset, now, pending_event)
+            reclaimed.append(pending_event)
+        return reclaimed
+
+    def group_stats(self, event: EventType, group: ConsumerGroup) -> GroupStats:
+        # NOTE: committed offsets belong to consumer group,
+        # so they are read by a separate consumer that joins no topics.
+        consumer = self.__group_consumers.get(str(group))
+        if consumer is None:
+            consumer = KafkaConsumer(
+                group_id=str(group), enable_auto_commit=False, **self.__configs
+            )
+            self.__group_consumers[str(group)] = consumer
+
+        topic_partitions: set[int] | None = consumer.partitions_for_topic(str(event))
+        partitions: list[Any] = [
+            TopicPartition(str(event), partition)
+            for partition in topic_partitions or ()
+        ]
+        if not partitions:
+            return GroupStats()
+
+        end_offsets: dict[Any, int] = consumer.end_offsets(partitions)
+        lag = 0
+        for partition in partitions:
+            committed: int | None = consumer.committed(partition)
+            lag += end_offsets[partition] - (committed or 0)
+        # NOTE: Kafka has no pending records, uncommitted ones are lag.
+        return GroupStats(lag=lag)
+
+    def flush(self) -> None:
+        self.__producer.flush()
+
+    def __key(self, event: Event) -> bytes | None:
+        policy = self.__partitions.get(str(event.type))
+        return None if policy is None else policy.key_of(event)
+
+    def __pop(
+        self,
+        group: ConsumerGroup,
+        events: Sequence[EventType],
+        max_records: int,
+        block: bool,
+        timeout: int,
+        ack: bool,
+    ) -> dict[str, list[Event]]:
+        consumer = self.__get_consumer(group, events)
+        # NOTE: records are polled by topic partition, not by topic
+        records: dict[Any, list[Any]] = consumer.poll(
+            timeout * 1000 if block else 0,
+            max_records=max_records,
+            update_offsets=True,
         )
+        positions = self.__positions[str(group)]
+        pending = self.__pending[str(group)]
+        polled_at = time.monotonic()
+        result: dict[str, list[Event]] = defaultdict(list)
+        for partition, partition_records in records.items():
+            for record in partition_records:
+                event = self.__serializer.decode(record.value)
+                result[partition.topic].append(event)
+                if not ack:
+                    pending[event.uid] = (partition, record.offset, polled_at, event)
+                positions[partition] = record.offset + 1
+        if ack and records:
+            self.__commit(str(group))
+        return result
+
+    def __commit(self, group: str) -> None:
+        # NOTE: Kafka commits an offset per partition, not separate records,
+        # so it is moved up to the first not acknowledged record only.
+        first_pending: dict[Any, int] = {}
+        for partition, offset, _, _ in self.__pending[group].values():
+            first_pending[partition] = min(offset, first_pending.get(partition, offset))
+        offsets: dict[Any, Any] = {
+            partition: OffsetAndMetadata(first_pending.get(partition, position), "", -1)
+            for partition, position in self.__positions[group].items()
+        }
+        if offsets:
+            self.__consumers[group].commit(offsets=offsets)
+
+    def __get_consumer(self, group: ConsumerGroup, events: Sequence[EventType]) -> Any:
+        consumer = self.__consumers.get(str(group))
+        if consumer is None:
+            # NOTE: auto commit would commit offsets before events are consumed
+            consumer = KafkaConsumer(
+                group_id=str(group),
+                enable_auto_commit=False,
+                value_deserializer=_deserialize,
+                **self.__configs,
+            )
+            self.__consumers[str(group)] = consumer
+
+        topics = tuple(str(event) for event in events)
+        subscription = self.__consumer_subscriptions.get(str(group))
+        if subscription == topics:
+            return consumer
+        if subscription is not None:
+            _ = consumer.unsubscribe()
+
+        self.__consumer_subscriptions[str(group)] = topics
+        _ = consumer.subscribe(topics=list(topics))
+        return consumer
@@ -0,0 +1,464 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from eventscore.core.abstract import ConsumerGroup, EventType, IAsyncStream, IStream
+from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.logging import logger as _logger
+from eventscore.core.ratelimits import local_bucket
+from eventscore.core.types import (
+    Event,
+    EventStatus,
+    GroupStats,
+    ProduceResult,
+    RateLimit,
+)
+
+
+class _Group:
+    __slots__ = ("cursor", "pending", "consumers", "ready")
+
+    def __init__(self, cursor: int, lock: threading.Lock) -> None:
+        # NOTE: absolute index of the next event delivered to group
+        self.cursor = cursor
+        # NOTE: insertion order is delivery order, so that the oldest
+        # pending events are reclaimed first.
+        self.pending: dict[uuid.UUID, tuple[Event, float]] = {}
+        self.consumers: set[str] = set()
+        # NOTE: every group waits on its own condition of topic lock,
+        # so that new events wake up as many consumers of every group.
+        self.ready = threading.Condition(lock)
+
+
+class _Topic:
+    __slots__ = ("lock", "entries", "offset", "start", "groups", "watchers")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: list[Event] = []
+        # NOTE: absolute index of the first entry in list
+        self.offset = 0
+        # NOTE: absolute index of the first entry not trimmed yet,
+        # entries before it are dropped from list in bulk.
+        self.start = 0
+        self.groups: dict[str, _Group] = {}
+        # NOTE: consumers waiting for events of several topics at once
+        self.watchers: set[threading.Event] = set()
+
+    @property
+    def end(self) -> int:
+        return self.offset + len(self.entries)
+
+
+class MemoryBroker:
+    """
+    Events of in-memory streams of a single process.
+    Streams share events only if they share broker,
+    `StreamFactory` shares a broker between streams it creates
+    within a process, see `InMemoryStream.shared_kwargs`.
+    Events are kept until they are delivered to all consumer groups
+    of their type, or until there are more than `maxlen` of them.
+    """
+
+    def __init__(self, *, maxlen: int | None = None) -> None:
+        """
+        Construct in-memory broker instance
+
+        :param maxlen: Max number of events kept per event type.
+            Defaults to None, i.e. events are kept until all groups
+            have them delivered. Event types without groups
+            keep all events.
+        :type maxlen: int | None
+        """
+        assert maxlen is None or maxlen > 0, "Max len must be positive."
+
+        self.__maxlen = maxlen
+        self.__topics: dict[str, _Topic] = {}
+        self.__lock = threading.Lock()
+        self.__delayed: list[tuple[float, int, Event]] = []
+        self.__sequence = itertools.count()
+
+    def topic(self, name: str) -> _Topic:
+        topic = self.__topics.get(name)
+        if topic is not None:
+            return topic
+        with self.__lock:
+            return self.__topics.setdefault(name, _Topic())
+
+    def append(self, topic: _Topic, events: Sequence[Event]) -> None:
+        with topic.lock:
+            topic.entries.extend(events)
+            if self.__maxlen is not None and topic.end - topic.start > self.__maxlen:
+                topic.start = topic.end - self.__maxlen
+                self.compact(topic)
+            for group in topic.groups.values():
+                group.ready.notify(len(events))
+            for watcher in topic.watchers:
+                watcher.set()
+
+    def wake(self, topic: _Topic) -> None:
+        with topic.lock:
+            for group in topic.groups.values():
+                group.ready.notify_all()
+            for watcher in topic.watchers:
+                watcher.set()
+
+    def compact(self, topic: _Topic) -> None:
+        if topic.groups:
+            topic.start = max(
+                topic.start, min(group.cursor for group in topic.groups.values())
+            )
+        # NOTE: list is shrunk once half of it is dropped, so that
+        # every entry is moved a constant number of times on average.
+        dropped = topic.start - topic.offset
+        if dropped and dropped >= len(topic.entries) // 2:
+            del topic.entries[:dropped]
+            topic.offset = topic.start
+
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        with self.__lock:
+            heapq.heappush(self.__delayed, (deliver_at, next(self.__sequence), event))
+        # NOTE: consumers waiting for the topic recalculate their wait
+        # until the next due event, so that this one is moved in time.
+        self.wake(self.topic(str(event.type)))
+
+    def move_due(self) -> float | None:
+        """
+        Put delayed events that are due to their streams
+
+        :return: Number of seconds until the next delayed event is due,
+            or None if there are none
+        :rtype: float | None
+        """
+        if not self.__delayed:
+            return None
+
+        due: list[Event] = []
+        with self.__lock:
+            now = time.time()
+            while self.__delayed and self.__delayed[0][0] <= now:
+                due.append(heapq.heappop(self.__delayed)[2])
+            next_due = self.__delayed[0][0] - now if self.__delayed else None
+        # NOTE: topic locks are never taken under broker lock
+        for event in due:
+            self.append(self.topic(str(event.type)), (event,))
+        return next_due
+
+
+class InMemoryStream(IStream, IAsyncStream):
+    """
+    Stream keeping events in memory of current process,
+    with the same consumer group semantics as Redis streams:
+    every group reads all events from its own cursor, consumers
+    of a group compete for events, events popped with `ack=False`
+    are pending until acknowledged or reclaimed.
+    Events are passed to consumers as is, without serialization,
+    so produce-to-consume latency is that of a thread wakeup.
+    Meant for tests and single-process deployments with in-process
+    workers, e.g. `SpawnThreadWorker`: processes do not share events.
+    """
+
+    def __init__(
+        self,
+        *,
+        broker: MemoryBroker | None = None,
+        maxlen: int | None = None,
+        consumer_name: str | None = None,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct in-memory stream instance
+
+        :param broker: Broker keeping events.
+            Defaults to None, i.e. stream gets a broker of its own.
+            `StreamFactory` shares a broker between streams
+            of a single process, see `shared_kwargs`.
+        :type broker: MemoryBroker | None
+        :param maxlen: Max number of events kept per event type,
+            used if broker is not provided. Defaults to None
+        :type maxlen: int | None
+        :param consumer_name: Name of consumer within consumer groups.
+            Defaults to None, i.e. process id followed by thread id
+        :type consumer_name: str | None
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        self.__broker = broker or MemoryBroker(maxlen=maxlen)
+        self.__name = consumer_name
+        self.__logger = logger
+
+    @classmethod
+    def shared_kwargs(
+        cls,
+        *,
+        broker: MemoryBroker | None = None,
+        maxlen: int | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Create a broker shared by streams of a single process.
+        Called by `StreamFactory` once per process with stream kwargs.
+
+        :return: Stream kwargs with shared broker
+        :rtype: dict[str, Any]
+        """
+        if broker is not None:
+            return {}
+        return {"broker": MemoryBroker(maxlen=maxlen)}
+
+    @property
+    def broker(self) -> MemoryBroker:
+        """
+        Broker keeping events of stream
+
+        :return: Broker
+        :rtype: MemoryBroker
+        """
+        return self.__broker
+
+    def put(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        self.__broker.append(self.__broker.topic(str(event.type)), (event,))
+        self.__logger.debug(f"Put event {event}.")
+
+    def put_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        by_type: dict[str, list[Event]] = {}
+        for event in events:
+            by_type.setdefault(str(event.type), []).append(event)
+        for name, typed_events in by_type.items():
+            self.__broker.append(self.__broker.topic(name), typed_events)
+        self.__logger.debug(f"Put {len(events)} events.")
+        return [ProduceResult(event=event, status=EventStatus.SENT) for event in events]
+
+    async def aput(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        self.put(event, block=block, timeout=timeout)
+
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        self.__broker.schedule(event, deliver_at)
+        self.__logger.debug(f"Scheduled event {event} due at {deliver_at}.")
+
+    def take_tokens(
+        self, key: str, rate_limit: RateLimit, count: int
+    ) -> tuple[int, float]:
+        # NOTE: events are not shared between processes, neither are tokens
+        return local_bucket(key, rate_limit).take(count)
+
+    def pop(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> Event:
+        return self.pop_many(
+            event, group, max_count=1, block=block, timeout=timeout, ack=ack
+        )[0]
+
+    def pop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        topic = self.__broker.topic(str(event))
+        deadline = time.monotonic() + timeout
+        while True:
+            next_due = self.__broker.move_due()
+            with topic.lock:
+                state = self.__group(topic, group)
+                events = self.__read(topic, state, max_count, ack)
+                if events:
+                    return events
+                wait = self.__wait_time(block, deadline, next_due)
+                if wait is None:
+                    raise EmptyStreamError
+                _ = state.ready.wait(wait)
+
+    def pop_multi(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+        assert len(events) > 0, "No events to pop."
+
+        topics = [self.__broker.topic(str(event)) for event in events]
+        watcher = threading.Event()
+        for topic in topics:
+            with topic.lock:
+                topic.watchers.add(watcher)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                next_due = self.__broker.move_due()
+                # NOTE: watcher is cleared before reading, so that events
+                # put after a topic is read are not missed.
+                watcher.clear()
+                result: list[Event] = []
+                for topic in topics:
+                    with topic.lock:
+                        state = self.__group(topic, group)
+                        result.extend(self.__read(topic, state, max_count, ack))
+                if result:
+                    return result
+                wait = self.__wait_time(block, deadline, next_due)
+                if wait is None:
+                    raise EmptyStreamError
+                _ = watcher.wait(wait)
+        finally:
+            for topic in topics:
+                with topic.lock:
+                    topic.watchers.discard(watcher)
+
+    async def apop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[Event]:
+        if not block:
+            return self.pop_many(event, group, max_count=max_count, block=False)
+        # NOTE: waiting is done on a thread, so that event loop is not blocked
+        return await asyncio.to_thread(
+            self.pop_many, event, group, max_count=max_count, timeout=timeout
+        )
+
+    def ack(self, event: EventType, group: ConsumerGroup, *events: Event) -> None:
+        topic = self.__broker.topic(str(event))
+        with topic.lock:
+            state = topic.groups.get(str(group))
+            if state is None:
+                return
+            for acked in events:
+                _ = state.pending.pop(acked.uid, None)
+        self.__logger.debug(f"Acknowledged {len(events)} events {event}.")
+
+    def reclaim(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        min_idle: float = 60.0,
+        max_count: int = 10,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        topic = self.__broker.topic(str(event))
+        now = time.monotonic()
+        with topic.lock:
+            state = self.__group(topic, group)
+            idle = [
+                reclaimed
+                for reclaimed, delivered_at in state.pending.values()
+                if now - delivered_at >= min_idle
+            ][:max_count]
+            for reclaimed in idle:
+                # NOTE: reclaimed event becomes the latest delivered one
+                del state.pending[reclaimed.uid]
+                state.pending[reclaimed.uid] = (reclaimed, now)
+        self.__logger.debug(f"Reclaimed {len(idle)} events {event}.")
+        return idle
+
+    def group_stats(self, event: EventType, group: ConsumerGroup) -> GroupStats:
+        topic = self.__broker.topic(str(event))
+        with topic.lock:
+            state = topic.groups.get(str(group))
+            if state is None:
+                return GroupStats()
+            return GroupStats(
+                lag=topic.end - max(state.cursor, topic.start),
+                pending=len(state.pending),
+                consumers=len(state.consumers),
+            )
+
+    def flush(self) -> None:
+        pass
+
+    async def aflush(self) -> None:
+        pass
+
+    def __group(self, topic: _Topic, group: ConsumerGroup) -> _Group:
+        state = topic.groups.get(str(group))
+        if state is None:
+            # NOTE: like Redis group created with id 0,
+            # new group reads all events kept so far.
+            state = topic.groups[str(group)] = _Group(topic.start, topic.lock)
+        state.consumers.add(self.__consumer_name())
+        return state
+
+    def __read(
+        self,
+        topic: _Topic,
+        state: _Group,
+        max_count: int,
+        ack: bool,
+    ) -> list[Event]:
+        begin = max(state.cursor, topic.start)
+        if begin >= topic.end:
+            return []
+
+        index = begin - topic.offset
+        stop = index + max_count
+        events = topic.entries[index:stop]
+        state.cursor = begin + len(events)
+        if not ack:
+            now = time.monotonic()
+            for event in events:
+                state.pending[event.uid] = (event, now)
+        self.__broker.compact(topic)
+        return events
+
+    def __wait_time(
+        self,
+        block: bool,
+        deadline: float,
+        next_due: float | None,
+    ) -> float | None:
+        remaining = deadline - time.monotonic()
+        if not block or remaining <= 0:
+            return None
+        return min(remaining, math.inf if next_due is None else next_due)
+
+    def __consumer_name(self) -> str:
+        return self.__name or f"{os.getpid()}-{threading.get_ident()}"
@@ -0,0 +1,194 @@
+import logging
+import math
+import time
+import zlib
+from collections.abc import Callable, Collection
+from typing import Any, cast
+
+from redis import Redis
+
+from eventscore.core.logging import logger as _logger
+
+# NOTE: lease is renewed or released only by its owner
+_RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class LaneLeases:
+    """
+    Leases of lanes of partitioned event types.
+    Every lane is read by a single consumer of a consumer group at a time,
+    lanes are spread evenly between live consumers of the group.
+    Consumers announce themselves with heartbeats, a lease of a consumer
+    that stopped renewing it expires and lane is taken over by another one.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        ttl: float = 10.0,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct lane leases instance
+
+        :param redis: Redis instance
+        :type redis: Redis
+        :param ttl: Number of seconds lease and heartbeat are valid for.
+            Leases are renewed three times within TTL. Defaults to 10.0
+        :type ttl: float
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert ttl > 0, "TTL must be positive."
+
+        self.__redis = redis
+        self.__ttl = ttl
+        self.__logger = logger
+        self.__owned: dict[tuple[str, str], list[int]] = {}
+        self.__refreshed_at: dict[tuple[str, str], float] = {}
+        self.__renew = redis.register_script(_RENEW_SCRIPT)
+        self.__release = redis.register_script(_RELEASE_SCRIPT)
+
+    @property
+    def ttl(self) -> float:
+        """
+        Number of seconds lease is valid for
+
+        :return: TTL
+        :rtype: float
+        """
+        return self.__ttl
+
+    def owned(
+        self,
+        name: str,
+        group: str,
+        consumer: str,
+        lanes: int,
+        *,
+        busy: Collection[int] = (),
+    ) -> list[int]:
+        """
+        Lanes owned by consumer, leases are refreshed if needed
+
+        :param name: Stream name of partitioned event type
+        :type name: str
+        :param group: Consumer group
+        :type group: str
+        :param consumer: Consumer name
+        :type consumer: str
+        :param lanes: Number of lanes of event type
+        :type lanes: int
+        :param busy: Owned lanes that must not be released,
+            e.g. some of their events are not consumed yet. Defaults to empty
+        :type busy: Collection[int]
+        :return: Owned lanes
+        :rtype: list[int]
+        """
+        key = (name, group)
+        now = time.monotonic()
+        refreshed_at = self.__refreshed_at.get(key)
+        if refreshed_at is not None and now - refreshed_at < self.__ttl / 3:
+            return self.__owned[key]
+
+        owned = self.__refresh(name, group, consumer, lanes, busy)
+        self.__owned[key] = owned
+        self.__refreshed_at[key] = now
+        return owned
+
+    def release(self, name: str, group: str, consumer: str) -> None:
+        """
+        Release all lanes owned by consumer, so others take them over at once
+
+        :param name: Stream name of partitioned event type
+        :type name: str
+        :param group: Consumer group
+        :type group: str
+        :param consumer: Consumer name
+        :type consumer: str
+        :return: None
+        :rtype: None
+        """
+        for lane in self.__owned.pop((name, group), []):
+            _ = self.__release(
+                keys=[self.__lease_key(name, group, lane)], args=[consumer]
+            )
+        _ = self.__refreshed_at.pop((name, group), None)
+        _ = self.__redis.zrem(self.__members_key(name, group), consumer)
+
+    def __refresh(
+        self,
+        name: str,
+        group: str,
+        consumer: str,
+        lanes: int,
+        busy: Collection[int],
+    ) -> list[int]:
+        ttl_ms = int(self.__ttl * 1000)
+        members = self.__members_key(name, group)
+        pipeline = self.__redis.pipeline(  # pyright:ignore[reportUnknownMemberType]
+            transaction=False
+        )
+        _ = pipeline.zadd(members, {consumer: time.time()})
+        _ = pipeline.zremrangebyscore(members, "-inf", time.time() - self.__ttl)
+        _ = pipeline.zcard(members)
+        _ = pipeline.pexpire(members, ttl_ms)
+        # NOTE: `Pipeline.execute` is not annotated, see `RedisStream`.
+        replies = cast(Callable[..., list[Any]], pipeline.execute)()
+        live = int(replies[2])
+        target = math.ceil(lanes / max(live, 1))
+
+        owned = [
+            lane
+            for lane in self.__owned.get((name, group), [])
+            if lane < lanes
+            and self.__renew(
+                keys=[self.__lease_key(name, group, lane)], args=[consumer, ttl_ms]
+            )
+        ]
+        # NOTE: lanes above even share are released for consumers
+        # that joined group lately, unless their events are being consumed.
+        for lane in [lane for lane in owned if lane not in busy][
+            : max(len(owned) - target, 0)
+        ]:
+            _ = self.__release(
+                keys=[self.__lease_key(name, group, lane)], args=[consumer]
+            )
+            owned.remove(lane)
+
+        # NOTE: every consumer starts looking for a free lane at its own offset,
+        # so that consumers do not race for the same lanes.
+        offset = zlib.crc32(consumer.encode()) % lanes
+        for lane in ((offset + idx) % lanes for idx in range(lanes)):
+            if len(owned) >= target:
+                break
+            if lane in owned:
+                continue
+            if self.__redis.set(
+                self.__lease_key(name, group, lane), consumer, nx=True, px=ttl_ms
+            ):
+                owned.append(lane)
+
+        self.__logger.debug(
+            f"Consumer {consumer} owns lanes {sorted(owned)} of {name} "
+            + f"within group {group}, {live} consumers are alive."
+        )
+        return sorted(owned)
+
+    def __lease_key(self, name: str, group: str, lane: int) -> str:
+        return f"eventscore:lanes:{name}:{group}:{lane}"
+
+    def __members_key(self, name: str, group: str) -> str:
+        return f"eventscore:lanes:{name}:{group}:members"
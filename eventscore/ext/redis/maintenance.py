@@ -0,0 +1,148 @@
+import logging
+import time
+from typing import cast
+
+import redis
+
+from eventscore.core.abstract import EventType, IRunner, IStreamFactory
+from eventscore.core.logging import logger as _logger
+from eventscore.ext.redis.streams import RedisStream
+
+
+class RetentionTask(IRunner):
+    """
+    Periodic task applying retention policies of Redis stream.
+    Can be hosted by any worker spawner as a regular runner.
+    """
+
+    def __init__(
+        self,
+        stream_factory: IStreamFactory,
+        *events: EventType,
+        interval: float = 60.0,
+        max_runs: int = -1,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct retention task instance
+
+        :param stream_factory: Factory of Redis streams
+            with retention policies configured
+        :type stream_factory: IStreamFactory
+        :param events: Event types which streams are trimmed
+        :type events: Tuple[EventType, ...]
+        :param interval: Number of seconds between trims.
+            Defaults to 60.0.
+        :type interval: float
+        :param max_runs: Max number of trims of every stream.
+            Defaults to -1.
+            If value is equal to -1, then task runs forever
+        :type max_runs: int
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert len(events) > 0, "No events provided to retention task."
+        assert interval >= 0, "Interval must be non-negative."
+        assert max_runs == -1 or max_runs > 0, "Max runs must be positive or -1."
+
+        self.__stream_factory = stream_factory
+        # NOTE: stream is created on run, since task is constructed
+        # in one process and run in another one.
+        self.__stream: RedisStream | None = None
+        self.__events = events
+        self.__interval = interval
+        self.__max_runs = max_runs
+        self.__logger = logger
+
+    def run(self) -> None:
+        runs_counter = 0
+        while self.__max_runs == -1 or runs_counter < self.__max_runs:
+            if runs_counter:
+                time.sleep(self.__interval)
+            runs_counter += 1
+            for event in self.__events:
+                self.__trim(event)
+
+    def __get_stream(self) -> RedisStream:
+        if self.__stream is None:
+            self.__stream = cast(RedisStream, self.__stream_factory())
+        return self.__stream
+
+    def __trim(self, event: EventType) -> None:
+        try:
+            trimmed = self.__get_stream().trim(event)
+        except redis.RedisError as exc:
+            self.__logger.error(f"Failed to trim stream {event}: {exc!r}")
+            return
+        self.__logger.debug(f"Trimmed {trimmed} events from stream {event}.")
+
+
+class DelayedEventsMover(IRunner):
+    """
+    Periodic task putting delayed events that are due to their streams.
+    Can be hosted by any worker spawner as a regular runner,
+    several movers may run at once.
+    """
+
+    def __init__(
+        self,
+        stream_factory: IStreamFactory,
+        *,
+        interval: float = 1.0,
+        batch_size: int = 1000,
+        max_runs: int = -1,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct delayed events mover instance
+
+        :param stream_factory: Factory of Redis streams events are scheduled with
+        :type stream_factory: IStreamFactory
+        :param interval: Number of seconds between moves,
+            i.e. max delivery delay of due events.
+            Defaults to 1.0.
+            Full batches are followed by the next one at once.
+        :type interval: float
+        :param batch_size: Max number of events moved at once.
+            Defaults to 1000.
+        :type batch_size: int
+        :param max_runs: Max number of moves.
+            Defaults to -1.
+            If value is equal to -1, then task runs forever
+        :type max_runs: int
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert interval >= 0, "Interval must be non-negative."
+        assert batch_size > 0, "Batch size must be positive."
+        assert max_runs == -1 or max_runs > 0, "Max runs must be positive or -1."
+
+        self.__stream_factory = stream_factory
+        # NOTE: stream is created on run, since mover is constructed
+        # in one process and run in another one.
+        self.__stream: RedisStream | None = None
+        self.__interval = interval
+        self.__batch_size = batch_size
+        self.__max_runs = max_runs
+        self.__logger = logger
+
+    def run(self) -> None:
+        runs_counter = 0
+        moved = 0
+        while self.__max_runs == -1 or runs_counter < self.__max_runs:
+            if runs_counter and moved < self.__batch_size:
+                time.sleep(self.__interval)
+            runs_counter += 1
+            moved = self.__move()
+
+    def __get_stream(self) -> RedisStream:
+        if self.__stream is None:
+            self.__stream = cast(RedisStream, self.__stream_factory())
+        return self.__stream
+
+    def __move(self) -> int:
+        try:
+            return self.__get_stream().move_due(max_count=self.__batch_size)
+        except redis.RedisError as exc:
+            self.__logger.error(f"Failed to move due events: {exc!r}")
+            return 0
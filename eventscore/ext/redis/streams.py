@@ -1,7 +1,12 @@
+import inspect
 import logging
 import os
-from collections import defaultdict
-from typing import TYPE_CHECKING, Any, TypeAlias
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, TypeAlias, cast
 
 import redis
 
@@ -9,16 +14,89 @@ if TYPE_CHECKING:
     pass
 
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.client import Pipeline
+from redis.commands.core import Script
 
-from eventscore.core.abstract import ConsumerGroup, EventType, IEventSerializer, IStream
+from eventscore.core.abstract import (
+    ConsumerGroup,
+    EventType,
+    IAsyncStream,
+    IEventSerializer,
+    IStream,
+)
 from eventscore.core.exceptions import EmptyStreamError, TooManyDataError
 from eventscore.core.logging import logger as _logger
-from eventscore.core.types import Event
+from eventscore.core.types import (
+    Event,
+    EventStatus,
+    GroupStats,
+    PartitionPolicy,
+    ProduceResult,
+    RateLimit,
+    RetentionPolicy,
+)
+from eventscore.ext.redis.lanes import LaneLeases
 
 XReadT: TypeAlias = list[tuple[bytes, list[tuple[bytes, dict[bytes, bytes]]]]]
+StreamIdT: TypeAlias = bytes | str
+# NOTE: `Pipeline.execute` is not annotated, calling it as is
+# is an untyped call for mypy and a partially unknown result for pyright.
+ExecuteT: TypeAlias = Callable[..., list[Any]]
 
+# Max number of entries counted when broker does not report group lag
+LAG_SCAN_LIMIT = 10000
+# Sorted set of delayed events scored by time they are due at
+DELAYED_KEY = "eventscore:delayed"
+# Prefix of hashes keeping token buckets of rate limits
+RATE_LIMITS_KEY = "eventscore:ratelimits"
 
-class RedisStream(IStream):
+# NOTE: member is `<length of stream name>:<stream name><encoded event>`,
+# so that stream name may contain any characters.
+_MOVE_DUE_SCRIPT = """
+local due = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+for _, member in ipairs(due) do
+    local prefix = string.match(member, "^%d+:")
+    local length = tonumber(string.sub(prefix, 1, -2))
+    local stream = string.sub(member, #prefix + 1, #prefix + length)
+    redis.call("XADD", stream, "*", "value", string.sub(member, #prefix + length + 1))
+    redis.call("ZREM", KEYS[1], member)
+end
+return #due
+"""
+
+# NOTE: bucket is refilled by Redis clock, so that clocks of hosts
+# do not matter. Floats are returned as strings, Lua numbers are truncated.
+_TAKE_TOKENS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local taken = math.min(tonumber(ARGV[3]), math.floor(tokens))
+tokens = tokens - taken
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+if taken > 0 then
+    return {taken, "0"}
+end
+return {0, tostring((1 - tokens) / rate)}
+"""
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _parse_id(id_: StreamIdT) -> tuple[int, int]:
+    ms, _, seq = _decode(id_).partition("-")
+    return int(ms), int(seq or 0)
+
+
+class RedisStream(IStream, IAsyncStream):
     def __init__(
         self,
         *,
@@ -29,6 +107,15 @@ class RedisStream(IStream):
         db: int | None = None,
         redis_init_kwargs: dict[str, Any] | None = None,
         logger: logging.Logger = _logger,
+        ack_batch_size: int = 1,
+        ack_interval: float = 0.0,
+        pipeline_acks: bool = False,
+        async_redis: AsyncRedis | None = None,
+        retention: dict[EventType, RetentionPolicy] | None = None,
+        consumer_name: str | None = None,
+        connection_pool: redis.ConnectionPool | None = None,
+        partitions: dict[EventType, PartitionPolicy] | None = None,
+        lane_lease_ttl: float = 10.0,
     ) -> None:
         """
         Construct Redis stream instance
@@ -43,26 +130,142 @@ class RedisStream(IStream):
         :type serializer: IEventSerializer[bytes, str]
         :param redis_init_kwargs: Redis initialization kwargs
         :type redis_init_kwargs: dict[str, Any] | None
+        :param ack_batch_size: Number of acknowledgements accumulated
+            before they are sent with a single XACK.
+            Defaults to 1, i.e. every read is acknowledged immediately.
+        :type ack_batch_size: int
+        :param ack_interval: Max number of seconds acknowledgements
+            may be accumulated for. Checked on every read.
+            Defaults to 0.0, i.e. only ack_batch_size is taken into account.
+        :type ack_interval: float
+        :param pipeline_acks: Send accumulated acknowledgements
+            along with the next XREADGROUP in a single pipeline.
+            Defaults to `False`.
+        :type pipeline_acks: bool
+        :param async_redis: Asynchronous Redis instance.
+            Defaults to None.
+            If not provided, it is constructed on first asynchronous call
+            with the same connection params as the synchronous one.
+            Its connection pool is shared by all asynchronous calls,
+            so it must be used within a single event loop.
+        :type async_redis: redis.asyncio.Redis | None
+        :param retention: Retention policies by event type.
+            Defaults to None, i.e. streams are not trimmed.
+            Max len, or max age if max len is not set, is applied
+            by every XADD approximately, so that produce cost stays constant.
+            Other parts of policy are applied by `trim`.
+        :type retention: dict[EventType, RetentionPolicy] | None
+        :param consumer_name: Name of consumer within consumer groups.
+            Defaults to None, i.e. process id, followed by thread id
+            when stream is first read outside of main thread.
+            Name is resolved on first read, so stream constructed
+            before fork is named after the child process.
+        :type consumer_name: str | None
+        :param connection_pool: Connection pool shared with other streams.
+            Defaults to None.
+            Used instead of connection params, if Redis instance is not provided.
+            `StreamFactory` shares a pool between streams of a single process,
+            see `shared_kwargs`.
+        :type connection_pool: redis.ConnectionPool | None
+        :param partitions: Partition policies by event type.
+            Defaults to None, i.e. events are not partitioned.
+            Events of partitioned type are put to lane streams `<type>:<lane>`,
+            every lane is read by a single consumer of a group at a time,
+            so events with the same key are consumed in order.
+            Partitioned event types are consumed synchronously only.
+        :type partitions: dict[EventType, PartitionPolicy] | None
+        :param lane_lease_ttl: Number of seconds lane lease is valid for.
+            Must exceed time needed to consume a batch of popped events,
+            otherwise lane may be taken over while its events are consumed.
+            Defaults to 10.0
+        :type lane_lease_ttl: float
         """
-        assert redis is not None or (
-            host is not None and port is not None and db is not None
+        assert ack_batch_size > 0, "Ack batch size must be positive."
+        assert ack_interval >= 0, "Ack interval must be non-negative."
+        assert (
+            redis is not None
+            or connection_pool is not None
+            or (host is not None and port is not None and db is not None)
         ), "Redis instance or required params for its constructing are required."
 
-        redis_init_kwargs = redis_init_kwargs or {}
-        redis_init_kwargs.update(
-            dict(
-                host=host,
-                port=port,
-                db=db,
-            )
-        )
+        # NOTE: caller's kwargs are not modified, since they are reused
+        # by `StreamFactory` in every process.
+        redis_init_kwargs = {
+            **(redis_init_kwargs or {}),
+            "host": host,
+            "port": port,
+            "db": db,
+        }
+        if redis is None and connection_pool is not None:
+            redis = Redis(connection_pool=connection_pool)
         self.__redis = redis or Redis(**redis_init_kwargs)
+        self.__redis_init_kwargs = dict(redis_init_kwargs) if redis is None else None
+        self.__async_redis = async_redis
         self.__serializer = serializer
         self.__event_n_group_to_xgroup: dict[tuple[EventType, ConsumerGroup], bool] = (
             defaultdict(bool)
         )
         self.__logger = logger
-        self.__name = str(os.getpid())
+        self.__name = consumer_name
+        self.__ack_batch_size = ack_batch_size
+        self.__ack_interval = ack_interval
+        self.__pipeline_acks = pipeline_acks
+        self.__pending_acks: dict[tuple[str, str], list[bytes]] = defaultdict(list)
+        self.__pending_acks_count = 0
+        self.__pending_acks_since = 0.0
+        # NOTE: stream name is kept along with entry id,
+        # since partitioned events are read from lane streams.
+        self.__unacked: dict[tuple[str, str, uuid.UUID], tuple[str, bytes]] = {}
+        self.__reclaim_cursors: dict[tuple[str, str], StreamIdT] = {}
+        self.__retention = {
+            str(event): policy for event, policy in (retention or {}).items()
+        }
+        self.__partitions = {
+            str(event): policy for event, policy in (partitions or {}).items()
+        }
+        self.__lane_lease_ttl = lane_lease_ttl
+        self.__lanes: LaneLeases | None = None
+        self.__leased: set[tuple[str, str]] = set()
+        self.__move_due: Script | None = None
+        self.__take_tokens: Script | None = None
+        self.__lane_buffers: dict[tuple[str, str], deque[tuple[int, Event]]] = (
+            defaultdict(deque)
+        )
+
+    @classmethod
+    def shared_kwargs(
+        cls,
+        *,
+        redis: Redis | None = None,
+        host: str | None = None,
+        port: int | None = None,
+        db: int | None = None,
+        redis_init_kwargs: dict[str, Any] | None = None,
+        connection_pool: redis.ConnectionPool | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Create a connection pool shared by streams of a single process.
+        Called by `StreamFactory` once per process with stream kwargs.
+
+        :return: Stream kwargs with shared connection pool
+        :rtype: dict[str, Any]
+        """
+        if redis is not None or connection_pool is not None:
+            return {}
+        assert (
+            host is not None and port is not None and db is not None
+        ), "Redis instance or required params for its constructing are required."
+        # NOTE: pool is created by client, so that client specific params
+        # (e.g. ssl) are translated to connection params the same way.
+        init_kwargs: dict[str, Any] = {
+            **(redis_init_kwargs or {}),
+            "host": host,
+            "port": port,
+            "db": db,
+        }
+        client = Redis(**init_kwargs)
+        return {"connection_pool": client.connection_pool}
 
     def put(
         self,
@@ -71,11 +274,206 @@ class RedisStream(IStream):
         block: bool = True,
         timeout: int = 5,
     ) -> None:
-        _ = self.__redis.xadd(
-            name=str(event.type),
+        _ = self.__redis.xadd(**self.__xadd_kwargs(event))
+        self.__logger.debug(f"XADDed event {event}.")
+
+    def put_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        if not events:
+            return []
+
+        # NOTE: a single pipeline covers all streams
+        # and keeps order of events within every stream.
+        pipeline = self.__pipeline()
+        for event in events:
+            _ = pipeline.xadd(**self.__xadd_kwargs(event))
+        try:
+            replies = cast(ExecuteT, pipeline.execute)(raise_on_error=False)
+        except redis.RedisError as exc:
+            self.__logger.error(f"Failed to XADD {len(events)} events: {exc!r}")
+            return [
+                ProduceResult(event=event, status=EventStatus.FAILED, error=exc)
+                for event in events
+            ]
+
+        results = [
+            (
+                ProduceResult(event=event, status=EventStatus.FAILED, error=reply)
+                if isinstance(reply, Exception)
+                else ProduceResult(event=event, status=EventStatus.SENT)
+            )
+            for event, reply in zip(events, replies)
+        ]
+        self.__logger.debug(f"XADDed {len(events)} events in a single pipeline.")
+        return results
+
+    async def aput(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        _ = await self.__get_async_redis().xadd(**self.__xadd_kwargs(event))
+        self.__logger.debug(f"XADDed event {event}.")
+
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        name = self.__xadd_kwargs(event)["name"]
+        member = f"{len(name.encode())}:{name}{self.__serializer.encode(event)}"
+        _ = self.__redis.zadd(DELAYED_KEY, {member: deliver_at})
+        self.__logger.debug(f"ZADDed event {event} due at {deliver_at}.")
+
+    def move_due(self, *, max_count: int = 1000) -> int:
+        """
+        Put delayed events that are due to their streams, earliest first.
+        Events are moved atomically by a Lua script, so that it is safe
+        to call from several processes at once, see `DelayedEventsMover`.
+        Retention policies are applied to moved events by `trim` only.
+        The script writes streams that are not declared as its keys,
+        so it is not supported by Redis Cluster.
+
+        :param max_count: Max number of events moved at once.
+            Defaults to 1000
+        :type max_count: int
+        :return: Number of moved events
+        :rtype: int
+        """
+        assert max_count > 0, "Max count must be positive."
+
+        if self.__move_due is None:
+            self.__move_due = self.__redis.register_script(_MOVE_DUE_SCRIPT)
+        reply = self.__move_due(keys=[DELAYED_KEY], args=[time.time(), max_count])
+        moved = int(cast(int, reply))
+        self.__logger.debug(f"Moved {moved} due events to their streams.")
+        return moved
+
+    def take_tokens(
+        self, key: str, rate_limit: RateLimit, count: int
+    ) -> tuple[int, float]:
+        assert count > 0, "Count must be positive."
+
+        if self.__take_tokens is None:
+            self.__take_tokens = self.__redis.register_script(_TAKE_TOKENS_SCRIPT)
+        reply = self.__take_tokens(
+            keys=[f"{RATE_LIMITS_KEY}:{key}"],
+            args=[rate_limit.rate, rate_limit.capacity, count],
+        )
+        taken, wait = cast(list[Any], reply)
+        self.__logger.debug(f"Taken {taken} tokens of rate limit {key}.")
+        return int(taken), float(wait)
+
+    def trim(self, event: EventType) -> int:
+        """
+        Apply retention policy of event type to its stream.
+        Unlike trimming on XADD, takes consumer groups into account,
+        so it is meant to be called periodically, see `RetentionTask`.
+
+        :param event: Event type
+        :type event: EventType
+        :return: Number of evicted events
+        :rtype: int
+        """
+        name = str(event)
+        policy = self.__retention.get(name)
+        if policy is None:
+            return 0
+
+        return sum(self.__trim(stream, policy) for stream in self.__streams(name))
+
+    def __trim(self, name: str, policy: RetentionPolicy) -> int:
+        trimmed = 0
+        try:
+            if policy.maxlen is not None:
+                trimmed += cast(
+                    int,
+                    self.__redis.xtrim(
+                        name, maxlen=policy.maxlen, **self.__trim_kwargs(policy)
+                    ),
+                )
+            minid = self.__trim_minid(name, policy)
+            if minid is not None:
+                trimmed += cast(
+                    int,
+                    self.__redis.xtrim(name, minid=minid, **self.__trim_kwargs(policy)),
+                )
+        except redis.ResponseError as exc:
+            self.__logger.debug(f"Stream {name} was not trimmed: {exc!r}.")
+            return trimmed
+
+        self.__logger.debug(f"XTRIMmed {trimmed} events from stream {name}.")
+        return trimmed
+
+    def __pipeline(self) -> Pipeline:
+        return self.__redis.pipeline(  # pyright:ignore[reportUnknownMemberType]
+            transaction=False
+        )
+
+    def __xadd_kwargs(self, event: Event) -> dict[str, Any]:
+        name = str(event.type)
+        partition = self.__partitions.get(name)
+        kwargs: dict[str, Any] = dict(
+            name=(
+                name
+                if partition is None
+                else self.__lane_name(name, partition.lane(event))
+            ),
             fields={"value": self.__serializer.encode(event)},
         )
-        self.__logger.debug(f"XADDed event {event}.")
+        policy = self.__retention.get(name)
+        if policy is None:
+            return kwargs
+
+        # NOTE: XADD accepts a single trimming strategy,
+        # the rest of policy is up to `trim`.
+        if policy.maxlen is not None:
+            kwargs.update(maxlen=policy.maxlen, **self.__trim_kwargs(policy))
+        elif policy.max_age is not None and not policy.keep_unconsumed:
+            kwargs.update(
+                minid=self.__age_minid(policy.max_age),
+                **self.__trim_kwargs(policy),
+            )
+        return kwargs
+
+    def __trim_kwargs(self, policy: RetentionPolicy) -> dict[str, Any]:
+        kwargs: dict[str, Any] = dict(approximate=policy.approximate)
+        if policy.approximate and policy.limit is not None:
+            kwargs["limit"] = policy.limit
+        return kwargs
+
+    def __age_minid(self, max_age: float) -> str:
+        return f"{int((time.time() - max_age) * 1000)}-0"
+
+    def __trim_minid(self, name: str, policy: RetentionPolicy) -> StreamIdT | None:
+        minids: list[StreamIdT] = []
+        if policy.max_age is not None:
+            minids.append(self.__age_minid(policy.max_age))
+        if policy.keep_unconsumed:
+            floor = self.__consumed_floor(name)
+            if floor is None:
+                return None
+            minids.append(floor)
+        return min(minids, key=_parse_id) if minids else None
+
+    def __consumed_floor(self, name: str) -> StreamIdT | None:
+        # NOTE: events pending in some group are not consumed yet,
+        # even though they were delivered.
+        floor: StreamIdT | None = None
+        groups = cast(list[dict[str, Any]], self.__redis.xinfo_groups(name))
+        for group in groups:
+            candidate: StreamIdT = group["last-delivered-id"]
+            if group["pending"]:
+                pending = cast(
+                    dict[str, Any], self.__redis.xpending(name, group["name"])
+                )
+                candidate = min(candidate, pending["min"], key=_parse_id)
+            if floor is None or _parse_id(candidate) < _parse_id(floor):
+                floor = candidate
+        return floor
 
     def pop(
         self,
@@ -84,17 +482,343 @@ class RedisStream(IStream):
         *,
         block: bool = True,
         timeout: int = 5,
+        ack: bool = True,
     ) -> Event:
+        if str(event) in self.__partitions:
+            return self.__pop_lanes(event, group, 1, block, timeout, ack)[0]
+
+        name, data = self.__parse_xresult(
+            self.__xreadgroup((event,), group, 1, block, timeout)
+        )
+        if len(data) > 1:
+            raise TooManyDataError
+
+        uid, payload = data[0]
+        decoded = self.__serializer.decode(payload[b"value"])
+        if ack:
+            self.__ack(event, group, uid)
+        else:
+            self.__unacked[(str(event), str(group), decoded.uid)] = (str(event), uid)
+        self.__logger.debug(
+            f"Received valid event {name.decode()} with id {uid.decode()}."
+        )
+        return decoded
+
+    def pop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        if str(event) in self.__partitions:
+            return self.__pop_lanes(event, group, max_count, block, timeout, ack)
+
+        name, data = self.__parse_xresult(
+            self.__xreadgroup((event,), group, max_count, block, timeout)
+        )
+        if len(data) > max_count:
+            raise TooManyDataError
+
+        events = [self.__serializer.decode(payload[b"value"]) for _, payload in data]
+        if ack:
+            self.__ack(event, group, *(uid for uid, _ in data))
+        else:
+            for (uid, _), decoded in zip(data, events):
+                self.__unacked[(str(event), str(group), decoded.uid)] = (
+                    str(event),
+                    uid,
+                )
+        self.__logger.debug(f"Received {len(data)} valid events {name.decode()}.")
+        return events
+
+    def ack(self, event: EventType, group: ConsumerGroup, *events: Event) -> None:
+        uids: dict[str, list[bytes]] = defaultdict(list)
+        for item in events:
+            entry = self.__unacked.pop((str(event), str(group), item.uid), None)
+            if entry is not None:
+                uids[entry[0]].append(entry[1])
+        missing = len(events) - sum(len(stream_uids) for stream_uids in uids.values())
+        if missing:
+            self.__logger.warning(
+                f"{missing} events were not popped "
+                + "without acknowledgement, nothing to acknowledge."
+            )
+        for stream, stream_uids in uids.items():
+            self.__ack(stream, group, *stream_uids)
+
+    def reclaim(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        min_idle: float = 60.0,
+        max_count: int = 10,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        events: list[Event] = []
+        for stream in self.__read_streams(str(event), group):
+            events.extend(self.__reclaim(stream, event, group, min_idle, max_count))
+        return events
+
+    def __reclaim(
+        self,
+        stream: str,
+        event: EventType,
+        group: ConsumerGroup,
+        min_idle: float,
+        max_count: int,
+    ) -> list[Event]:
+        self.__ensure_xgroup(stream, group)
+        key = (stream, str(group))
+        xresult: list[Any] = self.__redis.xautoclaim(  # type:ignore[assignment]
+            name=stream,
+            groupname=str(group),
+            consumername=self.__consumer_name(),
+            min_idle_time=int(min_idle * 1000),
+            start_id=self.__reclaim_cursors.get(key, "0-0"),
+            count=max_count,
+        )
+        # NOTE: cursor makes consecutive calls scan pending entries
+        # in batches instead of starting from the beginning every time.
+        self.__reclaim_cursors[key] = xresult[0]
+
+        events: list[Event] = []
+        deleted: list[bytes] = []
+        for uid, payload in xresult[1]:
+            if not payload:
+                # NOTE: entry was trimmed from stream while pending
+                deleted.append(uid)
+                continue
+            decoded = self.__serializer.decode(payload[b"value"])
+            self.__unacked[(str(event), str(group), decoded.uid)] = (stream, uid)
+            events.append(decoded)
+        if deleted:
+            _ = self.__redis.xack(stream, str(group), *deleted)
+        self.__logger.debug(f"XAUTOCLAIMed {len(events)} events {stream}.")
+        return events
+
+    def group_stats(self, event: EventType, group: ConsumerGroup) -> GroupStats:
+        lag = pending = consumers = 0
+        for stream in self.__streams(str(event)):
+            stats = self.__group_stats(stream, group)
+            lag += stats.lag
+            pending += stats.pending
+            # NOTE: consumer reading several lanes is a member of every lane group
+            consumers = max(consumers, stats.consumers)
+        return GroupStats(lag=lag, pending=pending, consumers=consumers)
+
+    def __group_stats(self, name: str, group: ConsumerGroup) -> GroupStats:
+        try:
+            groups: list[dict[str, Any]] = self.__redis.xinfo_groups(
+                name
+            )  # type:ignore[assignment]
+        except redis.ResponseError as exc:
+            self.__logger.debug(f"Stream {name} has no groups: {exc!r}.")
+            return GroupStats()
+
+        for info in groups:
+            if _decode(info["name"]) != str(group):
+                continue
+            lag: int | None = info.get("lag")
+            if lag is None:
+                # NOTE: lag is reported since Redis 7.0 and only
+                # while it can be computed, otherwise entries
+                # after last delivered one are counted, up to a limit.
+                lag = len(
+                    self.__redis.xrange(  # type:ignore[arg-type]
+                        name,
+                        min=f"({_decode(info['last-delivered-id'])}",
+                        count=LAG_SCAN_LIMIT,
+                    )
+                )
+            return GroupStats(
+                lag=lag,
+                pending=info["pending"],
+                consumers=info["consumers"],
+            )
+        return GroupStats()
+
+    def pop_multi(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+        assert len(events) > 0, "No events to pop."
+
+        # NOTE: partitioned event types are read from owned lanes only
+        streams = {
+            stream: str(event)
+            for event in events
+            for stream in self.__read_streams(str(event), group)
+        }
+        if not streams:
+            self.__wait_for_lanes(block, timeout)
+            raise EmptyStreamError
+
+        xresult = self.__xreadgroup(list(streams), group, max_count, block, timeout)
+        result: list[Event] = []
+        for item in xresult or ():
+            if not item or not item[1]:
+                continue
+            name, data = item
+            if len(data) > max_count:
+                raise TooManyDataError
+
+            stream = name.decode()
+            decoded = [
+                self.__serializer.decode(payload[b"value"]) for _, payload in data
+            ]
+            if ack:
+                self.__ack(stream, group, *(uid for uid, _ in data))
+            else:
+                for (uid, _), event in zip(data, decoded):
+                    self.__unacked[(streams[stream], str(group), event.uid)] = (
+                        stream,
+                        uid,
+                    )
+            result.extend(decoded)
+            self.__logger.debug(f"Received {len(data)} valid events {name.decode()}.")
+
+        if not result:
+            raise EmptyStreamError
+        return result
+
+    def __pop_lanes(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        max_count: int,
+        block: bool,
+        timeout: int,
+        ack: bool,
+    ) -> list[Event]:
+        # NOTE: events read from several lanes at once are buffered,
+        # so that every call returns them in order and lanes of buffered
+        # events are not released meanwhile.
+        name = str(event)
+        buffer = self.__lane_buffers[(name, str(group))]
+        streams = self.__read_streams(name, group, busy={lane for lane, _ in buffer})
+        if not buffer:
+            if not streams:
+                self.__wait_for_lanes(block, timeout)
+                raise EmptyStreamError
+            xresult = self.__xreadgroup(streams, group, max_count, block, timeout)
+            for item in xresult or ():
+                if not item or not item[1]:
+                    continue
+                stream, data = item[0].decode(), item[1]
+                lane = int(stream.rpartition(":")[2])
+                for uid, payload in data:
+                    decoded = self.__serializer.decode(payload[b"value"])
+                    if not ack:
+                        self.__unacked[(name, str(group), decoded.uid)] = (stream, uid)
+                    buffer.append((lane, decoded))
+                if ack:
+                    self.__ack(stream, group, *(uid for uid, _ in data))
+                self.__logger.debug(f"Received {len(data)} valid events {stream}.")
+        if not buffer:
+            raise EmptyStreamError
+
+        return [buffer.popleft()[1] for _ in range(min(max_count, len(buffer)))]
+
+    def __streams(self, name: str) -> list[str]:
+        partition = self.__partitions.get(name)
+        if partition is None:
+            return [name]
+        return [self.__lane_name(name, lane) for lane in range(partition.lanes)]
+
+    def __read_streams(
+        self,
+        name: str,
+        group: ConsumerGroup,
+        *,
+        busy: set[int] | None = None,
+    ) -> list[str]:
+        partition = self.__partitions.get(name)
+        if partition is None:
+            return [name]
+
+        if self.__lanes is None:
+            self.__lanes = LaneLeases(
+                self.__redis, ttl=self.__lane_lease_ttl, logger=self.__logger
+            )
+        self.__leased.add((name, str(group)))
+        lanes = self.__lanes.owned(
+            name,
+            str(group),
+            self.__consumer_name(),
+            partition.lanes,
+            busy=busy or (),
+        )
+        return [self.__lane_name(name, lane) for lane in lanes]
+
+    def __lane_name(self, name: str, lane: int) -> str:
+        return f"{name}:{lane}"
+
+    def __wait_for_lanes(self, block: bool, timeout: int) -> None:
+        # NOTE: all lanes are owned by other consumers,
+        # one of them may be released by the next refresh.
+        if block:
+            time.sleep(min(timeout, self.__lane_lease_ttl / 3))
+
+    def __xreadgroup(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        count: int,
+        block: bool,
+        timeout: int,
+    ) -> XReadT:
         self.__logger.debug(f"About to xread an event. Stream {id(self)}")
-        self.__ensure_xgroup(event, group)
-        xresult: XReadT = self.__redis.xreadgroup(  # type:ignore[assignment]
+        for event in events:
+            self.__ensure_xgroup(event, group)
+        kwargs = self.__xreadgroup_kwargs(events, group, count, block, timeout)
+        if self.__pending_acks_count and self.__pipeline_acks:
+            pipeline = self.__pipeline()
+            self.__xack_pending(pipeline)
+            _ = pipeline.xreadgroup(**kwargs)
+            xresult: XReadT = cast(ExecuteT, pipeline.execute)()[-1]
+        else:
+            if self.__pending_acks_count and self.__ack_interval_elapsed():
+                self.__flush_acks()
+            xresult = self.__redis.xreadgroup(**kwargs)  # type:ignore[assignment]
+        self.__logger.debug(f"XREADedGROUP {xresult}.")
+        return xresult
+
+    def __xreadgroup_kwargs(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        count: int,
+        block: bool,
+        timeout: int,
+    ) -> dict[str, Any]:
+        # NOTE: count is applied by Redis to every stream separately
+        return dict(
             groupname=str(group),
-            consumername=self.__name,
-            streams={str(event): ">"},
-            count=1,
+            consumername=self.__consumer_name(),
+            streams={str(event): ">" for event in events},
+            count=count,
             block=timeout * 1000 if block else None,
         )
-        self.__logger.debug(f"XREADedGROUP {xresult}.")
+
+    def __parse_xresult(
+        self,
+        xresult: XReadT,
+    ) -> tuple[bytes, list[tuple[bytes, dict[bytes, bytes]]]]:
         if not xresult:
             raise EmptyStreamError
 
@@ -105,16 +829,138 @@ class RedisStream(IStream):
         name, data = item
         if not data:
             raise EmptyStreamError
-        if len(data) > 1:
+
+        return name, data
+
+    async def apop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+        assert (
+            str(event) not in self.__partitions
+        ), "Partitioned events are consumed synchronously only."
+
+        async_redis = self.__get_async_redis()
+        await self.__aensure_xgroup(async_redis, event, group)
+        xresult: XReadT = await async_redis.xreadgroup(
+            **self.__xreadgroup_kwargs((event,), group, max_count, block, timeout)
+        )
+        self.__logger.debug(f"XREADedGROUP {xresult}.")
+        name, data = self.__parse_xresult(xresult)
+        if len(data) > max_count:
             raise TooManyDataError
 
-        uid, payload = data[0]
-        _ = self.__redis.xack(str(event), str(group), uid)
-        bevent = payload[b"value"]
-        self.__logger.debug(
-            f"Received valid event {name.decode()} with id {uid.decode()}."
+        # NOTE: acknowledgements are not accumulated in asynchronous mode,
+        # reads are batched instead.
+        _ = await async_redis.xack(str(event), str(group), *(uid for uid, _ in data))
+        self.__logger.debug(f"Received {len(data)} valid events {name.decode()}.")
+        return [self.__serializer.decode(payload[b"value"]) for _, payload in data]
+
+    async def aflush(self) -> None:
+        if self.__async_redis is None:
+            return
+        await self.__async_redis.aclose()
+        self.__async_redis = None
+
+    def flush(self) -> None:
+        self.__flush_acks()
+        if self.__lanes is None:
+            return
+        # NOTE: lanes are released, so that other consumers
+        # take them over without waiting for leases to expire.
+        for name, group in self.__leased:
+            self.__lanes.release(name, group, self.__consumer_name())
+        self.__leased.clear()
+
+    def __flush_acks(self) -> None:
+        if not self.__pending_acks_count:
+            return
+        pipeline = self.__pipeline()
+        self.__xack_pending(pipeline)
+        _ = cast(ExecuteT, pipeline.execute)()
+
+    def __ack(self, event: EventType, group: ConsumerGroup, *uids: bytes) -> None:
+        if self.__ack_batch_size == 1:
+            _ = self.__redis.xack(str(event), str(group), *uids)
+            return
+
+        if not self.__pending_acks_count:
+            self.__pending_acks_since = time.monotonic()
+        self.__pending_acks[(str(event), str(group))].extend(uids)
+        self.__pending_acks_count += len(uids)
+        if (
+            self.__pending_acks_count >= self.__ack_batch_size
+            or self.__ack_interval_elapsed()
+        ):
+            self.__flush_acks()
+
+    def __ack_interval_elapsed(self) -> bool:
+        return (
+            self.__ack_interval > 0
+            and time.monotonic() - self.__pending_acks_since >= self.__ack_interval
         )
-        return self.__serializer.decode(bevent)
+
+    def __xack_pending(self, pipeline: Pipeline) -> None:
+        for (name, group), uids in self.__pending_acks.items():
+            _ = pipeline.xack(name, group, *uids)
+        self.__logger.debug(f"XACKing {self.__pending_acks_count} pending ids.")
+        self.__pending_acks.clear()
+        self.__pending_acks_count = 0
+
+    def __consumer_name(self) -> str:
+        if self.__name is None:
+            self.__name = str(os.getpid())
+            if threading.current_thread() is not threading.main_thread():
+                self.__name += f"-{threading.get_native_id()}"
+        return self.__name
+
+    def __get_async_redis(self) -> AsyncRedis:
+        if self.__async_redis is None:
+            kwargs = self.__redis_init_kwargs
+            if kwargs is None:
+                # NOTE: only params known to asynchronous client are taken
+                # from synchronous client connection params.
+                known = inspect.signature(
+                    AsyncRedis.__init__  # pyright:ignore[reportUnknownMemberType,reportUnknownArgumentType]  # noqa:E501
+                ).parameters
+                connection_kwargs = cast(
+                    dict[str, Any],
+                    self.__redis.connection_pool.connection_kwargs,  # pyright:ignore[reportUnknownMemberType]  # noqa:E501
+                )
+                kwargs = {
+                    key: value
+                    for key, value in connection_kwargs.items()
+                    if key in known
+                }
+            self.__async_redis = AsyncRedis(**kwargs)
+        return self.__async_redis
+
+    async def __aensure_xgroup(
+        self,
+        async_redis: AsyncRedis,
+        event: EventType,
+        group: ConsumerGroup,
+    ) -> None:
+        if self.__event_n_group_to_xgroup[(event, group)]:
+            return
+        try:
+            _ = await async_redis.xgroup_create(
+                name=str(event),
+                groupname=str(group),
+                id="0",
+                mkstream=True,
+            )
+        except redis.ResponseError:
+            self.__logger.debug(f"XGROUP already created for {(event, group)}.")
+        else:
+            self.__logger.debug(f"XGROUP created for {(event, group)}.")
+        self.__event_n_group_to_xgroup[(event, group)] = True
 
     def __ensure_xgroup(self, event: EventType, group: ConsumerGroup) -> None:
         if self.__event_n_group_to_xgroup[(event, group)]:
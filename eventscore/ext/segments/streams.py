@@ -0,0 +1,757 @@
+import bisect
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from eventscore.core.abstract import ConsumerGroup, EventType, IEventSerializer, IStream
+from eventscore.core.exceptions import (
+    EmptyStreamError,
+    EventNotSentError,
+    UnsupportedOperationError,
+)
+from eventscore.core.logging import logger as _logger
+from eventscore.core.serializers import MemoryViewEventSerializer
+from eventscore.core.types import (
+    Event,
+    EventStatus,
+    GroupStats,
+    ProduceResult,
+    RateLimit,
+    RetentionPolicy,
+)
+
+# NOTE: record is length and CRC32 of encoded event, followed by encoded event.
+# Offset of record is its number in the log of event type.
+_RECORD = struct.Struct("<II")
+# NOTE: index entry is offset of record and its position in segment
+_INDEX_ENTRY = struct.Struct("<QQ")
+_CHECKPOINT = struct.Struct("<Q")
+_SEGMENT_SUFFIX = ".log"
+_INDEX_SUFFIX = ".index"
+_LOCK_FILE = "lock"
+_GROUPS_DIR = "groups"
+_CHECKPOINT_SUFFIX = ".offset"
+
+
+def _write_all(fd: int, data: bytes | bytearray) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+class _Group:
+    """
+    Consumer group of a log, its checkpoint is the offset
+    of the next record to read, kept in a file.
+    Checkpoint file is locked while consumer reads,
+    so that consumers of all processes take turns.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.lock = threading.Lock()
+        # NOTE: offset, segment and position of the last read,
+        # saves an index lookup while checkpoint is not moved by others.
+        self.position: tuple[int, int, int] | None = None
+
+
+class _Log:
+    """
+    Append-only log of a single event type.
+    A directory of segment files, named after offset of their first record,
+    with a sparse index file per segment. Writers of all processes
+    take turns by a lock file, state of writer is recovered from files
+    whenever another writer has appended or rolled segment.
+    """
+
+    def __init__(self, name: str, path: str) -> None:
+        os.makedirs(os.path.join(path, _GROUPS_DIR), exist_ok=True)
+        self.name = name
+        self.path = path
+        self.lock = threading.Lock()
+        self.lock_fd = os.open(
+            os.path.join(path, _LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644
+        )
+        self.fd: int | None = None
+        self.index_fd: int | None = None
+        self.base = 0
+        self.pos = 0
+        self.offset = 0
+        self.index_pos = 0
+        self.bases: list[int] = []
+        self.maps: dict[int, mmap.mmap] = {}
+        self.indexes: dict[int, list[tuple[int, int]]] = {}
+        self.groups: dict[str, _Group] = {}
+        # NOTE: number of appends of this process and how many of them
+        # are synced to disk, see `SegmentLogStream.__sync`.
+        self.written = 0
+        self.synced = 0
+        self.syncing = False
+        self.synced_cond = threading.Condition()
+
+    def segment_path(self, base: int) -> str:
+        return os.path.join(self.path, f"{base:020d}{_SEGMENT_SUFFIX}")
+
+    def index_path(self, base: int) -> str:
+        return os.path.join(self.path, f"{base:020d}{_INDEX_SUFFIX}")
+
+    def scan(self) -> list[int]:
+        self.bases = sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.path)
+            if name.endswith(_SEGMENT_SUFFIX)
+        )
+        return self.bases
+
+
+class SegmentLogStream(IStream):
+    """
+    Durable stream of a single host, kept in files without any broker.
+    Every event type is an append-only log of segment files
+    in its own directory, see `directory`. Segments are memory-mapped
+    by consumers, which decode events from mapped pages,
+    copying them only into decoded text.
+    Sparse index of every segment maps offsets to positions in it,
+    so that consumer finds its checkpoint without reading the segment.
+    Every consumer group reads all events from its own checkpoint,
+    kept in a file, consumers of a group compete for events.
+    Processes of the host coordinate by file locks,
+    so several processes may produce and consume at once.
+    Appends are synced to disk by group commit: producers waiting
+    for durability share a single fsync, see `fsync`.
+    Events popped with `ack=False` are pending within consuming process
+    only, so events of a crashed process are not delivered again.
+    Events are consumed synchronously only. POSIX only.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str | os.PathLike[str],
+        segment_bytes: int = 64 * 1024 * 1024,
+        index_interval: int = 4096,
+        fsync: bool = True,
+        poll_interval: float = 0.05,
+        retention: dict[EventType, RetentionPolicy] | None = None,
+        serializer: IEventSerializer[memoryview, bytes] | None = None,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct segment log stream instance
+
+        :param directory: Directory logs are kept in, created if missing
+        :type directory: str | os.PathLike[str]
+        :param segment_bytes: Max size of segment file in bytes,
+            a new segment is started once it is reached.
+            Defaults to 64 MiB
+        :type segment_bytes: int
+        :param index_interval: Number of bytes of segment
+            between entries of its index. Defaults to 4096
+        :type index_interval: int
+        :param fsync: Sync appended events to disk before `put`
+            with `block=True` returns. Producers waiting at the same time
+            share a single fsync. Events put with `block=False` are synced
+            by the next blocking put or `flush`. Defaults to `True`
+        :type fsync: bool
+        :param poll_interval: Max number of seconds blocking pop waits
+            before it checks logs again. Events put by the same process
+            wake it up at once. Defaults to 0.05
+        :type poll_interval: float
+        :param retention: Retention policies by event type.
+            Defaults to None, i.e. logs are not trimmed.
+            Events are evicted by whole segments, when a new segment
+            is started or by `trim`, so logs are always trimmed
+            approximately and limit of policy is ignored.
+            The segment being written is never evicted.
+        :type retention: dict[EventType, RetentionPolicy] | None
+        :param serializer: Event serializer.
+            Defaults to None, i.e. `MemoryViewEventSerializer`
+        :type serializer: IEventSerializer[memoryview, bytes] | None
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        assert segment_bytes > 0, "Segment bytes must be positive."
+        assert index_interval > 0, "Index interval must be positive."
+        assert poll_interval > 0, "Poll interval must be positive."
+
+        self.__directory = os.fspath(directory)
+        self.__segment_bytes = segment_bytes
+        self.__index_interval = index_interval
+        self.__fsync = fsync
+        self.__poll_interval = poll_interval
+        self.__retention = {
+            str(event): policy for event, policy in (retention or {}).items()
+        }
+        self.__serializer = serializer or MemoryViewEventSerializer()
+        self.__logger = logger
+        self.__logs: dict[str, _Log] = {}
+        self.__pending: dict[tuple[str, str], dict[uuid.UUID, tuple[Event, float]]] = {}
+        self.__lock = threading.Lock()
+        self.__appended = threading.Condition()
+
+    def put(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        log = self.__log(event.type)
+        try:
+            written = self.__append(log, [self.__serializer.encode(event)])
+            if block:
+                self.__sync(log, written)
+        except OSError as exc:
+            raise EventNotSentError(f"Event {event} was not appended: {exc!r}")
+        self.__logger.debug(f"Put event {event}.")
+
+    def put_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        by_type: dict[str, list[Event]] = {}
+        for event in events:
+            by_type.setdefault(str(event.type), []).append(event)
+
+        failed: dict[uuid.UUID, Exception] = {}
+        for name, typed_events in by_type.items():
+            # NOTE: events of a type are appended with a single write
+            log = self.__log(name)
+            try:
+                written = self.__append(
+                    log, [self.__serializer.encode(event) for event in typed_events]
+                )
+                if block:
+                    self.__sync(log, written)
+            except OSError as exc:
+                self.__logger.error(f"Failed to put events {name}: {exc!r}")
+                failed.update({event.uid: exc for event in typed_events})
+        self.__logger.debug(f"Put {len(events) - len(failed)} events.")
+        return [
+            (
+                ProduceResult(
+                    event=event, status=EventStatus.FAILED, error=failed[event.uid]
+                )
+                if event.uid in failed
+                else ProduceResult(event=event, status=EventStatus.SENT)
+            )
+            for event in events
+        ]
+
+    async def aput(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        self.put(event, block=block, timeout=timeout)
+
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        raise UnsupportedOperationError(
+            "Segment log stream does not support delayed events."
+        )
+
+    def take_tokens(
+        self, key: str, rate_limit: RateLimit, count: int
+    ) -> tuple[int, float]:
+        raise UnsupportedOperationError(
+            "Segment log stream does not keep token buckets, "
+            + "rate limits are applied per process."
+        )
+
+    def pop(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> Event:
+        return self.pop_many(
+            event, group, max_count=1, block=block, timeout=timeout, ack=ack
+        )[0]
+
+    def pop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        return self.pop_multi(
+            (event,), group, max_count=max_count, block=block, timeout=timeout, ack=ack
+        )
+
+    def pop_multi(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+        assert len(events) > 0, "No events to pop."
+
+        logs = [(event, self.__log(event)) for event in events]
+        deadline = time.monotonic() + timeout
+        while True:
+            result: list[Event] = []
+            for event, log in logs:
+                popped = self.__read(log, self.__group(log, group), max_count)
+                if popped and not ack:
+                    self.__add_pending(event, group, popped)
+                result.extend(popped)
+            if result:
+                return result
+
+            remaining = deadline - time.monotonic()
+            if not block or remaining <= 0:
+                raise EmptyStreamError
+            # NOTE: appends of other processes are noticed by polling
+            with self.__appended:
+                _ = self.__appended.wait(min(remaining, self.__poll_interval))
+
+    def ack(self, event: EventType, group: ConsumerGroup, *events: Event) -> None:
+        with self.__lock:
+            pending = self.__pending.get((str(event), str(group)), {})
+            for acked in events:
+                _ = pending.pop(acked.uid, None)
+
+    def reclaim(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        min_idle: float = 60.0,
+        max_count: int = 10,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        now = time.monotonic()
+        with self.__lock:
+            pending = self.__pending.get((str(event), str(group)), {})
+            idle = [
+                reclaimed
+                for reclaimed, delivered_at in pending.values()
+                if now - delivered_at >= min_idle
+            ][:max_count]
+            for reclaimed in idle:
+                del pending[reclaimed.uid]
+                pending[reclaimed.uid] = (reclaimed, now)
+        return idle
+
+    def group_stats(self, event: EventType, group: ConsumerGroup) -> GroupStats:
+        log = self.__log(event)
+        with self.__writing(log):
+            end = log.offset
+            start = log.bases[0]
+        checkpoint = self.__checkpoint(self.__group(log, group))
+        with self.__lock:
+            pending = len(self.__pending.get((str(event), str(group)), {}))
+        return GroupStats(
+            lag=end - max(start, checkpoint if checkpoint is not None else 0),
+            pending=pending,
+        )
+
+    def trim(self, event: EventType) -> int:
+        """
+        Apply retention policy of event type to its log.
+        Called whenever a new segment is started,
+        but may be called periodically as well, e.g. for max age
+
+        :param event: Event type
+        :type event: EventType
+        :return: Number of evicted events
+        :rtype: int
+        """
+        log = self.__log(event)
+        with self.__writing(log):
+            return self.__trim(log)
+
+    def flush(self) -> None:
+        for log in list(self.__logs.values()):
+            self.__sync(log, log.written)
+
+    def __log(self, event: EventType) -> _Log:
+        name = str(event)
+        log = self.__logs.get(name)
+        if log is None:
+            with self.__lock:
+                log = self.__logs.get(name)
+                if log is None:
+                    log = self.__logs[name] = _Log(
+                        name, os.path.join(self.__directory, quote(name, safe=""))
+                    )
+        return log
+
+    def __group(self, log: _Log, group: ConsumerGroup) -> _Group:
+        name = str(group)
+        state = log.groups.get(name)
+        if state is None:
+            with self.__lock:
+                state = log.groups.get(name)
+                if state is None:
+                    state = log.groups[name] = _Group(
+                        os.path.join(
+                            log.path,
+                            _GROUPS_DIR,
+                            quote(name, safe="") + _CHECKPOINT_SUFFIX,
+                        )
+                    )
+        return state
+
+    @contextmanager
+    def __writing(self, log: _Log) -> Generator[None, None, None]:
+        # NOTE: log is locked for threads of current process
+        # and for all processes of the host.
+        with log.lock:
+            fcntl.flock(log.lock_fd, fcntl.LOCK_EX)
+            try:
+                self.__recover(log)
+                yield
+            finally:
+                fcntl.flock(log.lock_fd, fcntl.LOCK_UN)
+
+    def __recover(self, log: _Log) -> None:
+        # NOTE: writer catches up with appends and segments of other writers
+        bases = log.scan()
+        if not bases:
+            self.__start_segment(log, 0)
+            return
+        last = bases[-1]
+        size = os.path.getsize(log.segment_path(last))
+        if log.fd is not None and log.base == last:
+            if log.pos == size:
+                return
+            offset, pos = log.offset, log.pos
+        else:
+            self.__close_segment(log)
+            entries = self.__index(log, last)
+            offset, pos = entries[-1] if entries else (last, 0)
+            self.__open_segment(log, last)
+            log.index_pos = pos
+
+        with open(log.segment_path(last), "rb") as file:
+            _ = file.seek(pos)
+            data = file.read()
+        valid = 0
+        while valid + _RECORD.size <= len(data):
+            length, crc = _RECORD.unpack_from(data, valid)
+            start, stop = valid + _RECORD.size, valid + _RECORD.size + length
+            if stop > len(data) or zlib.crc32(data[start:stop]) != crc:
+                break
+            valid = stop
+            offset += 1
+        if pos + valid < size:
+            # NOTE: torn record of a crashed writer
+            self.__logger.warning(
+                f"Truncated {size - pos - valid} bytes of segment "
+                + f"{log.segment_path(last)}."
+            )
+            os.truncate(log.segment_path(last), pos + valid)
+            _ = log.maps.pop(last, None)
+        log.pos = pos + valid
+        log.offset = offset
+
+    def __append(self, log: _Log, records: list[bytes]) -> int:
+        with self.__writing(log):
+            size = sum(_RECORD.size + len(record) for record in records)
+            if log.pos and log.pos + size > self.__segment_bytes:
+                self.__roll(log)
+
+            data, index = bytearray(), bytearray()
+            pos, offset = log.pos, log.offset
+            for record in records:
+                if pos - log.index_pos >= self.__index_interval:
+                    index += _INDEX_ENTRY.pack(offset, pos)
+                    log.index_pos = pos
+                data += _RECORD.pack(len(record), zlib.crc32(record))
+                data += record
+                pos += _RECORD.size + len(record)
+                offset += 1
+            try:
+                _write_all(log.fd, data)  # type:ignore[arg-type]
+                if index:
+                    _write_all(log.index_fd, index)  # type:ignore[arg-type]
+            except OSError:
+                # NOTE: writer state is recovered from files by the next append
+                self.__close_segment(log)
+                raise
+            log.pos, log.offset = pos, offset
+            log.written += 1
+            written = log.written
+
+        with self.__appended:
+            self.__appended.notify_all()
+        return written
+
+    def __sync(self, log: _Log, written: int) -> None:
+        if not self.__fsync:
+            return
+
+        with log.synced_cond:
+            while log.synced < written:
+                if log.syncing:
+                    _ = log.synced_cond.wait()
+                    continue
+                log.syncing = True
+                break
+            else:
+                return
+
+        # NOTE: group commit, appends made while fsync is running
+        # are synced by the next one, of a single waiting producer.
+        synced = log.synced
+        try:
+            with log.lock:
+                synced = log.written
+                fd = os.dup(log.fd) if log.fd is not None else None
+            if fd is not None:
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        finally:
+            with log.synced_cond:
+                log.syncing = False
+                log.synced = max(log.synced, synced)
+                log.synced_cond.notify_all()
+
+    def __roll(self, log: _Log) -> None:
+        self.__close_segment(log)
+        self.__start_segment(log, log.offset)
+        self.__logger.debug(f"Started segment {log.segment_path(log.offset)}.")
+        _ = self.__trim(log)
+
+    def __start_segment(self, log: _Log, base: int) -> None:
+        self.__open_segment(log, base)
+        log.pos = log.index_pos = 0
+        log.offset = base
+        if base not in log.bases:
+            log.bases.append(base)
+
+    def __open_segment(self, log: _Log, base: int) -> None:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        log.fd = os.open(log.segment_path(base), flags, 0o644)
+        log.index_fd = os.open(log.index_path(base), flags, 0o644)
+        log.base = base
+
+    def __close_segment(self, log: _Log) -> None:
+        if log.fd is not None:
+            # NOTE: appends are synced before segment is left,
+            # since group commit syncs the current one only.
+            if self.__fsync:
+                os.fsync(log.fd)
+            os.close(log.fd)
+        if log.index_fd is not None:
+            os.close(log.index_fd)
+        log.fd = log.index_fd = None
+
+    def __trim(self, log: _Log) -> int:
+        policy = self.__retention.get(log.name)
+        if policy is None:
+            return 0
+
+        floor = self.__consumed_floor(log) if policy.keep_unconsumed else None
+        now = time.time()
+        evicted = 0
+        for base, next_base in zip(log.bases[:-1], log.bases[1:]):
+            expired = (
+                policy.maxlen is not None and log.offset - next_base >= policy.maxlen
+            ) or (
+                policy.max_age is not None
+                and os.path.getmtime(log.segment_path(base)) < now - policy.max_age
+            )
+            if policy.keep_unconsumed:
+                if floor is None or next_base > floor:
+                    break
+                expired = expired or (policy.maxlen is None and policy.max_age is None)
+            if not expired:
+                break
+            os.remove(log.segment_path(base))
+            os.remove(log.index_path(base))
+            _ = log.maps.pop(base, None)
+            _ = log.indexes.pop(base, None)
+            evicted += next_base - base
+        if evicted:
+            _ = log.scan()
+        self.__logger.debug(f"Evicted {evicted} events from log {log.path}.")
+        return evicted
+
+    def __consumed_floor(self, log: _Log) -> int | None:
+        # NOTE: events pending in some group are not consumed yet,
+        # but pending events are not known to other processes.
+        floor: int | None = None
+        groups_path = os.path.join(log.path, _GROUPS_DIR)
+        for name in os.listdir(groups_path):
+            with open(os.path.join(groups_path, name), "rb") as file:
+                data = file.read(_CHECKPOINT.size)
+            checkpoint = _CHECKPOINT.unpack(data)[0] if data else 0
+            floor = checkpoint if floor is None else min(floor, checkpoint)
+        return floor
+
+    def __index(self, log: _Log, base: int) -> list[tuple[int, int]]:
+        entries = log.indexes.get(base)
+        if entries is not None:
+            return entries
+        try:
+            with open(log.index_path(base), "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return []
+        entries = [
+            _INDEX_ENTRY.unpack_from(data, pos)
+            for pos in range(0, len(data) - _INDEX_ENTRY.size + 1, _INDEX_ENTRY.size)
+        ]
+        # NOTE: index of the last segment still grows
+        if log.bases and base != log.bases[-1]:
+            log.indexes[base] = entries
+        return entries
+
+    def __map(self, log: _Log, base: int) -> mmap.mmap | None:
+        mapped = log.maps.get(base)
+        if mapped is not None:
+            return mapped
+        try:
+            with open(log.segment_path(base), "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # NOTE: segment is evicted or empty
+            return None
+        log.maps[base] = mapped
+        return mapped
+
+    def __checkpoint(self, group: _Group) -> int | None:
+        data = os.pread(group.fd, _CHECKPOINT.size, 0)
+        return int(_CHECKPOINT.unpack(data)[0]) if data else None
+
+    def __read(self, log: _Log, group: _Group, max_count: int) -> list[Event]:
+        with group.lock:
+            fcntl.flock(group.fd, fcntl.LOCK_EX)
+            try:
+                offset = self.__checkpoint(group)
+                bases = log.bases or log.scan()
+                if not bases:
+                    return []
+                if offset is None or offset < bases[0]:
+                    # NOTE: like Redis group created with id 0,
+                    # new group reads all events kept so far.
+                    bases = log.scan()
+                    offset = max(offset or 0, bases[0])
+
+                if group.position is not None and group.position[0] == offset:
+                    _, base, pos = group.position
+                else:
+                    base, pos = self.__locate(log, offset)
+                events, offset, base, pos = self.__scan(
+                    log, offset, base, pos, max_count
+                )
+                _ = os.pwrite(group.fd, _CHECKPOINT.pack(offset), 0)
+                group.position = (offset, base, pos)
+                return events
+            finally:
+                fcntl.flock(group.fd, fcntl.LOCK_UN)
+
+    def __locate(self, log: _Log, offset: int) -> tuple[int, int]:
+        idx = bisect.bisect_right(log.bases, offset) - 1
+        base = log.bases[max(idx, 0)]
+        entries = self.__index(log, base)
+        idx = bisect.bisect_right(entries, (offset, float("inf"))) - 1
+        current, pos = entries[idx] if idx >= 0 else (base, 0)
+
+        # NOTE: index is sparse, the rest is skipped record by record
+        _ = log.maps.pop(base, None)
+        mapped = self.__map(log, base)
+        while (
+            current < offset
+            and mapped is not None
+            and pos + _RECORD.size <= len(mapped)
+        ):
+            length = _RECORD.unpack_from(mapped, pos)[0]
+            pos += _RECORD.size + length
+            current += 1
+        return base, pos
+
+    def __scan(
+        self, log: _Log, offset: int, base: int, pos: int, max_count: int
+    ) -> tuple[list[Event], int, int, int]:
+        events: list[Event] = []
+        remapped = False
+        while len(events) < max_count:
+            mapped = self.__map(log, base)
+            record = self.__record(mapped, pos) if mapped is not None else None
+            if record is not None:
+                with record:
+                    event = self.__decode(record)
+                    pos += _RECORD.size + len(record)
+                if event is not None:
+                    events.append(event)
+                offset += 1
+                continue
+
+            if not remapped:
+                # NOTE: segment may have grown or been truncated since mapped
+                _ = log.maps.pop(base, None)
+                remapped = True
+                continue
+            if base == log.bases[-1]:
+                _ = log.scan()
+            idx = bisect.bisect_right(log.bases, base)
+            if idx == len(log.bases) or log.bases[idx] != offset:
+                break
+            base, pos, remapped = log.bases[idx], 0, False
+        return events, offset, base, pos
+
+    def __record(self, mapped: mmap.mmap, pos: int) -> memoryview | None:
+        if pos + _RECORD.size > len(mapped):
+            return None
+        length, crc = _RECORD.unpack_from(mapped, pos)
+        start = pos + _RECORD.size
+        stop = start + length
+        if stop > len(mapped):
+            return None
+        record = memoryview(mapped)[start:stop]
+        # NOTE: record being written by another process is read later
+        if zlib.crc32(record) != crc:
+            record.release()
+            return None
+        return record
+
+    def __decode(self, data: memoryview) -> Event | None:
+        try:
+            return self.__serializer.decode(data)
+        except Exception as exc:
+            # NOTE: event that can not be decoded is skipped,
+            # otherwise it blocks the whole group.
+            self.__logger.error(f"Failed to decode an event: {exc!r}")
+            return None
+
+    def __add_pending(
+        self, event: EventType, group: ConsumerGroup, events: list[Event]
+    ) -> None:
+        now = time.monotonic()
+        with self.__lock:
+            pending = self.__pending.setdefault((str(event), str(group)), {})
+            for popped in events:
+                pending[popped.uid] = (popped, now)
@@ -0,0 +1,657 @@
+import hashlib
+import logging
+import multiprocessing as mp
+import os
+import struct
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Condition, Lock
+from typing import Any
+
+from eventscore.core.abstract import ConsumerGroup, EventType, IEventSerializer, IStream
+from eventscore.core.exceptions import (
+    EmptyStreamError,
+    EventNotSentError,
+    UnsupportedOperationError,
+)
+from eventscore.core.logging import logger as _logger
+from eventscore.core.serializers import MemoryViewEventSerializer
+from eventscore.core.types import (
+    Event,
+    EventStatus,
+    GroupStats,
+    ProduceResult,
+    RateLimit,
+)
+
+# NOTE: ring header is head position and sequence number, tail position
+# and sequence number, followed by number of waiting consumers.
+# Positions only grow, offset in ring is position modulo capacity.
+_HEADER_SIZE = 64
+_POSITION = struct.Struct("<QQ")
+_COUNTER = struct.Struct("<Q")
+_HEAD_OFFSET, _TAIL_OFFSET, _WAITERS_OFFSET = 0, 16, 32
+# NOTE: group slot is read position and sequence number,
+# a flag of slot in use and digest of group name.
+_SLOT_SIZE = 64
+_SLOT_USED_OFFSET = 16
+_SLOT_DIGEST_OFFSET = 24
+_DIGEST_SIZE = 16
+# NOTE: record is length of encoded event, its state and PID of producer
+# that has reserved it, followed by encoded event, aligned to 8 bytes.
+_RECORD = struct.Struct("<III")
+_RESERVED, _COMMITTED, _PADDING = 0, 1, 2
+_ALIGNMENT = 8
+# Max number of seconds consumer sleeps before checking ring again,
+# covers wakeups missed due to reordered writes of other processes.
+_MAX_WAIT = 0.01
+# Number of seconds producer sleeps before checking full ring again
+_FULL_WAIT = 0.001
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        # NOTE: signal 0 is CTRL_C_EVENT on Windows, not a probe,
+        # so owner of a reserved record is assumed to be alive.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _Ring:
+    """
+    Multi-producer ring buffer of a single event type in shared memory.
+    Ring is not lock-free: producers reserve space under a lock
+    shared by processes, then copy events and commit them without it.
+    Consumers of a group take turns by a lock of group and read
+    committed events in order. Record reserved by a producer
+    that has died before commit is skipped as padding.
+    Space is reused only after all groups have read it.
+    """
+
+    def __init__(
+        self,
+        shm: SharedMemory,
+        capacity: int,
+        max_groups: int,
+        lock: Lock,
+        group_locks: list[Lock],
+        waiting: Condition,
+    ) -> None:
+        assert shm.buf is not None, "Shared memory is closed."
+        self.shm = shm
+        self.buf = shm.buf
+        self.capacity = capacity
+        self.max_groups = max_groups
+        self.lock = lock
+        self.group_locks = group_locks
+        self.waiting = waiting
+        self.data_offset = _HEADER_SIZE + max_groups * _SLOT_SIZE
+
+    @classmethod
+    def size(cls, capacity: int, max_groups: int) -> int:
+        return _HEADER_SIZE + max_groups * _SLOT_SIZE + capacity
+
+    def register(self, group: str) -> int:
+        digest = hashlib.blake2b(group.encode(), digest_size=_DIGEST_SIZE).digest()
+        buf = self.buf
+        with self.lock:
+            free: int | None = None
+            for idx in range(self.max_groups):
+                slot = self.__slot_offset(idx)
+                if not buf[slot + _SLOT_USED_OFFSET]:
+                    free = idx if free is None else free
+                    continue
+                start = slot + _SLOT_DIGEST_OFFSET
+                stop = start + _DIGEST_SIZE
+                if buf[start:stop].tobytes() == digest:
+                    return idx
+            if free is None:
+                raise UnsupportedOperationError(
+                    f"Ring has no free slots for consumer group {group}, "
+                    + "increase max groups."
+                )
+
+            # NOTE: like Redis group created with id 0,
+            # new group reads all events kept so far.
+            slot = self.__slot_offset(free)
+            tail_pos, tail_seq = _POSITION.unpack_from(buf, _TAIL_OFFSET)
+            _POSITION.pack_into(buf, slot, tail_pos, tail_seq)
+            start = slot + _SLOT_DIGEST_OFFSET
+            stop = start + _DIGEST_SIZE
+            buf[start:stop] = digest
+            buf[slot + _SLOT_USED_OFFSET] = 1
+            return free
+
+    def reserve(self, length: int) -> int | None:
+        """
+        Reserve space for a record, None if ring is full
+
+        :param length: Length of encoded event
+        :type length: int
+        :return: Offset of record in ring
+        :rtype: int | None
+        """
+        size = _align(_RECORD.size + length)
+        buf = self.buf
+        with self.lock:
+            head_pos, head_seq = _POSITION.unpack_from(buf, _HEAD_OFFSET)
+            tail_pos = _COUNTER.unpack_from(buf, _TAIL_OFFSET)[0]
+            offset = head_pos % self.capacity
+            padding = self.capacity - offset if self.capacity - offset < size else 0
+            if head_pos + padding + size - tail_pos > self.capacity:
+                tail_pos = self.__free(head_pos + padding + size)
+                if head_pos + padding + size - tail_pos > self.capacity:
+                    return None
+
+            if padding:
+                # NOTE: record never wraps, rest of ring is skipped instead
+                _RECORD.pack_into(
+                    buf,
+                    self.data_offset + offset,
+                    padding - _RECORD.size,
+                    _PADDING,
+                    0,
+                )
+                head_pos += padding
+                offset = 0
+            # NOTE: record is marked as reserved before head is moved,
+            # so that consumers never read a record of the previous lap.
+            _RECORD.pack_into(
+                buf, self.data_offset + offset, length, _RESERVED, os.getpid()
+            )
+            _POSITION.pack_into(buf, _HEAD_OFFSET, head_pos + size, head_seq + 1)
+            return int(offset)
+
+    def commit(self, offset: int, data: bytes) -> None:
+        start = self.data_offset + offset + _RECORD.size
+        stop = start + len(data)
+        self.buf[start:stop] = data
+        _RECORD.pack_into(self.buf, self.data_offset + offset, len(data), _COMMITTED, 0)
+        if self.waiters:
+            with self.waiting:
+                self.waiting.notify_all()
+
+    def read(
+        self,
+        slot: int,
+        max_count: int,
+        decode: Callable[[memoryview], Event | None],
+    ) -> list[Event]:
+        buf = self.buf
+        events: list[Event] = []
+        with self.group_locks[slot]:
+            offset = self.__slot_offset(slot)
+            pos, seq = _POSITION.unpack_from(buf, offset)
+            head_pos = _COUNTER.unpack_from(buf, _HEAD_OFFSET)[0]
+            while pos < head_pos and len(events) < max_count:
+                record = self.data_offset + pos % self.capacity
+                length, state, owner = _RECORD.unpack_from(buf, record)
+                if state == _RESERVED and not _alive(owner):
+                    # NOTE: record is never committed by a dead producer,
+                    # so it is turned into padding of the same size.
+                    length = _align(_RECORD.size + length) - _RECORD.size
+                    state = _PADDING
+                    _RECORD.pack_into(buf, record, length, state, 0)
+                if state == _RESERVED:
+                    # NOTE: events are read in order, so a record
+                    # being copied holds back the ones after it.
+                    break
+                if state == _PADDING:
+                    pos += _RECORD.size + length
+                    continue
+                start = record + _RECORD.size
+                stop = start + length
+                # NOTE: event is decoded before position is moved,
+                # until then its space is not reused.
+                event = decode(buf[start:stop])
+                if event is not None:
+                    events.append(event)
+                pos += _align(_RECORD.size + length)
+                seq += 1
+            _POSITION.pack_into(buf, offset, pos, seq)
+        return events
+
+    def lag(self, slot: int) -> int:
+        head_seq = _POSITION.unpack_from(self.buf, _HEAD_OFFSET)[1]
+        seq = _POSITION.unpack_from(self.buf, self.__slot_offset(slot))[1]
+        return int(head_seq - seq)
+
+    def has_unread(self, slot: int) -> bool:
+        head_pos = _COUNTER.unpack_from(self.buf, _HEAD_OFFSET)[0]
+        pos = _COUNTER.unpack_from(self.buf, self.__slot_offset(slot))[0]
+        return bool(pos < head_pos)
+
+    @property
+    def waiters(self) -> int:
+        return int(_COUNTER.unpack_from(self.buf, _WAITERS_OFFSET)[0])
+
+    def add_waiters(self, count: int) -> None:
+        # NOTE: called under waiting condition only
+        _COUNTER.pack_into(self.buf, _WAITERS_OFFSET, self.waiters + count)
+
+    def __free(self, needed_pos: int) -> int:
+        buf = self.buf
+        tail_pos, tail_seq = _POSITION.unpack_from(buf, _TAIL_OFFSET)
+        cursors = [
+            _POSITION.unpack_from(buf, self.__slot_offset(idx))
+            for idx in range(self.max_groups)
+            if buf[self.__slot_offset(idx) + _SLOT_USED_OFFSET]
+        ]
+        if cursors:
+            # NOTE: space is reused only after all groups have read it
+            tail_pos, tail_seq = min(cursors)
+        else:
+            # NOTE: without groups, the oldest events are dropped
+            while needed_pos - tail_pos > self.capacity:
+                length, state, _ = _RECORD.unpack_from(
+                    buf, self.data_offset + tail_pos % self.capacity
+                )
+                if state == _PADDING:
+                    tail_pos += _RECORD.size + length
+                    continue
+                tail_pos += _align(_RECORD.size + length)
+                tail_seq += 1
+        _POSITION.pack_into(buf, _TAIL_OFFSET, tail_pos, tail_seq)
+        return int(tail_pos)
+
+    def __slot_offset(self, idx: int) -> int:
+        return _HEADER_SIZE + idx * _SLOT_SIZE
+
+
+class SharedRings:
+    """
+    Ring buffers in shared memory, one per event type.
+    Rings must be created by a parent process before workers are started,
+    e.g. before `ECore.spawn_workers`, and passed to streams as is,
+    since locks of rings are inherited by child processes
+    and can not be looked up by name. Creating process owns rings
+    and must `unlink` them once all processes are done.
+    """
+
+    def __init__(
+        self,
+        events: Sequence[EventType],
+        *,
+        capacity: int = 1 << 20,
+        max_groups: int = 8,
+        start_method: str | None = None,
+    ) -> None:
+        """
+        Construct and allocate shared rings
+
+        :param events: Event types to allocate rings for
+        :type events: Sequence[EventType]
+        :param capacity: Number of bytes of a single ring.
+            Rounded up to 8 bytes. Defaults to 1 MiB
+        :type capacity: int
+        :param max_groups: Max number of consumer groups reading a ring.
+            Defaults to 8
+        :type max_groups: int
+        :param start_method: Multiprocessing start method of processes
+            rings are passed to, must match the one of spawn worker.
+            Defaults to None, i.e. default start method of the platform
+        :type start_method: str | None
+        """
+        assert len(events) > 0, "No events to allocate rings for."
+        assert capacity > 0, "Capacity must be positive."
+        assert max_groups > 0, "Max groups must be positive."
+
+        self.__capacity = _align(capacity)
+        self.__max_groups = max_groups
+        self.__owner = os.getpid()
+        context: Any = mp if start_method is None else mp.get_context(start_method)
+        self.__waiting: Condition = context.Condition()
+        self.__rings: dict[str, _Ring] = {}
+        for event in events:
+            shm = SharedMemory(
+                create=True, size=_Ring.size(self.__capacity, max_groups)
+            )
+            # NOTE: new shared memory is zero-filled,
+            # i.e. ring is empty and has no groups.
+            self.__rings[str(event)] = _Ring(
+                shm,
+                self.__capacity,
+                max_groups,
+                context.Lock(),
+                [context.Lock() for _ in range(max_groups)],
+                self.__waiting,
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # NOTE: locks are pickled only while child process is spawned
+        return {
+            "capacity": self.__capacity,
+            "max_groups": self.__max_groups,
+            "owner": self.__owner,
+            "waiting": self.__waiting,
+            "rings": {
+                event: (ring.shm.name, ring.lock, ring.group_locks)
+                for event, ring in self.__rings.items()
+            },
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__capacity = state["capacity"]
+        self.__max_groups = state["max_groups"]
+        self.__owner = state["owner"]
+        self.__waiting = state["waiting"]
+        self.__rings = {}
+        for event, (name, lock, group_locks) in state["rings"].items():
+            # NOTE: child process shares resource tracker of its parent,
+            # so memory attached by name is unlinked by the owner only.
+            self.__rings[event] = _Ring(
+                SharedMemory(name=name),
+                self.__capacity,
+                self.__max_groups,
+                lock,
+                group_locks,
+                self.__waiting,
+            )
+
+    @property
+    def capacity(self) -> int:
+        """
+        Number of bytes of a single ring
+
+        :return: Capacity
+        :rtype: int
+        """
+        return self.__capacity
+
+    @property
+    def waiting(self) -> Condition:
+        """
+        Condition consumers of all rings wait on for new events
+
+        :return: Condition
+        :rtype: multiprocessing.synchronize.Condition
+        """
+        return self.__waiting
+
+    def ring(self, event: EventType) -> _Ring:
+        """
+        Ring of event type
+
+        :param event: Event type
+        :type event: EventType
+        :raises UnsupportedOperationError: Event type has no ring
+        :return: Ring
+        :rtype: _Ring
+        """
+        ring = self.__rings.get(str(event))
+        if ring is None:
+            raise UnsupportedOperationError(
+                f"Event type {event} has no shared ring, declare it in SharedRings."
+            )
+        return ring
+
+    def unlink(self) -> None:
+        """
+        Free shared memory of rings.
+        Must be called by creating process, once all processes are done
+
+        :return: None
+        :rtype: None
+        """
+        assert os.getpid() == self.__owner, "Rings are unlinked by their owner only."
+        for ring in self.__rings.values():
+            ring.shm.close()
+            ring.shm.unlink()
+
+
+class SharedMemoryStream(IStream):
+    """
+    Stream of processes of a single host, backed by ring buffers
+    in shared memory, see `SharedRings`. Events are encoded and copied
+    into a ring once, consumers decode them from shared memory,
+    copying them only into decoded text.
+    Every consumer group reads all events from its own position,
+    consumers of a group compete for events. A full ring blocks producers
+    until the slowest group catches up.
+    Events popped with `ack=False` are pending within consuming process
+    only, so events of a crashed process are not delivered again.
+    Events are consumed synchronously only. POSIX only.
+    """
+
+    def __init__(
+        self,
+        *,
+        rings: SharedRings,
+        serializer: IEventSerializer[memoryview, bytes] | None = None,
+        logger: logging.Logger = _logger,
+    ) -> None:
+        """
+        Construct shared memory stream instance
+
+        :param rings: Shared rings, created by a parent process
+        :type rings: SharedRings
+        :param serializer: Event serializer.
+            Defaults to None, i.e. `MemoryViewEventSerializer`
+        :type serializer: IEventSerializer[memoryview, bytes] | None
+        :param logger: Logger instance
+        :type logger: logging.Logger
+        """
+        self.__rings = rings
+        self.__serializer = serializer or MemoryViewEventSerializer()
+        self.__logger = logger
+        self.__slots: dict[tuple[str, str], int] = {}
+        self.__pending: dict[tuple[str, str], dict[uuid.UUID, tuple[Event, float]]] = {}
+        self.__lock = threading.Lock()
+
+    def put(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        ring = self.__rings.ring(event.type)
+        data = self.__serializer.encode(event)
+        if _align(_RECORD.size + len(data)) > ring.capacity // 2:
+            # NOTE: event with padding before it must fit into empty ring
+            raise EventNotSentError(f"Event {event} does not fit into ring.")
+
+        deadline = time.monotonic() + timeout
+        offset = ring.reserve(len(data))
+        while offset is None:
+            if not block or time.monotonic() >= deadline:
+                raise EventNotSentError(f"Ring of {event.type} is full.")
+            time.sleep(_FULL_WAIT)
+            offset = ring.reserve(len(data))
+        ring.commit(offset, data)
+        self.__logger.debug(f"Put event {event}.")
+
+    def put_many(
+        self,
+        events: Sequence[Event],
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> list[ProduceResult]:
+        results: list[ProduceResult] = []
+        for event in events:
+            try:
+                self.put(event, block=block, timeout=timeout)
+            except (EventNotSentError, UnsupportedOperationError) as exc:
+                self.__logger.error(f"Failed to put event {event}: {exc!r}")
+                results.append(
+                    ProduceResult(event=event, status=EventStatus.FAILED, error=exc)
+                )
+            else:
+                results.append(ProduceResult(event=event, status=EventStatus.SENT))
+        return results
+
+    async def aput(
+        self,
+        event: Event,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+    ) -> None:
+        self.put(event, block=block, timeout=timeout)
+
+    def schedule(self, event: Event, deliver_at: float) -> None:
+        raise UnsupportedOperationError(
+            "Shared memory stream does not support delayed events."
+        )
+
+    def take_tokens(
+        self, key: str, rate_limit: RateLimit, count: int
+    ) -> tuple[int, float]:
+        raise UnsupportedOperationError(
+            "Shared memory stream does not keep token buckets, "
+            + "rate limits are applied per process."
+        )
+
+    def pop(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> Event:
+        return self.pop_many(
+            event, group, max_count=1, block=block, timeout=timeout, ack=ack
+        )[0]
+
+    def pop_many(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        return self.pop_multi(
+            (event,), group, max_count=max_count, block=block, timeout=timeout, ack=ack
+        )
+
+    def pop_multi(
+        self,
+        events: Sequence[EventType],
+        group: ConsumerGroup,
+        *,
+        max_count: int = 10,
+        block: bool = True,
+        timeout: int = 5,
+        ack: bool = True,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+        assert len(events) > 0, "No events to pop."
+
+        rings = [
+            (event, self.__rings.ring(event), self.__slot(event, group))
+            for event in events
+        ]
+        deadline = time.monotonic() + timeout
+        while True:
+            result: list[Event] = []
+            for event, ring, slot in rings:
+                popped = ring.read(slot, max_count, self.__decode)
+                if popped and not ack:
+                    self.__add_pending(event, group, popped)
+                result.extend(popped)
+            if result:
+                return result
+
+            remaining = deadline - time.monotonic()
+            if not block or remaining <= 0:
+                raise EmptyStreamError
+            self.__wait(rings, min(remaining, _MAX_WAIT))
+
+    def ack(self, event: EventType, group: ConsumerGroup, *events: Event) -> None:
+        with self.__lock:
+            pending = self.__pending.get((str(event), str(group)), {})
+            for acked in events:
+                _ = pending.pop(acked.uid, None)
+
+    def reclaim(
+        self,
+        event: EventType,
+        group: ConsumerGroup,
+        *,
+        min_idle: float = 60.0,
+        max_count: int = 10,
+    ) -> list[Event]:
+        assert max_count > 0, "Max count must be positive."
+
+        now = time.monotonic()
+        with self.__lock:
+            pending = self.__pending.get((str(event), str(group)), {})
+            idle = [
+                reclaimed
+                for reclaimed, delivered_at in pending.values()
+                if now - delivered_at >= min_idle
+            ][:max_count]
+            for reclaimed in idle:
+                del pending[reclaimed.uid]
+                pending[reclaimed.uid] = (reclaimed, now)
+        return idle
+
+    def group_stats(self, event: EventType, group: ConsumerGroup) -> GroupStats:
+        with self.__lock:
+            pending = len(self.__pending.get((str(event), str(group)), {}))
+        return GroupStats(
+            lag=self.__rings.ring(event).lag(self.__slot(event, group)),
+            pending=pending,
+        )
+
+    def flush(self) -> None:
+        pass
+
+    def __slot(self, event: EventType, group: ConsumerGroup) -> int:
+        key = (str(event), str(group))
+        slot = self.__slots.get(key)
+        if slot is None:
+            slot = self.__slots[key] = self.__rings.ring(event).register(str(group))
+        return slot
+
+    def __decode(self, data: memoryview) -> Event | None:
+        try:
+            return self.__serializer.decode(data)
+        except Exception as exc:
+            # NOTE: event that can not be decoded is skipped,
+            # otherwise it blocks the whole group.
+            self.__logger.error(f"Failed to decode an event: {exc!r}")
+            return None
+
+    def __add_pending(
+        self, event: EventType, group: ConsumerGroup, events: list[Event]
+    ) -> None:
+        now = time.monotonic()
+        with self.__lock:
+            pending = self.__pending.setdefault((str(event), str(group)), {})
+            for popped in events:
+                pending[popped.uid] = (popped, now)
+
+    def __wait(self, rings: list[tuple[EventType, _Ring, int]], timeout: float) -> None:
+        waiting = self.__rings.waiting
+        with waiting:
+            for _, ring, _ in rings:
+                ring.add_waiters(1)
+            try:
+                # NOTE: producers notify only when there are waiters,
+                # so rings are checked again after consumer is counted.
+                if not any(ring.has_unread(slot) for _, ring, slot in rings):
+                    _ = waiting.wait(timeout)
+            finally:
+                for _, ring, _ in rings:
+                    ring.add_waiters(-1)
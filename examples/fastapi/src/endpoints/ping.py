@@ -8,5 +8,5 @@ router = APIRouter(prefix="/api/v0", tags=["ping"])
 
 @router.get("/ping/")
 async def ping():
-    ecore.produce(event=Event(type="ping", payload={"some": "value"}))
+    await ecore.aproduce(event=Event(type="ping", payload={"some": "value"}))
     return {"detail": "OK"}
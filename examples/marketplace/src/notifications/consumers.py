@@ -1,4 +1,4 @@
-import time
+import asyncio
 
 from config.ecore import ecore
 
@@ -10,8 +10,8 @@ from eventscore.core.types import Event
     event="product-out-of-stock",
     group="product-out-of-stock",
 )
-def payment_init(event: Event):
-    time.sleep(1)  # Some external notification system API call
+async def payment_init(event: Event):
+    await asyncio.sleep(1)  # Some external notification system API call
     logger.info(f"Product out of stock notification sent for event: {event}")
 
 
@@ -19,8 +19,8 @@ def payment_init(event: Event):
     event="payment-completed",
     group="payment-completed",
 )
-def payment_completed(event: Event):
-    time.sleep(1)  # Some external notification system API call
+async def payment_completed(event: Event):
+    await asyncio.sleep(1)  # Some external notification system API call
     logger.info(f"Payment success notification sent for event: {event}")
 
 
@@ -28,6 +28,6 @@ def payment_completed(event: Event):
     event="payment-failed",
     group="payment-failed",
 )
-def payment_failed(event: Event):
-    time.sleep(1)  # Some external notification system API call
+async def payment_failed(event: Event):
+    await asyncio.sleep(1)  # Some external notification system API call
     logger.info(f"Payment failure notification sent for event: {event}")
@@ -5,6 +5,7 @@ import pytest
 
 from eventscore.core.exceptions import EmptyStreamError
 from eventscore.core.runners import ObserverRunner
+from eventscore.core.types import Event
 
 
 def infinite_stream_factory(events):
@@ -36,7 +37,7 @@ def mp_run(
     def incr():
         counter.value += 1
 
-    events = tuple(mock.Mock() for _ in range(events_count))
+    events = tuple(Event(type="event") for _ in range(events_count))
     consumers = tuple(mock.Mock(side_effect=incr) for _ in range(consumers_count))
 
     runner._ObserverRunner__stream = infinite_stream_factory(events)
@@ -65,7 +66,7 @@ class TestObserverRunner:
         mock_factory,
         stream_mock_factory,
     ):
-        events = tuple(mock_factory() for _ in range(events_count))
+        events = tuple(Event(type="event") for _ in range(events_count))
         consumers = tuple(mock_factory() for _ in range(consumers_count))
         runner = ObserverRunner(
             stream_mock_factory(events),
@@ -215,6 +215,7 @@ def ecore_factory(
         spawn_worker=spawn_worker_mock,
         spawn_worker_type=SpawnMPWorker,
         spawn_worker_init_kwargs=None,
+        group_spawn_workers=SKIP,
         producer=producer_mock,
         producer_type=Producer,
         producer_init_kwargs=None,
@@ -236,6 +237,8 @@ def ecore_factory(
             kwargs["spawn_worker_type"] = spawn_worker_type
         if spawn_worker_init_kwargs != SKIP:
             kwargs["spawn_worker_init_kwargs"] = spawn_worker_init_kwargs
+        if group_spawn_workers != SKIP:
+            kwargs["group_spawn_workers"] = group_spawn_workers
         if producer != SKIP:
             kwargs["producer"] = producer
         if producer_type != SKIP:
@@ -273,8 +276,9 @@ def redis_stream_factory(redis_mock, event_serializer_mock):
         port=6379,
         db=0,
         redis_init_kwargs=None,
+        **extra_kwargs,
     ):
-        kwargs = {}
+        kwargs = dict(extra_kwargs)
         if redis != SKIP:
             kwargs["redis"] = redis
         if host != SKIP:
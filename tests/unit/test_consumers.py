@@ -1,5 +1,11 @@
+import threading
+from unittest import mock
+
 import pytest
 
+from eventscore.core.consumers import AsyncConsumer, Consumer
+from eventscore.core.types import RateLimit, RetryPolicy
+
 
 @pytest.mark.unit
 class TestConsumer:
@@ -7,3 +13,63 @@ class TestConsumer:
         consumer.consume(event)
 
         consumer_func_mock.assert_called_once_with(event)
+
+    @pytest.mark.parametrize("event_type", (None, "event"), ids=("any", "bound"))
+    def test_event(self, event_type, consumer_func_mock):
+        assert Consumer(consumer_func_mock, event=event_type).event == event_type
+
+    @pytest.mark.parametrize(
+        "retry", (None, RetryPolicy()), ids=("no-retries", "retried")
+    )
+    def test_retry(self, retry, consumer_func_mock):
+        assert Consumer(consumer_func_mock, retry=retry).retry is retry
+
+    @pytest.mark.parametrize(
+        "rate_limit", (None, RateLimit(rate=1)), ids=("not-limited", "limited")
+    )
+    def test_rate_limit(self, rate_limit, consumer_func_mock):
+        consumer = Consumer(consumer_func_mock, rate_limit=rate_limit)
+
+        assert consumer.rate_limit is rate_limit
+
+    def test_name(self):
+        class Notifier:
+            def __call__(self, event):
+                pass
+
+        def notify(event):
+            pass
+
+        assert Consumer(notify).name == (
+            "tests.unit.test_consumers.TestConsumer.test_name.<locals>.notify"
+        )
+        assert Consumer(Notifier()).name == (
+            "tests.unit.test_consumers.TestConsumer.test_name.<locals>.Notifier"
+        )
+
+
+@pytest.mark.unit
+class TestAsyncConsumer:
+    @pytest.mark.asyncio
+    async def test_consume_coroutine(self, event):
+        func = mock.AsyncMock(__name__="func")
+        consumer = AsyncConsumer(func)
+
+        await consumer.consume(event)
+
+        func.assert_awaited_once_with(event)
+
+    @pytest.mark.asyncio
+    async def test_consume_function(self, event):
+        main_thread = threading.get_ident()
+        consumed_in = []
+
+        def func(event):
+            consumed_in.append(threading.get_ident())
+
+        consumer = AsyncConsumer(func)
+
+        await consumer.consume(event)
+
+        assert len(consumed_in) == 1
+        assert consumed_in[0] != main_thread
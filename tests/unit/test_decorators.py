@@ -1,3 +1,6 @@
+import inspect
+from unittest import mock
+
 import pytest
 
 from eventscore.decorators import consumer
@@ -32,11 +35,15 @@ def test_consumer_decorator(func, ecore_mock, consumer_func_mock):
     assert consumer_func_mock.__consumer_event__ == "event"
     assert consumer_func_mock.__consumer_group__ == "group"
     assert consumer_func_mock.__consumer_clones__ == 1
+    assert consumer_func_mock.__consumer_weight__ == 1.0
     ecore_mock.register_consumer.assert_called_once_with(
         consumer_func_mock,
         "event",
         "group",
         clones=1,
+        weight=1.0,
+        retry=None,
+        rate_limit=None,
     )
 
     args, kwargs = (1,), {"field": "value"}
@@ -44,3 +51,15 @@ def test_consumer_decorator(func, ecore_mock, consumer_func_mock):
 
     assert result == consumer_func_mock.return_value
     consumer_func_mock.assert_called_once_with(*args, **kwargs)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_consumer_decorator_async(ecore_mock):
+    func = mock.AsyncMock(__name__="func")
+
+    decorated = consumer(func, ecore=ecore_mock, event="event", group="group")
+
+    assert inspect.iscoroutinefunction(decorated)
+    assert await decorated(1) == func.return_value
+    func.assert_awaited_once_with(1)
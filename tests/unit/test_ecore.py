@@ -213,6 +213,9 @@ class TestECore:
             event=event,
             group=group,
             clones=clones,
+            weight=1.0,
+            retry=None,
+            rate_limit=None,
         )
 
     @pytest.mark.parametrize(
@@ -322,8 +325,61 @@ class TestECore:
             event,
             block=block,
             timeout=timeout,
+            deliver_at=None,
+            delay=None,
         )
 
+    def test_produce_delayed(self, producer_mock, ecore_factory):
+        event = Event(type="event")
+
+        ecore_factory().produce(event, delay=10)
+
+        producer_mock.produce.assert_called_once_with(
+            event, block=True, timeout=5, deliver_at=None, delay=10
+        )
+
+    @pytest.mark.parametrize("block", (False, True), ids=("non-blocking", "blocking"))
+    @pytest.mark.parametrize("skip", (False, True), ids=("not-skipped", "skipped"))
+    def test_produce_many(self, block, skip, producer_mock, ecore_factory):
+        events = [Event(type="event1"), Event(type="event2")]
+        ecore = ecore_factory()
+        setattr(ecore, "_ECore__skip", skip)
+
+        result = ecore.produce_many(events, block=block, timeout=1)
+
+        if skip:
+            assert result == []
+            producer_mock.produce_many.assert_not_called()
+        else:
+            assert result == producer_mock.produce_many.return_value
+            producer_mock.produce_many.assert_called_once_with(
+                events,
+                block=block,
+                timeout=1,
+            )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("event", (Event(type="event"),), ids=("event",))
+    @pytest.mark.parametrize("block", (False, True), ids=("non-blocking", "blocking"))
+    @pytest.mark.parametrize("skip", (False, True), ids=("not-skipped", "skipped"))
+    async def test_aproduce(self, event, block, skip, producer_mock, ecore_factory):
+        producer_mock.aproduce = mock.AsyncMock()
+        ecore = ecore_factory()
+        setattr(ecore, "_ECore__skip", skip)
+
+        result = await ecore.aproduce(event, block=block, timeout=1)
+
+        assert result is None
+        if skip:
+            producer_mock.aproduce.assert_not_awaited()
+        else:
+            producer_mock.aproduce.assert_awaited_once_with(
+                event,
+                block=block,
+                timeout=1,
+            )
+        producer_mock.produce.assert_not_called()
+
     @pytest.mark.parametrize(
         "already_spawned",
         (False, True),
@@ -380,3 +436,36 @@ class TestECore:
             spawn_worker_mock.assert_has_calls(
                 [mock.call(worker) for worker in expected_workers]
             )
+
+    def test_spawn_workers_group_spawn_workers(
+        self, spawn_worker_mock, process_pipeline_mock, ecore_factory
+    ):
+        workers = (mock.Mock(), mock.Mock(), mock.Mock())
+        process_pipeline_mock.side_effect = workers
+        thread_spawn_worker_mock = mock.Mock()
+        ecore = ecore_factory(
+            group_spawn_workers={"io-1": thread_spawn_worker_mock},
+        )
+        setattr(
+            ecore,
+            "_ECore__pipelines",
+            {"cpu": mock.Mock(), "io-1": mock.Mock(), "io-2": mock.Mock()},
+        )
+
+        ecore.spawn_workers()
+
+        spawn_worker_mock.assert_has_calls(
+            [mock.call(workers[0]), mock.call(workers[2])]
+        )
+        thread_spawn_worker_mock.assert_called_once_with(workers[1])
+        spawn_worker_mock.finalize.assert_called_once_with()
+        thread_spawn_worker_mock.finalize.assert_called_once_with()
+
+    def test_spawn_workers_without_finalize(self, process_pipeline_mock, ecore_factory):
+        spawn_worker_mock = mock.Mock(spec=["__call__"])
+        ecore = ecore_factory(spawn_worker=spawn_worker_mock)
+        setattr(ecore, "_ECore__pipelines", {"group": mock.Mock()})
+
+        ecore.spawn_workers()
+
+        spawn_worker_mock.assert_called_once_with(process_pipeline_mock.return_value)
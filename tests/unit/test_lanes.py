@@ -0,0 +1,113 @@
+from unittest import mock
+
+import pytest
+
+from eventscore.ext.redis.lanes import LaneLeases
+
+
+@pytest.fixture
+def lanes_redis_mock(redis_mock):
+    redis_mock.pipeline.return_value.execute.return_value = [1, 0, 2, 1]
+    redis_mock.set.return_value = True
+    return redis_mock
+
+
+@pytest.fixture
+def renew_mock(lanes_redis_mock):
+    renew, release = mock.Mock(return_value=1), mock.Mock(return_value=1)
+    lanes_redis_mock.register_script.side_effect = [renew, release]
+    return renew, release
+
+
+@pytest.mark.unit
+class TestLaneLeases:
+    def test_init_invalid_ttl(self, lanes_redis_mock):
+        with pytest.raises(AssertionError):
+            LaneLeases(lanes_redis_mock, ttl=0)
+
+    def test_owned_claims_even_share(self, lanes_redis_mock, renew_mock):
+        leases = LaneLeases(lanes_redis_mock, ttl=3)
+
+        with mock.patch("eventscore.ext.redis.lanes.zlib.crc32", return_value=3):
+            owned = leases.owned("event", "group", "consumer", 4)
+
+        assert owned == [0, 3]
+        assert lanes_redis_mock.set.call_args_list == [
+            mock.call("eventscore:lanes:event:group:3", "consumer", nx=True, px=3000),
+            mock.call("eventscore:lanes:event:group:0", "consumer", nx=True, px=3000),
+        ]
+        lanes_redis_mock.pipeline.return_value.zadd.assert_called_once_with(
+            "eventscore:lanes:event:group:members", {"consumer": mock.ANY}
+        )
+
+    def test_owned_skips_taken_lanes(self, lanes_redis_mock, renew_mock):
+        lanes_redis_mock.set.side_effect = [False, True, False, True]
+        leases = LaneLeases(lanes_redis_mock)
+
+        with mock.patch("eventscore.ext.redis.lanes.zlib.crc32", return_value=0):
+            assert leases.owned("event", "group", "consumer", 4) == [1, 3]
+
+    def test_owned_cached(self, lanes_redis_mock, renew_mock):
+        leases = LaneLeases(lanes_redis_mock, ttl=3)
+
+        with mock.patch("eventscore.ext.redis.lanes.time.monotonic", return_value=0):
+            first = leases.owned("event", "group", "consumer", 4)
+        with mock.patch("eventscore.ext.redis.lanes.time.monotonic", return_value=0.5):
+            second = leases.owned("event", "group", "consumer", 4)
+
+        assert first == second
+        lanes_redis_mock.pipeline.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "busy,expected_owned,expected_released",
+        (((), [2, 3], [0, 1]), ({0, 1}, [0, 1], [2, 3])),
+        ids=("idle", "busy"),
+    )
+    def test_owned_releases_extra_lanes(
+        self,
+        busy,
+        expected_owned,
+        expected_released,
+        lanes_redis_mock,
+        renew_mock,
+    ):
+        _, release = renew_mock
+        lanes_redis_mock.pipeline.return_value.execute.return_value = [1, 0, 1, 1]
+        leases = LaneLeases(lanes_redis_mock, ttl=3)
+        with mock.patch("eventscore.ext.redis.lanes.time.monotonic", return_value=0):
+            assert leases.owned("event", "group", "consumer", 4) == [0, 1, 2, 3]
+
+        # NOTE: another consumer has joined the group
+        lanes_redis_mock.pipeline.return_value.execute.return_value = [1, 0, 2, 1]
+        with mock.patch("eventscore.ext.redis.lanes.time.monotonic", return_value=5):
+            owned = leases.owned("event", "group", "consumer", 4, busy=busy)
+
+        assert owned == expected_owned
+        assert release.call_args_list == [
+            mock.call(keys=[f"eventscore:lanes:event:group:{lane}"], args=["consumer"])
+            for lane in expected_released
+        ]
+
+    def test_owned_lost_lease(self, lanes_redis_mock, renew_mock):
+        renew, _ = renew_mock
+        leases = LaneLeases(lanes_redis_mock, ttl=3)
+        with mock.patch("eventscore.ext.redis.lanes.time.monotonic", return_value=0):
+            leases.owned("event", "group", "consumer", 4)
+
+        renew.return_value = 0
+        lanes_redis_mock.set.return_value = False
+        with mock.patch("eventscore.ext.redis.lanes.time.monotonic", return_value=5):
+            assert leases.owned("event", "group", "consumer", 4) == []
+
+    def test_release(self, lanes_redis_mock, renew_mock):
+        _, release = renew_mock
+        leases = LaneLeases(lanes_redis_mock)
+        with mock.patch("eventscore.ext.redis.lanes.zlib.crc32", return_value=0):
+            leases.owned("event", "group", "consumer", 4)
+
+        leases.release("event", "group", "consumer")
+
+        assert release.call_count == 2
+        lanes_redis_mock.zrem.assert_called_once_with(
+            "eventscore:lanes:event:group:members", "consumer"
+        )
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+from redis import ConnectionError
+
+from eventscore.ext.redis.maintenance import DelayedEventsMover, RetentionTask
+
+
+@pytest.mark.unit
+class TestRetentionTask:
+    @pytest.mark.parametrize("max_runs", (1, 3))
+    def test_run(self, max_runs):
+        stream = mock.Mock()
+        stream.trim.return_value = 1
+        stream_factory = mock.Mock(return_value=stream)
+        task = RetentionTask(
+            stream_factory, "first", "second", interval=5, max_runs=max_runs
+        )
+        stream_factory.assert_not_called()
+
+        with mock.patch("eventscore.ext.redis.maintenance.time.sleep") as sleep_mock:
+            task.run()
+
+        assert (
+            stream.trim.call_args_list
+            == [
+                mock.call("first"),
+                mock.call("second"),
+            ]
+            * max_runs
+        )
+        assert sleep_mock.call_args_list == [mock.call(5)] * (max_runs - 1)
+        # NOTE: stream is created once, on run
+        stream_factory.assert_called_once_with()
+
+    def test_run_error(self):
+        stream = mock.Mock()
+        stream.trim.side_effect = (ConnectionError, 1)
+        task = RetentionTask(
+            mock.Mock(return_value=stream), "first", "second", max_runs=1
+        )
+
+        task.run()
+
+        assert stream.trim.call_count == 2
+
+    @pytest.mark.parametrize(
+        "events,interval,max_runs",
+        (((), 1, 1), (("event",), -1, 1), (("event",), 1, 0)),
+        ids=("no-events", "negative-interval", "zero-max-runs"),
+    )
+    def test_init_invalid(self, events, interval, max_runs):
+        with pytest.raises(AssertionError):
+            RetentionTask(mock.Mock(), *events, interval=interval, max_runs=max_runs)
+
+
+@pytest.mark.unit
+class TestDelayedEventsMover:
+    def test_run(self):
+        stream = mock.Mock()
+        stream.move_due.side_effect = (10, 3, ConnectionError, 0)
+        stream_factory = mock.Mock(return_value=stream)
+        mover = DelayedEventsMover(
+            stream_factory, interval=2, batch_size=10, max_runs=4
+        )
+        stream_factory.assert_not_called()
+
+        with mock.patch("eventscore.ext.redis.maintenance.time.sleep") as sleep_mock:
+            mover.run()
+
+        assert stream.move_due.call_args_list == [mock.call(max_count=10)] * 4
+        # NOTE: full batch is followed by the next one at once
+        assert sleep_mock.call_args_list == [mock.call(2)] * 2
+        stream_factory.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        ({"interval": -1}, {"batch_size": 0}, {"max_runs": 0}),
+        ids=("negative-interval", "zero-batch-size", "zero-max-runs"),
+    )
+    def test_init_invalid(self, kwargs):
+        with pytest.raises(AssertionError):
+            DelayedEventsMover(mock.Mock(), **kwargs)
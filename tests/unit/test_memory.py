@@ -0,0 +1,217 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.runners import ObserverRunner
+from eventscore.core.streams import StreamFactory
+from eventscore.core.types import Event, EventStatus, GroupStats, RateLimit
+from eventscore.ext.memory.streams import InMemoryStream, MemoryBroker
+
+
+@pytest.fixture
+def memory_stream():
+    return InMemoryStream()
+
+
+@pytest.mark.unit
+class TestInMemoryStream:
+    def test_groups(self, memory_stream):
+        events = [Event(type="event") for _ in range(3)]
+        for group in ("first", "second"):
+            with pytest.raises(EmptyStreamError):
+                memory_stream.pop("event", group, block=False)
+        for event in events:
+            memory_stream.put(event)
+
+        assert memory_stream.pop_many("event", "first", max_count=2) == events[:2]
+        assert memory_stream.pop("event", "first") == events[2]
+        # NOTE: every group reads all events from its own cursor
+        assert memory_stream.pop_many("event", "second") == events
+        with pytest.raises(EmptyStreamError):
+            memory_stream.pop("event", "first", block=False)
+
+    def test_late_group(self, memory_stream):
+        events = [Event(type="event") for _ in range(3)]
+        _ = memory_stream.put_many(events)
+
+        assert memory_stream.pop_many("event", "first", max_count=2) == events[:2]
+        # NOTE: events delivered to all groups known so far are dropped
+        assert memory_stream.pop_many("event", "second") == events[2:]
+
+    def test_put_many(self, memory_stream):
+        events = [Event(type="first"), Event(type="second"), Event(type="first")]
+
+        results = memory_stream.put_many(events)
+
+        assert [result.status for result in results] == [EventStatus.SENT] * 3
+        assert memory_stream.pop_many("first", "group") == [events[0], events[2]]
+        assert memory_stream.pop_many("second", "group") == [events[1]]
+
+    def test_competing_consumers(self, memory_stream):
+        events = [Event(type="event") for _ in range(1000)]
+        popped = [[], []]
+
+        def consume(idx):
+            while True:
+                try:
+                    popped[idx].extend(
+                        memory_stream.pop_many("event", "group", max_count=7, timeout=0)
+                    )
+                except EmptyStreamError:
+                    return
+
+        _ = memory_stream.put_many(events)
+        threads = [threading.Thread(target=consume, args=(idx,)) for idx in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # NOTE: every event is delivered to a single consumer of group
+        assert len(popped[0]) + len(popped[1]) == len(events)
+        assert {event.uid for event in popped[0] + popped[1]} == {
+            event.uid for event in events
+        }
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_blocking(self, multi, memory_stream):
+        event = Event(type="second")
+        timer = threading.Timer(0.05, memory_stream.put, args=(event,))
+        timer.start()
+
+        if multi:
+            popped = memory_stream.pop_multi(("first", "second"), "group", timeout=5)
+        else:
+            popped = memory_stream.pop_many("second", "group", timeout=5)
+        timer.join()
+
+        assert popped == [event]
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_timeout(self, multi, memory_stream):
+        with pytest.raises(EmptyStreamError):
+            if multi:
+                memory_stream.pop_multi(("first", "second"), "group", timeout=0)
+            else:
+                memory_stream.pop("first", "group", timeout=0)
+
+    def test_pop_multi(self, memory_stream):
+        events = [Event(type="first"), Event(type="second"), Event(type="first")]
+        _ = memory_stream.put_many(events)
+
+        popped = memory_stream.pop_multi(("first", "second"), "group", max_count=1)
+
+        assert popped == events[:2]
+
+    def test_pending(self, memory_stream):
+        events = [Event(type="event") for _ in range(3)]
+        _ = memory_stream.put_many(events)
+
+        assert memory_stream.pop_many("event", "group", ack=False) == events
+        memory_stream.ack("event", "group", events[1])
+
+        assert memory_stream.group_stats("event", "group") == GroupStats(
+            lag=0, pending=2, consumers=1
+        )
+        assert memory_stream.reclaim("event", "group", min_idle=60) == []
+        assert memory_stream.reclaim("event", "group", min_idle=0, max_count=1) == [
+            events[0]
+        ]
+        # NOTE: reclaimed event is the latest delivered one now
+        assert memory_stream.reclaim("event", "group", min_idle=0) == [
+            events[2],
+            events[0],
+        ]
+
+    def test_group_stats(self, memory_stream):
+        _ = memory_stream.put_many([Event(type="event") for _ in range(5)])
+
+        assert memory_stream.group_stats("event", "group") == GroupStats()
+        memory_stream.pop_many("event", "group", max_count=2)
+        assert memory_stream.group_stats("event", "group") == GroupStats(
+            lag=3, pending=0, consumers=1
+        )
+
+    def test_retention(self, memory_stream):
+        _ = memory_stream.put_many([Event(type="event") for _ in range(10)])
+        memory_stream.pop_many("event", "second", max_count=6)
+        memory_stream.pop_many("event", "first", max_count=10)
+
+        # NOTE: events delivered to all groups are dropped
+        assert len(memory_stream.broker.topic("event").entries) == 4
+
+    def test_maxlen(self):
+        stream = InMemoryStream(maxlen=3)
+        events = [Event(type="event") for _ in range(5)]
+        _ = stream.put_many(events)
+
+        assert stream.pop_many("event", "group") == events[2:]
+
+    def test_schedule(self, memory_stream):
+        due, later = Event(type="event"), Event(type="event")
+        memory_stream.schedule(later, time.time() + 0.1)
+        memory_stream.schedule(due, time.time() - 1)
+
+        assert memory_stream.pop_many("event", "group", block=False) == [due]
+        with pytest.raises(EmptyStreamError):
+            memory_stream.pop("event", "group", block=False)
+        # NOTE: blocking pop waits for delayed event to be due
+        assert memory_stream.pop("event", "group", timeout=5) == later
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_schedule_blocking(self, multi, memory_stream):
+        event = Event(type="second")
+        timer = threading.Timer(
+            0.05, memory_stream.schedule, args=(event, time.time() + 0.1)
+        )
+        timer.start()
+        started = time.monotonic()
+
+        # NOTE: consumer waiting before event is scheduled is woken by schedule
+        if multi:
+            popped = memory_stream.pop_multi(("first", "second"), "group", timeout=5)
+        else:
+            popped = memory_stream.pop_many("second", "group", timeout=5)
+        timer.join()
+
+        assert popped == [event]
+        assert time.monotonic() - started < 1
+
+    def test_take_tokens(self, memory_stream):
+        with mock.patch(
+            "eventscore.ext.memory.streams.local_bucket"
+        ) as local_bucket_mock:
+            local_bucket_mock.return_value.take.return_value = (2, 0.0)
+            rate_limit = RateLimit(rate=1)
+
+            assert memory_stream.take_tokens("consumer", rate_limit, 2) == (2, 0.0)
+
+        local_bucket_mock.assert_called_once_with("consumer", rate_limit)
+
+    @pytest.mark.asyncio
+    async def test_apop_many(self, memory_stream):
+        event = Event(type="event")
+        await memory_stream.aput(event)
+
+        assert await memory_stream.apop_many("event", "group") == [event]
+        with pytest.raises(EmptyStreamError):
+            await memory_stream.apop_many("event", "group", block=False)
+
+    def test_shared_kwargs(self):
+        broker = MemoryBroker()
+
+        assert InMemoryStream.shared_kwargs(broker=broker) == {}
+        assert isinstance(InMemoryStream.shared_kwargs()["broker"], MemoryBroker)
+
+    def test_runner(self):
+        factory = StreamFactory(InMemoryStream, {})
+        events = [Event(type="event") for _ in range(3)]
+        _ = factory().put_many(events)
+        consumer = mock.Mock()
+
+        ObserverRunner(factory, "event", "group", consumer, max_events=3).run()
+
+        assert consumer.consume.call_args_list == [mock.call(event) for event in events]
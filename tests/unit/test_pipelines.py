@@ -8,7 +8,12 @@ from eventscore.core.exceptions import (
     UnrelatedConsumersError,
 )
 from eventscore.core.logging import logger as _logger
-from eventscore.core.types import PipelineItem, Worker
+from eventscore.core.pipelines import ProcessPipeline
+from eventscore.core.types import PipelineItem, RateLimit, RetryPolicy, Worker
+
+
+async def async_consumer_func(event):
+    pass
 
 
 @pytest.mark.unit
@@ -146,3 +151,159 @@ class TestProcessPipeline:
                 *[consumer_mock.return_value for _ in items],
                 logger=_logger,
             )
+
+    @pytest.mark.parametrize(
+        "runner_init_kwargs,expected_kwargs",
+        ((None, {}), ({}, {}), ({"pool_size": 4}, {"pool_size": 4})),
+        ids=("none-kwargs", "empty-kwargs", "pool-size-kwargs"),
+    )
+    def test_process_runner_init_kwargs(
+        self,
+        runner_init_kwargs,
+        expected_kwargs,
+        pipeline_factory,
+        ecore_mock,
+        consumer_mock,
+        runner_mock,
+    ):
+        item = PipelineItem(func=int, func_path="path", event="event", group="group")
+        process_pipeline = ProcessPipeline(
+            consumer_mock,
+            runner_mock,
+            runner_init_kwargs=runner_init_kwargs,
+        )
+
+        process_pipeline(pipeline_factory(items=[item]), ecore_mock)
+
+        runner_mock.assert_called_once_with(
+            ecore_mock.stream_factory,
+            "event",
+            "group",
+            consumer_mock.return_value,
+            logger=_logger,
+            **expected_kwargs,
+        )
+
+    @pytest.mark.parametrize(
+        "funcs",
+        ((async_consumer_func,), (async_consumer_func, int)),
+        ids=("async-consumer", "async-and-sync-consumers"),
+    )
+    def test_process_async(self, funcs, pipeline_factory, ecore_mock):
+        consumer_mock, runner_mock = mock.Mock(), mock.Mock()
+        async_consumer_mock, async_runner_mock = mock.Mock(), mock.Mock()
+        items = [
+            PipelineItem(func=func, func_path=str(idx), event="event", group="group")
+            for idx, func in enumerate(funcs)
+        ]
+        process_pipeline = ProcessPipeline(
+            consumer_mock,
+            runner_mock,
+            async_consumer_type=async_consumer_mock,
+            async_runner_type=async_runner_mock,
+            async_runner_init_kwargs={"max_in_flight": 10},
+        )
+
+        result = process_pipeline(pipeline_factory(items=items), ecore_mock)
+
+        assert result.runner == async_runner_mock.return_value
+        consumer_mock.assert_not_called()
+        runner_mock.assert_not_called()
+        async_consumer_mock.assert_has_calls(
+            [mock.call(func, logger=_logger) for func in funcs], any_order=True
+        )
+        async_runner_mock.assert_called_once_with(
+            ecore_mock.stream_factory,
+            "event",
+            "group",
+            *[async_consumer_mock.return_value for _ in funcs],
+            logger=_logger,
+            max_in_flight=10,
+        )
+
+    def test_process_retry(self, pipeline_factory, ecore_mock):
+        consumer_mock, runner_mock = mock.Mock(), mock.Mock()
+        retry = RetryPolicy()
+        items = [
+            PipelineItem(
+                func=int, func_path="int", event="event", group="group", retry=retry
+            ),
+        ]
+        process_pipeline = ProcessPipeline(consumer_mock, runner_mock)
+
+        process_pipeline(pipeline_factory(items=items), ecore_mock)
+
+        consumer_mock.assert_called_once_with(int, logger=_logger, retry=retry)
+
+    def test_process_async_retry(self, pipeline_factory, ecore_mock):
+        item = PipelineItem(
+            func=async_consumer_func,
+            func_path="a",
+            event="event",
+            group="group",
+            retry=RetryPolicy(),
+        )
+        process_pipeline = ProcessPipeline(mock.Mock(), mock.Mock())
+
+        with pytest.raises(AssertionError):
+            process_pipeline(pipeline_factory(items=[item]), ecore_mock)
+
+    def test_process_rate_limit(self, pipeline_factory, ecore_mock):
+        consumer_mock, runner_mock = mock.Mock(), mock.Mock()
+        rate_limit = RateLimit(rate=10)
+        item = PipelineItem(
+            func=int,
+            func_path="int",
+            event="event",
+            group="group",
+            rate_limit=rate_limit,
+        )
+        process_pipeline = ProcessPipeline(consumer_mock, runner_mock)
+
+        process_pipeline(pipeline_factory(items=[item]), ecore_mock)
+
+        consumer_mock.assert_called_once_with(
+            int, logger=_logger, rate_limit=rate_limit
+        )
+
+    def test_process_multi_event(self, pipeline_factory, ecore_mock):
+        consumer_mock, runner_mock = mock.Mock(), mock.Mock()
+        items = [
+            PipelineItem(func=int, func_path="int", event="event2", group="group"),
+            PipelineItem(func=str, func_path="str", event="event1", group="group"),
+        ]
+        process_pipeline = ProcessPipeline(consumer_mock, runner_mock, multi_event=True)
+
+        worker = process_pipeline(pipeline_factory(items=items), ecore_mock)
+
+        assert worker.runner == runner_mock.return_value
+        assert worker.weight == 2.0
+        assert worker.events == ("event1", "event2")
+        assert worker.group == "group"
+        consumer_mock.assert_has_calls(
+            [
+                mock.call(int, logger=_logger, event="event2"),
+                mock.call(str, logger=_logger, event="event1"),
+            ],
+            any_order=True,
+        )
+        runner_mock.assert_called_once_with(
+            ecore_mock.stream_factory,
+            ("event1", "event2"),
+            "group",
+            consumer_mock.return_value,
+            consumer_mock.return_value,
+            logger=_logger,
+        )
+
+    def test_process_multi_event_async(self, pipeline_factory, ecore_mock):
+        items = [
+            PipelineItem(
+                func=async_consumer_func, func_path="a", event="e1", group="group"
+            ),
+            PipelineItem(func=int, func_path="b", event="e2", group="group"),
+        ]
+        process_pipeline = ProcessPipeline(mock.Mock(), mock.Mock(), multi_event=True)
+
+        with pytest.raises(UnrelatedConsumersError):
+            process_pipeline(pipeline_factory(items=items), ecore_mock)
@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+from eventscore.core.pools import ThreadPool
+
+
+@pytest.mark.unit
+class TestThreadPool:
+    @pytest.mark.parametrize(
+        "size,maxsize,expected_error",
+        ((0, 0, True), (1, -1, True), (1, 0, False), (2, 4, False)),
+        ids=("zero-size", "negative-maxsize", "unbounded", "bounded"),
+    )
+    def test_init(self, size, maxsize, expected_error):
+        if expected_error:
+            with pytest.raises(AssertionError):
+                ThreadPool(size, maxsize=maxsize)
+        else:
+            pool = ThreadPool(size, maxsize=maxsize)
+
+            assert pool.size == size
+            assert pool.qsize == 0
+
+    @pytest.mark.parametrize("size", (1, 3), ids=("one-thread", "three-threads"))
+    def test_submit(self, size):
+        pool = ThreadPool(size)
+        idents = set()
+
+        def task(value):
+            idents.add(threading.get_ident())
+            return value * 2
+
+        futures = [pool.submit(task, value) for value in range(10)]
+        _ = wait(futures)
+        pool.shutdown()
+
+        assert [future.result() for future in futures] == [
+            value * 2 for value in range(10)
+        ]
+        # threads are reused between tasks
+        assert 0 < len(idents) <= size
+
+    def test_submit_exception(self):
+        pool = ThreadPool(1)
+
+        future = pool.submit(int, "not-a-number")
+        pool.shutdown()
+
+        assert isinstance(future.exception(), ValueError)
+
+    def test_queue_depth(self):
+        pool = ThreadPool(1, maxsize=2)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        first = pool.submit(block)
+        started.wait()
+        pending = [pool.submit(int, "1"), pool.submit(int, "2")]
+
+        assert pool.qsize == 2
+
+        release.set()
+        _ = wait([first, *pending])
+        pool.shutdown()
+
+        assert pool.qsize == 0
+
+    def test_submit_after_shutdown(self):
+        pool = ThreadPool(1)
+        pool.shutdown()
+
+        with pytest.raises(RuntimeError):
+            pool.submit(int, "1")
@@ -1,5 +1,13 @@
+import queue
+import threading
+from unittest import mock
+
 import pytest
 
+from eventscore.core.exceptions import BufferFullError, EventNotSentError
+from eventscore.core.producers import AsyncBatchingProducer
+from eventscore.core.types import BufferFullPolicy, Event, EventStatus, ProduceResult
+
 
 @pytest.mark.unit
 class TestProducer:
@@ -13,3 +21,228 @@ class TestProducer:
             block=block,
             timeout=timeout,
         )
+
+    @pytest.mark.parametrize(
+        "kwargs,expected_deliver_at",
+        (({"deliver_at": 150.0}, 150.0), ({"delay": 10}, 110.0)),
+        ids=("deliver-at", "delay"),
+    )
+    def test_produce_delayed(
+        self, kwargs, expected_deliver_at, ecore_mock, event, producer
+    ):
+        with mock.patch("eventscore.core.producers.time", return_value=100.0):
+            producer.produce(event, **kwargs)
+
+        ecore_mock.stream.schedule.assert_called_once_with(event, expected_deliver_at)
+        ecore_mock.stream.put.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        ({"deliver_at": 150.0, "delay": 10}, {"delay": -1}),
+        ids=("deliver-at-and-delay", "negative-delay"),
+    )
+    def test_produce_delayed_invalid(self, kwargs, ecore_mock, event, producer):
+        with pytest.raises(AssertionError):
+            producer.produce(event, **kwargs)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("block", (False, True), ids=("non-blocking", "blocking"))
+    @pytest.mark.parametrize("timeout", (0, 1), ids=("no-timeout", "timeout"))
+    async def test_aproduce(self, block, timeout, ecore_mock, event, producer):
+        ecore_mock.stream.aput = mock.AsyncMock()
+
+        await producer.aproduce(event, block=block, timeout=timeout)
+
+        ecore_mock.stream.aput.assert_awaited_once_with(
+            event=event,
+            block=block,
+            timeout=timeout,
+        )
+        ecore_mock.stream.put.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "statuses",
+        ((), (EventStatus.SENT,), (EventStatus.SENT, EventStatus.FAILED)),
+        ids=("no-events", "sent-event", "sent-and-failed-events"),
+    )
+    def test_produce_many(self, statuses, ecore_mock, producer):
+        events = [Event(type="event") for _ in statuses]
+        results = [
+            ProduceResult(event=event, status=status)
+            for event, status in zip(events, statuses)
+        ]
+        ecore_mock.stream.put_many.return_value = results
+
+        assert producer.produce_many(events, block=False, timeout=1) == results
+        ecore_mock.stream.put_many.assert_called_once_with(
+            events,
+            block=False,
+            timeout=1,
+        )
+
+
+def _sent(events, **kwargs):
+    return [ProduceResult(event=event, status=EventStatus.SENT) for event in events]
+
+
+@pytest.mark.unit
+class TestAsyncBatchingProducer:
+    @pytest.fixture
+    def make_producer(self, ecore_mock):
+        producers = []
+
+        def _make(**kwargs):
+            ecore_mock.stream.put_many.side_effect = _sent
+            kwargs.setdefault("flush_on_exit", False)
+            producer = AsyncBatchingProducer(ecore_mock, **kwargs)
+            producers.append(producer)
+            return producer
+
+        yield _make
+        for producer in producers:
+            producer.close()
+
+    def test_produce_blocking(self, ecore_mock, event, make_producer):
+        producer = make_producer()
+
+        producer.produce(event, block=True, timeout=1)
+
+        ecore_mock.stream.put_many.assert_called_once_with([event], block=True)
+
+    def test_produce_delayed(self, ecore_mock, event, make_producer):
+        producer = make_producer()
+
+        producer.produce(event, deliver_at=150.0)
+
+        # NOTE: delayed events bypass buffer
+        ecore_mock.stream.schedule.assert_called_once_with(event, 150.0)
+        assert producer.qsize == 0
+
+    def test_produce_non_blocking(self, ecore_mock, event, make_producer):
+        producer = make_producer()
+
+        producer.produce(event, block=False)
+
+        assert producer.flush(timeout=1)
+        ecore_mock.stream.put_many.assert_called_once_with([event], block=True)
+
+    def test_produce_failed(self, ecore_mock, event, make_producer):
+        producer = make_producer()
+        ecore_mock.stream.put_many.side_effect = ConnectionError
+
+        with pytest.raises(EventNotSentError):
+            producer.produce(event, block=True, timeout=1)
+
+    def test_micro_batching(self, ecore_mock, make_producer):
+        producer = make_producer(batch_size=3, linger=0.5)
+        events = [Event(type="event") for _ in range(7)]
+
+        results = producer.produce_many(events, block=True, timeout=5)
+
+        assert [result.event for result in results] == events
+        assert all(result.status == EventStatus.SENT for result in results)
+        assert [
+            len(call.args[0]) for call in ecore_mock.stream.put_many.call_args_list
+        ] == [3, 3, 1]
+
+    def test_produce_many_non_blocking(self, event, make_producer):
+        producer = make_producer()
+
+        results = producer.produce_many([event], block=False)
+
+        assert results == [ProduceResult(event=event, status=EventStatus.PENDING)]
+        assert producer.flush(timeout=1)
+
+    def test_submit_callback(self, event, make_producer):
+        callback = mock.Mock()
+        producer = make_producer(callback=callback)
+
+        result = producer.submit(event).result(timeout=1)
+
+        assert result == ProduceResult(event=event, status=EventStatus.SENT)
+        callback.assert_called_once_with(result)
+
+    @pytest.mark.parametrize(
+        "policy,raises",
+        (
+            (BufferFullPolicy.BLOCK, True),
+            (BufferFullPolicy.RAISE, True),
+            (BufferFullPolicy.DROP, False),
+        ),
+        ids=("block", "raise", "drop"),
+    )
+    def test_buffer_full(self, policy, raises, ecore_mock, make_producer):
+        sending = threading.Event()
+        release = threading.Event()
+
+        def put_many(events, **kwargs):
+            sending.set()
+            release.wait(5)
+            return _sent(events)
+
+        producer = make_producer(buffer_size=1, on_buffer_full=policy)
+        ecore_mock.stream.put_many.side_effect = put_many
+        producer.submit(Event(type="event"))
+        assert sending.wait(1)
+        producer.submit(Event(type="event"))
+
+        try:
+            if raises:
+                with pytest.raises(BufferFullError):
+                    producer.submit(Event(type="event"), timeout=0)
+            else:
+                result = producer.submit(Event(type="event")).result(timeout=1)
+                assert result.status == EventStatus.FAILED
+                assert isinstance(result.error, queue.Full)
+        finally:
+            release.set()
+        assert producer.flush(timeout=1)
+
+    def test_close(self, ecore_mock, event, make_producer):
+        producer = make_producer(linger=10, batch_size=10)
+        producer.produce(event, block=False)
+
+        producer.close()
+
+        ecore_mock.stream.put_many.assert_called_once_with([event], block=True)
+        with pytest.raises(RuntimeError):
+            producer.produce(event)
+
+    def test_close_racing_submit(self, ecore_mock, make_producer):
+        sending = threading.Event()
+        release = threading.Event()
+
+        def put_many(events, **kwargs):
+            sending.set()
+            release.wait(5)
+            return _sent(events)
+
+        producer = make_producer(buffer_size=1)
+        ecore_mock.stream.put_many.side_effect = put_many
+        futures = [producer.submit(Event(type="event"))]
+        assert sending.wait(1)
+        futures.append(producer.submit(Event(type="event")))
+        # NOTE: submit waits for a free slot, while close is called
+        submitting = threading.Thread(
+            target=lambda: futures.append(producer.submit(Event(type="event")))
+        )
+        submitting.start()
+        closing = threading.Thread(target=producer.close)
+        closing.start()
+
+        release.set()
+        submitting.join(5)
+        closing.join(5)
+
+        assert len(futures) == 3
+        assert [future.result(timeout=1).status for future in futures] == [
+            EventStatus.SENT
+        ] * 3
+
+    @pytest.mark.asyncio
+    async def test_aproduce(self, ecore_mock, event, make_producer):
+        producer = make_producer()
+
+        await producer.aproduce(event, block=True, timeout=1)
+
+        ecore_mock.stream.put_many.assert_called_once_with([event], block=True)
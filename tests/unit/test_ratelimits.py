@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+
+from eventscore.core.exceptions import UnsupportedOperationError
+from eventscore.core.ratelimits import RateLimiter, TokenBucket, local_bucket
+from eventscore.core.types import RateLimit
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    def test_take(self):
+        with mock.patch(
+            "eventscore.core.ratelimits.time.monotonic", side_effect=(0, 0, 0, 1.5)
+        ):
+            bucket = TokenBucket(RateLimit(rate=2, burst=4))
+
+            assert bucket.take(3) == (3, 0.0)
+            assert bucket.take(3) == (1, 0.0)
+            # NOTE: 0.5 second left till the next token
+            assert bucket.take(3) == (3, 0.0)
+
+    def test_take_exceeded(self):
+        with mock.patch(
+            "eventscore.core.ratelimits.time.monotonic", side_effect=(0, 0, 0.25)
+        ):
+            bucket = TokenBucket(RateLimit(rate=2, burst=1))
+
+            assert bucket.take(1) == (1, 0.0)
+            assert bucket.take(1) == (0, 0.25)
+
+    def test_local_bucket(self):
+        rate_limit = RateLimit(rate=1)
+
+        assert local_bucket("a", rate_limit) is local_bucket("a", rate_limit)
+        assert local_bucket("a", rate_limit) is not local_bucket("b", rate_limit)
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    def test_acquire(self):
+        stream = mock.Mock()
+        stream.take_tokens.side_effect = [(0, 0.3), (3, 0.0), (3, 0.0)]
+        rate_limit = RateLimit(rate=10, prefetch=3)
+        limiter = RateLimiter(stream, "consumer", rate_limit)
+
+        with mock.patch("eventscore.core.ratelimits.time.sleep") as sleep_mock:
+            for _ in range(4):
+                limiter.acquire()
+
+        assert (
+            stream.take_tokens.call_args_list
+            == [mock.call("consumer", rate_limit, 3)] * 3
+        )
+        sleep_mock.assert_called_once_with(0.3)
+
+    def test_acquire_prefetch_above_capacity(self):
+        stream = mock.Mock()
+        stream.take_tokens.return_value = (1, 0.0)
+        rate_limit = RateLimit(rate=1, prefetch=10)
+
+        RateLimiter(stream, "consumer", rate_limit).acquire()
+
+        stream.take_tokens.assert_called_once_with("consumer", rate_limit, 1)
+
+    def test_acquire_local(self):
+        stream = mock.Mock()
+        stream.take_tokens.side_effect = UnsupportedOperationError
+        limiter = RateLimiter(stream, "local-consumer", RateLimit(rate=1, burst=2))
+
+        with mock.patch("eventscore.core.ratelimits.time.sleep") as sleep_mock:
+            for _ in range(2):
+                limiter.acquire()
+
+        # NOTE: stream is asked once, then bucket of process is used
+        stream.take_tokens.assert_called_once()
+        sleep_mock.assert_not_called()
@@ -0,0 +1,150 @@
+from unittest import mock
+
+import pytest
+
+from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.retries import (
+    ATTEMPT_HEADER,
+    CONSUMER_HEADER,
+    ERROR_HEADER,
+    GROUP_HEADER,
+    REDRIVE_GROUP,
+    TYPE_HEADER,
+    DeadLetterRedrive,
+    dead_letter_event,
+    dead_letter_stream,
+    redriven_event,
+    retry_event,
+)
+from eventscore.core.types import Event, EventStatus, ProduceResult
+
+
+@pytest.fixture
+def failed_consumer():
+    consumer = mock.Mock()
+    consumer.name = "consumer"
+    return consumer
+
+
+@pytest.mark.unit
+class TestRetries:
+    def test_retry_event(self, failed_consumer):
+        event = Event(type="event", headers={"trace": "id"})
+
+        retried = retry_event(event, "group", failed_consumer, ValueError("x"), 2)
+
+        assert retried.uid == event.uid
+        assert retried.type == "event"
+        assert retried.headers == {
+            "trace": "id",
+            ATTEMPT_HEADER: 2,
+            GROUP_HEADER: "group",
+            CONSUMER_HEADER: "consumer",
+            ERROR_HEADER: "ValueError('x')",
+        }
+
+    def test_dead_letter_event(self, failed_consumer):
+        event = Event(type="event", headers={ATTEMPT_HEADER: 3})
+
+        dead = dead_letter_event(event, "group", failed_consumer, ValueError("x"))
+
+        assert dead.uid == event.uid
+        assert dead.type == dead_letter_stream("group") == "eventscore.dlq.group"
+        assert dead.headers == {
+            ATTEMPT_HEADER: 3,
+            GROUP_HEADER: "group",
+            CONSUMER_HEADER: "consumer",
+            ERROR_HEADER: "ValueError('x')",
+            TYPE_HEADER: "event",
+        }
+
+    def test_redriven_event(self, failed_consumer):
+        event = Event(type="event", headers={ATTEMPT_HEADER: 3})
+        dead = dead_letter_event(event, "group", failed_consumer, ValueError())
+
+        redriven = redriven_event(dead)
+
+        assert redriven.uid == event.uid
+        assert redriven.type == "event"
+        # NOTE: redriven event is still consumed by the failed consumer only
+        assert redriven.headers == {
+            GROUP_HEADER: "group",
+            CONSUMER_HEADER: "consumer",
+        }
+
+
+@pytest.mark.unit
+class TestDeadLetterRedrive:
+    @pytest.mark.parametrize(
+        "kwargs",
+        ({"rate": 0}, {"batch_size": 0}, {"max_events": 0}),
+        ids=("zero-rate", "zero-batch-size", "zero-max-events"),
+    )
+    def test_init_invalid(self, kwargs):
+        with pytest.raises(AssertionError):
+            DeadLetterRedrive(mock.Mock(), "group", **kwargs)
+
+    def test_run(self, failed_consumer):
+        dead = [
+            dead_letter_event(Event(type="event"), "group", failed_consumer, error)
+            for error in (ValueError(), TypeError(), KeyError())
+        ]
+        stream = mock.Mock()
+        stream.pop_many.side_effect = (dead[:2], dead[2:], EmptyStreamError)
+        stream.put_many.side_effect = (
+            [
+                ProduceResult(event=event, status=EventStatus.PENDING)
+                for event in dead[:2]
+            ],
+            [ProduceResult(event=dead[2], status=EventStatus.FAILED)],
+        )
+        stream_factory = mock.Mock(return_value=stream)
+        redrive = DeadLetterRedrive(stream_factory, "group", rate=1000, batch_size=2)
+        stream_factory.assert_not_called()
+
+        redrive.run()
+
+        assert (
+            stream.pop_many.call_args_list
+            == [
+                mock.call(
+                    "eventscore.dlq.group",
+                    REDRIVE_GROUP,
+                    max_count=2,
+                    block=False,
+                    ack=False,
+                )
+            ]
+            * 3
+        )
+        redriven = [
+            event for call in stream.put_many.call_args_list for event in call.args[0]
+        ]
+        assert [event.uid for event in redriven] == [event.uid for event in dead]
+        assert all(event.type == "event" for event in redriven)
+        # NOTE: event failed to be redriven is left pending
+        stream.ack.assert_called_once_with(
+            "eventscore.dlq.group", REDRIVE_GROUP, *dead[:2]
+        )
+        stream.flush.assert_called_once_with()
+        stream_factory.assert_called_once_with()
+
+    def test_run_limited(self, failed_consumer):
+        dead = dead_letter_event(
+            Event(type="event"), "group", failed_consumer, ValueError()
+        )
+        stream = mock.Mock()
+        stream.pop_many.return_value = [dead]
+        stream.put_many.return_value = [
+            ProduceResult(event=dead, status=EventStatus.PENDING)
+        ]
+
+        with mock.patch("eventscore.core.retries.time.sleep") as sleep_mock:
+            DeadLetterRedrive(
+                mock.Mock(return_value=stream), "group", rate=1, max_events=2
+            ).run()
+
+        assert stream.pop_many.call_count == 2
+        assert stream.pop_many.call_args.kwargs["max_count"] == 1
+        # NOTE: redrive is paced by rate
+        assert sleep_mock.call_count == 2
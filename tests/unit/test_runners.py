@@ -1,8 +1,24 @@
+import asyncio
+import copy
+import threading
 from unittest import mock
 
 import pytest
 
-from eventscore.core.exceptions import EmptyStreamError
+from eventscore.core.exceptions import EmptyStreamError, UnsupportedOperationError
+from eventscore.core.retries import (
+    ATTEMPT_HEADER,
+    CONSUMER_HEADER,
+    ERROR_HEADER,
+    GROUP_HEADER,
+    TYPE_HEADER,
+)
+from eventscore.core.runners import AsyncObserverRunner, ObserverRunner
+from eventscore.core.types import DeliverySemantic, Event, RateLimit, RetryPolicy
+
+# NOTE: events are compared by their uid, so they are created once
+E0, E1, E2, E3, E4 = (Event(type="event") for _ in range(5))
+R1, R2, R3 = (Event(type="event") for _ in range(3))
 
 
 @pytest.mark.unit
@@ -54,13 +70,13 @@ class TestObserverRunner:
         # NOTE: max_events must be <= len(events), otherwise infinite loop will be started.
         # TODO: some tests with timeouts to test infinite loops could be considered.
         (
-            (["event"], 1, 1),
-            (["e1", "e2"], 1, 1),
-            (["e1", "e2"], 2, 2),
-            (["event", EmptyStreamError], 1, 1),
-            ([EmptyStreamError, "event"], 1, 1),
-            (["e1", EmptyStreamError, "e2"], 1, 1),
-            (["e1", EmptyStreamError, "e2"], 2, 2),
+            ([E0], 1, 1),
+            ([E1, E2], 1, 1),
+            ([E1, E2], 2, 2),
+            ([E0, EmptyStreamError], 1, 1),
+            ([EmptyStreamError, E0], 1, 1),
+            ([E1, EmptyStreamError, E2], 1, 1),
+            ([E1, EmptyStreamError, E2], 2, 2),
         ),
         ids=(
             "event--one-event-limit",
@@ -156,3 +172,753 @@ class TestObserverRunner:
         threading_mock.Thread.assert_has_calls(expected_thread_calls)
         threading_thread_mock.start.assert_has_calls(expected_start_calls)
         threading_thread_mock.join.assert_has_calls(expected_join_calls)
+
+    @pytest.mark.parametrize(
+        "pool_size,expected_error",
+        ((-1, True), (0, False), (1, False), (4, False)),
+        ids=("negative-pool-size", "no-pool", "one-thread-pool", "four-threads-pool"),
+    )
+    def test_init_pool_size(self, pool_size, expected_error, stream_factory_mock):
+        if expected_error:
+            with pytest.raises(AssertionError):
+                ObserverRunner(
+                    stream_factory_mock,
+                    "event",
+                    "group",
+                    mock.Mock(),
+                    pool_size=pool_size,
+                )
+        else:
+            runner = ObserverRunner(
+                stream_factory_mock,
+                "event",
+                "group",
+                mock.Mock(),
+                pool_size=pool_size,
+            )
+
+            assert runner.queue_depth == 0
+
+    @pytest.mark.parametrize("events_count", (1, 3), ids=("one-event", "three-events"))
+    @pytest.mark.parametrize(
+        "consumers_count",
+        (1, 3),
+        ids=("one-consumer", "three-consumers"),
+    )
+    @pytest.mark.parametrize("pool_size", (1, 2), ids=("one-thread", "two-threads"))
+    def test_run_pool(
+        self,
+        events_count,
+        consumers_count,
+        pool_size,
+        stream_mock,
+        stream_factory_mock,
+        threading_mock,
+    ):
+        events = [Event(type="event") for _ in range(events_count)]
+        stream_mock.pop.side_effect = events
+        consumers = [mock.Mock() for _ in range(consumers_count)]
+        consumers[0].consume.side_effect = ValueError  # must not stop the runner
+
+        with mock.patch("eventscore.core.runners.threading", threading_mock):
+            runner = ObserverRunner(
+                stream_factory_mock,
+                "event",
+                "group",
+                *consumers,
+                max_events=events_count,
+                pool_size=pool_size,
+            )
+            runner.run()
+
+        threading_mock.Thread.assert_not_called()
+        for consumer in consumers:
+            consumer.consume.assert_has_calls([mock.call(event) for event in events])
+        assert runner.queue_depth == 0
+
+    @pytest.mark.parametrize(
+        "batches,max_events,batch_size,expected_max_counts",
+        (
+            ([[E1, E2]], 2, 2, [2]),
+            ([[E1, E2], [E3]], 3, 2, [2, 1]),
+            ([[E1], EmptyStreamError, [E2, E3]], 3, 4, [3, 2, 2]),
+        ),
+        ids=("single-batch", "limited-last-batch", "empty-between-batches"),
+    )
+    def test_run_batch(
+        self,
+        batches,
+        max_events,
+        batch_size,
+        expected_max_counts,
+        stream_mock,
+        stream_factory_mock,
+    ):
+        stream_mock.pop_many.side_effect = batches
+        consumer = mock.Mock()
+
+        ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            consumer,
+            max_events=max_events,
+            batch_size=batch_size,
+        ).run()
+
+        stream_mock.pop.assert_not_called()
+        stream_mock.pop_many.assert_has_calls(
+            [
+                mock.call("event", "group", max_count=max_count, block=True)
+                for max_count in expected_max_counts
+            ]
+        )
+        consumer.consume.assert_has_calls(
+            [
+                mock.call(event)
+                for batch in batches
+                if batch is not EmptyStreamError
+                for event in batch
+            ]
+        )
+
+    def test_init_exactly_once(self, stream_factory_mock):
+        with pytest.raises(AssertionError):
+            ObserverRunner(
+                stream_factory_mock,
+                "event",
+                "group",
+                mock.Mock(),
+                delivery_semantic=DeliverySemantic.EXACTLY_ONCE,
+            )
+
+    @pytest.mark.parametrize("pool_size", (0, 2), ids=("threads", "pool"))
+    def test_run_at_least_once(self, pool_size, stream_mock, stream_factory_mock):
+        stream_mock.reclaim.return_value = []
+        stream_mock.pop_many.side_effect = [[E1, E2, E3], [E4]]
+        consumers = [mock.Mock(), mock.Mock()]
+        consumers[1].consume.side_effect = lambda event: event == E2 and 1 / 0
+
+        ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            *consumers,
+            max_events=4,
+            batch_size=3,
+            pool_size=pool_size,
+            delivery_semantic=DeliverySemantic.AT_LEAST_ONCE,
+            reclaim_interval=60,
+        ).run()
+
+        stream_mock.reclaim.assert_called_once_with(
+            "event", "group", min_idle=60.0, max_count=3
+        )
+        stream_mock.pop_many.assert_has_calls(
+            [
+                mock.call("event", "group", max_count=3, block=True, ack=False),
+                mock.call("event", "group", max_count=1, block=True, ack=False),
+            ]
+        )
+        assert stream_mock.ack.call_args_list == [
+            mock.call("event", "group", E1, E3),
+            mock.call("event", "group", E4),
+        ]
+
+    @pytest.mark.parametrize(
+        "reclaimed,expected_reclaim_calls",
+        (([[R1]], 1), ([[R1, R2], [R3]], 2)),
+        ids=("partial-batch", "full-batch"),
+    )
+    def test_run_at_least_once_reclaim(
+        self,
+        reclaimed,
+        expected_reclaim_calls,
+        stream_mock,
+        stream_factory_mock,
+    ):
+        stream_mock.reclaim.side_effect = reclaimed
+        stream_mock.pop_many.side_effect = lambda *args, **kwargs: [E0]
+        consumer = mock.Mock()
+
+        ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            consumer,
+            max_events=4,
+            batch_size=2,
+            delivery_semantic=DeliverySemantic.AT_LEAST_ONCE,
+        ).run()
+
+        assert stream_mock.reclaim.call_count == expected_reclaim_calls
+        consumer.consume.assert_has_calls(
+            [mock.call(event) for batch in reclaimed for event in batch]
+        )
+        stream_mock.ack.assert_has_calls(
+            [mock.call("event", "group", *batch) for batch in reclaimed]
+        )
+
+    @pytest.mark.parametrize(
+        "delivery_semantic",
+        (DeliverySemantic.AT_MOST_ONCE, DeliverySemantic.AT_LEAST_ONCE),
+        ids=("at-most-once", "at-least-once"),
+    )
+    @pytest.mark.parametrize("prefetch", (1, 10), ids=("one", "ten"))
+    def test_run_prefetch(
+        self,
+        prefetch,
+        delivery_semantic,
+        stream_mock,
+        stream_factory_mock,
+    ):
+        stream_mock.reclaim.return_value = []
+        stream_mock.pop_many.side_effect = [[E1, E2], EmptyStreamError, [E3]]
+        consumer = mock.Mock()
+        consumer.consume.side_effect = lambda event: event == E2 and 1 / 0
+
+        ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            consumer,
+            max_events=3,
+            batch_size=2,
+            pool_size=1,
+            prefetch=prefetch,
+            delivery_semantic=delivery_semantic,
+        ).run()
+
+        consumer.consume.assert_has_calls([mock.call(E1), mock.call(E2)])
+        consumer.consume.assert_called_with(E3)
+        assert stream_mock.pop_many.call_count == 3
+        acked = [
+            event for call in stream_mock.ack.call_args_list for event in call.args[2:]
+        ]
+        if delivery_semantic == DeliverySemantic.AT_LEAST_ONCE:
+            assert acked == [E1, E3]
+        else:
+            assert acked == []
+        stream_mock.flush.assert_called_once_with()
+
+    def test_run_prefetch_error(self, stream_mock, stream_factory_mock):
+        stream_mock.pop.side_effect = [E1, ConnectionError]
+        consumer = mock.Mock()
+
+        with pytest.raises(ConnectionError):
+            ObserverRunner(
+                stream_factory_mock, "event", "group", consumer, prefetch=5
+            ).run()
+
+        consumer.consume.assert_called_once_with(E1)
+        stream_mock.flush.assert_called_once_with()
+
+    @pytest.mark.parametrize("prefetch", (0, 3), ids=("no-prefetch", "prefetch"))
+    def test_stop(self, prefetch, stream_mock, stream_factory_mock):
+        popped = []
+
+        def pop(*args, **kwargs):
+            popped.append(Event(type="event"))
+            return popped[-1]
+
+        stream_mock.pop.side_effect = pop
+        consumer = mock.Mock()
+        runner = ObserverRunner(
+            stream_factory_mock, "event", "group", consumer, prefetch=prefetch
+        )
+        consumer.consume.side_effect = lambda event: runner.stop()
+
+        runner.run()
+
+        # NOTE: every popped event is consumed before runner stops
+        consumer.consume.assert_has_calls([mock.call(event) for event in popped])
+        assert len(popped) <= prefetch + 2
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        ({}, {"prefetch": 3}, {"independent_consumers": True}),
+        ids=("no-prefetch", "prefetch", "independent-consumers"),
+    )
+    def test_stop_before_run(self, kwargs, stream_mock, stream_factory_mock):
+        stream_mock.pop.side_effect = ConnectionError
+        consumer = mock.Mock()
+        runner = ObserverRunner(
+            stream_factory_mock, "event", "group", consumer, **kwargs
+        )
+
+        runner.stop()
+        runner.run()
+
+        stream_mock.pop.assert_not_called()
+        consumer.consume.assert_not_called()
+
+    def test_stop_copy(self, stream_mock, stream_factory_mock):
+        stream_mock.pop.side_effect = [E1, ConnectionError]
+        consumer = mock.Mock()
+        runner = ObserverRunner(stream_factory_mock, "event", "group", consumer)
+        runner.stop()
+
+        with pytest.raises(ConnectionError):
+            copy.copy(runner).run()
+
+        consumer.consume.assert_called_once_with(E1)
+
+    @pytest.mark.parametrize(
+        "delivery_semantic",
+        (DeliverySemantic.AT_MOST_ONCE, DeliverySemantic.AT_LEAST_ONCE),
+        ids=("at-most-once", "at-least-once"),
+    )
+    def test_run_multi_event(
+        self,
+        delivery_semantic,
+        stream_mock,
+        stream_factory_mock,
+    ):
+        events = [Event(type="e1"), Event(type="e2"), Event(type="e1")]
+        stream_mock.reclaim.return_value = []
+        stream_mock.pop_multi.return_value = events
+        e1_consumer, e2_consumer = mock.Mock(event="e1"), mock.Mock(event="e2")
+        any_consumer = mock.Mock(event=None)
+
+        ObserverRunner(
+            stream_factory_mock,
+            ("e1", "e2"),
+            "group",
+            e1_consumer,
+            e2_consumer,
+            any_consumer,
+            max_events=3,
+            batch_size=5,
+            pool_size=1,
+            delivery_semantic=delivery_semantic,
+        ).run()
+
+        expected_kwargs = (
+            {"ack": False}
+            if delivery_semantic == DeliverySemantic.AT_LEAST_ONCE
+            else {}
+        )
+        stream_mock.pop_multi.assert_called_once_with(
+            ("e1", "e2"), "group", max_count=3, block=True, **expected_kwargs
+        )
+        stream_mock.pop.assert_not_called()
+        stream_mock.pop_many.assert_not_called()
+        assert e1_consumer.consume.call_args_list == [
+            mock.call(events[0]),
+            mock.call(events[2]),
+        ]
+        e2_consumer.consume.assert_called_once_with(events[1])
+        assert any_consumer.consume.call_args_list == [
+            mock.call(event) for event in events
+        ]
+        if delivery_semantic == DeliverySemantic.AT_LEAST_ONCE:
+            assert stream_mock.ack.call_args_list == [
+                mock.call("e1", "group", events[0], events[2]),
+                mock.call("e2", "group", events[1]),
+            ]
+        else:
+            stream_mock.ack.assert_not_called()
+
+    def test_run_independent_consumers(self, stream_factory_mock):
+        streams = {}
+
+        def stream_factory():
+            stream = mock.Mock()
+            stream.pop.side_effect = lambda event, group, **kwargs: Event(type=event)
+            streams[threading.get_ident()] = stream
+            return stream
+
+        stream_factory_mock.side_effect = stream_factory
+        fast_done = threading.Event()
+        fast = mock.Mock(event=None)
+        fast.name = "fast"
+        slow = mock.Mock(event=None)
+        slow.name = "slow"
+        slow.consume.side_effect = lambda event: fast_done.wait(5)
+
+        def consume_fast(event):
+            if fast.consume.call_count == 3:
+                fast_done.set()
+
+        fast.consume.side_effect = consume_fast
+
+        ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            fast,
+            slow,
+            max_events=3,
+            independent_consumers=True,
+        ).run()
+
+        # NOTE: fast consumer has consumed all its events
+        # while slow one was still consuming the first one.
+        assert fast_done.is_set()
+        assert fast.consume.call_count == 3
+        assert slow.consume.call_count == 3
+        assert (
+            sorted(
+                call.args[1]
+                for stream in streams.values()
+                for call in stream.pop.mock_calls
+            )
+            == ["group:fast"] * 3 + ["group:slow"] * 3
+        )
+        for stream in streams.values():
+            stream.flush.assert_called_once_with()
+
+    def test_run_independent_consumers_multi_event(
+        self, stream_mock, stream_factory_mock
+    ):
+        e1_consumer = mock.Mock(event="e1")
+        e1_consumer.name = "e1"
+        any_consumer = mock.Mock(event=None)
+        any_consumer.name = "any"
+        stream_mock.pop_multi.return_value = [Event(type="e1")]
+
+        ObserverRunner(
+            stream_factory_mock,
+            ("e1", "e2"),
+            "group",
+            e1_consumer,
+            any_consumer,
+            max_events=1,
+            independent_consumers=True,
+        ).run()
+
+        stream_mock.pop.assert_called_once_with("e1", "group:e1", block=True)
+        stream_mock.pop_multi.assert_called_once_with(
+            ("e1", "e2"), "group:any", max_count=1, block=True
+        )
+
+    def test_run_independent_consumers_error(self, stream_factory_mock):
+        failing_stream, stream = mock.Mock(), mock.Mock()
+        failing_stream.pop.side_effect = ConnectionError
+        stream_factory_mock.side_effect = [failing_stream, stream]
+        consumers = [mock.Mock(event=None), mock.Mock(event=None)]
+        runner = ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            *consumers,
+            independent_consumers=True,
+        )
+
+        with pytest.raises(ConnectionError):
+            runner.run()
+
+        # NOTE: other consumer is stopped along with the failed one
+        stream.flush.assert_called_once_with()
+
+    @pytest.mark.parametrize("pool_size", (0, 2), ids=("threads", "pool"))
+    @mock.patch("eventscore.core.runners.time.time", return_value=100.0)
+    def test_run_retry(self, _, pool_size, stream_mock, stream_factory_mock):
+        stream_mock.pop.side_effect = [E1]
+        error = ValueError("failed")
+        consumer = mock.Mock(retry=RetryPolicy(backoff=2.0, jitter=0))
+        consumer.name = "consumer"
+        consumer.consume.side_effect = error
+
+        ObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            consumer,
+            max_events=1,
+            pool_size=pool_size,
+        ).run()
+
+        stream_mock.schedule.assert_called_once()
+        retried, deliver_at = stream_mock.schedule.call_args.args
+        assert deliver_at == 102.0
+        assert retried.uid == E1.uid
+        assert retried.headers == {
+            ATTEMPT_HEADER: 2,
+            GROUP_HEADER: "group",
+            CONSUMER_HEADER: "consumer",
+            ERROR_HEADER: repr(error),
+        }
+        stream_mock.put.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "attempt,schedule_error",
+        ((3, None), (1, UnsupportedOperationError)),
+        ids=("attempts-exhausted", "delay-unsupported"),
+    )
+    def test_run_dead_letter(
+        self, attempt, schedule_error, stream_mock, stream_factory_mock
+    ):
+        event = Event(type="event", headers={ATTEMPT_HEADER: attempt})
+        stream_mock.pop.side_effect = [event]
+        stream_mock.schedule.side_effect = schedule_error
+        consumer = mock.Mock(retry=RetryPolicy(max_attempts=3))
+        consumer.name = "consumer"
+        consumer.consume.side_effect = ValueError
+
+        ObserverRunner(
+            stream_factory_mock, "event", "group", consumer, max_events=1
+        ).run()
+
+        stream_mock.put.assert_called_once()
+        (dead,) = stream_mock.put.call_args.args
+        assert dead.uid == event.uid
+        assert dead.type == "eventscore.dlq.group"
+        assert dead.headers[TYPE_HEADER] == "event"
+        assert dead.headers[CONSUMER_HEADER] == "consumer"
+
+    def test_run_retry_targets(self, stream_mock, stream_factory_mock):
+        other = Event(type="event", headers={GROUP_HEADER: "other"})
+        retried = Event(
+            type="event", headers={GROUP_HEADER: "group", CONSUMER_HEADER: "b"}
+        )
+        stream_mock.pop.side_effect = [other, retried]
+        consumers = [mock.Mock(), mock.Mock()]
+        consumers[0].name, consumers[1].name = "a", "b"
+
+        ObserverRunner(
+            stream_factory_mock, "event", "group", *consumers, max_events=2
+        ).run()
+
+        # NOTE: event retried by another group is skipped, retried one is
+        # consumed by the failed consumer only.
+        consumers[0].consume.assert_not_called()
+        consumers[1].consume.assert_called_once_with(retried)
+
+    @pytest.mark.parametrize("pool_size", (0, 2), ids=("threads", "pool"))
+    def test_run_rate_limit(self, pool_size, stream_mock, stream_factory_mock):
+        stream_mock.pop.side_effect = [E1, E2, E3]
+        stream_mock.take_tokens.side_effect = [(0, 0.5), (2, 0.0), (1, 0.0)]
+        rate_limit = RateLimit(rate=100, prefetch=2)
+        limited = mock.Mock(rate_limit=rate_limit)
+        limited.name = "limited"
+        free = mock.Mock(rate_limit=None)
+
+        with mock.patch("eventscore.core.ratelimits.time.sleep") as sleep_mock:
+            ObserverRunner(
+                stream_factory_mock,
+                "event",
+                "group",
+                limited,
+                free,
+                max_events=3,
+                pool_size=pool_size,
+            ).run()
+
+        # NOTE: tokens are taken in batches, one per event is spent
+        assert (
+            stream_mock.take_tokens.call_args_list
+            == [mock.call("limited", rate_limit, 2)] * 3
+        )
+        sleep_mock.assert_called_once_with(0.5)
+        assert limited.consume.call_args_list == [
+            mock.call(E1),
+            mock.call(E2),
+            mock.call(E3),
+        ]
+        assert free.consume.call_count == 3
+
+    def test_run_prefetch_side_streams(self, stream_factory_mock):
+        streams = [mock.Mock(), mock.Mock(), mock.Mock()]
+        stream_factory_mock.side_effect = streams
+        streams[0].pop.side_effect = [E1]
+        streams[1].take_tokens.return_value = (1, 0.0)
+        consumer = mock.Mock(
+            retry=RetryPolicy(jitter=0), rate_limit=RateLimit(rate=100)
+        )
+        consumer.name = "consumer"
+        consumer.consume.side_effect = ValueError
+
+        ObserverRunner(
+            stream_factory_mock, "event", "group", consumer, max_events=1, prefetch=5
+        ).run()
+
+        # NOTE: reader stream is not used by other threads
+        streams[0].take_tokens.assert_not_called()
+        streams[0].schedule.assert_not_called()
+        streams[1].take_tokens.assert_called_once()
+        streams[2].schedule.assert_called_once()
+        streams[2].flush.assert_called_once_with()
+
+    def test_copy(self, stream_factory_mock):
+        streams = [mock.Mock(), mock.Mock()]
+        stream_factory_mock.side_effect = streams
+        consumer = mock.Mock()
+        runner = ObserverRunner(
+            stream_factory_mock, "event", "group", consumer, max_events=1
+        )
+        runner.run()
+
+        clone = copy.copy(runner)
+        clone.run()
+
+        assert clone is not runner
+        assert clone._ObserverRunner__stream is streams[1]
+        assert runner._ObserverRunner__stream is streams[0]
+        assert clone._ObserverRunner__consumers == (consumer,)
+
+    def test_lazy_stream(self, stream_mock, stream_factory_mock):
+        runner = ObserverRunner(
+            stream_factory_mock, "event", "group", mock.Mock(), max_events=2
+        )
+
+        stream_factory_mock.assert_not_called()
+
+        runner.run()
+
+        stream_factory_mock.assert_called_once_with()
+        assert stream_mock.pop.call_count == 2
+
+
+@pytest.mark.unit
+class TestAsyncObserverRunner:
+    @pytest.mark.parametrize(
+        "kwargs",
+        (
+            {"max_events": 0},
+            {"max_in_flight": 0},
+            {"batch_size": 0},
+        ),
+        ids=("zero-event-limit", "zero-max-in-flight", "zero-batch-size"),
+    )
+    def test_init(self, kwargs, stream_factory_mock):
+        with pytest.raises(AssertionError):
+            AsyncObserverRunner(
+                stream_factory_mock, "event", "group", mock.Mock(), **kwargs
+            )
+
+    def test_init_no_consumers(self, stream_factory_mock):
+        with pytest.raises(AssertionError):
+            AsyncObserverRunner(stream_factory_mock, "event", "group")
+
+    @pytest.mark.parametrize(
+        "batches,max_events,max_in_flight,batch_size,expected_max_counts",
+        (
+            ([["e1", "e2"]], 2, 10, 10, [2]),
+            ([["e1"], EmptyStreamError, ["e2", "e3"]], 3, 10, 2, [2, 2, 2]),
+            ([["e1"], ["e2"], ["e3"]], 3, 1, 10, [1, 1, 1]),
+        ),
+        ids=("single-batch", "empty-between-batches", "one-in-flight"),
+    )
+    def test_run(
+        self,
+        batches,
+        max_events,
+        max_in_flight,
+        batch_size,
+        expected_max_counts,
+        stream_mock,
+        stream_factory_mock,
+    ):
+        stream_mock.apop_many = mock.AsyncMock(side_effect=batches)
+        stream_mock.aflush = mock.AsyncMock()
+        consumers = [mock.Mock(consume=mock.AsyncMock()) for _ in range(2)]
+        consumers[0].consume.side_effect = ValueError  # must not stop the runner
+
+        AsyncObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            *consumers,
+            max_events=max_events,
+            max_in_flight=max_in_flight,
+            batch_size=batch_size,
+        ).run()
+
+        stream_mock.apop_many.assert_has_awaits(
+            [
+                mock.call("event", "group", max_count=max_count, block=True)
+                for max_count in expected_max_counts
+            ]
+        )
+        stream_mock.aflush.assert_awaited_once()
+        for consumer in consumers:
+            consumer.consume.assert_has_awaits(
+                [
+                    mock.call(event)
+                    for batch in batches
+                    if batch is not EmptyStreamError
+                    for event in batch
+                ]
+            )
+
+    def test_run_concurrently(self, stream_mock, stream_factory_mock):
+        in_flight, max_seen = 0, 0
+
+        async def consume(event):
+            nonlocal in_flight, max_seen
+            in_flight += 1
+            max_seen = max(max_seen, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        stream_mock.apop_many = mock.AsyncMock(return_value=["e1", "e2", "e3"])
+        stream_mock.aflush = mock.AsyncMock()
+
+        AsyncObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            mock.Mock(consume=consume),
+            max_events=9,
+            max_in_flight=6,
+        ).run()
+
+        assert max_seen == 6
+
+    def test_lazy_stream(self, stream_mock, stream_factory_mock):
+        stream_mock.apop_many = mock.AsyncMock(return_value=["e1"])
+        stream_mock.aflush = mock.AsyncMock()
+        runner = AsyncObserverRunner(
+            stream_factory_mock,
+            "event",
+            "group",
+            mock.Mock(consume=mock.AsyncMock()),
+            max_events=1,
+        )
+        clone = copy.copy(runner)
+
+        stream_factory_mock.assert_not_called()
+
+        runner.run()
+        clone.run()
+
+        assert stream_factory_mock.call_count == 2
+
+    def test_stop_before_run(self, stream_mock, stream_factory_mock):
+        stream_mock.apop_many = mock.AsyncMock(side_effect=ConnectionError)
+        stream_mock.aflush = mock.AsyncMock()
+        consumer = mock.Mock()
+        runner = AsyncObserverRunner(stream_factory_mock, "event", "group", consumer)
+
+        runner.stop()
+        runner.run()
+
+        stream_mock.apop_many.assert_not_called()
+        assert copy.copy(runner)._AsyncObserverRunner__stopping is False
+
+    def test_stop(self, stream_mock, stream_factory_mock):
+        consumed = []
+
+        async def consume(event):
+            runner.stop()
+            await asyncio.sleep(0.01)
+            consumed.append(event)
+
+        batches = [["e1", "e2"], []]
+
+        async def apop_many(*args, **kwargs):
+            await asyncio.sleep(0.001)
+            return batches.pop(0)
+
+        stream_mock.apop_many = mock.AsyncMock(side_effect=apop_many)
+        stream_mock.aflush = mock.AsyncMock()
+        runner = AsyncObserverRunner(
+            stream_factory_mock, "event", "group", mock.Mock(consume=consume)
+        )
+
+        runner.run()
+
+        assert stream_mock.apop_many.await_count == 2
+        assert sorted(consumed) == ["e1", "e2"]
+        stream_mock.aflush.assert_awaited_once()
@@ -0,0 +1,229 @@
+from unittest import mock
+
+import pytest
+
+from eventscore.core.scaling import Autoscaler
+from eventscore.core.supervision import run_supervised
+from eventscore.core.types import GroupStats, ScalingPolicy, Worker
+
+
+@pytest.fixture
+def autoscaler_factory(stream_mock, mp_mock, mp_process_mock):
+    mp_process_mock.is_alive.return_value = True
+
+    def factory(
+        policy=None, clones=1, events=("event",), group="group", drain_timeout=30.0
+    ):
+        worker = Worker(
+            name="worker",
+            runner=mock.Mock(),
+            clones=clones,
+            events=events,
+            group=group,
+        )
+        return Autoscaler(
+            worker,
+            stream_mock,
+            policy
+            or ScalingPolicy(
+                min_clones=1,
+                max_clones=3,
+                scale_up_backlog=100,
+                scale_down_backlog=10,
+                sustain=2,
+                scale_up_cooldown=0,
+                scale_down_cooldown=0,
+            ),
+            drain_timeout=drain_timeout,
+        )
+
+    with mock.patch("eventscore.core.scaling.mp", mp_mock):
+        yield factory
+
+
+@pytest.mark.unit
+class TestAutoscaler:
+    @pytest.mark.parametrize(
+        "events,group",
+        (((), "group"), (("event",), None)),
+        ids=("no-events", "no-group"),
+    )
+    def test_init_invalid_worker(self, events, group, autoscaler_factory):
+        with pytest.raises(AssertionError):
+            autoscaler_factory(events=events, group=group)
+
+    @pytest.mark.parametrize(
+        "clones,expected_clones",
+        ((0, 1), (2, 2), (5, 3)),
+        ids=("below-min", "within-bounds", "above-max"),
+    )
+    def test_start(self, clones, expected_clones, mp_mock, autoscaler_factory):
+        autoscaler = autoscaler_factory(clones=clones)
+
+        autoscaler.start()
+
+        assert mp_mock.Process.call_count == expected_clones
+        assert autoscaler.clones == expected_clones
+
+    @pytest.mark.parametrize(
+        "lags,expected_clones",
+        (
+            ([500], [1]),
+            ([500, 500], [1, 2]),
+            ([500, 500, 500, 500], [1, 2, 2, 3]),
+            ([500, 50, 500], [1, 1, 1]),
+            ([500, 500, 500, 500, 500, 500], [1, 2, 2, 3, 3, 3]),
+        ),
+        ids=(
+            "single-spike",
+            "sustained",
+            "streak-resets-after-scaling",
+            "hysteresis-band-resets-streak",
+            "max-clones",
+        ),
+    )
+    def test_step_scale_up(
+        self, lags, expected_clones, stream_mock, autoscaler_factory
+    ):
+        stream_mock.group_stats.side_effect = [GroupStats(lag=lag) for lag in lags]
+        autoscaler = autoscaler_factory()
+        autoscaler.start()
+
+        clones = []
+        for _ in lags:
+            autoscaler.step()
+            clones.append(autoscaler.clones)
+
+        assert clones == expected_clones
+        assert [decision.clones for decision in autoscaler.decisions] == sorted(
+            set(expected_clones) - {1}
+        )
+
+    def test_step_scale_down(self, mp_process_mock, stream_mock, autoscaler_factory):
+        stream_mock.group_stats.return_value = GroupStats(lag=0, pending=1)
+        autoscaler = autoscaler_factory(clones=3)
+        autoscaler.start()
+
+        decisions = [autoscaler.step() for _ in range(6)]
+
+        assert autoscaler.clones == 1
+        assert [decision and decision.clones for decision in decisions] == [
+            None,
+            2,
+            None,
+            1,
+            None,
+            None,
+        ]
+        assert decisions[1].previous == 3
+        assert decisions[1].group == "group"
+        assert decisions[1].stats == GroupStats(lag=0, pending=1)
+        assert mp_process_mock.terminate.call_count == 2
+        assert autoscaler.stats == GroupStats(lag=0, pending=1)
+
+    def test_step_cooldown(self, stream_mock, autoscaler_factory):
+        stream_mock.group_stats.return_value = GroupStats(lag=5000)
+        autoscaler = autoscaler_factory(
+            ScalingPolicy(max_clones=3, sustain=1, scale_up_cooldown=30)
+        )
+
+        with mock.patch("eventscore.core.scaling.time.monotonic", return_value=0):
+            autoscaler.start()
+        for now in (10, 30, 40, 60):
+            with mock.patch("eventscore.core.scaling.time.monotonic", return_value=now):
+                autoscaler.step()
+
+        assert [decision.clones for decision in autoscaler.decisions] == [2, 3]
+
+    def test_step_restores_min_clones(
+        self, mp_mock, mp_process_mock, stream_mock, autoscaler_factory
+    ):
+        stream_mock.group_stats.return_value = GroupStats()
+        autoscaler = autoscaler_factory()
+        autoscaler.start()
+        mp_process_mock.is_alive.return_value = False
+
+        decision = autoscaler.step()
+
+        assert decision.previous == 0
+        assert decision.clones == 1
+        assert mp_mock.Process.call_count == 2
+
+    def test_step_sums_events(self, stream_mock, autoscaler_factory):
+        stream_mock.group_stats.side_effect = [
+            GroupStats(lag=1, pending=2, consumers=1),
+            GroupStats(lag=3, pending=4, consumers=1),
+        ]
+        autoscaler = autoscaler_factory(events=("event1", "event2"))
+
+        autoscaler.step()
+
+        assert autoscaler.stats == GroupStats(lag=4, pending=6, consumers=2)
+        stream_mock.group_stats.assert_has_calls(
+            [mock.call("event1", "group"), mock.call("event2", "group")]
+        )
+
+    def test_stop(self, mp_process_mock, autoscaler_factory):
+        autoscaler = autoscaler_factory(clones=2)
+        autoscaler.start()
+
+        autoscaler.stop()
+
+        assert autoscaler.clones == 0
+        assert mp_process_mock.terminate.call_count == 2
+
+    def test_start_draining(self, mp_mock, autoscaler_factory):
+        autoscaler = autoscaler_factory()
+
+        autoscaler.start()
+
+        mp_mock.Process.assert_called_once_with(
+            target=run_supervised,
+            args=(autoscaler.worker.runner, None, None, 1.0, mock.ANY),
+            daemon=True,
+        )
+
+    @pytest.mark.parametrize("drained", (True, False), ids=("drained", "killed"))
+    def test_stop_drain_timeout(self, drained, mp_process_mock, autoscaler_factory):
+        autoscaler = autoscaler_factory(drain_timeout=5)
+        autoscaler.start()
+        mp_process_mock.is_alive.return_value = not drained
+
+        with mock.patch("eventscore.core.scaling.time.monotonic", return_value=0):
+            autoscaler.stop()
+
+        mp_process_mock.terminate.assert_called_once_with()
+        assert mp_process_mock.join.call_args_list[0] == mock.call(5)
+        assert mp_process_mock.kill.call_count == int(not drained)
+
+    @pytest.mark.parametrize("drained", (True, False), ids=("drained", "killed"))
+    def test_step_drain(self, drained, mp_mock, stream_mock, autoscaler_factory):
+        processes = [mock.Mock(pid=pid) for pid in (1, 2)]
+        for process in processes:
+            process.is_alive.return_value = True
+        mp_mock.Process.side_effect = processes
+        stream_mock.group_stats.return_value = GroupStats()
+        autoscaler = autoscaler_factory(
+            ScalingPolicy(min_clones=1, max_clones=2, sustain=1, scale_down_cooldown=0),
+            clones=2,
+            drain_timeout=5,
+        )
+
+        with mock.patch("eventscore.core.scaling.time.monotonic", return_value=0):
+            autoscaler.start()
+            autoscaler.step()
+        with mock.patch("eventscore.core.scaling.time.monotonic", return_value=3):
+            autoscaler.step()
+
+        assert autoscaler.pids == (1,)
+        assert autoscaler.draining == (2,)
+        processes[1].terminate.assert_called_once_with()
+        processes[1].join.assert_not_called()
+
+        processes[1].is_alive.return_value = not drained
+        with mock.patch("eventscore.core.scaling.time.monotonic", return_value=6):
+            autoscaler.step()
+
+        assert autoscaler.draining == ()
+        processes[1].join.assert_called_once_with()
+        assert processes[1].kill.call_count == int(not drained)
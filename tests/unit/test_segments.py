@@ -0,0 +1,306 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from eventscore.core.exceptions import (
+    EmptyStreamError,
+    EventNotSentError,
+    UnsupportedOperationError,
+)
+from eventscore.core.types import (
+    Event,
+    EventStatus,
+    GroupStats,
+    RateLimit,
+    RetentionPolicy,
+)
+from eventscore.ext.segments.streams import SegmentLogStream
+
+
+@pytest.fixture
+def segment_log_stream(tmp_path):
+    return SegmentLogStream(directory=tmp_path)
+
+
+def _events(count, start=0):
+    return [Event(type="event", payload={"idx": idx}) for idx in range(start, count)]
+
+
+def _segments(path):
+    return sorted(name for name in os.listdir(path / "event") if name.endswith(".log"))
+
+
+def _produce(directory, start, count):
+    stream = SegmentLogStream(directory=directory, segment_bytes=2048)
+    for idx in range(start, start + count):
+        stream.put(Event(type="event", payload={"idx": idx}))
+
+
+@pytest.mark.unit
+class TestSegmentLogStream:
+    def test_groups(self, segment_log_stream):
+        events = _events(3)
+        for event in events:
+            segment_log_stream.put(event)
+
+        assert segment_log_stream.pop_many("event", "first", max_count=2) == events[:2]
+        assert segment_log_stream.pop("event", "first") == events[2]
+        # NOTE: every group reads all events from its own checkpoint
+        assert segment_log_stream.pop_many("event", "second") == events
+        with pytest.raises(EmptyStreamError):
+            segment_log_stream.pop("event", "first", block=False)
+
+    def test_put_many(self, segment_log_stream):
+        events = [Event(type="first"), Event(type="second"), Event(type="first")]
+
+        results = segment_log_stream.put_many(events)
+
+        assert [result.status for result in results] == [EventStatus.SENT] * 3
+        assert segment_log_stream.pop_many("first", "group") == [events[0], events[2]]
+        assert segment_log_stream.pop_many("second", "group") == [events[1]]
+
+    def test_put_failed(self, segment_log_stream):
+        with mock.patch(
+            "eventscore.ext.segments.streams._write_all", side_effect=OSError
+        ):
+            with pytest.raises(EventNotSentError):
+                segment_log_stream.put(Event(type="event"))
+            results = segment_log_stream.put_many([Event(type="event")])
+
+        assert results[0].status == EventStatus.FAILED
+        # NOTE: writer recovers from files by the next append
+        event = Event(type="event")
+        segment_log_stream.put(event)
+        assert segment_log_stream.pop_many("event", "group") == [event]
+
+    def test_durable(self, tmp_path, segment_log_stream):
+        events = _events(5)
+        _ = segment_log_stream.put_many(events)
+        segment_log_stream.pop_many("event", "group", max_count=2)
+
+        stream = SegmentLogStream(directory=tmp_path)
+
+        assert stream.pop_many("event", "group") == events[2:]
+
+    def test_segments(self, tmp_path):
+        stream = SegmentLogStream(
+            directory=tmp_path, segment_bytes=1024, index_interval=256
+        )
+        events = _events(50)
+        for event in events:
+            stream.put(event)
+
+        assert len(_segments(tmp_path)) > 1
+        assert stream.pop_many("event", "group", max_count=50) == events
+
+    def test_index(self, tmp_path):
+        first, second = (
+            SegmentLogStream(directory=tmp_path, segment_bytes=1024, index_interval=256)
+            for _ in range(2)
+        )
+        events = _events(50)
+        _ = first.put_many(events[:20])
+        _ = first.put_many(events[20:])
+
+        # NOTE: checkpoint moved by another consumer is looked up by index
+        assert first.pop_many("event", "group", max_count=17) == events[:17]
+        assert second.pop_many("event", "group", max_count=17) == events[17:34]
+        assert first.pop_many("event", "group", max_count=17) == events[34:]
+
+    def test_writers(self, tmp_path):
+        first, second = (
+            SegmentLogStream(directory=tmp_path, segment_bytes=1024) for _ in range(2)
+        )
+        events = _events(40)
+
+        for idx, event in enumerate(events):
+            (first if idx % 3 else second).put(event)
+
+        assert first.pop_many("event", "group", max_count=40) == events
+        assert second.group_stats("event", "other") == GroupStats(lag=40)
+
+    def test_torn_tail(self, tmp_path, segment_log_stream):
+        events = _events(3)
+        _ = segment_log_stream.put_many(events[:2])
+        with open(tmp_path / "event" / _segments(tmp_path)[-1], "ab") as file:
+            _ = file.write(b"\x10\x00\x00\x00\x00\x00")
+
+        stream = SegmentLogStream(directory=tmp_path)
+        stream.put(events[2])
+
+        assert stream.pop_many("event", "group") == events
+
+    def test_retention_maxlen(self, tmp_path):
+        stream = SegmentLogStream(
+            directory=tmp_path,
+            segment_bytes=1024,
+            retention={"event": RetentionPolicy(maxlen=20)},
+        )
+        events = _events(100)
+        for event in events:
+            stream.put(event)
+
+        popped = stream.pop_many("event", "group", max_count=100)
+
+        # NOTE: whole segments are evicted, so log is trimmed approximately
+        assert 20 <= len(popped) < 40
+        assert [event.payload["idx"] for event in popped] == list(
+            range(len(events) - len(popped), len(events))
+        )
+
+    def test_retention_max_age(self, tmp_path):
+        stream = SegmentLogStream(
+            directory=tmp_path,
+            segment_bytes=1024,
+            retention={"event": RetentionPolicy(max_age=60)},
+        )
+        for event in _events(20):
+            stream.put(event)
+        segments = _segments(tmp_path)
+        expired = time.time() - 120
+        os.utime(tmp_path / "event" / segments[0], (expired, expired))
+
+        assert stream.trim("event") > 0
+        assert _segments(tmp_path) == segments[1:]
+
+    def test_retention_keep_unconsumed(self, tmp_path):
+        stream = SegmentLogStream(
+            directory=tmp_path,
+            segment_bytes=1024,
+            retention={"event": RetentionPolicy(keep_unconsumed=True)},
+        )
+        with pytest.raises(EmptyStreamError):
+            stream.pop("event", "group", block=False)
+        events = _events(40)
+        for event in events:
+            stream.put(event)
+
+        assert stream.trim("event") == 0
+        assert stream.pop_many("event", "group", max_count=30) == events[:30]
+        assert stream.trim("event") > 0
+        assert stream.pop_many("event", "group", max_count=30) == events[30:]
+
+    def test_group_commit(self, tmp_path):
+        stream = SegmentLogStream(directory=tmp_path)
+        with mock.patch("eventscore.ext.segments.streams.os.fsync") as fsync_mock:
+            stream.put(Event(type="event"), block=False)
+            assert fsync_mock.call_count == 0
+
+            # NOTE: a single fsync covers both appends
+            stream.put(Event(type="event"))
+            assert fsync_mock.call_count == 1
+            stream.flush()
+            assert fsync_mock.call_count == 1
+
+    def test_no_fsync(self, tmp_path):
+        stream = SegmentLogStream(directory=tmp_path, fsync=False)
+        with mock.patch("eventscore.ext.segments.streams.os.fsync") as fsync_mock:
+            stream.put(Event(type="event"))
+            stream.flush()
+
+        fsync_mock.assert_not_called()
+
+    def test_competing_consumers(self, segment_log_stream):
+        events = _events(200)
+        popped = [[], []]
+
+        def consume(idx):
+            while True:
+                try:
+                    popped[idx].extend(
+                        segment_log_stream.pop_many(
+                            "event", "group", max_count=7, timeout=0
+                        )
+                    )
+                except EmptyStreamError:
+                    return
+
+        _ = segment_log_stream.put_many(events)
+        threads = [threading.Thread(target=consume, args=(idx,)) for idx in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # NOTE: every event is delivered to a single consumer of group
+        assert len(popped[0]) + len(popped[1]) == len(events)
+        assert {event.uid for event in popped[0] + popped[1]} == {
+            event.uid for event in events
+        }
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_blocking(self, multi, segment_log_stream):
+        event = Event(type="second")
+        timer = threading.Timer(0.05, segment_log_stream.put, args=(event,))
+        timer.start()
+
+        if multi:
+            popped = segment_log_stream.pop_multi(
+                ("first", "second"), "group", timeout=5
+            )
+        else:
+            popped = segment_log_stream.pop_many("second", "group", timeout=5)
+        timer.join()
+
+        assert popped == [event]
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_timeout(self, multi, segment_log_stream):
+        with pytest.raises(EmptyStreamError):
+            if multi:
+                segment_log_stream.pop_multi(("first", "second"), "group", timeout=0)
+            else:
+                segment_log_stream.pop("first", "group", timeout=0)
+
+    def test_pending(self, segment_log_stream):
+        events = _events(3)
+        _ = segment_log_stream.put_many(events)
+
+        assert segment_log_stream.pop_many("event", "group", ack=False) == events
+        segment_log_stream.ack("event", "group", events[1])
+
+        assert segment_log_stream.group_stats("event", "group") == GroupStats(pending=2)
+        assert segment_log_stream.reclaim("event", "group", min_idle=60) == []
+        assert segment_log_stream.reclaim(
+            "event", "group", min_idle=0, max_count=1
+        ) == [events[0]]
+
+    def test_group_stats(self, segment_log_stream):
+        _ = segment_log_stream.put_many(_events(5))
+
+        assert segment_log_stream.group_stats("event", "group") == GroupStats(lag=5)
+        segment_log_stream.pop_many("event", "group", max_count=2)
+        assert segment_log_stream.group_stats("event", "group") == GroupStats(lag=3)
+
+    def test_unsupported(self, segment_log_stream):
+        with pytest.raises(UnsupportedOperationError):
+            segment_log_stream.schedule(Event(type="event"), 0)
+        with pytest.raises(UnsupportedOperationError):
+            segment_log_stream.take_tokens("consumer", RateLimit(rate=1), 1)
+
+    def test_processes(self, tmp_path):
+        stream = SegmentLogStream(directory=tmp_path, segment_bytes=2048)
+        processes = [
+            mp.get_context("spawn").Process(target=_produce, args=(tmp_path, start, 50))
+            for start in (0, 50)
+        ]
+        for process in processes:
+            process.start()
+
+        popped = []
+        while len(popped) < 100:
+            popped.extend(stream.pop_many("event", "group", timeout=10))
+        for process in processes:
+            process.join()
+
+        # NOTE: events of every producer are read in order
+        for start in (0, 50):
+            assert [
+                event.payload["idx"]
+                for event in popped
+                if start <= event.payload["idx"] < start + 50
+            ] == list(range(start, start + 50))
@@ -1,7 +1,9 @@
+import json
 import uuid
 
 import pytest
 
+from eventscore.core.serializers import MemoryViewEventSerializer
 from eventscore.core.types import Event
 
 
@@ -62,6 +64,16 @@ class TestEventSerializer:
         assert event_serializer.decode(event) == expected_result
 
 
+@pytest.mark.unit
+class TestMemoryViewEventSerializer:
+    def test_serializer(self):
+        serializer = MemoryViewEventSerializer()
+        event = Event(type="event", payload={"key": "value"})
+
+        assert serializer.encode(event) == json.dumps(event.asdict()).encode()
+        assert serializer.decode(memoryview(serializer.encode(event))) == event
+
+
 @pytest.mark.unit
 class TestRedisEventSerializer:
     @pytest.mark.parametrize(
@@ -0,0 +1,243 @@
+import multiprocessing as mp
+import threading
+
+import pytest
+
+from eventscore.core.exceptions import (
+    EmptyStreamError,
+    EventNotSentError,
+    UnsupportedOperationError,
+)
+from eventscore.core.types import Event, EventStatus, GroupStats, RateLimit
+from eventscore.ext.shm.streams import SharedMemoryStream, SharedRings
+
+
+@pytest.fixture
+def shared_rings():
+    rings = SharedRings(("event", "other"), capacity=4096, max_groups=2)
+    yield rings
+    rings.unlink()
+
+
+@pytest.fixture
+def shm_stream(shared_rings):
+    return SharedMemoryStream(rings=shared_rings)
+
+
+def _reserve(rings):
+    rings.ring("event").reserve(16)
+
+
+def _produce(rings, count):
+    stream = SharedMemoryStream(rings=rings)
+    for idx in range(count):
+        stream.put(Event(type="event", payload={"idx": idx}), timeout=10)
+
+
+@pytest.mark.unit
+class TestSharedMemoryStream:
+    def test_groups(self, shm_stream):
+        events = [Event(type="event") for _ in range(3)]
+        for event in events:
+            shm_stream.put(event)
+
+        assert shm_stream.pop_many("event", "first", max_count=2) == events[:2]
+        assert shm_stream.pop("event", "first") == events[2]
+        # NOTE: every group reads all events from its own position
+        assert shm_stream.pop_many("event", "second") == events
+        with pytest.raises(EmptyStreamError):
+            shm_stream.pop("event", "first", block=False)
+
+    def test_max_groups(self, shm_stream):
+        for group in ("first", "second"):
+            with pytest.raises(EmptyStreamError):
+                shm_stream.pop("event", group, block=False)
+
+        with pytest.raises(UnsupportedOperationError):
+            shm_stream.pop("event", "third", block=False)
+
+    def test_undeclared_event(self, shm_stream):
+        with pytest.raises(UnsupportedOperationError):
+            shm_stream.put(Event(type="undeclared"))
+
+    def test_put_many(self, shm_stream):
+        events = [Event(type="event"), Event(type="other"), Event(type="undeclared")]
+
+        results = shm_stream.put_many(events)
+
+        assert [result.status for result in results] == [
+            EventStatus.SENT,
+            EventStatus.SENT,
+            EventStatus.FAILED,
+        ]
+        assert shm_stream.pop_many("event", "group") == events[:1]
+        assert shm_stream.pop_many("other", "group") == events[1:2]
+
+    def test_wraparound(self, shm_stream):
+        # NOTE: payload size is not a divisor of capacity,
+        # so records are padded at the end of ring
+        for idx in range(100):
+            event = Event(type="event", payload={"idx": idx, "data": "x" * 150})
+            shm_stream.put(event, block=False)
+
+            assert shm_stream.pop("event", "group", block=False) == event
+
+    def test_full(self, shm_stream):
+        with pytest.raises(EmptyStreamError):
+            shm_stream.pop("event", "group", block=False)
+        event = Event(type="event", payload={"data": "x" * 1000})
+        shm_stream.put(event, block=False)
+        shm_stream.put(event, block=False)
+        shm_stream.put(event, block=False)
+
+        # NOTE: ring is not overwritten until group reads it
+        with pytest.raises(EventNotSentError):
+            shm_stream.put(event, block=False)
+        assert shm_stream.put_many([event], timeout=0)[0].status == EventStatus.FAILED
+        shm_stream.pop("event", "group")
+        shm_stream.put(event, block=False)
+
+    def test_full_without_groups(self, shm_stream):
+        events = [
+            Event(type="event", payload={"idx": idx, "data": "x" * 1000})
+            for idx in range(5)
+        ]
+        for event in events:
+            shm_stream.put(event, block=False)
+
+        # NOTE: without groups, the oldest events are dropped
+        assert shm_stream.pop_many("event", "group") == events[2:]
+
+    def test_too_large(self, shm_stream):
+        with pytest.raises(EventNotSentError):
+            shm_stream.put(Event(type="event", payload={"data": "x" * 4096}))
+
+    def test_competing_consumers(self, shm_stream):
+        events = [Event(type="event") for _ in range(30)]
+        popped = [[], []]
+
+        def consume(idx):
+            while True:
+                try:
+                    popped[idx].extend(
+                        shm_stream.pop_many("event", "group", max_count=7, timeout=0)
+                    )
+                except EmptyStreamError:
+                    return
+
+        with pytest.raises(EmptyStreamError):
+            shm_stream.pop("event", "group", block=False)
+        for event in events:
+            shm_stream.put(event)
+        threads = [threading.Thread(target=consume, args=(idx,)) for idx in (0, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # NOTE: every event is delivered to a single consumer of group
+        assert len(popped[0]) + len(popped[1]) == len(events)
+        assert {event.uid for event in popped[0] + popped[1]} == {
+            event.uid for event in events
+        }
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_blocking(self, multi, shm_stream):
+        event = Event(type="other")
+        timer = threading.Timer(0.05, shm_stream.put, args=(event,))
+        timer.start()
+
+        if multi:
+            popped = shm_stream.pop_multi(("event", "other"), "group", timeout=5)
+        else:
+            popped = shm_stream.pop_many("other", "group", timeout=5)
+        timer.join()
+
+        assert popped == [event]
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_timeout(self, multi, shm_stream):
+        with pytest.raises(EmptyStreamError):
+            if multi:
+                shm_stream.pop_multi(("event", "other"), "group", timeout=0)
+            else:
+                shm_stream.pop("event", "group", timeout=0)
+
+    def test_pending(self, shm_stream):
+        events = [Event(type="event") for _ in range(3)]
+        for event in events:
+            shm_stream.put(event)
+
+        assert shm_stream.pop_many("event", "group", ack=False) == events
+        shm_stream.ack("event", "group", events[1])
+
+        assert shm_stream.group_stats("event", "group") == GroupStats(pending=2)
+        assert shm_stream.reclaim("event", "group", min_idle=60) == []
+        assert shm_stream.reclaim("event", "group", min_idle=0, max_count=1) == [
+            events[0]
+        ]
+
+    def test_group_stats(self, shm_stream):
+        with pytest.raises(EmptyStreamError):
+            shm_stream.pop("event", "group", block=False)
+        for _ in range(5):
+            shm_stream.put(Event(type="event"))
+        shm_stream.pop_many("event", "group", max_count=2)
+
+        assert shm_stream.group_stats("event", "group") == GroupStats(lag=3)
+
+    def test_unsupported(self, shm_stream):
+        with pytest.raises(UnsupportedOperationError):
+            shm_stream.schedule(Event(type="event"), 0)
+        with pytest.raises(UnsupportedOperationError):
+            shm_stream.take_tokens("consumer", RateLimit(rate=1), 1)
+
+    def test_reserved(self, shared_rings, shm_stream):
+        with pytest.raises(EmptyStreamError):
+            shm_stream.pop("event", "group", block=False)
+        shared_rings.ring("event").reserve(16)
+        shm_stream.put(Event(type="event"))
+
+        # NOTE: record reserved by a live producer holds back the next ones
+        with pytest.raises(EmptyStreamError):
+            shm_stream.pop("event", "group", block=False)
+
+    def test_reserved_by_dead_producer(self):
+        rings = SharedRings(("event",), capacity=4096, start_method="fork")
+        stream = SharedMemoryStream(rings=rings)
+        with pytest.raises(EmptyStreamError):
+            stream.pop("event", "group", block=False)
+        process = mp.get_context("fork").Process(target=_reserve, args=(rings,))
+        process.start()
+        process.join()
+        event = Event(type="event")
+        stream.put(event)
+
+        try:
+            assert stream.pop_many("event", "group", block=False) == [event]
+        finally:
+            rings.unlink()
+
+    @pytest.mark.parametrize("start_method", ("fork", "spawn"), ids=("fork", "spawn"))
+    def test_processes(self, start_method):
+        rings = SharedRings(("event",), capacity=4096, start_method=start_method)
+        stream = SharedMemoryStream(rings=rings)
+        with pytest.raises(EmptyStreamError):
+            stream.pop("event", "group", block=False)
+        processes = [
+            mp.get_context(start_method).Process(target=_produce, args=(rings, 50))
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+
+        popped = []
+        while len(popped) < 100:
+            popped.extend(stream.pop_many("event", "group", timeout=10))
+        for process in processes:
+            process.join()
+        rings.unlink()
+
+        assert sorted(event.payload["idx"] for event in popped) == sorted(
+            list(range(50)) * 2
+        )
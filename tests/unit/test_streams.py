@@ -1,12 +1,29 @@
 import os
+import pickle
+import threading
 from unittest import mock
 
 import pytest
-from redis import ResponseError
+from kafka.structs import OffsetAndMetadata, TopicPartition
+from redis import ConnectionError, ResponseError
 
 from eventscore.core.exceptions import EmptyStreamError, TooManyDataError
+from eventscore.core.streams import StreamFactory
+from eventscore.core.types import (
+    Event,
+    EventStatus,
+    GroupStats,
+    PartitionPolicy,
+    ProduceResult,
+    RateLimit,
+    RetentionPolicy,
+)
+from eventscore.ext.kafka.streams import KafkaStream, _deserialize
+from eventscore.ext.redis.streams import RedisStream
 from tests.unit.conftest import SKIP
 
+XREADGROUP_SINGLE = [(b"event", ((b"uid", {b"value": b"data"}),))]
+
 
 @pytest.mark.unit
 class TestRedisStream:
@@ -251,3 +268,1143 @@ class TestRedisStream:
                 )
                 redis_mock.assert_has_calls(expected_redis_calls)
                 event_serializer_mock.decode.assert_called_once_with(b"data")
+
+    @pytest.mark.parametrize(
+        "xreadgroup,max_count,expected_error,expected_uids",
+        (
+            ([], 2, EmptyStreamError, ()),
+            ([(b"event", tuple())], 2, EmptyStreamError, ()),
+            (
+                [(b"event", ((b"uid1", {b"value": b"data1"}),))],
+                2,
+                None,
+                (b"uid1",),
+            ),
+            (
+                [
+                    (
+                        b"event",
+                        (
+                            (b"uid1", {b"value": b"data1"}),
+                            (b"uid2", {b"value": b"data2"}),
+                        ),
+                    )
+                ],
+                2,
+                None,
+                (b"uid1", b"uid2"),
+            ),
+            (
+                [
+                    (
+                        b"event",
+                        (
+                            (b"uid1", {b"value": b"data1"}),
+                            (b"uid2", {b"value": b"data2"}),
+                        ),
+                    )
+                ],
+                1,
+                TooManyDataError,
+                (),
+            ),
+        ),
+        ids=(
+            "empty-xreadgroup",
+            "empty-messages-in-event",
+            "less-than-max-count",
+            "exactly-max-count",
+            "more-than-max-count",
+        ),
+    )
+    def test_pop_many(
+        self,
+        xreadgroup,
+        max_count,
+        expected_error,
+        expected_uids,
+        event_serializer_mock,
+        redis_stream_factory,
+        redis_mock,
+    ):
+        redis_mock.xreadgroup.return_value = xreadgroup
+        stream = redis_stream_factory()
+
+        if expected_error is not None:
+            with pytest.raises(expected_error):
+                stream.pop_many("event", "group", max_count=max_count)
+
+            redis_mock.xack.assert_not_called()
+        else:
+            events = stream.pop_many("event", "group", max_count=max_count)
+
+            assert events == [event_serializer_mock.decode.return_value] * len(
+                expected_uids
+            )
+            redis_mock.xreadgroup.assert_called_once_with(
+                groupname="group",
+                consumername=str(os.getpid()),
+                streams={"event": ">"},
+                count=max_count,
+                block=5000,
+            )
+            redis_mock.xack.assert_called_once_with("event", "group", *expected_uids)
+
+    @pytest.mark.parametrize(
+        "ack_batch_size,pops,expected_xack_calls",
+        (
+            (1, 3, 3),
+            (2, 3, 1),
+            (3, 3, 1),
+            (4, 3, 0),
+        ),
+        ids=(
+            "no-batching",
+            "batch-of-two",
+            "batch-of-three",
+            "batch-not-filled",
+        ),
+    )
+    def test_pop_ack_batching(
+        self,
+        ack_batch_size,
+        pops,
+        expected_xack_calls,
+        redis_mock,
+        redis_stream_factory,
+    ):
+        redis_mock.xreadgroup.return_value = XREADGROUP_SINGLE
+        stream = redis_stream_factory(ack_batch_size=ack_batch_size)
+
+        for _ in range(pops):
+            stream.pop("event", "group")
+
+        pipeline = redis_mock.pipeline.return_value
+        if ack_batch_size == 1:
+            assert redis_mock.xack.call_count == expected_xack_calls
+            redis_mock.pipeline.assert_not_called()
+        else:
+            redis_mock.xack.assert_not_called()
+            assert pipeline.xack.call_count == expected_xack_calls
+            if expected_xack_calls:
+                pipeline.xack.assert_called_with(
+                    "event", "group", *([b"uid"] * ack_batch_size)
+                )
+                pipeline.execute.assert_called()
+
+        pipeline.reset_mock()
+        stream.flush()
+        stream.flush()  # nothing left to flush on a second call
+
+        pending = pops % ack_batch_size if ack_batch_size > 1 else 0
+        if pending:
+            pipeline.xack.assert_called_once_with(
+                "event", "group", *([b"uid"] * pending)
+            )
+        else:
+            pipeline.xack.assert_not_called()
+
+    def test_pop_ack_interval(self, redis_mock, redis_stream_factory):
+        redis_mock.xreadgroup.return_value = XREADGROUP_SINGLE
+        stream = redis_stream_factory(ack_batch_size=10, ack_interval=1)
+
+        with mock.patch("eventscore.ext.redis.streams.time") as time_mock:
+            time_mock.monotonic.side_effect = [0, 0.5, 0.5, 1, 1.5, 1.5]
+            # acks are accumulated since 0, 0.5 seconds elapsed after first ack
+            stream.pop("event", "group")
+            # 0.5 seconds elapsed before read, 1 second elapsed after ack, flush
+            stream.pop("event", "group")
+            # acks are accumulated since 1.5 again
+            stream.pop("event", "group")
+
+        redis_mock.pipeline.return_value.xack.assert_called_once_with(
+            "event", "group", b"uid", b"uid"
+        )
+
+    def test_pop_pipeline_acks(self, redis_mock, redis_stream_factory):
+        redis_mock.xreadgroup.return_value = XREADGROUP_SINGLE
+        pipeline = redis_mock.pipeline.return_value
+        pipeline.execute.return_value = [1, redis_mock.xreadgroup.return_value]
+        stream = redis_stream_factory(ack_batch_size=10, pipeline_acks=True)
+
+        stream.pop("event", "group")
+        stream.pop("event", "group")
+
+        # first read has nothing to acknowledge,
+        # second one carries first read acknowledgement
+        assert redis_mock.xreadgroup.call_count == 1
+        redis_mock.pipeline.assert_called_once_with(transaction=False)
+        pipeline.assert_has_calls(
+            [
+                mock.call.xack("event", "group", b"uid"),
+                mock.call.xreadgroup(
+                    groupname="group",
+                    consumername=str(os.getpid()),
+                    streams={"event": ">"},
+                    count=1,
+                    block=5000,
+                ),
+                mock.call.execute(),
+            ]
+        )
+        redis_mock.xack.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "xreadgroup,expected_error",
+        (
+            ([], EmptyStreamError),
+            (
+                [
+                    (
+                        b"event",
+                        (
+                            (b"uid1", {b"value": b"data1"}),
+                            (b"uid2", {b"value": b"data2"}),
+                        ),
+                    )
+                ],
+                None,
+            ),
+        ),
+        ids=("empty-xreadgroup", "valid-events"),
+    )
+    async def test_apop_many(
+        self,
+        xreadgroup,
+        expected_error,
+        event_serializer_mock,
+        redis_stream_factory,
+        redis_mock,
+    ):
+        async_redis_mock = mock.AsyncMock()
+        async_redis_mock.xreadgroup.return_value = xreadgroup
+        stream = redis_stream_factory(async_redis=async_redis_mock)
+
+        if expected_error is not None:
+            with pytest.raises(expected_error):
+                await stream.apop_many("event", "group", max_count=2)
+
+            async_redis_mock.xack.assert_not_awaited()
+        else:
+            events = await stream.apop_many("event", "group", max_count=2)
+
+            assert events == [event_serializer_mock.decode.return_value] * 2
+            async_redis_mock.xack.assert_awaited_once_with(
+                "event", "group", b"uid1", b"uid2"
+            )
+        async_redis_mock.xgroup_create.assert_awaited_once_with(
+            name="event", groupname="group", id="0", mkstream=True
+        )
+        async_redis_mock.xreadgroup.assert_awaited_once_with(
+            groupname="group",
+            consumername=str(os.getpid()),
+            streams={"event": ">"},
+            count=2,
+            block=5000,
+        )
+        redis_mock.xreadgroup.assert_not_called()
+
+        await stream.aflush()
+
+        async_redis_mock.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_apop_many_builds_async_redis(self, redis_mock, redis_stream_factory):
+        with (
+            mock.patch("eventscore.ext.redis.streams.Redis", redis_mock),
+            mock.patch("eventscore.ext.redis.streams.AsyncRedis") as async_redis_cls,
+        ):
+            async_redis_cls.return_value = mock.AsyncMock()
+            async_redis_cls.return_value.xreadgroup.return_value = XREADGROUP_SINGLE
+            stream = redis_stream_factory(
+                redis=None,
+                redis_init_kwargs={"password": "password"},
+            )
+            await stream.apop_many("event", "group")
+            await stream.apop_many("event", "group")
+
+        async_redis_cls.assert_called_once_with(
+            password="password",
+            host="redis",
+            port=6379,
+            db=0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_aput(
+        self,
+        event_serializer_mock,
+        redis_mock,
+        redis_stream_factory,
+        event,
+    ):
+        async_redis_mock = mock.AsyncMock()
+        stream = redis_stream_factory(async_redis=async_redis_mock)
+
+        await stream.aput(event)
+
+        async_redis_mock.xadd.assert_awaited_once_with(
+            name=str(event.type),
+            fields={"value": event_serializer_mock.encode.return_value},
+        )
+        redis_mock.xadd.assert_not_called()
+
+    def test_put_many(self, event_serializer_mock, redis_mock, redis_stream_factory):
+        events = [Event(type="event1"), Event(type="event2"), Event(type="event1")]
+        error = ResponseError("OOM")
+        pipeline = redis_mock.pipeline.return_value
+        pipeline.execute.return_value = [b"1-0", error, b"1-1"]
+        stream = redis_stream_factory()
+
+        results = stream.put_many(events)
+
+        assert results == [
+            ProduceResult(event=events[0], status=EventStatus.SENT),
+            ProduceResult(event=events[1], status=EventStatus.FAILED, error=error),
+            ProduceResult(event=events[2], status=EventStatus.SENT),
+        ]
+        redis_mock.pipeline.assert_called_once_with(transaction=False)
+        pipeline.assert_has_calls(
+            [
+                mock.call.xadd(
+                    name=str(event.type),
+                    fields={"value": event_serializer_mock.encode.return_value},
+                )
+                for event in events
+            ]
+            + [mock.call.execute(raise_on_error=False)]
+        )
+        redis_mock.xadd.assert_not_called()
+
+    def test_put_many_connection_error(self, redis_mock, redis_stream_factory):
+        events = [Event(type="event1"), Event(type="event2")]
+        error = ConnectionError()
+        redis_mock.pipeline.return_value.execute.side_effect = error
+        stream = redis_stream_factory()
+
+        results = stream.put_many(events)
+
+        assert results == [
+            ProduceResult(event=event, status=EventStatus.FAILED, error=error)
+            for event in events
+        ]
+
+    def test_put_many_no_events(self, redis_mock, redis_stream_factory):
+        assert redis_stream_factory().put_many([]) == []
+        redis_mock.pipeline.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "policy,expected_kwargs",
+        (
+            (RetentionPolicy(), {}),
+            (
+                RetentionPolicy(maxlen=100),
+                {"maxlen": 100, "approximate": True},
+            ),
+            (
+                RetentionPolicy(maxlen=100, approximate=False, limit=10),
+                {"maxlen": 100, "approximate": False},
+            ),
+            (
+                RetentionPolicy(maxlen=100, max_age=60, limit=10),
+                {"maxlen": 100, "approximate": True, "limit": 10},
+            ),
+            (
+                RetentionPolicy(max_age=60),
+                {"minid": "40000-0", "approximate": True},
+            ),
+            (RetentionPolicy(max_age=60, keep_unconsumed=True), {}),
+        ),
+        ids=(
+            "empty-policy",
+            "maxlen",
+            "exact-maxlen",
+            "maxlen-and-max-age",
+            "max-age",
+            "max-age-keep-unconsumed",
+        ),
+    )
+    def test_put_retention(
+        self,
+        policy,
+        expected_kwargs,
+        event_serializer_mock,
+        redis_mock,
+        redis_stream_factory,
+    ):
+        event = Event(type="event")
+        stream = redis_stream_factory(retention={"event": policy})
+
+        with mock.patch("eventscore.ext.redis.streams.time.time", return_value=100):
+            stream.put(event)
+
+        redis_mock.xadd.assert_called_once_with(
+            name="event",
+            fields={"value": event_serializer_mock.encode.return_value},
+            **expected_kwargs,
+        )
+
+    def test_trim_no_policy(self, redis_mock, redis_stream_factory):
+        assert redis_stream_factory().trim("event") == 0
+        redis_mock.xtrim.assert_not_called()
+
+    def test_trim(self, redis_mock, redis_stream_factory):
+        redis_mock.xtrim.side_effect = (3, 2)
+        redis_mock.xinfo_groups.return_value = [
+            {"name": b"fast", "pending": 0, "last-delivered-id": b"90000-0"},
+            {"name": b"slow", "pending": 2, "last-delivered-id": b"80000-5"},
+        ]
+        redis_mock.xpending.return_value = {"pending": 2, "min": b"70000-1"}
+        stream = redis_stream_factory(
+            retention={
+                "event": RetentionPolicy(maxlen=100, max_age=20, keep_unconsumed=True)
+            }
+        )
+
+        with mock.patch("eventscore.ext.redis.streams.time.time", return_value=100):
+            assert stream.trim("event") == 5
+
+        redis_mock.xpending.assert_called_once_with("event", b"slow")
+        assert redis_mock.xtrim.call_args_list == [
+            mock.call("event", maxlen=100, approximate=True),
+            mock.call("event", minid=b"70000-1", approximate=True),
+        ]
+
+    @pytest.mark.parametrize(
+        "groups,expected_minid",
+        (
+            ([{"name": b"group", "pending": 0, "last-delivered-id": b"0-0"}], b"0-0"),
+            (
+                [{"name": b"group", "pending": 0, "last-delivered-id": b"90000-0"}],
+                "80000-0",
+            ),
+        ),
+        ids=("nothing-consumed", "everything-consumed"),
+    )
+    def test_trim_keep_unconsumed(
+        self, groups, expected_minid, redis_mock, redis_stream_factory
+    ):
+        redis_mock.xtrim.return_value = 0
+        redis_mock.xinfo_groups.return_value = groups
+        stream = redis_stream_factory(
+            retention={"event": RetentionPolicy(max_age=20, keep_unconsumed=True)}
+        )
+
+        with mock.patch("eventscore.ext.redis.streams.time.time", return_value=100):
+            stream.trim("event")
+
+        redis_mock.xtrim.assert_called_once_with(
+            "event", minid=expected_minid, approximate=True
+        )
+
+    def test_trim_no_groups(self, redis_mock, redis_stream_factory):
+        redis_mock.xinfo_groups.return_value = []
+        stream = redis_stream_factory(
+            retention={"event": RetentionPolicy(keep_unconsumed=True)}
+        )
+
+        assert stream.trim("event") == 0
+        redis_mock.xtrim.assert_not_called()
+
+    def test_trim_no_stream(self, redis_mock, redis_stream_factory):
+        redis_mock.xinfo_groups.side_effect = ResponseError("no such key")
+        stream = redis_stream_factory(
+            retention={"event": RetentionPolicy(keep_unconsumed=True)}
+        )
+
+        assert stream.trim("event") == 0
+
+    def test_pop_many_no_ack(
+        self, event_serializer_mock, redis_mock, redis_stream_factory
+    ):
+        events = [Event(type="event"), Event(type="event"), Event(type="event")]
+        event_serializer_mock.decode.side_effect = events
+        redis_mock.xreadgroup.return_value = [
+            (
+                b"event",
+                [(b"1-0", {b"value": b"1"}), (b"2-0", {b"value": b"2"})],
+            )
+        ]
+        stream = redis_stream_factory()
+
+        assert stream.pop_many("event", "group", ack=False) == events[:2]
+        redis_mock.xack.assert_not_called()
+
+        stream.ack("event", "group", events[1], events[2])
+        stream.ack("event", "group", events[1])
+
+        redis_mock.xack.assert_called_once_with("event", "group", b"2-0")
+
+    def test_pop_no_ack(self, event_serializer_mock, redis_mock, redis_stream_factory):
+        event = Event(type="event")
+        event_serializer_mock.decode.return_value = event
+        redis_mock.xreadgroup.return_value = XREADGROUP_SINGLE
+        stream = redis_stream_factory(ack_batch_size=2)
+
+        assert stream.pop("event", "group", ack=False) == event
+        stream.ack("event", "other", event)
+        stream.ack("event", "group", event)
+        redis_mock.xack.assert_not_called()
+        stream.flush()
+
+        redis_mock.pipeline.return_value.xack.assert_called_once_with(
+            "event", "group", b"uid"
+        )
+
+    def test_reclaim(self, event_serializer_mock, redis_mock, redis_stream_factory):
+        events = [Event(type="event"), Event(type="event")]
+        event_serializer_mock.decode.side_effect = events
+        redis_mock.xautoclaim.side_effect = [
+            [
+                b"3-0",
+                [(b"1-0", {b"value": b"1"}), (b"2-0", None), (b"3-0", {})],
+                [],
+            ],
+            [b"0-0", [(b"4-0", {b"value": b"4"})], []],
+        ]
+        stream = redis_stream_factory()
+
+        assert stream.reclaim("event", "group", min_idle=1.5, max_count=3) == [
+            events[0]
+        ]
+        redis_mock.xack.assert_called_once_with("event", "group", b"2-0", b"3-0")
+        assert stream.reclaim("event", "group", min_idle=1.5, max_count=3) == [
+            events[1]
+        ]
+        stream.ack("event", "group", *events)
+
+        assert redis_mock.xautoclaim.call_args_list == [
+            mock.call(
+                name="event",
+                groupname="group",
+                consumername=str(os.getpid()),
+                min_idle_time=1500,
+                start_id=start_id,
+                count=3,
+            )
+            for start_id in ("0-0", b"3-0")
+        ]
+        redis_mock.xack.assert_called_with("event", "group", b"1-0", b"4-0")
+
+    @pytest.mark.parametrize("ack", (True, False), ids=("ack", "no-ack"))
+    def test_pop_multi(
+        self, ack, event_serializer_mock, redis_mock, redis_stream_factory
+    ):
+        events = [Event(type="e1"), Event(type="e1"), Event(type="e3")]
+        event_serializer_mock.decode.side_effect = events
+        redis_mock.xreadgroup.return_value = [
+            (b"e1", [(b"1-0", {b"value": b"1"}), (b"2-0", {b"value": b"2"})]),
+            (b"e2", []),
+            (b"e3", [(b"1-0", {b"value": b"3"})]),
+        ]
+        stream = redis_stream_factory()
+
+        assert stream.pop_multi(("e1", "e2", "e3"), "group", max_count=2, ack=ack) == (
+            events
+        )
+
+        redis_mock.xreadgroup.assert_called_once_with(
+            groupname="group",
+            consumername=str(os.getpid()),
+            streams={"e1": ">", "e2": ">", "e3": ">"},
+            count=2,
+            block=5000,
+        )
+        assert redis_mock.xgroup_create.call_count == 3
+        if not ack:
+            redis_mock.xack.assert_not_called()
+            stream.ack("e3", "group", events[2])
+            stream.ack("e1", "group", *events[:2])
+        assert (
+            redis_mock.xack.call_args_list
+            == [
+                mock.call("e1", "group", b"1-0", b"2-0"),
+                mock.call("e3", "group", b"1-0"),
+            ][:: 1 if ack else -1]
+        )
+
+    @pytest.mark.parametrize(
+        "xresult",
+        ([], [(b"e1", [])], [(b"e1", []), (b"e2", [])]),
+        ids=("no-streams", "empty-stream", "empty-streams"),
+    )
+    def test_pop_multi_empty(self, xresult, redis_mock, redis_stream_factory):
+        redis_mock.xreadgroup.return_value = xresult
+
+        with pytest.raises(EmptyStreamError):
+            redis_stream_factory().pop_multi(("e1", "e2"), "group")
+
+    @pytest.mark.parametrize(
+        "consumer_name,in_thread,expected_prefix",
+        (
+            (None, False, None),
+            (None, True, None),
+            ("consumer", True, "consumer"),
+        ),
+        ids=("main-thread", "other-thread", "explicit-name"),
+    )
+    def test_consumer_name(
+        self,
+        consumer_name,
+        in_thread,
+        expected_prefix,
+        redis_mock,
+        redis_stream_factory,
+    ):
+        redis_mock.xreadgroup.return_value = XREADGROUP_SINGLE
+        stream = redis_stream_factory(consumer_name=consumer_name)
+        native_ids = []
+
+        def pop():
+            native_ids.append(threading.get_native_id())
+            stream.pop("event", "group")
+
+        if in_thread:
+            thread = threading.Thread(target=pop)
+            thread.start()
+            thread.join()
+        else:
+            pop()
+
+        if expected_prefix is not None:
+            expected_name = expected_prefix
+        elif in_thread:
+            expected_name = f"{os.getpid()}-{native_ids[0]}"
+        else:
+            expected_name = str(os.getpid())
+        assert redis_mock.xreadgroup.call_args.kwargs["consumername"] == expected_name
+
+    @pytest.mark.parametrize(
+        "groups,xrange,expected_stats",
+        (
+            (
+                [
+                    {
+                        "name": b"other",
+                        "consumers": 1,
+                        "pending": 1,
+                        "last-delivered-id": b"1-0",
+                        "lag": 1,
+                    },
+                    {
+                        "name": b"group",
+                        "consumers": 2,
+                        "pending": 3,
+                        "last-delivered-id": b"1-0",
+                        "lag": 4,
+                    },
+                ],
+                None,
+                GroupStats(lag=4, pending=3, consumers=2),
+            ),
+            (
+                [
+                    {
+                        "name": b"group",
+                        "consumers": 1,
+                        "pending": 0,
+                        "last-delivered-id": b"1-0",
+                        "lag": None,
+                    },
+                ],
+                [(b"2-0", {}), (b"3-0", {})],
+                GroupStats(lag=2, pending=0, consumers=1),
+            ),
+            ([], None, GroupStats()),
+        ),
+        ids=("lag-reported", "lag-not-reported", "no-group"),
+    )
+    def test_group_stats(
+        self, groups, xrange, expected_stats, redis_mock, redis_stream_factory
+    ):
+        redis_mock.xinfo_groups.return_value = groups
+        redis_mock.xrange.return_value = xrange
+        stream = redis_stream_factory()
+
+        assert stream.group_stats("event", "group") == expected_stats
+
+        redis_mock.xinfo_groups.assert_called_once_with("event")
+        if xrange is None:
+            redis_mock.xrange.assert_not_called()
+        else:
+            redis_mock.xrange.assert_called_once_with("event", min="(1-0", count=10000)
+
+    def test_group_stats_no_stream(self, redis_mock, redis_stream_factory):
+        redis_mock.xinfo_groups.side_effect = ResponseError("no such key")
+        stream = redis_stream_factory()
+
+        assert stream.group_stats("event", "group") == GroupStats()
+
+    def test_init_connection_pool(self, redis_mock, event_serializer_mock):
+        pool = mock.Mock()
+
+        with mock.patch("eventscore.ext.redis.streams.Redis", redis_mock):
+            RedisStream(serializer=event_serializer_mock, connection_pool=pool)
+
+        redis_mock.assert_called_once_with(connection_pool=pool)
+
+    @pytest.mark.parametrize(
+        "kwargs,expect_pool",
+        (
+            ({"host": "redis", "port": 6379, "db": 0}, True),
+            ({"redis": "redis_mock"}, False),
+            ({"connection_pool": "pool"}, False),
+        ),
+        ids=("connection-params", "redis-instance", "connection-pool"),
+    )
+    def test_shared_kwargs(self, kwargs, expect_pool, redis_mock):
+        with mock.patch("eventscore.ext.redis.streams.Redis", redis_mock):
+            shared = RedisStream.shared_kwargs(
+                **kwargs, redis_init_kwargs={"password": "password"}, serializer=None
+            )
+
+        if expect_pool:
+            assert shared == {"connection_pool": redis_mock.connection_pool}
+            redis_mock.assert_called_once_with(
+                password="password", host="redis", port=6379, db=0
+            )
+        else:
+            assert shared == {}
+            redis_mock.assert_not_called()
+
+    def test_put_partitioned(
+        self, event_serializer_mock, redis_mock, redis_stream_factory
+    ):
+        events = [
+            Event(type="event", payload={"user": 42}),
+            Event(type="event", payload={"user": 43}),
+            Event(type="other", payload={"user": 42}),
+        ]
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=4)}
+        )
+
+        for event in events:
+            stream.put(event)
+
+        assert [call.kwargs["name"] for call in redis_mock.xadd.call_args_list] == [
+            "event:0",
+            "event:2",
+            "other",
+        ]
+
+    @pytest.fixture
+    def lanes_mock(self):
+        with mock.patch("eventscore.ext.redis.streams.LaneLeases") as lanes:
+            lanes.return_value.owned.return_value = [0, 2]
+            yield lanes.return_value
+
+    def test_pop_partitioned(
+        self, lanes_mock, event_serializer_mock, redis_mock, redis_stream_factory
+    ):
+        events = [Event(type="event") for _ in range(3)]
+        event_serializer_mock.decode.side_effect = events
+        redis_mock.xreadgroup.return_value = [
+            (b"event:0", [(b"1-0", {b"value": b"1"}), (b"2-0", {b"value": b"2"})]),
+            (b"event:2", [(b"1-0", {b"value": b"3"})]),
+        ]
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=4)},
+            consumer_name="consumer",
+        )
+
+        assert stream.pop_many("event", "group", max_count=2) == events[:2]
+        assert stream.pop("event", "group") == events[2]
+
+        redis_mock.xreadgroup.assert_called_once_with(
+            groupname="group",
+            consumername="consumer",
+            streams={"event:0": ">", "event:2": ">"},
+            count=2,
+            block=5000,
+        )
+        assert redis_mock.xack.call_args_list == [
+            mock.call("event:0", "group", b"1-0", b"2-0"),
+            mock.call("event:2", "group", b"1-0"),
+        ]
+        # NOTE: lane of buffered event is kept while it is not consumed
+        assert lanes_mock.owned.call_args_list == [
+            mock.call("event", "group", "consumer", 4, busy=()),
+            mock.call("event", "group", "consumer", 4, busy={2}),
+        ]
+
+    def test_pop_partitioned_no_ack(
+        self, lanes_mock, event_serializer_mock, redis_mock, redis_stream_factory
+    ):
+        events = [Event(type="event"), Event(type="event")]
+        event_serializer_mock.decode.side_effect = events
+        redis_mock.xreadgroup.return_value = [
+            (b"event:0", [(b"1-0", {b"value": b"1"})]),
+            (b"event:2", [(b"1-0", {b"value": b"2"})]),
+        ]
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=4)}
+        )
+
+        assert stream.pop_many("event", "group", ack=False) == events
+        redis_mock.xack.assert_not_called()
+        stream.ack("event", "group", *events)
+
+        assert redis_mock.xack.call_args_list == [
+            mock.call("event:0", "group", b"1-0"),
+            mock.call("event:2", "group", b"1-0"),
+        ]
+
+    def test_pop_partitioned_no_lanes(
+        self, lanes_mock, redis_mock, redis_stream_factory
+    ):
+        lanes_mock.owned.return_value = []
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=4)},
+            lane_lease_ttl=3,
+        )
+
+        with mock.patch("eventscore.ext.redis.streams.time.sleep") as sleep:
+            with pytest.raises(EmptyStreamError):
+                stream.pop("event", "group")
+
+        sleep.assert_called_once_with(1)
+        redis_mock.xreadgroup.assert_not_called()
+
+    def test_pop_multi_partitioned(
+        self, lanes_mock, event_serializer_mock, redis_mock, redis_stream_factory
+    ):
+        events = [Event(type="event"), Event(type="other")]
+        event_serializer_mock.decode.side_effect = events
+        redis_mock.xreadgroup.return_value = [
+            (b"event:2", [(b"1-0", {b"value": b"1"})]),
+            (b"other", [(b"1-0", {b"value": b"2"})]),
+        ]
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=4)}
+        )
+
+        assert stream.pop_multi(["event", "other"], "group", ack=False) == events
+        assert redis_mock.xreadgroup.call_args.kwargs["streams"] == {
+            "event:0": ">",
+            "event:2": ">",
+            "other": ">",
+        }
+        stream.ack("event", "group", events[0])
+
+        redis_mock.xack.assert_called_once_with("event:2", "group", b"1-0")
+
+    def test_flush_releases_lanes(self, lanes_mock, redis_mock, redis_stream_factory):
+        redis_mock.xreadgroup.return_value = [
+            (b"event:0", [(b"1-0", {b"value": b"1"})])
+        ]
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=4)},
+            consumer_name="consumer",
+        )
+        stream.pop("event", "group")
+
+        stream.flush()
+        stream.flush()
+
+        lanes_mock.release.assert_called_once_with("event", "group", "consumer")
+
+    def test_group_stats_partitioned(self, redis_mock, redis_stream_factory):
+        redis_mock.xinfo_groups.return_value = [
+            {"name": b"group", "consumers": 2, "pending": 1, "lag": 3},
+        ]
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=2)}
+        )
+
+        assert stream.group_stats("event", "group") == GroupStats(
+            lag=6, pending=2, consumers=2
+        )
+        assert redis_mock.xinfo_groups.call_args_list == [
+            mock.call("event:0"),
+            mock.call("event:1"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_apop_many_partitioned(self, redis_stream_factory):
+        stream = redis_stream_factory(
+            partitions={"event": PartitionPolicy(key="user", lanes=2)}
+        )
+
+        with pytest.raises(AssertionError):
+            await stream.apop_many("event", "group")
+
+    @pytest.mark.parametrize(
+        "partitions,expected_member",
+        ((None, "5:event{}"), ({"event": PartitionPolicy(key="user")}, "7:event:8{}")),
+        ids=("plain", "partitioned"),
+    )
+    def test_schedule(
+        self,
+        partitions,
+        expected_member,
+        event_serializer_mock,
+        redis_mock,
+        redis_stream_factory,
+    ):
+        event_serializer_mock.encode.return_value = "{}"
+        stream = redis_stream_factory(partitions=partitions)
+
+        stream.schedule(Event(type="event", payload={"user": 42}), 150.0)
+
+        redis_mock.zadd.assert_called_once_with(
+            "eventscore:delayed", {expected_member: 150.0}
+        )
+        redis_mock.xadd.assert_not_called()
+
+    def test_move_due(self, redis_mock, redis_stream_factory):
+        script = redis_mock.register_script.return_value
+        script.return_value = 3
+        stream = redis_stream_factory()
+
+        with mock.patch("eventscore.ext.redis.streams.time.time", return_value=100):
+            assert stream.move_due(max_count=10) == 3
+            assert stream.move_due() == 3
+
+        redis_mock.register_script.assert_called_once()
+        assert script.call_args_list == [
+            mock.call(keys=["eventscore:delayed"], args=[100, 10]),
+            mock.call(keys=["eventscore:delayed"], args=[100, 1000]),
+        ]
+
+    @pytest.mark.parametrize(
+        "result,expected",
+        (([5, b"0"], (5, 0.0)), ([0, b"0.25"], (0, 0.25))),
+        ids=("taken", "exceeded"),
+    )
+    def test_take_tokens(self, result, expected, redis_mock, redis_stream_factory):
+        script = redis_mock.register_script.return_value
+        script.return_value = result
+        stream = redis_stream_factory()
+
+        assert stream.take_tokens("consumer", RateLimit(rate=2.5), 5) == expected
+        assert stream.take_tokens("consumer", RateLimit(rate=2.5), 5) == expected
+
+        redis_mock.register_script.assert_called_once()
+        assert (
+            script.call_args_list
+            == [mock.call(keys=["eventscore:ratelimits:consumer"], args=[2.5, 3, 5])]
+            * 2
+        )
+
+
+@pytest.fixture
+def kafka_mocks():
+    with (
+        mock.patch("eventscore.ext.kafka.streams.KafkaProducer") as producer_mock,
+        mock.patch("eventscore.ext.kafka.streams.KafkaConsumer") as consumer_mock,
+    ):
+        yield producer_mock.return_value, consumer_mock
+
+
+def _polled(*topics, partition=0, offsets=(0,)):
+    return {
+        TopicPartition(topic, partition): [
+            mock.Mock(value={"topic": topic}, offset=offset) for offset in offsets
+        ]
+        for topic in topics
+    }
+
+
+@pytest.mark.unit
+class TestKafkaStream:
+    def test_put(self, kafka_mocks):
+        producer, _ = kafka_mocks
+        serializer = mock.Mock()
+        event = Event(type="event")
+
+        KafkaStream(serializer).put(event, block=False)
+
+        producer.send.assert_called_once_with(
+            topic="event", value=serializer.encode.return_value, key=None
+        )
+
+    def test_put_many(self, kafka_mocks):
+        producer, _ = kafka_mocks
+        serializer = mock.Mock()
+        events = [Event(type="first"), Event(type="second")]
+
+        results = KafkaStream(serializer).put_many(events, block=False)
+
+        assert [result.status for result in results] == [EventStatus.PENDING] * 2
+        assert [call.kwargs["topic"] for call in producer.send.call_args_list] == [
+            "first",
+            "second",
+        ]
+
+    def test_consumer(self, kafka_mocks):
+        _, consumer_mock = kafka_mocks
+        consumer_mock.return_value.poll.return_value = _polled("event")
+        stream = KafkaStream(mock.Mock())
+
+        stream.pop("event", "first", ack=False)
+        stream.pop("event", "first", ack=False)
+        stream.pop("event", "second", ack=False)
+
+        assert consumer_mock.call_args_list == [
+            mock.call(
+                group_id=group,
+                enable_auto_commit=False,
+                value_deserializer=_deserialize,
+            )
+            for group in ("first", "second")
+        ]
+        consumer_mock.return_value.commit.assert_not_called()
+
+    @pytest.mark.parametrize("ack", (True, False), ids=("ack", "no-ack"))
+    def test_pop_commit(self, ack, kafka_mocks):
+        _, consumer_mock = kafka_mocks
+        consumer = consumer_mock.return_value
+        consumer.poll.return_value = _polled("event", offsets=(4,))
+        stream = KafkaStream(mock.Mock())
+
+        stream.pop_many("event", "group", ack=ack)
+
+        if ack:
+            consumer.commit.assert_called_once_with(
+                offsets={TopicPartition("event", 0): OffsetAndMetadata(5, "", -1)}
+            )
+        else:
+            consumer.commit.assert_not_called()
+
+    def test_ack(self, kafka_mocks):
+        _, consumer_mock = kafka_mocks
+        consumer = consumer_mock.return_value
+        consumer.poll.return_value = _polled("event", offsets=(0, 1))
+        serializer = mock.Mock()
+        events = [Event(type="event"), Event(type="event")]
+        serializer.decode.side_effect = events
+        stream = KafkaStream(serializer)
+
+        stream.ack("event", "group", events[0])
+        consumer.commit.assert_not_called()
+        assert stream.pop_many("event", "group", ack=False) == events
+        stream.ack("event", "group", events[1])
+        stream.ack("event", "group", events[0])
+
+        # NOTE: offset is not committed past the first not acknowledged event
+        partition = TopicPartition("event", 0)
+        assert consumer.commit.call_args_list == [
+            mock.call(offsets={partition: OffsetAndMetadata(0, "", -1)}),
+            mock.call(offsets={partition: OffsetAndMetadata(2, "", -1)}),
+        ]
+
+    def test_reclaim(self, kafka_mocks):
+        _, consumer_mock = kafka_mocks
+        consumer_mock.return_value.poll.return_value = _polled("event")
+        serializer = mock.Mock()
+        event = Event(type="event")
+        serializer.decode.return_value = event
+        stream = KafkaStream(serializer)
+        stream.pop("event", "group", ack=False)
+
+        assert stream.reclaim("event", "group", min_idle=60) == []
+        assert stream.reclaim("other", "group", min_idle=0) == []
+        assert stream.reclaim("event", "group", min_idle=0) == [event]
+        stream.ack("event", "group", event)
+        assert stream.reclaim("event", "group", min_idle=0) == []
+
+    @pytest.mark.parametrize("multi", (False, True), ids=("single", "multi"))
+    def test_pop_by_topic(self, multi, kafka_mocks):
+        _, consumer_mock = kafka_mocks
+        consumer = consumer_mock.return_value
+        serializer = mock.Mock()
+        stream = KafkaStream(serializer)
+
+        if multi:
+            consumer.poll.return_value = {
+                **_polled("first", "second"),
+                **_polled("first", partition=1),
+            }
+            popped = stream.pop_multi(("first", "second"), "group")
+        else:
+            consumer.poll.return_value = _polled("first")
+            popped = stream.pop_many("first", "group")
+
+        # NOTE: records are polled by topic partition and decoded by topic
+        assert popped == [serializer.decode.return_value] * (3 if multi else 1)
+        assert serializer.decode.call_args_list[0] == mock.call({"topic": "first"})
+
+    def test_pop_empty(self, kafka_mocks):
+        _, consumer_mock = kafka_mocks
+        consumer_mock.return_value.poll.return_value = _polled("other")
+        stream = KafkaStream(mock.Mock())
+
+        with pytest.raises(EmptyStreamError):
+            stream.pop("event", "group")
+        with pytest.raises(EmptyStreamError):
+            stream.pop_multi(("event",), "group")
+
+
+class _SharingStream:
+    shared_calls = 0
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    @classmethod
+    def shared_kwargs(cls, **kwargs):
+        cls.shared_calls += 1
+        return {"pool": object()}
+
+
+@pytest.mark.unit
+class TestStreamFactory:
+    def test_call(self):
+        stream_class = mock.Mock(spec=[])
+        factory = StreamFactory(stream_class, {"host": "redis"})
+
+        assert factory() is stream_class.return_value
+
+        stream_class.assert_called_once_with(host="redis")
+
+    def test_call_shared_kwargs(self):
+        _SharingStream.shared_calls = 0
+        factory = StreamFactory(_SharingStream, {"host": "redis"})
+
+        first, second = factory(), factory()
+        with mock.patch("eventscore.core.streams.os.getpid", return_value=-1):
+            forked = factory()
+
+        assert _SharingStream.shared_calls == 2
+        assert first.kwargs["host"] == "redis"
+        assert first.kwargs["pool"] is second.kwargs["pool"]
+        assert forked.kwargs["pool"] is not first.kwargs["pool"]
+
+    def test_call_redis_stream(self, event_serializer_mock, redis_mock):
+        redis_init_kwargs = {"password": "password"}
+        factory = StreamFactory(
+            RedisStream,
+            {
+                "serializer": event_serializer_mock,
+                "host": "redis",
+                "port": 6379,
+                "db": 0,
+                "redis_init_kwargs": redis_init_kwargs,
+            },
+        )
+
+        with mock.patch("eventscore.ext.redis.streams.Redis", redis_mock):
+            factory()
+            with mock.patch("eventscore.core.streams.os.getpid", return_value=-1):
+                factory()
+
+        # NOTE: kwargs of factory are reused by every process
+        assert redis_init_kwargs == {"password": "password"}
+        assert (
+            redis_mock.call_args_list.count(
+                mock.call(password="password", host="redis", port=6379, db=0)
+            )
+            == 2
+        )
+
+    def test_pickle(self):
+        _SharingStream.shared_calls = 0
+        factory = StreamFactory(_SharingStream, {"host": "redis"})
+        first = factory()
+
+        restored = pickle.loads(pickle.dumps(factory))
+
+        assert restored().kwargs["pool"] is not first.kwargs["pool"]
+        assert _SharingStream.shared_calls == 2
@@ -0,0 +1,61 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from eventscore.core.supervision import rss, run_supervised
+
+
+class _StoppableRunner:
+    def __init__(self):
+        self.ran = False
+        self.stopped = threading.Event()
+
+    def run(self):
+        self.ran = True
+        self.stopped.wait(5)
+
+    def stop(self):
+        self.stopped.set()
+
+
+@pytest.mark.unit
+class TestRunSupervised:
+    def test_no_stop(self):
+        runner = mock.Mock(spec=["run"])
+
+        with mock.patch("eventscore.core.supervision.signal.signal") as signal_mock:
+            run_supervised(runner, 0.01, None, 0.01, mock.Mock())
+
+        runner.run.assert_called_once_with()
+        signal_mock.assert_not_called()
+
+    def test_sigterm(self):
+        runner = _StoppableRunner()
+
+        with mock.patch("eventscore.core.supervision.signal.signal") as signal_mock:
+            signal_mock.side_effect = lambda signum, handler: handler(signum, None)
+            run_supervised(runner, None, None, 1, mock.Mock())
+
+        assert runner.ran
+        assert runner.stopped.is_set()
+
+    @pytest.mark.parametrize(
+        "ttl,max_rss",
+        ((0.01, None), (None, 1)),
+        ids=("ttl", "max-rss"),
+    )
+    def test_recycling(self, ttl, max_rss):
+        runner = _StoppableRunner()
+
+        with mock.patch("eventscore.core.supervision.signal.signal"):
+            run_supervised(runner, ttl, max_rss, 0.01, mock.Mock())
+
+        assert runner.stopped.is_set()
+
+    def test_rss(self):
+        assert rss() > 0
+
+    def test_rss_without_procfs(self):
+        with mock.patch("builtins.open", side_effect=OSError):
+            assert rss() > 0
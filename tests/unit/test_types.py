@@ -1,9 +1,19 @@
 import uuid
 from time import time
+from unittest import mock
 
 import pytest
 
-from eventscore.core.types import Event, Pipeline, PipelineItem, Worker
+from eventscore.core.types import (
+    Event,
+    PartitionPolicy,
+    Pipeline,
+    PipelineItem,
+    RateLimit,
+    RetryPolicy,
+    ScalingPolicy,
+    Worker,
+)
 
 
 @pytest.mark.unit
@@ -133,6 +143,12 @@ class TestEvent:
     def test_fromdict(self, dct, expected_event):
         assert Event.fromdict(dct) == expected_event
 
+    def test_headers(self):
+        event = Event(type="event", headers={"attempt": 2})
+
+        assert event.asdict()["headers"] == {"attempt": 2}
+        assert Event.fromdict(event.asdict()).headers == {"attempt": 2}
+
 
 @pytest.mark.unit
 class TestPipelineItem:
@@ -390,3 +406,116 @@ class TestWorker:
             worker = Worker(**init)
 
             assert isinstance(getattr(worker, missing_field), expect_type)
+
+
+@pytest.mark.unit
+class TestScalingPolicy:
+    @pytest.mark.parametrize(
+        "kwargs",
+        (
+            {"min_clones": -1},
+            {"min_clones": 2, "max_clones": 1},
+            {"scale_up_backlog": 100, "scale_down_backlog": 100},
+            {"scale_down_backlog": -1},
+            {"step": 0},
+            {"sustain": 0},
+            {"scale_up_cooldown": -1},
+            {"scale_down_cooldown": -1},
+        ),
+        ids=(
+            "negative-min-clones",
+            "max-less-than-min",
+            "no-hysteresis",
+            "negative-scale-down-backlog",
+            "zero-step",
+            "zero-sustain",
+            "negative-scale-up-cooldown",
+            "negative-scale-down-cooldown",
+        ),
+    )
+    def test_invalid(self, kwargs):
+        with pytest.raises(AssertionError):
+            ScalingPolicy(**kwargs)
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    @pytest.mark.parametrize(
+        "kwargs",
+        (
+            {"max_attempts": 0},
+            {"backoff": -1},
+            {"multiplier": 0.5},
+            {"backoff": 10, "max_backoff": 5},
+            {"jitter": 2},
+        ),
+        ids=(
+            "zero-max-attempts",
+            "negative-backoff",
+            "decreasing-multiplier",
+            "max-backoff-less-than-backoff",
+            "jitter-above-one",
+        ),
+    )
+    def test_invalid(self, kwargs):
+        with pytest.raises(AssertionError):
+            RetryPolicy(**kwargs)
+
+    @pytest.mark.parametrize(
+        "attempt,jitter,expected_delay",
+        ((1, 0.0, 1.0), (3, 0.0, 4.0), (10, 0.0, 5.0), (3, 0.5, 6.0)),
+        ids=("first-attempt", "third-attempt", "capped", "jittered"),
+    )
+    def test_delay(self, attempt, jitter, expected_delay):
+        policy = RetryPolicy(
+            backoff=1.0, multiplier=2.0, max_backoff=5.0, jitter=jitter
+        )
+
+        with mock.patch(
+            "eventscore.core.types.random.uniform", side_effect=lambda a, b: b
+        ):
+            assert policy.delay(attempt) == expected_delay
+
+
+@pytest.mark.unit
+class TestRateLimit:
+    @pytest.mark.parametrize(
+        "kwargs",
+        ({"rate": 0}, {"rate": 1, "burst": -1}, {"rate": 1, "prefetch": 0}),
+        ids=("zero-rate", "negative-burst", "zero-prefetch"),
+    )
+    def test_invalid(self, kwargs):
+        with pytest.raises(AssertionError):
+            RateLimit(**kwargs)
+
+    @pytest.mark.parametrize(
+        "rate,burst,expected_capacity",
+        ((0.5, 0, 1), (2.5, 0, 3), (2.5, 10, 10)),
+        ids=("below-one", "rounded-up", "burst"),
+    )
+    def test_capacity(self, rate, burst, expected_capacity):
+        assert RateLimit(rate=rate, burst=burst).capacity == expected_capacity
+
+
+@pytest.mark.unit
+class TestPartitionPolicy:
+    def test_invalid(self):
+        with pytest.raises(AssertionError):
+            PartitionPolicy(key="user", lanes=0)
+
+    @pytest.mark.parametrize(
+        "key,payload,expected_key,expected_lane",
+        (
+            ("user", {"user": 42}, b"42", 0),
+            ("user", {"user": "43"}, b"43", 2),
+            ("user", {}, b"None", 1),
+            (lambda event: f"user-{event.payload['id']}", {"id": 1}, b"user-1", 0),
+        ),
+        ids=("payload-field", "same-str-key", "missing-field", "callable"),
+    )
+    def test_lane(self, key, payload, expected_key, expected_lane):
+        policy = PartitionPolicy(key=key, lanes=4)
+        event = Event(type="event", payload=payload)
+
+        assert policy.key_of(event) == expected_key
+        assert policy.lane(event) == expected_lane
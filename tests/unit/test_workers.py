@@ -1,7 +1,20 @@
+import os
+import threading
 from unittest import mock
 
 import pytest
 
+from eventscore.core.supervision import run_supervised
+from eventscore.core.types import GroupStats, ScalingPolicy, Worker
+from eventscore.core.workers import (
+    SpawnAutoscaledMPWorker,
+    SpawnMPWorker,
+    SpawnMultiplexedWorker,
+    SpawnSupervisedMPWorker,
+    SpawnThreadWorker,
+    _run_host,
+)
+
 
 @pytest.mark.unit
 class TestSpawnMPWorker:
@@ -27,3 +40,376 @@ class TestSpawnMPWorker:
             [mock.call(target=worker.runner.run, daemon=True)] * clones
         )
         mp_process_mock.start.assert_has_calls([mock.call()] * clones)
+
+    def test_finalize(self, spawn_mp_worker):
+        assert spawn_mp_worker.finalize() == ()
+
+    def test_init_invalid_start_method(self):
+        with pytest.raises(AssertionError):
+            SpawnMPWorker(start_method="unknown")
+
+    @pytest.mark.parametrize(
+        "start_method,preload,expected_preload",
+        (
+            ("fork", ("consumers",), False),
+            ("forkserver", (), False),
+            ("forkserver", ("consumers",), True),
+        ),
+        ids=("fork", "forkserver", "forkserver-preload"),
+    )
+    def test_spawn_start_method(
+        self, start_method, preload, expected_preload, mp_mock, worker_factory
+    ):
+        context = mp_mock.get_context.return_value
+        worker = worker_factory(clones=2)
+
+        with mock.patch("eventscore.core.workers.mp", mp_mock):
+            SpawnMPWorker(start_method=start_method, preload=preload)(worker)
+
+        mp_mock.get_context.assert_called_once_with(start_method)
+        mp_mock.Process.assert_not_called()
+        assert context.Process.call_count == 2
+        if expected_preload:
+            context.set_forkserver_preload.assert_called_once_with(list(preload))
+        else:
+            context.set_forkserver_preload.assert_not_called()
+
+    @pytest.mark.parametrize("gc_freeze", (True, False), ids=("freeze", "no-freeze"))
+    def test_spawn_gc_freeze(self, gc_freeze, mp_mock, mp_process_mock, worker_factory):
+        manager = mock.Mock()
+        mp_process_mock.start = manager.start
+
+        with (
+            mock.patch("eventscore.core.workers.mp", mp_mock),
+            mock.patch("eventscore.core.workers.gc.freeze", manager.freeze),
+            mock.patch("eventscore.core.workers.gc.unfreeze", manager.unfreeze),
+        ):
+            SpawnMPWorker(gc_freeze=gc_freeze)(worker_factory(clones=2))
+
+        if gc_freeze:
+            assert manager.mock_calls == [
+                mock.call.freeze(),
+                mock.call.start(),
+                mock.call.start(),
+                mock.call.unfreeze(),
+            ]
+        else:
+            assert manager.mock_calls == [mock.call.start(), mock.call.start()]
+
+
+class _Runner:
+    def __init__(self, name):
+        self.name = name
+        self.ran = False
+
+    def run(self):
+        self.ran = True
+
+
+class _AsyncRunner(_Runner):
+    def run(self):
+        raise AssertionError("Must be run within host event loop.")
+
+    async def arun(self):
+        self.ran = True
+
+
+@pytest.mark.unit
+class TestSpawnMultiplexedWorker:
+    def test_init_invalid_hosts(self):
+        with pytest.raises(AssertionError):
+            SpawnMultiplexedWorker(hosts=-1)
+
+    @pytest.mark.parametrize(
+        "hosts,workers,expected_hosts",
+        (
+            (2, [("a", 1, 1.0)], [["a"]]),
+            (2, [("a", 3, 1.0)], [["a", "a"], ["a"]]),
+            (2, [("a", 1, 1.0), ("b", 2, 2.0)], [["b", "a"], ["b"]]),
+            (
+                3,
+                [("a", 2, 1.0), ("b", 1, 3.0), ("c", 2, 0.5)],
+                [["b"], ["a", "c"], ["a", "c"]],
+            ),
+        ),
+        ids=("single-clone", "more-clones-than-hosts", "weighted", "mixed"),
+    )
+    def test_pack(self, hosts, workers, expected_hosts):
+        spawn = SpawnMultiplexedWorker(hosts=hosts)
+        for name, clones, weight in workers:
+            assert (
+                spawn(
+                    Worker(
+                        name=name, runner=_Runner(name), clones=clones, weight=weight
+                    )
+                )
+                == ()
+            )
+
+        packed = spawn.pack()
+
+        assert [[runner.name for runner in host] for host in packed] == expected_hosts
+        runners = [runner for host in packed for runner in host]
+        assert len(set(map(id, runners))) == len(runners)
+
+    def test_finalize(self, mp_mock, mp_process_mock):
+        mp_process_mock.pid = 1
+        spawn = SpawnMultiplexedWorker(hosts=2)
+        spawn(Worker(name="a", runner=_Runner("a"), clones=3))
+
+        with mock.patch("eventscore.core.workers.mp", mp_mock):
+            assert spawn.finalize() == (1, 1)
+
+        assert mp_mock.Process.call_count == 2
+        assert [
+            len(call.kwargs["args"][0]) for call in mp_mock.Process.call_args_list
+        ] == [2, 1]
+        mp_process_mock.start.assert_has_calls([mock.call()] * 2)
+        assert spawn.pack() == []
+
+    def test_run_host(self):
+        runners = [_Runner("a"), _AsyncRunner("b"), _AsyncRunner("c")]
+        failing = mock.Mock(spec=["run"])
+        failing.run.side_effect = ValueError
+
+        _run_host([*runners, failing], mock.Mock())
+
+        assert all(runner.ran for runner in runners)
+        failing.run.assert_called_once_with()
+
+
+class _StoppableRunner(_Runner):
+    def __init__(self, name):
+        super().__init__(name)
+        self.stopped = threading.Event()
+
+    def run(self):
+        self.ran = True
+        self.stopped.wait(5)
+
+    def stop(self):
+        self.stopped.set()
+
+
+@pytest.mark.unit
+class TestSpawnThreadWorker:
+    def test_spawn(self):
+        runner = _StoppableRunner("a")
+        spawn = SpawnThreadWorker()
+
+        assert spawn(Worker(name="a", runner=runner, clones=2)) == (os.getpid(),) * 2
+        assert spawn.finalize() == ()
+
+        spawn.stop(timeout=5)
+        runners = getattr(spawn, "_SpawnThreadWorker__runners")
+        threads = getattr(spawn, "_SpawnThreadWorker__threads")
+        assert runners == []
+        assert threads == []
+        assert runner.ran is False
+
+    def test_spawn_failing_runner(self):
+        runner = mock.MagicMock(spec=["run"])
+        runner.run.side_effect = ValueError
+        logger = mock.Mock()
+        spawn = SpawnThreadWorker(logger=logger)
+
+        with mock.patch("eventscore.core.workers.copy.copy", return_value=runner):
+            spawn(Worker(name="a", runner=runner, clones=1))
+        spawn.stop(timeout=5)
+
+        runner.run.assert_called_once_with()
+        logger.error.assert_called_once()
+
+
+@pytest.mark.unit
+class TestSpawnAutoscaledMPWorker:
+    def test_spawn(self, mp_mock, mp_process_mock, stream_mock, stream_factory_mock):
+        mp_process_mock.pid = 1
+        mp_process_mock.is_alive.return_value = True
+        stream_mock.group_stats.return_value = GroupStats(lag=10000)
+        spawn = SpawnAutoscaledMPWorker(
+            stream_factory_mock,
+            {"scaled": ScalingPolicy(max_clones=2, sustain=1, scale_up_cooldown=0)},
+        )
+        scaled = Worker(
+            name="scaled", runner=_Runner("a"), events=("event",), group="scaled"
+        )
+        fixed = Worker(name="fixed", runner=_Runner("b"), clones=2, group="fixed")
+
+        with (
+            mock.patch("eventscore.core.scaling.mp", mp_mock),
+            mock.patch("eventscore.core.workers.mp", mp_mock),
+        ):
+            assert spawn(scaled) == (1,)
+            assert spawn(fixed) == (1, 1)
+            spawn.step()
+
+            autoscalers = spawn.autoscalers
+            assert list(autoscalers) == ["scaled"]
+            assert autoscalers["scaled"].clones == 2
+            assert mp_mock.Process.call_count == 4
+
+            spawn.stop()
+
+        assert autoscalers["scaled"].clones == 0
+        stream_factory_mock.assert_called_once_with()
+
+    def test_finalize(self, stream_factory_mock, threading_thread_mock):
+        spawn = SpawnAutoscaledMPWorker(
+            stream_factory_mock, default_policy=ScalingPolicy()
+        )
+        setattr(spawn, "_SpawnAutoscaledMPWorker__autoscalers", {"a": mock.Mock()})
+
+        with mock.patch(
+            "eventscore.core.workers.threading.Thread",
+            return_value=threading_thread_mock,
+        ) as thread_mock:
+            assert spawn.finalize() == ()
+            assert spawn.finalize() == ()
+
+        thread_mock.assert_called_once()
+        threading_thread_mock.start.assert_called_once_with()
+
+    def test_step_failure(self, stream_factory_mock):
+        logger = mock.Mock()
+        autoscaler = mock.Mock()
+        autoscaler.step.side_effect = ValueError
+        spawn = SpawnAutoscaledMPWorker(stream_factory_mock, logger=logger)
+        setattr(spawn, "_SpawnAutoscaledMPWorker__autoscalers", {"a": autoscaler})
+
+        spawn.step()
+
+        logger.error.assert_called_once()
+
+
+@pytest.mark.unit
+class TestSpawnSupervisedMPWorker:
+    @pytest.mark.parametrize(
+        "kwargs",
+        (
+            {"ttl": 0},
+            {"max_rss": 0},
+            {"backoff": 0},
+            {"backoff": 2, "max_backoff": 1},
+            {"check_interval": 0},
+            {"drain_timeout": -1},
+        ),
+        ids=(
+            "zero-ttl",
+            "zero-max-rss",
+            "zero-backoff",
+            "backoff-above-max",
+            "zero-check-interval",
+            "negative-drain-timeout",
+        ),
+    )
+    def test_init(self, kwargs):
+        with pytest.raises(AssertionError):
+            SpawnSupervisedMPWorker(**kwargs)
+
+    def test_spawn(self, mp_mock, mp_process_mock):
+        mp_process_mock.pid = 1
+        mp_process_mock.is_alive.return_value = True
+        runner = _Runner("a")
+        logger = mock.Mock()
+        spawn = SpawnSupervisedMPWorker(ttl=10, max_rss=100, logger=logger)
+
+        with mock.patch("eventscore.core.workers.mp", mp_mock):
+            assert spawn(Worker(name="a", runner=runner, clones=2)) == (1, 1)
+
+        assert (
+            mp_mock.Process.call_args_list
+            == [
+                mock.call(
+                    target=run_supervised,
+                    args=(runner, 10, 100, 1.0, logger),
+                    daemon=True,
+                )
+            ]
+            * 2
+        )
+        assert spawn.pids == (1, 1)
+
+    @pytest.mark.parametrize(
+        "exitcodes,expected_delays",
+        (
+            ([0, 0], [0, 0]),
+            ([1, 1, 1], [1, 2, 4]),
+            ([1, 1, 1, 1, 1], [1, 2, 4, 5, 5]),
+            ([1, 0, 1], [1, 0, 1]),
+        ),
+        ids=("recycled", "crashed", "max-backoff", "recycling-resets-backoff"),
+    )
+    def test_check(self, exitcodes, expected_delays, mp_mock, mp_process_mock):
+        spawn = SpawnSupervisedMPWorker(backoff=1, max_backoff=5)
+        now = 100.0
+
+        with (
+            mock.patch("eventscore.core.workers.mp", mp_mock),
+            mock.patch(
+                "eventscore.core.workers.time.monotonic", side_effect=lambda: now
+            ),
+        ):
+            spawn(Worker(name="a", runner=_Runner("a")))
+            delays = []
+            for exitcode in exitcodes:
+                mp_process_mock.is_alive.return_value = False
+                mp_process_mock.exitcode = exitcode
+                starts = mp_mock.Process.call_count
+                delay = 0
+                spawn.check()
+                while mp_mock.Process.call_count == starts:
+                    now += 1
+                    delay += 1
+                    spawn.check()
+                delays.append(delay)
+
+        assert delays == expected_delays
+
+    def test_check_healthy_resets_backoff(self, mp_mock, mp_process_mock):
+        spawn = SpawnSupervisedMPWorker(backoff=1, max_backoff=5)
+        clock = mock.Mock(return_value=0)
+        mp_process_mock.is_alive.return_value = False
+        mp_process_mock.exitcode = 1
+
+        with (
+            mock.patch("eventscore.core.workers.mp", mp_mock),
+            mock.patch("eventscore.core.workers.time.monotonic", clock),
+        ):
+            spawn(Worker(name="a", runner=_Runner("a")))
+            spawn.check()  # crash, restart in 1s
+            clock.return_value = 1
+            spawn.check()  # restarted
+            clock.return_value = 10
+            spawn.check()  # crash after a long run, restart in 1s again
+            clock.return_value = 11
+            spawn.check()
+
+        assert mp_mock.Process.call_count == 3
+
+    def test_stop(self, mp_mock, mp_process_mock):
+        mp_process_mock.is_alive.side_effect = [True, False]
+        spawn = SpawnSupervisedMPWorker(drain_timeout=1)
+
+        with mock.patch("eventscore.core.workers.mp", mp_mock):
+            spawn(Worker(name="a", runner=_Runner("a"), clones=2))
+            spawn.stop()
+
+        assert mp_process_mock.terminate.call_count == 2
+        mp_process_mock.kill.assert_called_once_with()
+        assert spawn.pids == ()
+
+    def test_finalize(self, threading_thread_mock):
+        spawn = SpawnSupervisedMPWorker()
+
+        with mock.patch(
+            "eventscore.core.workers.threading.Thread",
+            return_value=threading_thread_mock,
+        ) as thread_mock:
+            assert spawn.finalize() == ()
+            setattr(spawn, "_SpawnSupervisedMPWorker__clones", [mock.Mock()])
+            assert spawn.finalize() == ()
+            assert spawn.finalize() == ()
+
+        thread_mock.assert_called_once()
+        threading_thread_mock.start.assert_called_once_with()